@@ -0,0 +1,81 @@
+"""Gekürzte Batteriereports (englisch/deutsch): Tabellenerkennung und Trend."""
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+import winrep_battery
+from winrep_battery import BatteryInfo, BatteryReport, CapacityPoint, parse_report
+
+FIXTURES = Path(__file__).parent / "fixtures"
+REPORTS = ["CLS-BatteryReport.html", "CLS-BatteryReport.de.html"]
+
+
+@pytest.fixture(params=REPORTS)
+def report(request) -> BatteryReport:
+    return parse_report(FIXTURES / request.param)
+
+
+def test_installed_battery(report):
+    assert len(report.batteries) == 1
+    b = report.batteries[0]
+    assert (b.name, b.manufacturer, b.chemistry) == ("5B10W13930", "SMP", "LiP")
+    assert (b.design_mwh, b.full_mwh, b.cycle_count) == (50000, 41550, 312)
+    assert report.health == pytest.approx(83.1)
+
+
+def test_capacity_history(report):
+    # 30 Zeiträume, einer ohne Messung („-“)
+    assert len(report.capacity) == 29
+    first, last = report.capacity[0], report.capacity[-1]
+    assert (first.start, first.end, first.full_mwh) == (date(2025, 8, 18), date(2025, 8, 31), 45000)
+    assert (last.end, last.full_mwh, last.design_mwh) == (date(2026, 10, 11), 45000 - 115 * 29, 50000)
+
+
+def test_usage_history(report):
+    # „Letzte Nutzung“/„Akkunutzung“ haben ebenfalls fünf Spalten und dürfen nicht mitzählen
+    assert [u.end for u in report.usage] == [date(2026, 9, 20), date(2026, 9, 27), date(2026, 10, 4), date(2026, 10, 11)]
+    battery_h, ac_h = report.usage_totals()
+    assert battery_h == pytest.approx(10 + 10 / 60)
+    assert ac_h == pytest.approx(87.0)
+
+
+def test_trend(report):
+    trend = report.trend()
+    # -115 mWh je 14 Tage bei 50 000 mWh Design = 0,23 %-Punkte je 14 Tage
+    assert trend.loss_per_month == pytest.approx(0.23 / 14 * winrep_battery.DAYS_PER_MONTH)
+    assert trend.months_to_threshold == pytest.approx((83.1 - 65) / trend.loss_per_month)
+    assert trend.points == 26   # nur das letzte Jahr
+    assert trend.span_days == 364
+    assert trend.history_days == 419
+    assert "65 % voraussichtlich in ~36 Monaten" in trend.format_text()
+
+
+def test_table_split_across_chunks(monkeypatch):
+    monkeypatch.setattr(winrep_battery, "READ_CHUNK", 97)
+    small = parse_report(FIXTURES / REPORTS[1])
+    assert small.as_dict() | {"seconds": 0} == parse_report(FIXTURES / REPORTS[1]).as_dict() | {"seconds": 0}
+
+
+def _history(n: int, step_mwh: int, start_full: int = 48000) -> list:
+    end = date(2026, 1, 4)
+    return [CapacityPoint(end + timedelta(days=7 * i - 6), end + timedelta(days=7 * i), start_full - step_mwh * i, 50000)
+            for i in range(n)]
+
+
+def test_trend_needs_enough_points():
+    trend = BatteryReport("x", capacity=_history(3, 50)).trend()
+    assert trend.loss_per_month is None
+    assert trend.health == pytest.approx(100.0 * (48000 - 100) / 50000)
+    assert "Zu wenig Verlauf" in trend.format_text()
+
+
+def test_trend_flat_and_below_threshold():
+    flat = BatteryReport("x", capacity=_history(10, 0)).trend()
+    assert flat.loss_per_month == pytest.approx(0.0)
+    assert flat.months_to_threshold is None
+
+    worn = BatteryReport("x", [BatteryInfo(design_mwh=50000, full_mwh=30000)], _history(10, 50)).trend()
+    assert worn.health == pytest.approx(60.0)
+    assert worn.months_to_threshold == 0.0
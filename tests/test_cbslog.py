@@ -0,0 +1,134 @@
+"""Synthetisches CBS.log: Index, Zeitfenster und Einordnung der Zeilen."""
+
+import mmap
+from datetime import datetime, timedelta
+
+import pytest
+
+from winrep_cbslog import LogIndex, analyze_log, needs_triage, triage
+
+T0 = datetime(2026, 10, 12, 9, 0, 0)
+SINCE = T0 + timedelta(minutes=30)
+
+CANNOT = ('CSI    00000228 [SR] Cannot repair member file [l:11]"wuaueng.dll" of Microsoft-Windows-WindowsUpdateClient-'
+          'Core, version 10.0.22621.1, arch amd64, nonSxS, pkt {l:8 b:31bf3856ad364e35} in the store, hash mismatch')
+REPAIRING = ('CSI    0000022a [SR] Repairing corrupted file [ml:520{260},l:60{30}]"\\??\\C:\\Windows\\System32"'
+             '\\[l:22{11}]"{name}" from store')
+REPAIRED = 'CSI    0000022c [SR] Repaired file \\SystemRoot\\WinSxS\\amd64_x\\[l:11]"{name}" by copying from backup'
+HASHES = 'CSI    00000230 Hashes for file member [l:10]"ntdll.dll" do not match.'
+
+
+def _line(when: datetime, level: str, text: str) -> str:
+    return f"{when:%Y-%m-%d %H:%M:%S}, {level:<22}{text}\n"
+
+
+def _write_log(path, before: int = 400, after: int = 400):
+    lines = []
+    t = T0
+    for i in range(before):   # vor dem Lauf: Fehler, die nicht mitzählen dürfen
+        lines.append(_line(t, "Error", f"CBS    Failed to resolve package [HRESULT = 0x80070490 - ERROR_NOT_FOUND] #{i}"))
+        if i == 10:
+            lines.append(_line(t, "Info", CANNOT.replace("wuaueng.dll", "alt.dll")))
+        t += timedelta(seconds=4)
+    t = SINCE
+    lines.append(_line(t, "Info", "CBS    TI: --- Initializing Trusted Installer ---"))
+    for i in range(after):
+        t += timedelta(seconds=2)
+        if i == 20:
+            lines.append(_line(t, "Info", REPAIRING.replace("{name}", "wuaueng.dll")))
+            lines.append(_line(t, "Info", CANNOT))   # später „nicht reparierbar“ → höherer Zustand gewinnt
+            lines.append(_line(t, "Info", REPAIRING.replace("{name}", "wuaueng.dll")))
+        elif i == 40:
+            lines.append(_line(t, "Info", REPAIRING.replace("{name}", "kernel32.dll")))
+            lines.append(_line(t, "Info", REPAIRED.replace("{name}", "kernel32.dll")))
+        elif i == 60:
+            lines.append(_line(t, "Info", HASHES))
+        elif i == 80:
+            lines.append(_line(t, "Error", "CBS    Failed to restore: source files could not be found. "
+                                           "[HRESULT = 0x800f081f - CBS_E_SOURCE_MISSING]"))
+        elif i == 90:
+            lines.append(_line(t, "Info", "CBS    Exec: Processing complete.  Session: 31003_1, "
+                                          "Package: x [HRESULT = 0x800f081f - CBS_E_SOURCE_MISSING] failed"))
+        elif i % 50 == 0:
+            # Flags wie 0x80000000 in Info-Zeilen sind keine Fehler
+            lines.append(_line(t, "Info", "CBS    Appl: Selfupdate, flags: 0x80000000, Status: 0x0"))
+        else:
+            lines.append(_line(t, "Info", f"CBS    Read out cached package applicability for package #{i}"))
+    lines.append(_line(t, "Warning", "DISM   DISM Provider Store: PID=1 Failed to load 0x80070002 (0x80070002)"))
+    path.write_bytes("".join(lines).encode("utf-8"))
+    return path
+
+
+@pytest.fixture
+def log(tmp_path):
+    return _write_log(tmp_path / "CBS.log")
+
+
+def test_index_small_stride(log):
+    with open(log, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        index = LogIndex(mm, stride=1024)
+        assert len(index.offsets) > 20
+        assert index.times == sorted(index.times)
+        off = index.offset_for(SINCE.timestamp())
+        assert mm[off:off + 19] == f"{SINCE:%Y-%m-%d %H:%M:%S}".encode()
+        assert off == mm.find(f"{SINCE:%Y-%m-%d %H:%M:%S}".encode())
+        assert index.offset_for(T0.timestamp() - 60) == 0
+        assert index.offset_for((SINCE + timedelta(days=1)).timestamp()) == len(mm)
+        # Zeitpunkt zwischen zwei Einträgen → nächste Zeile danach
+        mid = index.offset_for((T0 + timedelta(seconds=5)).timestamp())
+        assert mm[mid:mid + 19] == f"{T0 + timedelta(seconds=8):%Y-%m-%d %H:%M:%S}".encode()
+
+
+def test_only_since_is_scanned(log):
+    summary = analyze_log(log, since=SINCE.timestamp())
+    assert summary.first_ts == SINCE.timestamp()
+    assert summary.scanned_bytes < log.stat().st_size / 2
+    assert "alt.dll" not in summary.files
+    assert "0x80070490" not in summary.hresults
+
+    full = analyze_log(log)
+    assert full.files["alt.dll"] == "unrepairable"
+    assert full.hresults["0x80070490"].count == 400
+
+
+def test_file_states(log):
+    summary = analyze_log(log, since=SINCE.timestamp())
+    assert summary.files == {"wuaueng.dll": "unrepairable", "kernel32.dll": "repaired", "ntdll.dll": "corrupt"}
+    assert summary.unrepairable == ["wuaueng.dll"]
+    text = summary.format_text()
+    assert "Nicht reparierbar (1): wuaueng.dll" in text
+    assert "Repariert (1): kernel32.dll" in text
+
+
+def test_source_missing_and_hresults(log):
+    summary = analyze_log(log, since=SINCE.timestamp())
+    assert summary.source_missing == 2
+    assert "source files could not be found" in summary.source_missing_line
+    # Error-Zeile und Info-Zeile mit „failed“ zählen, Info-Flags (0x80000000) nicht
+    assert summary.hresults["0x800f081f"].count == 2
+    assert "0x80000000" not in summary.hresults
+    assert summary.hresults["0x80070002"].count == 1    # zwei Treffer in einer Zeile, einmal gezählt
+    assert summary.top_hresults(1)[0].code == "0x800f081f"
+    assert "Reparaturquelle fehlt (2×)" in summary.format_text()
+
+
+def test_notes(tmp_path):
+    utf16 = tmp_path / "utf16.log"
+    utf16.write_bytes(_line(T0, "Info", "CBS    x").encode("utf-16"))
+    assert analyze_log(utf16).note == "UTF-16-Log wird nicht unterstützt"
+    empty = tmp_path / "leer.log"
+    empty.write_bytes(b"")
+    assert analyze_log(empty).note == "leer"
+    assert analyze_log(tmp_path / "fehlt.log").note.startswith("nicht lesbar")
+    assert "UTF-16" in analyze_log(utf16).format_text()
+
+
+def test_triage_per_action(log, tmp_path):
+    dism = _write_log(tmp_path / "dism.log", before=5, after=5)
+    summaries = triage("dism_restorehealth", SINCE.timestamp(), {"cbs": log, "dism": dism})
+    assert [s.kind for s in summaries] == ["dism", "cbs"]
+    assert triage("net_reset", None, {"cbs": log}) == []
+    assert needs_triage("sfc_scannow", 0, "corrupt")
+    assert not needs_triage("sfc_scannow", 0, "healthy")
+    assert needs_triage("dism_scanhealth", 2, "ok")
+    assert not needs_triage("net_reset", 1, None)
@@ -0,0 +1,136 @@
+"""Synthetische PAGEDU64-Kopfdateien: Bugcheck, Parameter, Zeitpunkt, Treiber-Heuristik."""
+
+import struct
+from datetime import datetime, timezone
+
+from winrep_crashdump import CrashSummary, parse_dump, scan_dumps
+
+NT = ("ntoskrnl.exe", 0xFFFFF80000000000, 0x1000000)
+HAL = ("hal.dll", 0xFFFFF80001000000, 0x100000)
+NV = ("nvlddmkm.sys", 0xFFFFF80010000000, 0x2000000)
+WLAN = ("rtwlane.sys", 0xFFFFF80020000000, 0x300000)
+DRIVERS = [NT, HAL, NV, WLAN]
+
+WHEN = datetime(2026, 9, 14, 18, 30, tzinfo=timezone.utc)
+
+
+def _filetime(dt: datetime) -> int:
+    return int((dt - datetime(1601, 1, 1, tzinfo=timezone.utc)).total_seconds() * 10**7)
+
+
+def make_dump(path, code, params, when=WHEN, drivers=None, exception=0, stack=(), stride=0xA0):
+    """Kernel-Minidump wie von Windows: DUMP_HEADER64 (0x2000) + Triage-Block dahinter."""
+    b = bytearray(0x2000 + 0x4000)
+    b[0:8] = b"PAGEDU64"
+    struct.pack_into("<I", b, 0x0C, 22631)
+    struct.pack_into("<I", b, 0x34, 8)
+    struct.pack_into("<I", b, 0x38, code)
+    struct.pack_into("<4Q", b, 0x40, *params)
+    struct.pack_into("<I", b, 0xF98, 4)                       # Triage-Dump
+    struct.pack_into("<Q", b, 0xFA8, _filetime(when))
+    struct.pack_into("<Q", b, 0x1030, 36000 * 10**7)          # 1 h Laufzeit
+    if drivers:
+        triage, exc, stk, lst, pool = 0x2000, 0x2100, 0x2200, 0x2400, 0x3400
+        struct.pack_into("<Q", b, exc + 0x10, exception)
+        pos = pool
+        for i, (name, base, size) in enumerate(drivers):
+            entry = lst + i * stride
+            struct.pack_into("<I", b, entry, pos)
+            struct.pack_into("<Q", b, entry + 0x38, base)
+            struct.pack_into("<I", b, entry + 0x48, size)
+            raw = name.encode("utf-16-le")
+            struct.pack_into("<I", b, pos, len(name))
+            b[pos + 4:pos + 4 + len(raw)] = raw
+            pos += 4 + len(raw) + 2
+        for i, value in enumerate(stack):
+            struct.pack_into("<Q", b, stk + 8 * i, value)
+        fields = [0] * 16
+        fields[4], fields[10], fields[11] = exc, stk, 8 * len(stack)
+        fields[12], fields[13], fields[14], fields[15] = lst, len(drivers), pool, pos - pool
+        struct.pack_into("<16I", b, triage, *fields)
+    path.write_bytes(bytes(b))
+    return path
+
+
+def test_header_fields(tmp_path):
+    params = (0x10, 0x2, 0x0, 0xFFFFF80000123456)
+    dump = parse_dump(make_dump(tmp_path / "a.dmp", 0x133, params))
+    assert dump.error == ""
+    assert dump.kind == "kernel64"
+    assert dump.dump_type == "Minidump"
+    assert dump.bugcheck == 0x133
+    assert dump.code_text == "0x00000133"
+    assert dump.params == params
+    assert dump.build == 22631
+    assert dump.processors == 8
+    assert dump.uptime_s == 36000
+    assert dump.crashed == WHEN.astimezone().replace(tzinfo=None)
+    assert dump.module == ""   # ohne Treiberliste keine Zuordnung
+
+
+def test_module_from_parameter(tmp_path):
+    params = (0xFFFFA00000001000, NV[1] + 0x1234, 0, 0)
+    dump = parse_dump(make_dump(tmp_path / "b.dmp", 0x116, params, drivers=DRIVERS))
+    assert (dump.module, dump.module_source) == ("nvlddmkm.sys", "parameter")
+
+
+def test_module_with_other_entry_size(tmp_path):
+    params = (0, 2, 0, WLAN[1] + 0x42)
+    dump = parse_dump(make_dump(tmp_path / "c.dmp", 0xD1, params, drivers=DRIVERS, stride=0xA8))
+    assert (dump.module, dump.module_source) == ("rtwlane.sys", "parameter")
+
+
+def test_exception_address_wins_over_parameters(tmp_path):
+    params = (0xC0000005, NT[1] + 0x10, 0, 0)
+    dump = parse_dump(make_dump(tmp_path / "d.dmp", 0x1000007E, params, drivers=DRIVERS,
+                                exception=NV[1] + 0x500))
+    assert (dump.module, dump.module_source) == ("nvlddmkm.sys", "exception")
+
+
+def test_stack_skips_kernel_modules(tmp_path):
+    stack = (NT[1] + 0x100, HAL[1] + 0x20, WLAN[1] + 0x80)
+    dump = parse_dump(make_dump(tmp_path / "e.dmp", 0x50, (NT[1] + 8, 0, 0, 0), drivers=DRIVERS, stack=stack))
+    assert (dump.module, dump.module_source) == ("rtwlane.sys", "stack")
+
+
+def test_kernel_only_falls_back_to_kernel(tmp_path):
+    dump = parse_dump(make_dump(tmp_path / "f.dmp", 0x50, (NT[1] + 8, 0, 0, 0), drivers=DRIVERS))
+    assert (dump.module, dump.module_source) == ("ntoskrnl.exe", "parameter")
+
+
+def test_unreadable_files(tmp_path):
+    (tmp_path / "tiny.dmp").write_bytes(b"MD")
+    (tmp_path / "user.dmp").write_bytes(b"MDMP" + bytes(60))
+    (tmp_path / "junk.dmp").write_bytes(bytes(64))
+    (tmp_path / "cut.dmp").write_bytes(b"PAGEDU64" + bytes(0x20))
+    errors = {p.name: parse_dump(p).error for p in sorted(tmp_path.iterdir())}
+    assert errors == {
+        "cut.dmp": "Kopf unvollständig",
+        "junk.dmp": "kein Windows-Speicherabbild",
+        "tiny.dmp": "zu klein für ein Speicherabbild",
+        "user.dmp": "Anwendungs-Minidump (kein Bluescreen) – nicht ausgewertet",
+    }
+
+
+def test_frequency_groups_variants(tmp_path):
+    later = WHEN.replace(day=20)
+    paths = [
+        make_dump(tmp_path / "1.dmp", 0x116, (0, NV[1] + 1, 0, 0), drivers=DRIVERS),
+        make_dump(tmp_path / "2.dmp", 0x116, (0, NV[1] + 2, 0, 0), when=later, drivers=DRIVERS),
+        make_dump(tmp_path / "3.dmp", 0x7E, (0xC0000005, 0, 0, 0)),
+        make_dump(tmp_path / "4.dmp", 0x1000007E, (0xC0000005, 0, 0, 0)),
+        make_dump(tmp_path / "5.dmp", 0x1000007E, (0xC0000005, 0, 0, 0)),
+        make_dump(tmp_path / "6.dmp", 0xD1, (0, 2, 0, WLAN[1]), drivers=DRIVERS),
+    ]
+    summary = scan_dumps(paths)
+    groups = summary.frequency()
+    assert [(g.code, g.count) for g in groups] == [(0x7E, 3), (0x116, 2), (0xD1, 1)]
+    video = groups[1]
+    assert video.modules == {"nvlddmkm.sys": 2}
+    assert video.last == later.astimezone().replace(tzinfo=None)
+    assert "nvlddmkm.sys (2 von 6 Abstürzen)" in summary.format_text()
+
+
+def test_empty_summary():
+    assert CrashSummary().frequency() == []
+    assert CrashSummary().format_text() == "Keine Absturzabbilder gefunden."
@@ -0,0 +1,45 @@
+"""Top-Liste des Ordnergrößen-Index auf einem kleinen Testbaum."""
+
+import os
+
+import pytest
+
+from winrep_diskindex import DiskIndex
+
+
+def _file(path, size: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+
+
+@pytest.fixture
+def index(tmp_path):
+    root = tmp_path / "c"
+    _file(root / "Windows" / "WinSxS" / "a.bin", 9500)      # Windows besteht fast nur aus WinSxS
+    _file(root / "Windows" / "notepad.exe", 500)
+    _file(root / "Users" / "x" / "AppData" / "big.bin", 6000)  # Users/x nur AppData → gleich groß
+    _file(root / "Games" / "g1" / "data.pak", 3000)            # Games verteilt sich auf zwei Unterordner
+    _file(root / "Games" / "g2" / "data.pak", 2500)
+    idx = DiskIndex(tmp_path / "diskindex.db", str(root))
+    idx.scan()
+    yield idx
+    idx.close()
+
+
+def _names(index, entries):
+    return [os.path.relpath(e.path, index.root) for e in entries]
+
+
+def test_top_leaves(index):
+    names = _names(index, index.top(10))
+    assert "." not in names
+    assert names[:3] == ["Windows" + os.sep + "WinSxS", os.path.join("Users", "x", "AppData"), "Games"]
+    # Vorfahren eines aufgeführten Ordners tauchen nicht auf
+    assert not {"Windows", "Users", os.path.join("Users", "x")} & set(names)
+
+
+def test_top_all_without_root(index):
+    entries = index.top(3, leaves=False)
+    assert index.total.total_bytes == 21500
+    assert index.root not in [e.path for e in entries]
+    assert [e.total_bytes for e in entries] == [10000, 9500, 6000]
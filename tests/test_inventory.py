@@ -0,0 +1,96 @@
+"""Inventar aus gespeicherten Rohdaten (``--save-raw``): Modell und alle drei Ausgaben."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from winrep_inventory import (
+    RENDERERS,
+    SECTIONS,
+    FixtureBackend,
+    _parse_disks,
+    collect_inventory,
+    inventory_report,
+    write_reports,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "inventory_raw.json"
+
+
+@pytest.fixture
+def inv():
+    # "board" fehlt in den Testdaten → Abschnitt schlägt fehl, Rest bleibt gültig
+    return collect_inventory(FixtureBackend.from_file(FIXTURE), max_workers=3)
+
+
+def test_sections_and_errors(inv):
+    assert list(inv.timings) == list(SECTIONS)
+    assert list(inv.errors) == ["board"]
+    assert "fehlt in den Testdaten" in inv.errors["board"]
+    assert inv.board is None
+    assert inv.os.caption == "Microsoft Windows 11 Pro"
+    # einzelnes Objekt statt Liste (ConvertTo-Json bei genau einem Element)
+    assert [(c.cores, c.threads, c.max_mhz) for c in inv.cpus] == [(10, 12, 1700)]
+    assert [g.name for g in inv.gpus] == ["Intel(R) Iris(R) Xe Graphics", "NVIDIA GeForce MX550"]
+    assert inv.memory_total == 16 * 1024 ** 3
+    assert inv.memory[0].part_number == "M425R1GB4BB0-CQKOD"
+
+
+def test_disk_volume_linking(inv):
+    internal, usb = inv.disks
+    # Partitionen sortiert, Partition ohne Laufwerksbuchstaben übersprungen
+    assert [v.letter for v in internal.volumes] == ["C:", "D:"]
+    assert internal.volumes[1].label == "Spiele & Daten"
+    assert [(v.letter, v.label) for v in usb.volumes] == [("E:", "Sicherung Bilder")]
+    assert usb.interface == "USB"
+
+
+def test_disk_linking_single_objects():
+    raw = {
+        "Disks": {"DeviceID": "\\\\.\\PHYSICALDRIVE0", "Model": "NVMe", "Size": "256060514304"},
+        "DiskPartitions": {"Disk": "\\\\.\\PHYSICALDRIVE0", "Partition": "Disk #0, Partition #1"},
+        "PartitionVolumes": {"Partition": "Disk #0, Partition #1", "Volume": "C:"},
+        "Volumes": {"DeviceID": "C:", "VolumeName": "", "Size": 255000000000, "FreeSpace": None},
+    }
+    (disk,) = _parse_disks(raw)
+    assert (disk.model, disk.size_bytes) == ("NVMe", 256060514304)
+    assert [(v.letter, v.free_bytes) for v in disk.volumes] == [("C:", 0)]
+    assert _parse_disks(None) == [] and _parse_disks([]) == []
+
+
+def test_renderers_same_model(inv):
+    text = RENDERERS["txt"](inv)
+    assert "Edition       = Microsoft Windows 11 Pro" in text
+    assert "Laufwerk      = C:, D:" in text
+    assert "Arbeitsspeicher (16 GB)" in text
+    assert "[Mainboard nicht verfügbar:" in text
+
+    data = json.loads(RENDERERS["json"](inv))
+    assert data["disks"][0]["volumes"][1]["label"] == "Spiele & Daten"
+    assert data["errors"].keys() == {"board"}
+    assert data["cpus"][0]["name"] == inv.cpus[0].name
+
+    page = RENDERERS["html"](inv)
+    assert page.startswith("<!DOCTYPE html>") and page.rstrip().endswith("</body></html>")
+    assert "<td>Windows, Spiele &amp; Daten</td>" in page
+    assert '<p class="error">Mainboard nicht verfügbar:' in page
+    assert "<h2>Mainboard</h2>" not in page
+
+
+def test_write_reports_and_action_report(inv, tmp_path):
+    paths = write_reports(inv, tmp_path)
+    assert [p.name for p in paths] == ["WinRep_Systeminfo.txt", "WinRep_Systeminfo.json", "WinRep_Systeminfo.html"]
+    assert paths[0].read_bytes().startswith(b"\xef\xbb\xbf")   # BOM für den Editor
+    report = inventory_report(inv, paths, 1.25)
+    assert report.returncode == 0
+    assert report.metrics["sections_ok"]["value"] == 5
+    assert report.warnings == [f"Mainboard: {inv.errors['board']}"]
+    assert [a["kind"] for a in report.artifacts] == ["sysinfo_report", "sysinfo_json", "sysinfo_html"]
+
+
+def test_nothing_collected():
+    inv = collect_inventory(FixtureBackend({}), max_workers=2)
+    assert list(inv.errors) == list(SECTIONS)
+    report = inventory_report(inv, [], 0.1)
+    assert (report.returncode, report.message) == (1, "Keine Systeminformationen erfasst")
@@ -0,0 +1,40 @@
+"""Fortschrittsmarker, auch aus UTF-16-Ausgabe (sfc), die als CP850 gelesen wird."""
+
+import pytest
+
+from winrep_progress import ProgressParser
+from winrep_pshost import SegmentReader
+
+
+def _utf16_as_cp850(text: str) -> str:
+    """So kommt sfc-Ausgabe ohne Umkodierung an: ein NUL hinter jedem Zeichen."""
+    return text.encode("utf-16-le").decode("cp850")
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Verification 42% complete.", 0.42),
+    ("Überprüfung 7 % abgeschlossen.", 0.07),
+    ("[==========                 42.3%                          ]", 0.423),
+    ("Stage 2: Examining file name linkage ...", 1 / 3),
+    ("3/6: TCP/IP-Einstellungen werden zurückgesetzt ...", 2 / 6),
+    ("Beginning system scan.", None),
+])
+def test_markers(line, expected):
+    assert ProgressParser().feed(line) == (None if expected is None else pytest.approx(expected))
+
+
+def test_sfc_nul_interleaved():
+    parser = ProgressParser()
+    assert parser.feed(_utf16_as_cp850("Verification 42% complete.\r")) == pytest.approx(0.42)
+    assert parser.feed(_utf16_as_cp850("Überprüfung 100 % abgeschlossen.\n")) == pytest.approx(1.0)
+    assert parser.fraction == pytest.approx(1.0)
+
+
+def test_segment_reader_drops_nuls():
+    raw = "Verification 42% complete.\rVerification 43% complete.\r\n".encode("utf-16-le")
+    reader = SegmentReader("cp850")
+    lines = []
+    for i in range(0, len(raw), 5):   # Chunk-Grenzen mitten in Zeichen und Zeilenenden
+        lines += reader.feed(raw[i:i + 5])
+    lines += reader.feed(b"", final=True)
+    assert lines == ["Verification 42% complete.\r", "Verification 43% complete.\n"]
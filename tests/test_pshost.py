@@ -0,0 +1,97 @@
+"""Host-Pool mit dem Stand-in-Host (Shell statt powershell.exe)."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from winrep_pshost import ALERT_SOFT_TIMEOUT, ALERT_STALL, PSHostPool, RunControl, standin_launcher
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="Stand-in führt POSIX-Shellbefehle aus")
+
+
+@pytest.fixture
+def pool():
+    p = PSHostPool(standin_launcher(), warm=0, max_size=2)
+    yield p
+    p.close()
+
+
+def test_round_trip_and_exit_code(pool):
+    lines = []
+    result = pool.run("echo eins; echo zwei; exit 3", on_output=lines.append)
+    assert (result.output, result.returncode) == ("eins\nzwei\n", 3)
+    assert lines == ["eins\n", "zwei\n"]
+    assert result.output_lines == 2 and result.output_bytes == 10
+    assert result.spawn_s > 0 and result.first_output_s is not None
+    assert not (result.timed_out or result.cancelled or result.crashed)
+
+    again = pool.run("echo warm")
+    assert (again.output, again.returncode, again.spawn_s) == ("warm\n", 0, 0.0)
+    assert pool.stats.spawns == 1 and pool.stats.calls == 2
+
+
+def test_no_trailing_newline(pool):
+    lines = []
+    result = pool.run("printf 'ohne Zeilenende'", on_output=lines.append)
+    assert (result.output, result.returncode) == ("ohne Zeilenende", 0)
+    assert "".join(lines) == "ohne Zeilenende"
+    # Sentinel wurde erkannt, der Host bleibt benutzbar
+    assert pool.run("printf 'a\\rb\\n'").output == "a\rb\n"
+
+
+def test_restart_after_host_killed(pool):
+    result = pool.run("echo teil1; sleep 0.2; kill -9 $PPID; sleep 5; echo nie")
+    assert result.crashed and result.returncode == -1
+    assert result.output == "teil1\n"
+    assert result.duration < 4
+    after = pool.run("echo weiter")
+    assert (after.output, after.returncode) == ("weiter\n", 0)
+    assert pool.stats.restarts == 1 and pool.stats.spawns == 2
+
+
+def test_timeout_keeps_partial_output(pool):
+    t0 = time.perf_counter()
+    result = pool.run("echo vorher; sleep 30; echo nachher", timeout=1.0)
+    assert time.perf_counter() - t0 < 10
+    assert result.timed_out and not result.crashed
+    assert result.output == "vorher\n"
+    assert pool.stats.timeouts == 1
+    assert pool.run("echo neu").output == "neu\n"
+
+
+def test_cancel_keeps_partial_output(pool):
+    control = RunControl()
+    threading.Timer(0.5, control.cancel, args=("vom Benutzer abgebrochen",)).start()
+    result = pool.run("echo start; sleep 30", control=control)
+    assert result.cancelled and not result.timed_out
+    assert result.output == "start\n"
+    assert control.reason == "vom Benutzer abgebrochen"
+    assert pool.stats.cancels == 1
+
+
+def test_soft_limit_and_stall_alerts(pool):
+    alerts = []
+    control = RunControl(soft=0.3, stall=0.5, on_alert=lambda kind, s: alerts.append(kind))
+    result = pool.run("echo los; sleep 1.2; echo fertig", control=control)
+    assert result.returncode == 0 and result.output == "los\nfertig\n"
+    assert ALERT_SOFT_TIMEOUT in alerts and ALERT_STALL in alerts
+    assert result.max_silence_s >= 1.0
+
+
+def test_parallel_hosts(pool):
+    results = {}
+
+    def call(name):
+        results[name] = pool.run(f"sleep 0.5; echo {name}")
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in ("a", "b")]
+    t0 = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert time.perf_counter() - t0 < 1.5 + 2 * 0.5   # zwei Hosts, nicht nacheinander
+    assert {n: r.output for n, r in results.items()} == {"a": "a\n", "b": "b\n"}
+    assert pool.stats.spawns == 2
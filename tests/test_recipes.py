@@ -0,0 +1,126 @@
+"""Mitgelieferte Abläufe mit vorgegebenen Schritt-Ergebnissen statt echter Aktionen."""
+
+import pytest
+
+from winrep_core import RC_CANCELLED
+from winrep_recipes import (
+    STEP_DONE,
+    STEP_FAILED,
+    STEP_NOT_RUN,
+    STEP_RESUMED_NOTE,
+    STEP_SKIPPED,
+    StepOutcome,
+    describe_record,
+    evaluate,
+    load_recipes,
+    parse_recipes,
+    run_recipe,
+)
+
+
+@pytest.fixture(scope="module")
+def recipes(tmp_path_factory):
+    # nicht vorhandene eigene recipes.json → nur die mitgelieferten
+    return load_recipes(tmp_path_factory.mktemp("daten") / "recipes.json")
+
+
+def _run(recipe, outcomes, **kwargs):
+    """Führt ``recipe`` aus; ``outcomes``: Schritt-ID → StepOutcome (fehlt = OK ohne Status)."""
+    executed = []
+
+    def execute(step):
+        executed.append(step.id)
+        return outcomes.get(step.id, StepOutcome(0))
+
+    run = run_recipe(recipe, execute, **kwargs)
+    return run, executed, {rec.step.id: rec.state for rec in run.records}
+
+
+def test_intake_healthy(recipes):
+    run, executed, states = _run(recipes["intake"], {
+        "check": StepOutcome(0, "healthy"),
+        "scan": StepOutcome(0, "healthy"),
+        "sfc": StepOutcome(0, "healthy"),
+    })
+    assert executed == ["check", "scan", "sfc", "cleanup"]
+    assert states["restore"] == STEP_SKIPPED
+    assert run.records[2].note == "Komponentenspeicher ist intakt"
+    assert run.returncode == 0
+    assert run.summary() == "4 ausgeführt, 1 übersprungen"
+
+
+def test_intake_repairable_after_check(recipes):
+    run, executed, states = _run(recipes["intake"], {
+        "check": StepOutcome(0, "repairable"),
+        "restore": StepOutcome(0, "repaired"),
+    })
+    # CheckHealth meldet die Beschädigung schon → ScanHealth entfällt
+    assert executed == ["check", "restore", "sfc", "cleanup"]
+    assert states["scan"] == STEP_SKIPPED
+    assert run.returncode == 0
+
+
+def test_intake_scan_failed_runs_restore(recipes):
+    run, executed, states = _run(recipes["intake"], {
+        "check": StepOutcome(0, "healthy"),
+        "scan": StepOutcome(2),
+    })
+    assert executed == ["check", "scan", "restore", "sfc", "cleanup"]
+    assert states["scan"] == STEP_FAILED
+    assert run.returncode == 2
+
+
+def test_intake_restore_failed_skips_cleanup(recipes):
+    run, executed, states = _run(recipes["intake"], {
+        "check": StepOutcome(0, "healthy"),
+        "scan": StepOutcome(0, "repairable"),
+        "restore": StepOutcome(0x800F081F, "failed"),
+    })
+    assert executed == ["check", "scan", "restore", "sfc"]
+    assert (states["restore"], states["sfc"], states["cleanup"]) == (STEP_FAILED, STEP_DONE, STEP_SKIPPED)
+    assert run.returncode == 0x800F081F
+    assert describe_record(3, 5, run.records[2]).endswith(f"Fehlercode {0x800F081F}, failed (0 s)")
+
+
+def test_cancelled_step_stops_recipe(recipes):
+    run, executed, states = _run(recipes["intake"], {"scan": StepOutcome(RC_CANCELLED)})
+    assert executed == ["check", "scan"]
+    assert [states[s] for s in ("restore", "sfc", "cleanup")] == [STEP_NOT_RUN] * 3
+    assert run.returncode == RC_CANCELLED
+
+
+def test_on_fail_stop(recipes):
+    run, executed, states = _run(recipes["network_intake"], {"net": StepOutcome(1)})
+    assert executed == ["net"]
+    assert states == {"net": STEP_FAILED, "wu": STEP_NOT_RUN}
+
+
+def test_resume_uses_done_outcomes(recipes):
+    done = {"check": StepOutcome(0, "repairable")}
+    run, executed, states = _run(recipes["intake"], {}, done=done)
+    assert executed == ["restore", "sfc", "cleanup"]
+    assert run.records[0].note == STEP_RESUMED_NOTE
+    assert states["scan"] == STEP_SKIPPED
+
+
+@pytest.mark.parametrize("condition, expected", [
+    ({"step": "a", "returncode": [0, 3010]}, True),
+    ({"step": "a", "returncode": {"not": 3010}}, False),
+    ({"step": "a", "status": "ok"}, True),
+    ({"step": "b", "skipped": True}, True),
+    ({"step": "b", "status": "ok"}, False),
+    ({"step": "a", "skipped": True}, False),
+    ({"all": [{"step": "a"}, {"not": {"step": "b"}}]}, True),
+    ({"any": [{"step": "b"}, {"step": "a", "status": "kaputt"}]}, False),
+])
+def test_evaluate(condition, expected):
+    assert evaluate(condition, {"a": StepOutcome(3010, "ok"), "b": None}) is expected
+
+
+def test_parse_rejects_forward_reference():
+    data = {"version": 1, "recipes": [{"key": "x", "steps": [
+        {"id": "eins", "action": "sfc_scannow", "if": {"step": "zwei"}},
+        {"id": "zwei", "action": "sfc_scannow"},
+    ]}]}
+    with pytest.raises(ValueError, match="'zwei', der nicht vorher läuft"):
+        parse_recipes(data)
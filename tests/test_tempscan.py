@@ -0,0 +1,120 @@
+"""Probelauf und Löschen auf einem Testbaum (tmp_path)."""
+
+import os
+import time
+
+import pytest
+
+from winrep_tempscan import CleanupTarget, delete_files, is_link, path_targets, scan_targets
+
+OLD = time.time() - 3 * 86400
+
+
+def _file(path, size: int, mtime: float = OLD):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def tree(tmp_path):
+    temp = tmp_path / "temp"
+    _file(temp / "a.tmp", 100)
+    _file(temp / "sub" / "b.tmp", 200)
+    _file(temp / "sub" / "deep" / "c.tmp", 300)
+    _file(temp / "fresh.tmp", 50, mtime=time.time())
+    (temp / "empty").mkdir()
+    wu = tmp_path / "wu"
+    _file(wu / "pkg.cab", 1000)
+    # außerhalb der Ziele: darf weder gezählt noch gelöscht werden
+    outside = tmp_path / "outside"
+    _file(outside / "keep.bin", 5000)
+    (temp / "link_dir").symlink_to(outside, target_is_directory=True)
+    (temp / "link_file").symlink_to(outside / "keep.bin")
+    return tmp_path
+
+
+def test_totals_per_category(tree):
+    report = scan_targets(path_targets([str(tree / "temp"), str(tree / "wu")]), workers=3)
+    temp, wu = report.categories["path1"], report.categories["path2"]
+    assert (temp.files, temp.bytes) == (4, 650)
+    assert temp.dirs == 4            # temp, sub, sub/deep, empty – Links nicht
+    assert (wu.files, wu.bytes) == (1, 1000)
+    assert (report.total_files, report.total_bytes) == (5, 1650)
+    assert report.as_dict()["categories"][0]["roots"] == [str(tree / "temp")]
+
+
+def test_min_age_skips_recent_files(tree):
+    temp = scan_targets(path_targets([str(tree / "temp")]), min_age=3600).categories["path1"]
+    assert (temp.files, temp.bytes, temp.skipped_recent) == (3, 600, 1)
+    assert "1 zu neu" in scan_targets(path_targets([str(tree / "temp")]), min_age=3600).format_text()
+
+
+def test_links_not_followed(tree):
+    temp = scan_targets(path_targets([str(tree / "temp")]), collect=True).categories["path1"]
+    assert not any("link_" in p or "keep.bin" in p for p in temp.paths)
+
+
+class _Entry:
+    """Junctions gibt es nur unter Windows – ``os.DirEntry`` nachgestellt."""
+
+    def __init__(self, symlink=False, junction=None):
+        self._symlink = symlink
+        if junction is not None:
+            self.is_junction = lambda: junction
+
+    def is_symlink(self):
+        return self._symlink
+
+
+def test_is_link_covers_junctions():
+    assert is_link(_Entry(symlink=True))
+    assert is_link(_Entry(junction=True))
+    assert not is_link(_Entry(junction=False))
+    assert not is_link(_Entry())          # Python < 3.12: kein is_junction
+
+
+def test_pattern_not_recursive(tmp_path):
+    explorer = tmp_path / "Explorer"
+    _file(explorer / "thumbcache_256.db", 400)
+    _file(explorer / "THUMBCACHE_IDX.DB", 10)
+    _file(explorer / "iconcache_16.db", 70)
+    _file(explorer / "sub" / "thumbcache_96.db", 900)
+    target = CleanupTarget("thumbnails", "Miniaturansichten", (str(explorer),), "thumbcache_*.db", recursive=False)
+    cat = scan_targets([target]).categories["thumbnails"]
+    assert (cat.files, cat.bytes, cat.dirs) == (2, 410, 1)
+
+
+def test_missing_and_single_file_roots(tmp_path):
+    dump = _file(tmp_path / "MEMORY.DMP", 4096)
+    target = CleanupTarget("dumps", "Speicherabbilder", (str(dump), str(tmp_path / "fehlt"), "%WINREP_UNSET_VAR%"))
+    cat = scan_targets([target]).categories["dumps"]
+    assert (cat.files, cat.bytes, cat.roots) == (1, 4096, [str(dump)])
+
+
+def test_delete_only_collected(tree):
+    temp_root = tree / "temp"
+    report = scan_targets(path_targets([str(temp_root)]), min_age=3600, collect=True)
+    result = delete_files(report, workers=2)
+    assert (result.files, result.bytes, result.failed) == (3, 600, 0)
+    assert result.dirs_removed == 2  # sub/deep, sub
+    assert sorted(p.name for p in temp_root.iterdir()) == ["empty", "fresh.tmp", "link_dir", "link_file"]
+    assert (tree / "outside" / "keep.bin").read_bytes() == b"x" * 5000
+    assert (tree / "wu" / "pkg.cab").exists()
+
+
+def test_delete_keeps_roots(tmp_path):
+    root = tmp_path / "temp"
+    _file(root / "only.tmp", 10)
+    result = delete_files(scan_targets(path_targets([str(root)]), collect=True))
+    assert result.files == 1 and result.dirs_removed == 0
+    assert root.is_dir() and not any(root.iterdir())
+
+
+def test_delete_counts_vanished_files(tmp_path):
+    root = tmp_path / "temp"
+    gone = _file(root / "gone.tmp", 10)
+    report = scan_targets(path_targets([str(root)]), collect=True)
+    gone.unlink()
+    assert delete_files(report).failed == 1
@@ -1,1074 +1,843 @@
 from __future__ import annotations
 
-import locale
-import os
-import socket
-import subprocess
+import argparse
+import json
 import sys
-import threading
-from dataclasses import dataclass
+import time
 from pathlib import Path
-from typing import Dict, List
-import webbrowser
-from tkinter import messagebox
-
-import tkinter as tk
-import customtkinter as ctk
-from PIL import Image
+from typing import List
+
+from winrep_core import (
+    ACTION_ORDER,
+    ACTIONS,
+    APP_TITLE,
+    RC_CANCELLED,
+    RC_SCRIPT_MISSING,
+    RC_START_FAILED,
+    describe_returncode,
+    run_ps1_action,
+    sorted_action_keys,
+)
 
 # =============================================================================
-# Basis-Konfiguration
+# CLI / Batch-Modus
 # =============================================================================
+#
+# Der GUI-Stack (tkinter, customtkinter, PIL) wird erst in run_gui()
+# importiert – "winrep.py --help" oder "winrep.py run ..." laden ihn nie.
+
+
+def _emit_json(obj: dict):
+    sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def cmd_list(args) -> int:
+    keys = sorted_action_keys(list(ACTIONS.keys()))
+    if args.json:
+        for k in keys:
+            a = ACTIONS[k]
+            _emit_json({"key": a.key, "title": a.title, "category": a.category})
+        return 0
+    width = max(len(k) for k in keys)
+    for k in keys:
+        print(f"{k.ljust(width)}  {ACTIONS[k].title}")
+    return 0
+
+
+class _ActionRunner:
+    """Führt einzelne Aktionen für ``run``/``recipe`` aus (Ausgabe, Ereignisse, Metriken)."""
+
+    def __init__(self, json_mode: bool, limit_overrides: dict | None = None):
+        from winrep_core import load_limits
+        from winrep_events import default_result_store
+        from winrep_history import current_machine
+        from winrep_metrics import default_writer
+        from winrep_paths import app_data_dir
+        from winrep_pshost import PSHostPool
+        from winrep_sysinfo import SysInfoCache
+
+        self.json = json_mode
+        self.pool = PSHostPool(warm=0, max_size=1)
+        self.metrics = default_writer()
+        self.results = default_result_store()
+        self.limit_overrides = limit_overrides or {}
+        self.history = _open_history()
+        self.machine = current_machine(SysInfoCache(app_data_dir("cache") / "sysinfo.json").values())
+        self.interrupted = False   # Strg+C: keine weiteren Aktionen starten
+        try:
+            self.limits = load_limits()
+        except (OSError, ValueError) as exc:
+            print(f"limits.json wird ignoriert: {exc}", file=sys.stderr)
+            self.limits = {k: a.limits for k, a in ACTIONS.items()}
 
-APP_TITLE = "SD TechTools – Windows Repair Toolbox"
-WINDOW_SIZE = "1120x620"
-
-BG_WINDOW = "#F3F4F6"
-BG_CARD = "#FFFFFF"
-BG_CARD_SELECTED = "#E7F1FF"
-BORDER_CARD = "#E5E7EB"
-BORDER_CARD_SELECTED = "#3B82F6"
-BG_RIGHT_PANEL = "#EFF4FF"
-TEXT_MUTED = "#6B7280"
-ACCENT = "#3B82F6"
-
-CMD_ENCODING = "cp850"   # kannst du für andere Dinge behalten
-PS_ENCODING = "cp850"
-
-README_URL = "https://github.com/SD-ITLab/SD-TechTools"
-LOGO_URL   = "https://sd-itlab.de"
-BRAND_URL  = "https://sd-itlab.de"
-
+    def close(self):
+        self.pool.close()
+        if self.history is not None:
+            self.history.close()
 
-def resource_path(rel: str) -> str:
-    """Pfad-Helfer (PyInstaller-kompatibel)."""
-    base = getattr(sys, "_MEIPASS", str(Path(__file__).resolve().parent))
-    return str(Path(base) / rel)
+    def _prior_seconds(self, key: str) -> float | None:
+        """Erfahrungswert für die Laufzeit (winrep_eta), falls die Historie passende Läufe hat."""
+        import sqlite3
 
+        from winrep_eta import predict
 
-# =============================================================================
-# Aktionen
-# =============================================================================
-
-@dataclass(frozen=True)
-class WinRepAction:
-    key: str
-    title: str
-    description: str
-    category: str
-    ps_command: str | None = None  # nur informativ, Logik liegt in PS1
-
-
-ACTIONS: Dict[str, WinRepAction] = {
-    "dism_scanhealth": WinRepAction(
-        "dism_scanhealth",
-        "Windows Komponentenspeicher auf Fehler prüfen [ScanHealth]",
-        "Prüft den Komponentenstore auf Beschädigungen.",
-        "Systemdateien / DISM",
-        ps_command="DISM /Online /Cleanup-Image /ScanHealth",
-    ),
-    "dism_checkhealth": WinRepAction(
-        "dism_checkhealth",
-        "Prüfen, ob Windows als beschädigt markiert ist [CheckHealth]",
-        "Zeigt an, ob Windows als beschädigt markiert wurde.",
-        "Systemdateien / DISM",
-        ps_command="DISM /Online /Cleanup-Image /CheckHealth",
-    ),
-    "dism_restorehealth": WinRepAction(
-        "dism_restorehealth",
-        "Automatische Reparaturvorgänge durchführen [RestoreHealth]",
-        "Versucht, beschädigte Dateien zu reparieren.",
-        "Systemdateien / DISM",
-        ps_command="DISM /Online /Cleanup-Image /RestoreHealth",
-    ),
-    "dism_componentcleanup": WinRepAction(
-        "dism_componentcleanup",
-        "Abgelöste Startkomponenten bereinigen [ComponentCleanup]",
-        "Bereinigt den Komponentenstore und entfernt veraltete Komponenten.",
-        "Systemdateien / DISM",
-        ps_command="DISM /Online /Cleanup-Image /StartComponentCleanup",
-    ),
-    "sfc_scannow": WinRepAction(
-        "sfc_scannow",
-        "Systemdateien prüfen & reparieren [sfc /scannow]",
-        "Prüft Systemdateien und stellt Originale wieder her.",
-        "Systemdateien / DISM",
-        ps_command="sfc /scannow",
-    ),
-    "net_reset": WinRepAction(
-        "net_reset",
-        "Netzwerkeinstellungen zurücksetzen [FlushDNS usw.]",
-        "Setzt DNS-Cache, Winsock und wichtige Netzwerk-Stacks zurück.",
-        "Netzwerk",
-    ),
-    "wu_reset": WinRepAction(
-        "wu_reset",
-        "Windows Updates zurücksetzen / Cache bereinigen",
-        "Bereinigt den Update-Cache und setzt Windows Update Komponenten zurück.",
-        "Cleanup / Updates",
-    ),
-    "temp_cleanup": WinRepAction(
-        "temp_cleanup",
-        "Temporäre Dateien bereinigen",
-        "Löscht TEMP-Ordner & unnötige Dateien.",
-        "Cleanup / Updates",
-    ),
-    "upgrade_pro": WinRepAction(
-        "upgrade_pro",
-        "Upgrade von Windows Home auf Windows Pro",
-        "Setzt den Product Key für das Upgrade auf Windows Pro.",
-        "Leistung / Tuning",
-    ),
-    "power_high": WinRepAction(
-        "power_high",
-        "Windows Höchstleistungsmodus aktivieren",
-        "Aktiviert den Windows-Höchstleistungsmodus, sofern verfügbar.",
-        "Leistung / Tuning",
-    ),
-    "sysinfo": WinRepAction(
-        "sysinfo",
-        "Systeminformationen anzeigen",
-        "Zeigt ausführliche Systeminformationen an.",
-        "Info & Tools",
-        ps_command="systeminfo",
-    ),
-    "chkdsk_c": WinRepAction(
-        "chkdsk_c",
-        "Dateisystem von C: prüfen [chkdsk]",
-        "Führt eine Dateisystemprüfung von Laufwerk C: (online /scan) durch.",
-        "Systemdateien / DISM",
-    ),
-    "bitlocker_disable": WinRepAction(
-        "bitlocker_disable",
-        "BitLocker auf Laufwerk C: deaktivieren",
-        "Deaktiviert BitLocker auf C:. Achtung: Entschlüsselung kann lange dauern!",
-        "Info & Tools",
-    ),
-    "battery_info": WinRepAction(
-        "battery_info",
-        "Akkuinformationen anzeigen",
-        "Zeigt Informationen zum Akku (Ladestand, Status usw.), falls vorhanden.",
-        "Info & Tools",
-    ),
-    "sysinfo": WinRepAction(
-        "sysinfo",
-        "Systeminformationen anzeigen",
-        "Zeigt ausführliche Systeminformationen an.",
-        "Info & Tools",
-        ps_command="systeminfo",
-    ),
-}
-
-ACTION_ORDER: List[str] = [
-    "dism_scanhealth",
-    "dism_checkhealth",
-    "dism_restorehealth",
-    "dism_componentcleanup",
-    "sfc_scannow",
-    "chkdsk_c",
-    "net_reset",
-    "wu_reset",
-    "temp_cleanup",
-    "upgrade_pro",
-    "power_high",
-    "bitlocker_disable",
-    "battery_info",
-    "sysinfo",
-]
-
-
-def sorted_action_keys(keys: List[str]) -> List[str]:
-    def order_index(k: str) -> int:
+        if self.history is None:
+            return None
         try:
-            return ACTION_ORDER.index(k)
-        except ValueError:
-            return len(ACTION_ORDER) + 1
+            prior = predict(self.history, key, self.machine.cpu, self.machine.disk)
+        except sqlite3.Error:
+            return None
+        return None if prior is None else prior.seconds
 
-    return sorted(keys, key=order_index)
+    def _record_history(self, report, result, triage_text: str = "", battery_text: str = ""):
+        import sqlite3
 
+        from winrep_metrics import host_result_fields
 
-# =============================================================================
-# UI: ActionRow
-# =============================================================================
-
-class ActionRow(ctk.CTkFrame):
-    def __init__(self, master, action_key: str, on_click, width: int = 540, height: int = 80):
-        super().__init__(
-            master,
-            fg_color=BG_CARD,
-            corner_radius=14,
-            width=width,
-            height=height,
-        )
-        self.grid_propagate(False)
-
-        self.action_key = action_key
-        self.on_click = on_click
-        self.selected = False
+        if self.history is None:
+            return
+        try:
+            self.history.record(
+                self.machine, report.action, report.returncode,
+                wall_s=result.duration, status=report.status, message=report.message,
+                metrics=report.metrics, timings=host_result_fields(result), source="cli",
+                output=result.output
+                + (f"\n[Log-Auswertung]\n{triage_text}\n" if triage_text else "")
+                + (f"\n[Akku-Verlauf]\n{battery_text}\n" if battery_text else ""),
+            )
+        except sqlite3.Error as exc:
+            print(f"[Historie] Lauf nicht gespeichert: {exc}", file=sys.stderr)
 
-        self.configure(border_width=1, border_color=BORDER_CARD)
-        self.grid_columnconfigure(0, weight=1)
+    def _start_native(self, key: str):
+        if self.json:
+            _emit_json({"event": "start", "action": key, "title": ACTIONS[key].title})
+        else:
+            print(f"==> {ACTIONS[key].title} [{key}]", flush=True)
 
-        action = ACTIONS[action_key]
+    def _finish_native(self, report, seconds: float, text: str, timings: dict | None = None):
+        """Gemeinsamer Abschluss der Python-Aktionen: Ergebnisse, Metriken, Historie, Ausgabe."""
+        key = report.action
+        self.results.put(report)
+        self.metrics.write("action", key, source="cli", status=report.status, wall_s=round(seconds, 3),
+                           **(timings or {}))
+        if self.history is not None:
+            import sqlite3
 
-        self.title_lbl = ctk.CTkLabel(
-            self,
-            text=action.title,
-            font=ctk.CTkFont(size=12, weight="bold"),
-            anchor="w",
-        )
-        self.title_lbl.grid(row=0, column=0, sticky="w", padx=12, pady=(8, 0))
-
-        self.desc_lbl = ctk.CTkLabel(
-            self,
-            text=action.description,
-            font=ctk.CTkFont(size=10),
-            text_color=TEXT_MUTED,
-            anchor="w",
-            justify="left",
-            wraplength=width - 40,
+            try:
+                self.history.record(
+                    self.machine, key, report.returncode, wall_s=seconds,
+                    status=report.status, message=report.message, metrics=report.metrics,
+                    timings=timings, source="cli", output=text,
+                )
+            except sqlite3.Error as exc:
+                print(f"[Historie] Lauf nicht gespeichert: {exc}", file=sys.stderr)
+        if self.json:
+            _emit_json({
+                "event": "result", "action": key, "returncode": report.returncode,
+                "seconds": round(seconds, 3), "status": report.status, "message": report.message,
+                "metrics": report.metrics, "artifacts": report.artifacts, "warnings": report.warnings,
+                "diagnostics": report.diagnostics,
+            })
+        else:
+            print(text)
+            print(f"<== {key}: Rückgabecode {report.returncode} – {report.message}\n", flush=True)
+        return report.returncode, report
+
+    def _run_crashscan(self):
+        """``crash_scan`` läuft ohne PS1 – gleiche Ausgabe wie ``winrep.py crashes``."""
+        from winrep_crashdump import CRASHSCAN_ACTION, crashscan_report, scan_dumps
+
+        self._start_native(CRASHSCAN_ACTION)
+        summary = scan_dumps()
+        return self._finish_native(crashscan_report(summary), summary.seconds, summary.format_text())
+
+    def _run_inventory(self):
+        """``sysinfo`` wie in der GUI über winrep_inventory: Abschnitte parallel, Reports auf den Desktop."""
+        from winrep_inventory import (
+            INVENTORY_ACTION,
+            INVENTORY_WORKERS,
+            PowerShellBackend,
+            collect_inventory,
+            desktop_dir,
+            inventory_report,
+            write_reports,
         )
-        self.desc_lbl.grid(row=1, column=0, sticky="w", padx=12, pady=(0, 8))
+        from winrep_metrics import host_result_fields
+        from winrep_pshost import HostError, PSHostPool
 
-        for w in (self, self.title_lbl, self.desc_lbl):
-            w.bind("<Button-1>", self._on_click_internal)
+        self._start_native(INVENTORY_ACTION)
+        pool = PSHostPool(warm=0, max_size=INVENTORY_WORKERS)
 
-    def _on_click_internal(self, _event=None):
-        if callable(self.on_click):
-            self.on_click(self.action_key)
+        def runner(script: str, timeout: float) -> str:
+            try:
+                result = pool.run(script, timeout=timeout)
+            except (HostError, OSError):
+                return ""
+            self.metrics.write("probe", "inventory", source="cli", **host_result_fields(result))
+            return "" if result.timed_out or result.crashed else result.output or ""
 
-    def set_selected(self, selected: bool):
-        self.selected = selected
+        t0 = time.perf_counter()
         try:
-            if selected:
-                self.configure(fg_color=BG_CARD_SELECTED, border_color=BORDER_CARD_SELECTED)
+            inv = collect_inventory(PowerShellBackend(runner), max_workers=INVENTORY_WORKERS)
+        finally:
+            pool.close()
+        seconds = time.perf_counter() - t0
+        paths = write_reports(inv, desktop_dir()) if len(inv.errors) < len(inv.timings) else []
+        report = inventory_report(inv, paths, seconds)
+        lines = [f"Nicht verfügbar – {w}" for w in report.warnings]
+        lines += [f"Geschrieben: {p}" for p in paths]
+        return self._finish_native(report, seconds, "\n".join(lines), {"sections": dict(inv.timings)})
+
+    def run(self, key: str):
+        """Rückgabe: (Rückgabecode, ActionReport)."""
+        from dataclasses import replace
+
+        from winrep_battery import analyze_battery_report
+        from winrep_cbslog import triage_report
+        from winrep_core import describe_alert
+        from winrep_crashdump import CRASHSCAN_ACTION
+        from winrep_events import ActionReport, EventStream
+        from winrep_inventory import INVENTORY_ACTION
+        from winrep_metrics import host_result_fields
+        from winrep_pshost import HostError
+        from winrep_tempscan import TEMPSCAN_ACTIONS, estimate_cleanup
+
+        action = ACTIONS[key]
+        if key == CRASHSCAN_ACTION:
+            return self._run_crashscan()
+        if key == INVENTORY_ACTION:
+            return self._run_inventory()
+
+        def on_alert(kind: str, seconds: float):
+            if self.json:
+                _emit_json({"event": "watchdog", "action": key, "kind": kind, "seconds": round(seconds, 1)})
             else:
-                self.configure(fg_color=BG_CARD, border_color=BORDER_CARD)
-        except tk.TclError:
-            pass
-
-    def set_width(self, width: int):
-        self.configure(width=width)
-        self.desc_lbl.configure(wraplength=max(180, width - 40))
-
-
-# =============================================================================
-# Main-App
-# =============================================================================
-
-class WinRepApp(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-
-        ctk.set_appearance_mode("light")
-        ctk.set_default_color_theme("blue")
-
-        self.title(APP_TITLE)
-        self.geometry(WINDOW_SIZE)
-        self.minsize(1120, 620)
-        self.resizable(False, False)  # bewusst fix
-        self.configure(fg_color=BG_WINDOW)
-
-        self._set_window_icon()
-
-        self.category_var = tk.StringVar(value="Alle")
-        self.selected_action: str | None = None
-
-        self.rows: Dict[str, ActionRow] = {}
-        self._list_resize_after_id: str | None = None
-
-        self.sys_computer = tk.StringVar(value="-")
-        self.sys_os = tk.StringVar(value="-")
-        self.sys_ip = tk.StringVar(value="-")
-        self.sys_cpu = tk.StringVar(value="-")
-        self.sys_boot = tk.StringVar(value="-")
-        self.sys_bitlocker = tk.StringVar(value="-")
-        self.sys_disk = tk.StringVar(value="-")
-
-        self.bottom_logo = None  # Referenz für CTkImage
-
-        self._build_layout()
-
-        self.after(0, self._initial_render)
-        self.after(200, self._load_system_info_async)
-
-    def _open_url(self, url: str):
+                print(f"\n[Watchdog] {key}: {describe_alert(kind, seconds)}", file=sys.stderr, flush=True)
+
+        limits = replace(self.limits.get(key, action.limits), **self.limit_overrides)
+        control = limits.control(on_alert)
+        events = EventStream()
+        report = ActionReport(key)
+        prior = self._prior_seconds(key)
+        scan = estimate_cleanup(report) if key in TEMPSCAN_ACTIONS else None
+        if self.json:
+            start = {"event": "start", "action": key, "title": action.title}
+            if prior is not None:
+                start["eta_s"] = round(prior, 1)
+            _emit_json(start)
+            if scan is not None:
+                _emit_json({"event": "estimate", "action": key, **scan.as_dict()})
+
+            def on_output(line: str):
+                text, found = events.feed(line)
+                for ev in found:
+                    report.apply(ev)
+                    _emit_json({"event": "action_event", "action": key, "type": ev.type, **ev.data})
+                if text:
+                    _emit_json({"event": "output", "action": key, "text": text.rstrip("\r\n")})
+        else:
+            usual = f" (üblich ~{prior / 60:.0f} min)" if prior is not None and prior >= 60 else ""
+            print(f"==> {action.title} [{key}]{usual}", flush=True)
+            if scan is not None:
+                print(f"Vorschau (eigener Scan, cleanmgr entfernt ggf. mehr):\n{scan.format_text()}\n", flush=True)
+
+            def on_output(line: str):
+                text, found = events.feed(line)
+                for ev in found:
+                    report.apply(ev)
+                if text:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+
+        t0 = time.perf_counter()
+        started = time.time()
+        triage_text = battery_text = ""
         try:
-            webbrowser.open(url, new=2)
-        except Exception as exc:
-            messagebox.showinfo(
-                "Info",
-                f"Link konnte nicht geöffnet werden:\n{exc}"
-            )
-    # -------------------------------------------------------------------------
-    # Icon
-    # -------------------------------------------------------------------------
-
-    def _set_window_icon(self):
-        candidates = ["winrep.ico", "WinRep.ico", "icon.ico"]
-        for name in candidates:
-            path = Path(resource_path(name))
-            if path.exists():
-                try:
-                    self.iconbitmap(str(path))
-                except Exception:
-                    pass
-                break
-
-    # -------------------------------------------------------------------------
-    # Layout
-    # -------------------------------------------------------------------------
-
-    def _build_layout(self):
-        # Root: 2 Zeilen (Hauptbereich + Footer), 2 Spalten (links + Hauptbereich)
-        self.grid_rowconfigure(0, weight=1)
-        self.grid_rowconfigure(1, weight=0)
-        self.grid_columnconfigure(0, weight=0)  # linke Spalte
-        self.grid_columnconfigure(1, weight=1)  # Mitte + Rechts + Footer
-
-        # --------------------------- Linke Spalte -----------------------------
-        LEFT_PANEL_WIDTH = 190
-        left = ctk.CTkFrame(self, fg_color=BG_WINDOW, width=LEFT_PANEL_WIDTH)
-        left.grid(row=0, column=0, rowspan=2, sticky="nsw", padx=(16, 8), pady=8)
-        left.grid_propagate(False)
-        left.grid_columnconfigure(0, weight=1)
-
-        ctk.CTkLabel(
-            left,
-            text="Kategorien",
-            font=ctk.CTkFont(size=13, weight="bold"),
-        ).grid(row=0, column=0, sticky="w", padx=4, pady=(4, 6))
-
-        cats = ["Alle"] + sorted({a.category for a in ACTIONS.values()})
-        self.cat_buttons: List[ctk.CTkButton] = []
-
-        for i, cat in enumerate(cats, start=1):
-            btn = ctk.CTkButton(
-                left,
-                text=cat,
-                width=170,
-                height=34,
-                fg_color=BG_CARD_SELECTED if cat == "Alle" else BG_CARD,
-                border_width=1,
-                border_color=(BORDER_CARD_SELECTED if cat == "Alle" else BORDER_CARD),
-                text_color="#111827",
-                hover_color="#E5E7EB",
-                command=lambda c=cat: self._set_category(c),
-            )
-            btn.grid(row=i, column=0, sticky="ew", padx=4, pady=4)
-            self.cat_buttons.append(btn)
-
-        spacer_row = len(cats) + 1
-        left.grid_rowconfigure(spacer_row, weight=1)
-
-        logo_box = ctk.CTkFrame(
-            left,
-            fg_color=BG_CARD,
-            corner_radius=18,
-            border_width=1,
-            border_color=BORDER_CARD,
-            width=LEFT_PANEL_WIDTH,
-            height=120,
-        )
-        logo_box.grid(row=spacer_row + 1, column=0, sticky="sew", padx=4, pady=(0, 4))
-        logo_box.grid_propagate(False)
-
-        self.logo_label = ctk.CTkLabel(logo_box, text="")
-        self.logo_label.place(relx=0.5, rely=0.5, anchor="center")
-        self.logo_label.configure(cursor="hand2")
-        self.logo_label.bind("<Button-1>", lambda e: self._open_url(LOGO_URL))
-        self._load_bottom_logo()
-
-        # -------------------------- Hauptbereich ------------------------------
-        main = ctk.CTkFrame(self, fg_color=BG_WINDOW)
-        main.grid(row=0, column=1, sticky="nsew", padx=(0, 16), pady=(8, 0))
-        main.grid_rowconfigure(0, weight=1)
-        main.grid_columnconfigure(0, weight=1)  # Mitte
-        main.grid_columnconfigure(1, weight=0)  # Rechts
-
-        # Mitte: Aktionen
-        mid = ctk.CTkFrame(main, fg_color=BG_WINDOW, width=540)
-        mid.grid(row=0, column=0, sticky="nsw", padx=(8, 4), pady=(0, 8))
-        mid.grid_propagate(False)
-        mid.grid_columnconfigure(0, weight=1)
-        mid.grid_rowconfigure(1, weight=1)
-
-        ctk.CTkLabel(
-            mid,
-            text="Aktionen auswählen",
-            font=ctk.CTkFont(size=17, weight="bold"),
-        ).grid(row=0, column=0, sticky="w", padx=4, pady=(4, 8))
-
-        list_wrapper = ctk.CTkFrame(mid, fg_color=BG_WINDOW)
-        list_wrapper.grid(row=1, column=0, sticky="nsew", padx=4, pady=(0, 4))
-        list_wrapper.grid_columnconfigure(0, weight=1)
-        list_wrapper.grid_rowconfigure(0, weight=1)
-
-        self.list_scroll = ctk.CTkScrollableFrame(
-            list_wrapper,
-            fg_color=BG_WINDOW,
-            corner_radius=0,
-        )
-        self.list_scroll.grid(row=0, column=0, sticky="nsew")
-        self.list_scroll.grid_columnconfigure(0, weight=1)
-
-        canvas = getattr(self.list_scroll, "_parent_canvas", None)
-        if canvas is not None:
-            canvas.bind("<Configure>", self._on_list_canvas_configure)
-
-        # Rechts: Systeminfos + Log
-        right = ctk.CTkFrame(main, fg_color=BG_WINDOW, width=400)
-        right.grid(row=0, column=1, sticky="nse", padx=(1, 0), pady=(0, 8))
-        right.grid_propagate(False)
-        right.grid_columnconfigure(0, weight=1)
-        right.grid_rowconfigure(3, weight=1)
-
-        header = ctk.CTkFrame(right, fg_color="transparent")
-        header.grid(row=0, column=0, sticky="ew", padx=6, pady=(4, 6))
-        header.grid_columnconfigure(0, weight=1)
-
-        ctk.CTkLabel(
-            header,
-            text="SD - TechTools",
-            font=ctk.CTkFont(size=18, weight="bold"),
-        ).grid(row=0, column=0, sticky="w")
-
-        sys_box = ctk.CTkFrame(
-            right,
-            fg_color=BG_RIGHT_PANEL,
-            corner_radius=18,
-            border_width=1,
-            border_color=BORDER_CARD,
-        )
-        sys_box.grid(row=1, column=0, sticky="ew", padx=4, pady=(4, 6))
-        sys_box.grid_columnconfigure(0, weight=0)
-        sys_box.grid_columnconfigure(1, weight=1)
-
-        def add_row(r: int, label: str, var: ctk.StringVar):
-            ctk.CTkLabel(
-                sys_box,
-                text=label,
-                text_color=TEXT_MUTED,
-                anchor="w",
-                font=ctk.CTkFont(size=10),
-            ).grid(row=r, column=0, sticky="w", padx=12, pady=(1, 1))
-
-            ctk.CTkLabel(
-                sys_box,
-                textvariable=var,
-                anchor="w",
-                justify="left",
-                wraplength=230,
-                font=ctk.CTkFont(size=11),
-            ).grid(row=r, column=1, sticky="w", padx=12, pady=(1, 1))
-
-        add_row(0, "Betriebssystem:", self.sys_os)
-        add_row(1, "Boot:", self.sys_boot)
-        add_row(2, "BitLocker:", self.sys_bitlocker)
-        add_row(3, "Netzwerk-IP:", self.sys_ip)
-        add_row(4, "Systemlaufwerk C:\\", self.sys_disk)
-        add_row(5, "Prozessor:", self.sys_cpu)
-
-        ctk.CTkLabel(
-            right,
-            text="Aktuelles Log:",
-            font=ctk.CTkFont(size=11, weight="bold"),
-        ).grid(row=2, column=0, sticky="w", padx=6, pady=(6, 2))
-
-        self.log_text = ctk.CTkTextbox(
-            right,
-            height=260,
-            fg_color=BG_CARD,
-            text_color="#111827",
-            wrap="word",
-            font=ctk.CTkFont(size=10),
-        )
-        self.log_text.grid(row=3, column=0, sticky="nsew", padx=6, pady=(0, 8))
-        self.log_text.insert("end", "Hier erscheinen Ausgaben von WinRep-Aktionen …")
-        self.log_text.configure(state="disabled")
-
-        # ------------------------------ Footer -------------------------------
-        footer = ctk.CTkFrame(self, corner_radius=0, fg_color=BG_WINDOW)
-        footer.grid(row=1, column=1, sticky="ew", padx=(0, 16), pady=(4, 8))
-        footer.grid_columnconfigure(0, weight=1)
-        footer.grid_columnconfigure(1, weight=0)
-        footer.grid_columnconfigure(2, weight=0)
-        footer.grid_columnconfigure(3, weight=0)
-
-        self.progress = ctk.CTkProgressBar(
-            footer,
-            progress_color=ACCENT,
-            fg_color="#E5E7EB",
-            height=10,
-            corner_radius=999,
-        )
-        self.progress.grid(row=0, column=0, columnspan=4, sticky="ew", padx=(8, 0), pady=(4, 8))
-        self.progress.set(0.0)
-
-        self.status_lbl = ctk.CTkLabel(
-            footer,
-            text="Bereit.",
-            text_color=TEXT_MUTED,
-            font=ctk.CTkFont(size=10),
-        )
-        self.status_lbl.grid(row=1, column=0, sticky="w", padx=8, pady=(0, 8))
-
-        self.footer_brand = ctk.CTkLabel(
-            footer,
-            text="© 2026 SD-ITLab – MIT licensed",
-            font=ctk.CTkFont(size=10),
-            text_color=TEXT_MUTED,
-            cursor="hand2",
-        )
-        self.footer_brand.grid(row=1, column=1, sticky="e", padx=(0, 10), pady=(0, 8))
-        self.footer_brand.bind("<Button-1>", lambda e: self._open_url(BRAND_URL))
-        self.footer_brand.bind("<Enter>", lambda e: self.footer_brand.configure(text_color=ACCENT))
-        self.footer_brand.bind("<Leave>", lambda e: self.footer_brand.configure(text_color=TEXT_MUTED))
-
-
-        self.btn_readme = ctk.CTkButton(
-            footer,
-            text="Readme",
-            width=100,
-            command=lambda: self._open_url(README_URL),
-        )
-        self.btn_readme.grid(row=1, column=2, padx=6, pady=(0, 8))
-
-        self.btn_run = ctk.CTkButton(
-            footer,
-            text="Aktion ausführen",
-            width=130,
-            command=self._run_selected_action,
+            result = run_ps1_action(self.pool, action, on_output=on_output, control=control)
+            rc = result.returncode
+            if result.timed_out:
+                print(f"\n[{control.reason}] {key} wurde samt Kindprozessen beendet.", file=sys.stderr, flush=True)
+            elif result.crashed:
+                print(f"\n[PowerShell-Host unerwartet beendet] {key} ist nicht vollständig gelaufen.",
+                      file=sys.stderr, flush=True)
+            report.finish(rc)
+            triage_text = "\n".join(s.format_text() for s in triage_report(report, started))
+            battery = analyze_battery_report(report)
+            battery_text = battery.format_text() if battery is not None else ""
+            self.results.put(report)
+            self.metrics.write("action", key, source="cli", status=report.status, **host_result_fields(result))
+            self._record_history(report, result, triage_text, battery_text)
+        except FileNotFoundError as exc:
+            print(f"winrep_actions.ps1 wurde nicht gefunden: {exc}", file=sys.stderr)
+            rc = RC_SCRIPT_MISSING
+        except (HostError, OSError) as exc:
+            print(f"[Fehler beim Start von PowerShell] {exc}", file=sys.stderr)
+            rc = RC_START_FAILED
+        except KeyboardInterrupt:
+            print(f"\n[Abgebrochen] {key} wurde samt Kindprozessen beendet.", file=sys.stderr, flush=True)
+            self.interrupted = True
+            rc = RC_CANCELLED
+        seconds = round(time.perf_counter() - t0, 3)
+        if report.returncode is None:
+            report.finish(rc)
+
+        if self.json:
+            _emit_json({
+                "event": "result", "action": key, "returncode": rc, "seconds": seconds,
+                "status": report.status, "message": report.message,
+                "metrics": report.metrics, "artifacts": report.artifacts, "warnings": report.warnings,
+                "diagnostics": report.diagnostics,
+            })
+        else:
+            detail = f" – {report.message}" if report.message else ""
+            label = f" ({describe_returncode(rc)})" if rc != 0 else ""
+            print(f"<== {key}: Rückgabecode {rc}{label} ({seconds:.1f} s){detail}", flush=True)
+            for warning in report.warnings:
+                print(f"    Hinweis: {warning}", flush=True)
+            for artifact in report.artifacts:
+                print(f"    Datei: {artifact['path']}", flush=True)
+            if triage_text:
+                print("    Log-Auswertung:\n" + "\n".join("      " + line for line in triage_text.splitlines()), flush=True)
+            if battery_text:
+                print("    Akku-Verlauf:\n" + "\n".join("      " + line for line in battery_text.splitlines()), flush=True)
+            print(flush=True)
+        return rc, report
+
+
+def _refuse_unconfirmed(keys: List[str], args) -> bool:
+    needs_confirm = [k for k in keys if ACTIONS[k].confirm]
+    if needs_confirm and not args.yes:
+        print(
+            f"Aktion(en) {', '.join(needs_confirm)} verändern das System grundlegend "
+            "und müssen mit --yes bestätigt werden.",
+            file=sys.stderr,
         )
-        self.btn_run.grid(row=1, column=3, padx=6, pady=(0, 8))
+        return True
+    return False
+
+
+def _limit_overrides(args) -> dict:
+    """--soft-timeout/--timeout/--stall-timeout (Sekunden, 0 = ohne Grenze) für alle Aktionen."""
+    pairs = (("soft", args.soft_timeout), ("hard", args.timeout), ("stall", args.stall_timeout))
+    return {name: (value if value > 0 else None) for name, value in pairs if value is not None}
+
+
+def _add_limit_arguments(p: argparse.ArgumentParser):
+    p.add_argument("--timeout", type=float, metavar="S", help="hartes Zeitlimit je Aktion (beendet den Prozessbaum)")
+    p.add_argument("--soft-timeout", type=float, metavar="S", help="Hinweis, wenn eine Aktion länger läuft")
+    p.add_argument("--stall-timeout", type=float, metavar="S", help="Hinweis nach S Sekunden ohne Ausgabe")
+
+
+def cmd_run(args) -> int:
+    unknown = [k for k in args.actions if k not in ACTIONS]
+    if unknown:
+        print(f"Unbekannte Aktion(en): {', '.join(unknown)}", file=sys.stderr)
+        print(f"Verfügbar: {', '.join(ACTION_ORDER)}", file=sys.stderr)
+        return 2
+    if _refuse_unconfirmed(args.actions, args):
+        return 2
+
+    runner = _ActionRunner(args.json, _limit_overrides(args))
+    final_rc = 0
+    try:
+        for key in args.actions:
+            rc, _report = runner.run(key)
+            if rc != 0 and final_rc == 0:
+                final_rc = rc
+            if runner.interrupted or (rc != 0 and args.stop_on_error):
+                break
+    finally:
+        runner.close()
 
-        self.btn_close = ctk.CTkButton(
-            footer,
-            text="Schließen",
-            width=110,
-            command=self.destroy,
-        )
-        self.btn_close.grid(row=1, column=4, padx=(6, 0), pady=(0, 8))
+    if args.json:
+        _emit_json({"event": "done", "returncode": final_rc})
+    return final_rc
 
 
+def cmd_recipe(args) -> int:
+    from winrep_recipes import StepOutcome, describe_record, load_recipes, run_recipe
 
-    # -------------------------------------------------------------------------
-    # Logo
-    # -------------------------------------------------------------------------
+    try:
+        recipes = load_recipes()
+    except (OSError, ValueError) as exc:
+        print(f"Abläufe konnten nicht geladen werden: {exc}", file=sys.stderr)
+        return 2
 
-    def _load_bottom_logo(self):
+    if not args.name:
+        for r in recipes.values():
+            if args.json:
+                _emit_json({"key": r.key, "title": r.title, "steps": [s.action for s in r.steps]})
+            else:
+                print(f"{r.key}  {r.title}")
+                print(f"    {' → '.join(s.action for s in r.steps)}")
+        return 0
+
+    recipe = recipes.get(args.name)
+    if recipe is None:
+        print(f"Unbekannter Ablauf: {args.name} (verfügbar: {', '.join(recipes)})", file=sys.stderr)
+        return 2
+    if _refuse_unconfirmed([s.action for s in recipe.steps], args):
+        return 2
+
+    total = len(recipe.steps)
+    runner = _ActionRunner(args.json, _limit_overrides(args))
+
+    def execute(step) -> StepOutcome:
+        rc, report = runner.run(step.action)
+        return StepOutcome(rc, report.status)
+
+    def on_step(index: int, record):
+        if args.json:
+            _emit_json({
+                "event": "recipe_step", "recipe": recipe.key, "index": index, "step": record.step.id,
+                "action": record.step.action, "state": record.state, "returncode": record.returncode,
+                "status": record.status, "note": record.note,
+            })
+        elif record.state in ("skipped", "not_run"):
+            print(describe_record(index, total, record) + "\n", flush=True)
+
+    try:
+        run = run_recipe(recipe, execute, on_step=on_step, cancelled=lambda: runner.interrupted)
+    finally:
+        runner.close()
+    runner.metrics.write("recipe", recipe.key, source="cli", wall_s=round(run.seconds, 3), returncode=run.returncode)
+
+    if args.json:
+        _emit_json({"event": "done", "recipe": recipe.key, "returncode": run.returncode, "summary": run.summary()})
+    else:
+        print(f"Ablauf {recipe.key}: {run.summary()} ({run.seconds / 60:.1f} min)")
+        for i, record in enumerate(run.records, 1):
+            print("  " + describe_record(i, total, record))
+    return run.returncode
+
+
+def _open_history():
+    import sqlite3
+
+    from winrep_history import default_history
+
+    try:
+        return default_history()
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Lauf-Historie nicht verfügbar: {exc}", file=sys.stderr)
+        return None
+
+
+def cmd_history(args) -> int:
+    from datetime import datetime
+
+    from winrep_history import parse_condition
+
+    history = _open_history()
+    if history is None:
+        return 1
+    try:
+        if args.show is not None:
+            output = history.output(args.show)
+            if output is None:
+                print(f"Keine Ausgabe zu Lauf {args.show} (unbekannt oder bereits entfernt).", file=sys.stderr)
+                return 1
+            sys.stdout.write(output)
+            return 0
+        if args.compact:
+            stats = history.compact()
+            print(", ".join(f"{k}={v}" for k, v in stats.items()))
+            return 0
+        if args.where:
+            try:
+                action, metric, op, value = parse_condition(args.where)
+            except ValueError as exc:
+                print(exc, file=sys.stderr)
+                return 2
+            for name, val, ts in history.machines_where(action, metric, op, value):
+                when = datetime.fromtimestamp(ts).strftime("%d.%m.%Y %H:%M")
+                if args.json:
+                    _emit_json({"machine": name, "action": action, "metric": metric, "value": val, "started": ts})
+                else:
+                    print(f"{name}  {metric}={val:g}  ({when})")
+            return 0
+
+        machine = args.machine
+        if args.here:
+            from winrep_sysinfo import machine_id
+
+            machine = machine_id()
+        for row in history.runs(action=args.action, machine=machine, limit=args.limit):
+            if args.json:
+                _emit_json(row.as_dict())
+                continue
+            when = datetime.fromtimestamp(row.started).strftime("%d.%m.%Y %H:%M")
+            wall = f"{row.wall_s:.0f} s" if row.wall_s is not None else "-"
+            status = f" {row.status}" if row.status else ""
+            message = f" – {row.message}" if row.message else ""
+            print(f"#{row.id:<6} {when}  {row.machine}  {row.action}  rc={row.returncode}{status} ({wall}){message}")
+        return 0
+    finally:
+        history.close()
+
+
+def cmd_triage(args) -> int:
+    from datetime import datetime
+
+    from winrep_cbslog import analyze_log, default_log_paths
+
+    since = None
+    if args.since:
         try:
-            logo_path = resource_path("logo1.png")
-            img = Image.open(logo_path).convert("RGBA")
-        except Exception:
-            self.logo_label.configure(
-                text="SD-ITLAB",
-                text_color=TEXT_MUTED,
-                font=ctk.CTkFont(size=11, weight="bold"),
-            )
-            return
-
-        max_width, max_height = 190, 100
-        ratio = img.width / img.height
-
-        if ratio > (max_width / max_height):
-            new_w = max_width
-            new_h = int(max_width / ratio)
+            since = datetime.fromisoformat(args.since).timestamp()
+        except ValueError:
+            print(f"--since: erwartet z. B. '2026-10-02 14:00', nicht {args.since!r}", file=sys.stderr)
+            return 2
+    if args.logs:
+        paths = [Path(p) for p in args.logs]
+    else:
+        paths = [p for p in default_log_paths().values() if p.exists()]
+        if not paths:
+            print("Keine CBS.log/dism.log gefunden – Pfad angeben.", file=sys.stderr)
+            return 2
+    rc = 0
+    for path in paths:
+        summary = analyze_log(path, since=since)
+        if summary.note:
+            rc = 2   # nicht lesbar, leer oder UTF-16 – wie bei ``battery``
+        if args.json:
+            _emit_json(summary.as_dict())
         else:
-            new_h = max_height
-            new_w = int(max_height * ratio)
-
-        img = img.resize((new_w, new_h), Image.LANCZOS)
+            print(summary.format_text())
+            if args.verbose:
+                if summary.source_missing_line:
+                    print(f"    {summary.source_missing_line}")
+                for h in summary.top_hresults():
+                    print(f"    {h.code}: {h.first_line}")
+    return rc
+
+
+def cmd_crashes(args) -> int:
+    from winrep_crashdump import default_dump_paths, expand_paths, scan_dumps
+
+    paths = expand_paths(args.paths) if args.paths else default_dump_paths()
+    summary = scan_dumps(paths)
+    if args.json:
+        _emit_json(summary.as_dict())
+    else:
+        print(summary.format_text(verbose=args.verbose))
+    # wie ``battery``: 2, wenn Abbilder nicht ausgewertet werden konnten
+    if any(d.error for d in summary.dumps) or (summary.dumps and not summary.crashes):
+        return 2
+    return 0
+
+
+def cmd_battery(args) -> int:
+    from winrep_battery import parse_report
+
+    rc = 0
+    for name in args.reports:
+        try:
+            parsed = parse_report(Path(name))
+        except OSError as exc:
+            print(f"{name}: {exc.strerror or exc}", file=sys.stderr)
+            rc = 2
+            continue
+        if args.json:
+            _emit_json(parsed.as_dict())
+        else:
+            print(parsed.format_text())
+    return rc
 
-        self.bottom_logo = ctk.CTkImage(
-            light_image=img,
-            dark_image=img,
-            size=(new_w, new_h),
-        )
-        self.logo_label.configure(image=self.bottom_logo, text="")
 
-    # -------------------------------------------------------------------------
-    # Rendering / Filter
-    # -------------------------------------------------------------------------
+def cmd_inventory(args) -> int:
+    from winrep_inventory import (
+        RENDERERS,
+        FixtureBackend,
+        PowerShellBackend,
+        collect_inventory,
+        write_reports,
+    )
 
-    def _get_row_width(self) -> int:
+    pool = None
+    if args.fixture:
         try:
-            canvas = getattr(self.list_scroll, "_parent_canvas", None)
-            if canvas is not None:
-                w = int(canvas.winfo_width() or 0)
-                if w > 50:
-                    return max(1, w - 28)
-        except Exception:
-            pass
-        return 520 - 24
-
-    def _on_list_canvas_configure(self, _event=None):
-        if self._list_resize_after_id is not None:
+            backend = FixtureBackend.from_file(Path(args.fixture))
+        except (OSError, ValueError) as exc:
+            print(f"Testdaten konnten nicht geladen werden: {exc}", file=sys.stderr)
+            return 2
+    else:
+        from winrep_pshost import PSHostPool
+
+        pool = PSHostPool(warm=0, max_size=args.workers)
+
+        def runner(script: str, timeout: float) -> str:
+            result = pool.run(script, timeout=timeout)
+            return "" if result.timed_out or result.crashed else result.output or ""
+
+        backend = PowerShellBackend(runner)
+    raw = {} if args.save_raw else None
+    try:
+        inv = collect_inventory(backend, max_workers=args.workers, raw_out=raw)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    for section, error in inv.errors.items():
+        print(f"[{section}] {error}", file=sys.stderr)
+    if raw is not None:
+        Path(args.save_raw).write_text(json.dumps({"sections": raw}, ensure_ascii=False, indent=2), encoding="utf-8")
+    formats = tuple(dict.fromkeys(args.format or ["txt"]))
+    if args.out:
+        for path in write_reports(inv, Path(args.out), formats):
+            print(f"Geschrieben: {path}")
+    else:
+        for fmt in formats:
+            sys.stdout.write(RENDERERS[fmt](inv))
+    return 0 if len(inv.errors) < len(inv.timings) else 1
+
+
+def cmd_tempscan(args) -> int:
+    from winrep_tempscan import default_targets, delete_files, format_size, path_targets, scan_targets
+
+    if args.delete and not args.yes:
+        print("--delete löscht Dateien endgültig und muss mit --yes bestätigt werden.", file=sys.stderr)
+        return 2
+    targets = path_targets(args.paths) if args.paths else default_targets()
+    if args.only:
+        targets = [t for t in targets if t.key in args.only]
+    report = scan_targets(targets, workers=args.workers, min_age=args.older_than * 3600, collect=args.delete)
+    if args.json:
+        _emit_json({"event": "scan", **report.as_dict()})
+    else:
+        print(report.format_text())
+    if not args.delete:
+        return 0
+    result = delete_files(report, workers=args.workers)
+    if args.json:
+        _emit_json({"event": "deleted", "files": result.files, "bytes": result.bytes,
+                    "failed": result.failed, "dirs_removed": result.dirs_removed,
+                    "seconds": round(result.seconds, 3)})
+    else:
+        print(result.format_text())
+        if result.bytes < report.total_bytes:
+            print(f"Nicht freigegeben: {format_size(report.total_bytes - result.bytes)}")
+    return 0 if result.failed == 0 else 1
+
+
+def cmd_diskusage(args) -> int:
+    import sqlite3
+    from datetime import datetime
+
+    from winrep_diskindex import default_index
+    from winrep_tempscan import format_size
+
+    try:
+        index = default_index(args.root)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Ordner-Index nicht verfügbar: {exc}", file=sys.stderr)
+        return 1
+    try:
+        if args.cached and index.scanned is not None:
+            when = datetime.fromtimestamp(index.scanned).strftime("%d.%m.%Y %H:%M")
+            if not args.json:
+                print(f"Stand {when} (ohne neuen Scan)")
+        else:
             try:
-                self.after_cancel(self._list_resize_after_id)
-            except Exception:
-                pass
-        self._list_resize_after_id = self.after(50, self._resize_rows_to_canvas)
-
-    def _resize_rows_to_canvas(self):
-        self._list_resize_after_id = None
-        if not self.rows:
-            return
-        new_w = self._get_row_width()
-        if not new_w:
-            return
-        for r in self.rows.values():
-            r.set_width(new_w)
-
-    def _initial_render(self):
-        self._render_action_list()
-        self.after(80, self._resize_rows_to_canvas)
-
-    def _set_category(self, cat: str):
-        self.category_var.set(cat)
-        for b in self.cat_buttons:
-            if b.cget("text") == cat:
-                b.configure(fg_color=BG_CARD_SELECTED, border_color=BORDER_CARD_SELECTED)
+                stats = index.scan(workers=args.workers, full=args.full)
+            except FileNotFoundError as exc:
+                print(exc, file=sys.stderr)
+                return 2
+            if args.json:
+                _emit_json({"event": "scan", "root": index.root, **stats.__dict__})
             else:
-                b.configure(fg_color=BG_CARD, border_color=BORDER_CARD)
-        self._render_action_list()
-
-    def _filtered_keys(self) -> List[str]:
-        cat = self.category_var.get()
-        keys = list(ACTIONS.keys())
-        if cat and cat != "Alle":
-            keys = [k for k in keys if ACTIONS[k].category == cat]
-        return sorted_action_keys(keys)
-
-    def _render_action_list(self):
-        for child in self.list_scroll.winfo_children():
-            child.destroy()
-        self.rows.clear()
-
-        keys = self._filtered_keys()
-        row_width = self._get_row_width()
-
-        for i, k in enumerate(keys):
-            r = ActionRow(self.list_scroll, k, on_click=self._on_action_clicked, width=row_width)
-            r.grid(row=i, column=0, sticky="ew", padx=4, pady=4)
-            self.rows[k] = r
-
-    def _on_action_clicked(self, action_key: str):
-        self.selected_action = action_key
-        for k, row in self.rows.items():
-            row.set_selected(k == action_key)
-
-    # -------------------------------------------------------------------------
-    # PowerShell Helper
-    # -------------------------------------------------------------------------
-
-    def _run_ps1_action(self, action: WinRepAction):
-        """
-        Führt eine Aktion über die externe winrep_actions.ps1 aus.
-        Die PS1 bekommt den Parameter -Action <action_key>.
-        Ausgabe-Kodierung: CP850 (damit Umlaute von DISM/SFC korrekt sind).
-        """
-        script_path = Path(resource_path("winrep_actions.ps1"))
-
-        if not script_path.exists():
-            self._append_log(
-                "winrep_actions.ps1 wurde nicht gefunden.\n"
-                "Bitte die Datei im gleichen Verzeichnis wie WinRep ablegen.\n"
-            )
-            self.after(
-                0,
-                self.status_lbl.configure,
-                {"text": f"Aktion fehlgeschlagen: {action.title} (PS1 fehlt)"},
-            )
-            self.after(1200, lambda: self.progress.set(0.0))
-            return
-
-        self._clear_log()
-        self._append_log(f"Starte Aktion: {action.title}\n")
-        self._append_log(f"Script: {script_path.name}\n\n")
-
-        ps_cmd = (
-            "[Console]::OutputEncoding=[System.Text.Encoding]::GetEncoding(850); "
-            "$OutputEncoding=[System.Text.Encoding]::GetEncoding(850); "
-            f"& '{script_path}' -Action '{action.key}'"
-        )
-
-        cmd = [
-            "powershell.exe",
-            "-NoProfile",
-            "-NonInteractive",
-            "-WindowStyle", "Hidden",
-            "-ExecutionPolicy", "Bypass",
-            "-Command", ps_cmd,
-        ]
-
-        # PowerShell-Fenster verstecken (auch bei PyInstaller-Onefile)
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        startupinfo.wShowWindow = subprocess.SW_HIDE
-
-        try:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding=PS_ENCODING,  # cp850
-                errors="replace",
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-        except Exception as exc:
-            self._append_log(f"[Fehler beim Start von PowerShell] {exc}\n")
-            self.after(
-                0,
-                self.status_lbl.configure,
-                {"text": f"Fehler bei Aktion: {action.title}"},
-            )
-            self.after(1200, lambda: self.progress.set(0.0))
-            return
-
-        self.progress.set(0.2)
-
-        for line in proc.stdout:
-            self._append_log(line)
-
-        rc = proc.wait()
-
-        self.after(0, self.progress.set, 1.0)
-        if rc == 0:
-            self.after(
-                0,
-                self.status_lbl.configure,
-                {"text": f"Fertig: {action.title} (OK)"},
-            )
-
-            # Spezielles Verhalten für CHKDSK: Neustart anbieten
-            if action.key == "chkdsk_c":
-                def ask_restart():
-                    from tkinter import messagebox
-
-                    if messagebox.askyesno(
-                        "Neustart für CHKDSK",
-                        "Die Reparatur von Laufwerk C: wurde mit CHKDSK /F "
-                        "für den nächsten Systemstart eingeplant.\n\n"
-                        "Möchten Sie den Computer jetzt neu starten?",
-                    ):
-                        self._append_log(
-                            "\nNeustart wird vorbereitet ...\n"
-                            "Windows führt CHKDSK vor dem Hochfahren aus.\n"
-                        )
-                        try:
-                            subprocess.Popen(
-                                ["shutdown", "/r", "/t", "0"],
-                                stdout=subprocess.DEVNULL,
-                                stderr=subprocess.DEVNULL,
-                            )
-                        except Exception as exc:
-                            self._append_log(
-                                f"[Fehler beim Neustart] {exc}\n"
-                            )
-                    else:
-                        self._append_log(
-                            "\nNeustart wurde vom Benutzer abgebrochen. "
-                            "CHKDSK wird beim nächsten manuellen Neustart "
-                            "trotzdem ausgeführt.\n"
-                        )
-
-                # Dialog im GUI-Thread anzeigen
-                self.after(0, ask_restart)
-
+                print(stats.format_text())
+        total = index.total
+        rows = index.children(args.children)[: args.top] if args.children else index.top(args.top, leaves=not args.all)
+        if args.json:
+            for e in rows:
+                _emit_json({"path": e.path, "bytes": e.total_bytes, "files": e.total_files})
+            return 0
+        if total is not None:
+            print(f"{index.root}: {format_size(total.total_bytes)} in {total.total_files} Dateien\n")
+        for e in rows:
+            share = f"{100 * e.total_bytes / total.total_bytes:5.1f} %" if total and total.total_bytes else ""
+            print(f"{format_size(e.total_bytes):>10} {share}  {e.path}")
+        return 0
+    finally:
+        index.close()
+
+
+def cmd_settings(args) -> int:
+    from winrep_settings import load_settings, render_reg
+
+    try:
+        sets = load_settings()
+    except (OSError, ValueError) as exc:
+        print(f"Einstellungen konnten nicht geladen werden: {exc}", file=sys.stderr)
+        return 2
+    if not args.name:
+        for name, rows in sets.items():
+            if args.json:
+                _emit_json({"set": name, "rows": len(rows)})
+            else:
+                print(f"{name}: {len(rows)} Einstellungen")
+        return 0
+    if args.name not in sets:
+        print(f"Unbekannter Satz {args.name!r}. Verfügbar: {', '.join(sets)}", file=sys.stderr)
+        return 2
+    rows = sets[args.name]
+    if args.reg:
+        Path(args.reg).write_text(render_reg(rows, args.scheme), encoding="utf-16", newline="")
+        print(f"{len(rows)} Einstellungen nach {args.reg} geschrieben.")
+        return 0
+    for row in rows:
+        if args.json:
+            _emit_json(row.__dict__)
         else:
-            self._append_log(f"\nScript Rückgabecode: {rc}\n")
-            self.after(
-                0,
-                self.status_lbl.configure,
-                {"text": f"Fertig: {action.title} (Fehlercode {rc})"},
-            )
-
-        self.after(1500, lambda: self.progress.set(0.0))
-
-    # -------------------------------------------------------------------------
-    # Aktionen ausführen – alles über winrep_actions.ps1
-    # -------------------------------------------------------------------------
-
-    def _run_selected_action(self):
-        if not self.selected_action:
-            self._append_log("Bitte zuerst eine Aktion auswählen.\n")
-            return
+            print(row.describe())
+    return 0
+
+
+def cmd_metrics(args) -> int:
+    from winrep_metrics import MetricsWriter, default_writer, read_records, summarize
+
+    writer = MetricsWriter(Path(args.file)) if args.file else default_writer()
+    rows = summarize(read_records(writer.files()), kind=args.kind)
+    if args.json:
+        for row in rows:
+            _emit_json(row)
+        return 0
+    if not rows:
+        print(f"Keine Metriken vom Typ '{args.kind}' gefunden ({writer.path}).")
+        return 0
+    cols = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) if c == "key" else c.rjust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(widths[c]) if c == "key" else str(r[c]).rjust(widths[c]) for c in cols))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from winrep_inventory import INVENTORY_FORMATS, INVENTORY_WORKERS
+    from winrep_tempscan import TEMPSCAN_WORKERS
+
+    parser = argparse.ArgumentParser(
+        prog="winrep",
+        description=f"{APP_TITLE} – ohne Argumente startet die GUI.",
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    p_list = sub.add_parser("list", help="verfügbare Aktionen anzeigen")
+    p_list.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_list.set_defaults(func=cmd_list)
+
+    p_run = sub.add_parser("run", help="Aktionen ohne GUI nacheinander ausführen")
+    p_run.add_argument("actions", nargs="+", metavar="ACTION", help="Aktionsschlüssel, z. B. sfc_scannow")
+    p_run.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines (Events)")
+    p_run.add_argument("--yes", action="store_true", help="Rückfragen (z. B. upgrade_pro) bestätigen")
+    p_run.add_argument("--stop-on-error", action="store_true", help="nach dem ersten Fehler abbrechen")
+    _add_limit_arguments(p_run)
+    p_run.set_defaults(func=cmd_run)
+
+    p_recipe = sub.add_parser("recipe", help="Ablauf aus winrep_recipes.json ausführen (ohne Namen: auflisten)")
+    p_recipe.add_argument("name", nargs="?", help="z. B. intake")
+    p_recipe.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines (Events)")
+    p_recipe.add_argument("--yes", action="store_true", help="Rückfragen bestätigen")
+    _add_limit_arguments(p_recipe)
+    p_recipe.set_defaults(func=cmd_recipe)
+
+    p_history = sub.add_parser("history", help="gespeicherte Läufe abfragen (SQLite-Historie)")
+    p_history.add_argument("--action", help="nur diese Aktion")
+    p_history.add_argument("--machine", help="Rechnername oder -Kennung")
+    p_history.add_argument("--here", action="store_true", help="nur dieser Rechner")
+    p_history.add_argument("--limit", type=int, default=20)
+    p_history.add_argument("--where", metavar="AKTION.WERT<ZAHL", help="Rechner nach letztem Messwert, z. B. battery_info.health<65")
+    p_history.add_argument("--show", type=int, metavar="ID", help="gespeicherte Ausgabe eines Laufs")
+    p_history.add_argument("--compact", action="store_true", help="Aufbewahrungsregeln jetzt anwenden")
+    p_history.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_history.set_defaults(func=cmd_history)
+
+    p_triage = sub.add_parser("triage", help="CBS.log/dism.log nach Reparaturfehlern auswerten (auch kopierte Logs)")
+    p_triage.add_argument("logs", nargs="*", metavar="LOG", help="Logdateien (Standard: die des Systems)")
+    p_triage.add_argument("--since", metavar="ZEIT", help="erst ab diesem Zeitpunkt, z. B. '2026-10-02 14:00'")
+    p_triage.add_argument("-v", "--verbose", action="store_true", help="erste Fundstelle je Fehlercode zeigen")
+    p_triage.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_triage.set_defaults(func=cmd_triage)
+
+    p_crashes = sub.add_parser("crashes", help="Bluescreen-Abbilder auswerten (Minidump, MEMORY.DMP): Bugcheck-Häufigkeit")
+    p_crashes.add_argument("paths", nargs="*", metavar="PFAD", help="Abbilder oder Ordner (Standard: Minidump-Ordner + MEMORY.DMP)")
+    p_crashes.add_argument("-v", "--verbose", action="store_true", help="jedes Abbild einzeln mit Parametern")
+    p_crashes.add_argument("--json", action="store_true", help="Ausgabe als JSON")
+    p_crashes.set_defaults(func=cmd_crashes)
+
+    p_battery = sub.add_parser("battery", help="Batteriereport (powercfg /batteryreport) auswerten: Kapazitätsverlauf, Prognose")
+    p_battery.add_argument("reports", nargs="+", metavar="HTML", help="z. B. CLS-BatteryReport.html vom Desktop")
+    p_battery.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_battery.set_defaults(func=cmd_battery)
+
+    p_inv = sub.add_parser("inventory", help="Systeminformationen als TXT/JSON/HTML (Abschnitte parallel)")
+    p_inv.add_argument("--format", nargs="+", choices=list(INVENTORY_FORMATS), metavar="FMT",
+                       help=f"{'/'.join(INVENTORY_FORMATS)} (Standard: txt)")
+    p_inv.add_argument("--out", metavar="ORDNER", help="Reports in ORDNER schreiben statt auf die Konsole")
+    p_inv.add_argument("--fixture", metavar="DATEI", help="Rohdaten aus DATEI statt PowerShell (siehe --save-raw)")
+    p_inv.add_argument("--save-raw", metavar="DATEI", help="gesammelte Rohdaten als Testdaten speichern")
+    p_inv.add_argument("--workers", type=int, default=INVENTORY_WORKERS, help="parallele Abschnitte (Standard: %(default)s)")
+    p_inv.set_defaults(func=cmd_inventory)
+
+    p_tempscan = sub.add_parser("tempscan", help="Probelauf für temp_cleanup: Größe je Kategorie (optional löschen)")
+    p_tempscan.add_argument("paths", nargs="*", metavar="PFAD", help="beliebige Ordner statt der Bereinigungsziele")
+    p_tempscan.add_argument("--only", nargs="+", metavar="KAT", help="nur diese Kategorien, z. B. user_temp wer")
+    p_tempscan.add_argument("--older-than", type=float, default=0.0, metavar="H", help="nur Dateien älter als H Stunden")
+    p_tempscan.add_argument("--workers", type=int, default=TEMPSCAN_WORKERS, help="Threads (Standard: %(default)s)")
+    p_tempscan.add_argument("--delete", action="store_true", help="gefundene Dateien parallel löschen")
+    p_tempscan.add_argument("--yes", action="store_true", help="Löschen bestätigen")
+    p_tempscan.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_tempscan.set_defaults(func=cmd_tempscan)
+
+    p_disk = sub.add_parser("diskusage", help="größte Ordner des Systemlaufwerks (inkrementeller Index)")
+    p_disk.add_argument("root", nargs="?", help="Wurzelordner (Standard: Systemlaufwerk)")
+    p_disk.add_argument("--top", type=int, default=20, metavar="N")
+    p_disk.add_argument("--all", action="store_true", help="auch übergeordnete Ordner zeigen, die fast nur aus einem Unterordner bestehen")
+    p_disk.add_argument("--children", metavar="PFAD", help="Unterordner von PFAD nach Größe")
+    p_disk.add_argument("--cached", action="store_true", help="vorhandenen Index ohne neuen Scan verwenden")
+    p_disk.add_argument("--full", action="store_true", help="alle Ordner neu einlesen (auch unveränderte)")
+    p_disk.add_argument("--workers", type=int, default=TEMPSCAN_WORKERS, help="Threads (Standard: %(default)s)")
+    p_disk.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_disk.set_defaults(func=cmd_diskusage)
+
+    p_settings = sub.add_parser("settings", help="Einstellungs-Zeilen aus winrep_settings.json anzeigen/exportieren")
+    p_settings.add_argument("name", nargs="?", help="z. B. power_high (ohne Namen: auflisten)")
+    p_settings.add_argument("--reg", metavar="DATEI", help="Sollzustand als .reg-Datei exportieren")
+    p_settings.add_argument("--scheme", default="8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c",
+                            help="Energieplan-GUID für Energieoptionen im Export (Standard: Höchstleistung)")
+    p_settings.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_settings.set_defaults(func=cmd_settings)
+
+    p_metrics = sub.add_parser("metrics", help="Laufzeit-Metriken zusammenfassen (p50/p95 je Aktion)")
+    p_metrics.add_argument("--kind", default="action", choices=["action", "probe", "startup"])
+    p_metrics.add_argument("--file", help="andere metrics.jsonl auswerten")
+    p_metrics.add_argument("--json", action="store_true", help="Ausgabe als JSON-Lines")
+    p_metrics.set_defaults(func=cmd_metrics)
+
+    return parser
 
-        action = ACTIONS[self.selected_action]
-
-        if action.key == "upgrade_pro":
-            from tkinter import messagebox
-
-            if not messagebox.askyesno(
-                "Windows-Edition upgraden",
-                "Diese Aktion versucht, ein Windows Home auf Windows Pro zu upgraden.\n"
-                "Nur auf Systemen ausführen, auf denen du das wirklich möchtest.\n\n"
-                "Fortfahren?",
-            ):
-                return
-
-        self.status_lbl.configure(text=f"Führe Aktion aus: {action.title}")
-        self.progress.set(0.1)
-
-        def worker():
-            try:
-                self._run_ps1_action(action)
-            except Exception as exc:
-                self._append_log(f"\n[Fehler] {exc}\n")
-                self.after(
-                    0,
-                    self.status_lbl.configure,
-                    {"text": f"Fehler bei Aktion: {action.title}"},
-                )
-                self.after(1200, lambda: self.progress.set(0.0))
-
-        threading.Thread(target=worker, daemon=True).start()
-
-    # -------------------------------------------------------------------------
-    # Log Helpers
-    # -------------------------------------------------------------------------
-
-    def _clear_log(self):
-        self.log_text.configure(state="normal")
-        self.log_text.delete("1.0", "end")
-        self.log_text.configure(state="disabled")
-
-    def _append_log(self, text: str):
-        self.log_text.configure(state="normal")
-        self.log_text.insert("end", text)
-        self.log_text.see("end")
-        self.log_text.configure(state="disabled")
-
-    # -------------------------------------------------------------------------
-    # Systeminfo
-    # -------------------------------------------------------------------------
-
-    def _run_powershell(self, ps: str) -> str:
-        prefixed = (
-            "[Console]::OutputEncoding=[System.Text.Encoding]::GetEncoding(850); "
-            "$OutputEncoding=[System.Text.Encoding]::GetEncoding(850); "
-            + ps
-        )
-        try:
-            # PowerShell-Fenster verstecken
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-
-            out = subprocess.check_output(
-                [
-                    "powershell.exe",
-                    "-NoProfile",
-                    "-NonInteractive",
-                    "-WindowStyle", "Hidden",
-                    "-ExecutionPolicy", "Bypass",
-                    "-Command", prefixed,
-                ],
-                text=True,
-                encoding=PS_ENCODING,  # cp850
-                errors="replace",
-                stderr=subprocess.STDOUT,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            return (out or "").strip()
-        except Exception:
-            return ""
-
-    def _get_system_info_bundle(self) -> dict[str, str]:
-        ps = r"""
-        $ErrorActionPreference = 'SilentlyContinue'
-
-        # Betriebssystem
-        $os = Get-CimInstance Win32_OperatingSystem
-        $cv = Get-ItemProperty -Path 'HKLM:\SOFTWARE\Microsoft\Windows NT\CurrentVersion' -ErrorAction SilentlyContinue
-        $cap = $os.Caption
-        $edition = $cap -replace '^Microsoft\s+', ''
-
-        $arch = $os.OSArchitecture
-        if ($arch) {
-            $arch = $arch -replace 'bit','Bit'
-            $arch = $arch -replace '-', ' '
-        }
-
-        $disp = $cv.DisplayVersion
-        if (-not $disp -and $cv.ReleaseId) { $disp = $cv.ReleaseId }
-        if (-not $disp) { $disp = $os.Version }
-
-        if ($arch) {
-            $osStr = "$edition - $arch ($disp)"
-        } else {
-            $osStr = "$edition ($disp)"
-        }
-
-        # Boot-Modus und Partitionsstil
-        $boot = 'Unbekannt'
-        try {
-            $fw = (Get-ItemProperty -Path 'HKLM:\SYSTEM\CurrentControlSet\Control' -Name 'PEFirmwareType' -ErrorAction SilentlyContinue).PEFirmwareType
-            if ($fw) {
-                $boot = switch ($fw) {
-                    1 { 'Legacy / BIOS' }
-                    2 { 'UEFI' }
-                    Default { 'Unbekannt' }
-                }
-            }
-        } catch {}
-
-        if ($boot -eq 'Unbekannt') {
-            try {
-                if (Test-Path 'HKLM:\SYSTEM\CurrentControlSet\Control\SecureBoot\State') {
-                    $boot = 'UEFI'
-                } else {
-                    $boot = 'Legacy / BIOS'
-                }
-            } catch {}
-        }
-
-        $style = $null
-        try {
-            $diskObj = Get-Partition -DriveLetter C -ErrorAction SilentlyContinue | Get-Disk
-            $style = $diskObj.PartitionStyle
-        } catch {}
-
-        if ($style) {
-            $bootStr = "$boot ($style)"
-        } else {
-            $bootStr = $boot
-        }
-
-        # BitLocker-Status
-        $blStr = 'BitLocker: Unbekannt'
-        try {
-            if (Get-Command -Name Get-BitLockerVolume -ErrorAction SilentlyContinue) {
-                $vol = Get-BitLockerVolume -MountPoint 'C:' -ErrorAction SilentlyContinue
-                if ($vol) {
-                    $prot = [int]$vol.ProtectionStatus
-                    $protText = switch ($prot) {
-                        0 { 'Aus' }
-                        1 { 'Aktiv' }
-                        2 { 'Ausgesetzt' }
-                        default { "Unbekannt ($prot)" }
-                    }
-                    $vs = $vol.VolumeStatus
-                    if ($vs) {
-                        $blStr = "BitLocker: $protText – VolumeStatus: $vs"
-                    } else {
-                        $blStr = "BitLocker: $protText"
-                    }
-                } else {
-                    $blStr = 'BitLocker: Kein Volume gefunden'
-                }
-            } else {
-                $blStr = 'BitLocker-Cmdlets nicht vorhanden'
-            }
-        } catch {}
-
-        # IP-Adresse (primäre IPv4)
-        $ipv4 = '-'
-        try {
-            $adapters = Get-NetIPAddress -AddressFamily IPv4 -PrefixOrigin Dhcp,Manual -ErrorAction SilentlyContinue |
-                        Where-Object { $_.IPAddress -notlike '169.254.*' -and $_.IPAddress -ne '127.0.0.1' } |
-                        Sort-Object -Property InterfaceMetric, AddressFamily
-            if ($adapters) {
-                $ipv4 = $adapters[0].IPAddress
-            }
-        } catch {}
-
-        # CPU
-        $cpuName = '-'
-        try {
-            $cpu = Get-CimInstance Win32_Processor | Select-Object -First 1
-            if ($cpu -and $cpu.Name) { $cpuName = $cpu.Name.Trim() }
-        } catch {}
-
-        # Systemlaufwerk C:
-        $diskStr = 'Nicht verfügbar'
-        try {
-            $drive = Get-CimInstance Win32_LogicalDisk -Filter "DeviceID='C:'" -ErrorAction SilentlyContinue
-            if ($drive -and $drive.Size) {
-                function Format-Size([double]$bytes) {
-                    if ($bytes -ge 1TB) {
-                        $tb = [math]::Round($bytes / 1TB, 0)
-                        "{0} TB" -f $tb
-                    }
-                    elseif ($bytes -ge 1GB) {
-                        $gb = [math]::Round($bytes / 1GB, 0)
-                        "{0} GB" -f $gb
-                    }
-                    else {
-                        $mb = [math]::Round($bytes / 1MB, 0)
-                        "{0} MB" -f $mb
-                    }
-                }
-
-                $size = [double]$drive.Size
-                $free = [double]$drive.FreeSpace
-                $used = $size - $free
-                $usedStr = Format-Size $used
-                $sizeStr = Format-Size $size
-                $diskStr = "Disk C:\ $usedStr genutzt von $sizeStr"
-            }
-        } catch {}
-
-        $obj = [PSCustomObject]@{
-            OS        = $osStr
-            Boot      = $bootStr
-            BitLocker = $blStr
-            IPv4      = $ipv4
-            CPU       = $cpuName
-            Disk      = $diskStr
-        }
-
-        $obj | ConvertTo-Json -Compress
-        """
-        raw = self._run_powershell(ps)
-        if not raw:
-            return {}
-        try:
-            import json
-            return json.loads(raw)
-        except Exception:
-            return {}
-
-    def _load_system_info_async(self):
-        def worker():
-            # Computername lokal holen, das ist instant
-            try:
-                name = socket.gethostname()
-            except Exception:
-                name = "-"
-
-            info = self._get_system_info_bundle()
-
-            # Fallbacks
-            os_str = info.get("OS", "-")
-            boot = info.get("Boot", "-")
-            bitlocker = info.get("BitLocker", "-")
-            ip = info.get("IPv4", "-")
-            cpu = info.get("CPU", "-")
-            disk = info.get("Disk", "-")
-
-            self.sys_computer.set(name)
-            self.sys_os.set(os_str)
-            self.sys_ip.set(ip)
-            self.sys_cpu.set(cpu)
-            self.sys_boot.set(boot)
-            self.sys_bitlocker.set(bitlocker)
-            self.sys_disk.set(disk)
-
-        threading.Thread(target=worker, daemon=True).start()
 
 # =============================================================================
 # Main
 # =============================================================================
 
-def main():
+def run_gui():
+    from winrep_gui import WinRepApp
+
     app = WinRepApp()
     app.mainloop()
 
 
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        run_gui()
+        return 0
+    return args.func(args)
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -7,7 +7,6 @@ param(
         "dism_restorehealth",
         "dism_componentcleanup",
         "sfc_scannow",
-        "sysinfo",
         "net_reset",
         "wu_reset",
         "temp_cleanup",
@@ -22,6 +21,264 @@ param(
 
 $ErrorActionPreference = "Stop"
 
+# -----------------------------------------------------------------------------
+# Strukturierte Ereignisse für WinRep
+# -----------------------------------------------------------------------------
+# Zusätzlich zur lesbaren Ausgabe eine JSON-Zeile pro Ereignis. WinRep blendet
+# diese Zeilen im Log aus und nutzt sie für Fortschritt, Status und Ergebnis
+# (siehe winrep_events.py).
+
+$WinRepEventPrefix = "$([char]0x1f)WINREP-EVENT "
+
+function Send-WinRepEvent {
+    param(
+        [Parameter(Mandatory = $true)][string]$Type,
+        [hashtable]$Data = @{}
+    )
+    $Data["type"] = $Type
+    $json = $Data | ConvertTo-Json -Compress -Depth 4
+    # Nur ASCII ausgeben, damit Umlaute die CP850-Ausgabe unbeschadet überstehen
+    $json = [regex]::Replace($json, '[^\x00-\x7F]', { param($m) '\u{0:x4}' -f [int][char]$m.Value })
+    Write-Output ($WinRepEventPrefix + $json)
+}
+
+$script:WinRepStep = $null
+
+function Start-WinRepStep {
+    param([int]$Index, [int]$Total, [string]$Title)
+    if ($script:WinRepStep) { Complete-WinRepStep }
+    $script:WinRepStep = @{ index = $Index; total = $Total }
+    Send-WinRepEvent "step_start" @{ index = $Index; total = $Total; title = $Title }
+}
+
+function Complete-WinRepStep {
+    param([bool]$Ok = $true)
+    if (-not $script:WinRepStep) { return }
+    Send-WinRepEvent "step_end" @{ index = $script:WinRepStep.index; total = $script:WinRepStep.total; ok = $Ok }
+    $script:WinRepStep = $null
+}
+
+function Send-WinRepResult {
+    param([string]$Status, [string]$Message)
+    Complete-WinRepStep
+    Send-WinRepEvent "result" @{ status = $Status; message = $Message }
+}
+
+# Zustand des Komponentenspeichers aus der DISM-Ausgabe (deutsch/englisch)
+function Get-DismHealthState {
+    param([string[]]$Lines)
+    $text = ($Lines -join "`n")
+    if ($text -match 'kann nicht repariert werden|cannot be repaired') { return "not_repairable" }
+    if ($text -match 'kann repariert werden|is repairable') { return "repairable" }
+    if ($text -match 'Keine Komponentenspeicherbesch.digung|No component store corruption') { return "healthy" }
+    return "unknown"
+}
+
+# Ergebnis von sfc /scannow (Ausgabe kann NUL-Zeichen enthalten)
+function Get-SfcState {
+    param([string[]]$Lines)
+    $text = ($Lines -join "`n") -replace "`0", ""
+    if ($text -match 'keine Integrit.tsverletzungen|did not find any integrity violations') { return "healthy" }
+    if ($text -match 'konnte einige dieser Dateien nicht reparieren|unable to fix some of them') { return "corrupt" }
+    if ($text -match 'erfolgreich repariert|successfully repaired') { return "repaired" }
+    return "unknown"
+}
+
+$DismHealthMessages = @{
+    healthy        = "Keine Beschädigung des Komponentenspeichers"
+    repairable     = "Komponentenspeicher beschädigt – reparierbar"
+    not_repairable = "Komponentenspeicher beschädigt – nicht reparierbar"
+    unknown        = "Zustand unklar"
+}
+
+# -----------------------------------------------------------------------------
+# Deklarative Einstellungen (winrep_settings.json, siehe winrep_settings.py)
+# -----------------------------------------------------------------------------
+# Jede Einstellung ist eine Zeile. Istwerte werden prozessintern gelesen
+# (.NET-Registry, ein "powercfg /qh"), nur abweichende Zeilen werden
+# gesammelt geschrieben: eine .reg-Datei per "reg import", danach ein
+# "powercfg /setactive", damit der Energiedienst die Werte übernimmt.
+# Stimmt schon alles, startet kein weiterer Prozess.
+
+$RegHives = @{ HKLM = "HKEY_LOCAL_MACHINE"; HKCU = "HKEY_CURRENT_USER"; HKCR = "HKEY_CLASSES_ROOT"; HKU = "HKEY_USERS" }
+$PowerSchemesKey = "HKLM\SYSTEM\CurrentControlSet\Control\Power\User\PowerSchemes"
+
+function ConvertTo-WinRepRegPath {
+    param([string]$Key)
+    $hive, $rest = $Key -split '\\', 2
+    return $RegHives[$hive.ToUpper()] + "\" + $rest
+}
+
+function Get-WinRepSettingRows {
+    param([string]$Set)
+    $file = Join-Path $PSScriptRoot "winrep_settings.json"
+    $data = Get-Content -LiteralPath $file -Raw -Encoding UTF8 | ConvertFrom-Json
+    $rows = New-Object System.Collections.Generic.List[object]
+    foreach ($entry in @($data.sets.$Set)) {
+        if ($entry.power) {
+            $rows.Add(@{ kind = "power"; title = [string]$entry.title; sub = $entry.power.ToLower()
+                         setting = $entry.setting.ToLower(); ac = [int64]$entry.ac; dc = [int64]$entry.dc })
+            continue
+        }
+        $items = @($null)
+        if ($entry.items) { $items = @($data.lists.($entry.items)) }
+        $values = [ordered]@{}
+        if ($entry.values) {
+            foreach ($p in $entry.values.PSObject.Properties) { $values[$p.Name] = $p.Value }
+        } else {
+            $values[[string]$entry.name] = $entry.value
+        }
+        $type = if ($entry.type) { [string]$entry.type } else { "dword" }
+        foreach ($item in $items) {
+            $key = [string]$entry.reg
+            $title = [string]$entry.title
+            if ($null -ne $item) {
+                $key = $key.Replace("{item}", $item)
+                $title = $title.Replace("{item}", $item)
+            }
+            foreach ($name in $values.Keys) {
+                $rows.Add(@{ kind = "reg"; title = $title; key = $key; name = $name; type = $type
+                             value = $values[$name]; existing_only = [bool]$entry.existing_only })
+            }
+        }
+    }
+    return $rows
+}
+
+function Test-WinRepRegKey {
+    param([string]$Key)
+    $hive, $rest = $Key -split '\\', 2
+    $base = switch ($hive.ToUpper()) {
+        "HKLM" { [Microsoft.Win32.Registry]::LocalMachine }
+        "HKCU" { [Microsoft.Win32.Registry]::CurrentUser }
+        "HKCR" { [Microsoft.Win32.Registry]::ClassesRoot }
+        "HKU"  { [Microsoft.Win32.Registry]::Users }
+    }
+    $k = $base.OpenSubKey($rest)
+    if ($k) { $k.Close(); return $true }
+    return $false
+}
+
+function Test-WinRepSameValue {
+    param($Current, $Wanted, [string]$Type)
+    if ($null -eq $Current) { return $false }
+    if ($Type -eq "dword") {
+        try { return (([int64]$Current -band 0xFFFFFFFFL) -eq [int64]$Wanted) } catch { return $false }
+    }
+    return ([string]$Current -ceq [string]$Wanted)
+}
+
+# Aktiver Plan und aktuelle AC/DC-Indizes aller Energieoptionen (ein powercfg-Aufruf).
+# Sprachunabhängig: je Einstellungs-GUID sind die letzten beiden 0x-Werte AC und DC.
+function Get-WinRepPowerValues {
+    $scheme = $null
+    $current = $null
+    $hex = @{}
+    foreach ($line in (powercfg /qh SCHEME_CURRENT)) {
+        if ($line -match '([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})') {
+            $current = $Matches[1].ToLower()
+            if (-not $scheme) { $scheme = $current }
+            $hex[$current] = New-Object System.Collections.Generic.List[int64]
+        } elseif ($current -and $line -match ':\s*0x([0-9a-fA-F]+)\s*$') {
+            $hex[$current].Add([Convert]::ToInt64($Matches[1], 16))
+        }
+    }
+    $values = @{}
+    foreach ($guid in $hex.Keys) {
+        $v = $hex[$guid]
+        if ($v.Count -ge 2) { $values[$guid] = @($v[$v.Count - 2], $v[$v.Count - 1]) }
+    }
+    return @{ scheme = $scheme; values = $values }
+}
+
+function Format-WinRepRegLine {
+    param([string]$Name, [string]$Type, $Value)
+    $left = if ($Name -eq "") { "@" } else { '"' + $Name.Replace('\', '\\').Replace('"', '\"') + '"' }
+    if ($Type -eq "dword") { return $left + "=dword:" + ('{0:x8}' -f [int64]$Value) }
+    return $left + '="' + ([string]$Value).Replace('\', '\\').Replace('"', '\"') + '"'
+}
+
+function Import-WinRepRegFile {
+    param($Writes)
+    $lines = New-Object System.Collections.Generic.List[string]
+    $lines.Add("Windows Registry Editor Version 5.00")
+    foreach ($group in ($Writes | Group-Object { $_.key })) {
+        $lines.Add("")
+        $lines.Add("[" + (ConvertTo-WinRepRegPath $group.Name) + "]")
+        foreach ($w in $group.Group) { $lines.Add((Format-WinRepRegLine $w.name $w.type $w.value)) }
+    }
+    $path = Join-Path $env:TEMP ("winrep-settings-{0}.reg" -f $PID)
+    [System.IO.File]::WriteAllLines($path, $lines, [System.Text.Encoding]::Unicode)
+    try {
+        $p = Start-Process -FilePath "reg.exe" -ArgumentList @("import", "`"$path`"") -Wait -PassThru -WindowStyle Hidden
+        if ($p.ExitCode -ne 0) { throw "reg import ist fehlgeschlagen (Code $($p.ExitCode))" }
+    }
+    finally {
+        Remove-Item -LiteralPath $path -Force -ErrorAction SilentlyContinue
+    }
+}
+
+function Invoke-WinRepSettings {
+    param([string]$Set)
+    $rows = Get-WinRepSettingRows $Set
+    $power = $null
+    if (@($rows | Where-Object { $_.kind -eq "power" }).Count) { $power = Get-WinRepPowerValues }
+
+    $writes = New-Object System.Collections.Generic.List[object]
+    $changed = New-Object System.Collections.Generic.List[object]
+    $unchanged = 0
+    $skipped = 0
+    foreach ($row in $rows) {
+        if ($row.kind -eq "power") {
+            if (-not $power.scheme -or -not $power.values.ContainsKey($row.setting)) { $skipped++; continue }
+            $cur = $power.values[$row.setting]
+            if ($cur[0] -eq $row.ac -and $cur[1] -eq $row.dc) { $unchanged++; continue }
+            $key = "$PowerSchemesKey\$($power.scheme)\$($row.sub)\$($row.setting)"
+            $writes.Add(@{ key = $key; name = "ACSettingIndex"; type = "dword"; value = $row.ac })
+            $writes.Add(@{ key = $key; name = "DCSettingIndex"; type = "dword"; value = $row.dc })
+            $changed.Add(@{ row = $row; old = "AC $($cur[0]) / DC $($cur[1])"; new = "AC $($row.ac) / DC $($row.dc)" })
+        } else {
+            if ($row.existing_only -and -not (Test-WinRepRegKey $row.key)) { $skipped++; continue }
+            $cur = $null
+            try { $cur = [Microsoft.Win32.Registry]::GetValue((ConvertTo-WinRepRegPath $row.key), $row.name, $null) } catch { }
+            if (Test-WinRepSameValue $cur $row.value $row.type) { $unchanged++; continue }
+            $writes.Add(@{ key = $row.key; name = $row.name; type = $row.type; value = $row.value })
+            $old = if ($null -eq $cur) { "(fehlt)" } else { [string]$cur }
+            $changed.Add(@{ row = $row; old = $old; new = [string]$row.value })
+        }
+    }
+
+    $fallback = 0
+    if ($writes.Count) {
+        Import-WinRepRegFile $writes
+        $powerChanged = @($changed | Where-Object { $_.row.kind -eq "power" })
+        if ($powerChanged.Count) {
+            powercfg /setactive $power.scheme | Out-Null
+            # Nachprüfen; was der Energiedienst nicht übernommen hat, einzeln setzen
+            $after = (Get-WinRepPowerValues).values
+            foreach ($c in $powerChanged) {
+                $r = $c.row
+                $now = $after[$r.setting]
+                if ($now -and $now[0] -eq $r.ac -and $now[1] -eq $r.dc) { continue }
+                powercfg /setacvalueindex $power.scheme $r.sub $r.setting $r.ac | Out-Null
+                powercfg /setdcvalueindex $power.scheme $r.sub $r.setting $r.dc | Out-Null
+                $fallback++
+            }
+            if ($fallback) { powercfg /setactive $power.scheme | Out-Null }
+        }
+    }
+
+    foreach ($c in $changed) {
+        $name = if ($c.row.kind -eq "reg") { " [$($c.row.name)]" } else { "" }
+        Write-Output "  geändert: $($c.row.title)${name}: $($c.old) -> $($c.new)"
+    }
+    $note = if ($skipped) { ", $skipped nicht vorhanden" } else { "" }
+    Write-Output "• $($changed.Count) Einstellung(en) geändert, $unchanged bereits korrekt$note."
+    if ($fallback) { Write-Output "  ($fallback Energieoption(en) einzeln per powercfg gesetzt)" }
+    Send-WinRepEvent "metric" @{ name = "settings_changed"; value = $changed.Count; unit = "" }
+    Send-WinRepEvent "metric" @{ name = "settings_unchanged"; value = $unchanged; unit = "" }
+}
+
 Write-Output "WinRep PowerShell-Aktionen"
 Write-Output "==========================="
 Write-Output "Action: $Action"
@@ -37,13 +294,17 @@ switch ($Action) {
         Write-Output ""
 
         try {
-            DISM /Online /Cleanup-Image /ScanHealth
+            $dismOut = New-Object System.Collections.Generic.List[string]
+            DISM /Online /Cleanup-Image /ScanHealth | ForEach-Object { $dismOut.Add([string]$_); $_ }
             $code = $LASTEXITCODE
             Write-Output ""
             if ($code -ne 0) {
                 Write-Output "DISM /ScanHealth beendet. Rückgabecode: $code"
+                Send-WinRepResult "failed" "DISM-Fehlercode $code"
             } else {
                 Write-Output "DISM /ScanHealth erfolgreich abgeschlossen."
+                $state = Get-DismHealthState $dismOut
+                Send-WinRepResult $state $DismHealthMessages[$state]
             }
             exit $code
         }
@@ -63,13 +324,17 @@ switch ($Action) {
         Write-Output ""
 
         try {
-            DISM /Online /Cleanup-Image /CheckHealth
+            $dismOut = New-Object System.Collections.Generic.List[string]
+            DISM /Online /Cleanup-Image /CheckHealth | ForEach-Object { $dismOut.Add([string]$_); $_ }
             $code = $LASTEXITCODE
             Write-Output ""
             if ($code -ne 0) {
                 Write-Output "DISM /CheckHealth beendet. Rückgabecode: $code"
+                Send-WinRepResult "failed" "DISM-Fehlercode $code"
             } else {
                 Write-Output "DISM /CheckHealth erfolgreich abgeschlossen."
+                $state = Get-DismHealthState $dismOut
+                Send-WinRepResult $state $DismHealthMessages[$state]
             }
             exit $code
         }
@@ -89,25 +354,32 @@ switch ($Action) {
         Write-Output ""
 
         try {
-            $output = DISM /Online /Cleanup-Image /RestoreHealth
-            Write-Output $output
+            # Zeilen sofort weiterreichen (Fortschrittsbalken), für die Auswertung mitschreiben
+            $dismOut = New-Object System.Collections.Generic.List[string]
+            DISM /Online /Cleanup-Image /RestoreHealth | ForEach-Object { $dismOut.Add([string]$_); $_ }
+            $output = @($dismOut)
             Write-Output ""
 
             if ($output -match 'Der Wiederherstellungsvorgang wurde erfolgreich abgeschlossen') {
                 Write-Output "Ergebnis: Der Windows-Komponentenspeicher wurde erfolgreich repariert."
+                Send-WinRepResult "repaired" "Komponentenspeicher repariert"
                 exit 0
             }
             elseif ($output -match 'Keine Beschädigung des Komponentenspeichers erkannt') {
                 Write-Output "Ergebnis: Keine Beschädigungen gefunden. Keine Reparatur erforderlich."
+                Send-WinRepResult "ok" "Keine Beschädigungen gefunden"
                 exit 0
             }
             elseif ($output -match 'Fehler') {
                 Write-Output "Ergebnis: Reparatur fehlgeschlagen."
                 Write-Output "Empfehlung: Windows Update / Installationsmedium prüfen."
+                Send-WinRepResult "failed" "Reparatur fehlgeschlagen – Quelle prüfen"
                 exit 2
             }
             else {
                 Write-Output "Ergebnis: Unklarer DISM-Status. Bitte Log prüfen."
+                Send-WinRepEvent "warning" @{ message = "Unklarer DISM-Status" }
+                Send-WinRepResult "unknown" "Unklarer DISM-Status"
                 exit 1
             }
         }
@@ -153,11 +425,20 @@ switch ($Action) {
 
         try {
             # SFC einfach laufen lassen, Ausgabe geht direkt ins Log
-            cmd /c "chcp 850 >nul & sfc /scannow"
+            $sfcOut = New-Object System.Collections.Generic.List[string]
+            cmd /c "chcp 850 >nul & sfc /scannow" | ForEach-Object { $sfcOut.Add([string]$_); $_ }
             $code = $LASTEXITCODE
 
             Write-Output ""
             Write-Output "sfc /scannow beendet. Rückgabecode: $code"
+            $state = Get-SfcState $sfcOut
+            $sfcMessages = @{
+                healthy  = "Keine Integritätsverletzungen"
+                repaired = "Beschädigte Dateien repariert"
+                corrupt  = "Beschädigte Dateien – nicht alle reparierbar"
+                unknown  = "Ergebnis unklar"
+            }
+            Send-WinRepResult $state $sfcMessages[$state]
             exit $code
         }
         catch {
@@ -194,130 +475,6 @@ switch ($Action) {
         }
     }
 
-    # -------------------------------------------------------------------------
-    # 6: Systeminformationen → Report auf Desktop + Notepad
-    # -------------------------------------------------------------------------
-    "sysinfo" {
-        Write-Output "Erstelle Systeminformationen-Report auf dem Desktop ..."
-        Write-Output ""
-
-        try {
-            $desktopPath = [Environment]::GetFolderPath("Desktop")
-            $filePath    = Join-Path $desktopPath "WinRep_Systeminfo.txt"
-
-            $os    = Get-CimInstance Win32_OperatingSystem
-            $cpu   = Get-CimInstance Win32_Processor | Select-Object -First 1
-            $gpus  = Get-CimInstance Win32_VideoController
-            $board = Get-CimInstance Win32_BaseBoard | Select-Object -First 1
-            $bios  = Get-CimInstance Win32_BIOS | Select-Object -First 1
-            $memModules = Get-CimInstance Win32_PhysicalMemory
-            $disks = Get-CimInstance Win32_DiskDrive
-
-            $output = @"
-Systeminformationen
-
-Betriebssystem
-    Edition       = $($os.Caption)
-    Build-Nummer  = $($os.Version)
-
-Prozessor
-    Name          = $($cpu.Name)
-    Kerne/Threads = $($cpu.NumberOfCores) C / $($cpu.NumberOfLogicalProcessors) T
-    Sockel        = $($cpu.SocketDesignation)
-
-"@
-
-            if ($gpus) {
-                foreach ($gpu in $gpus) {
-                    $output += @"
-Grafik
-    Chip-Name     = $($gpu.Name)
-    Treiberversion= $($gpu.DriverVersion)
-    Treiberdatum  = $($gpu.DriverDate)
-
-"@
-                }
-            }
-
-            if ($board -and $bios) {
-                $output += @"
-Mainboard
-    Hersteller    = $($board.Manufacturer)
-    Modell        = $($board.Product)
-    Seriennummer  = $($board.SerialNumber)
-    Revision      = $($board.Version)
-    BIOS-Version  = $($bios.SMBIOSBIOSVersion)
-
-"@
-            }
-
-            if ($memModules) {
-                $output += "Arbeitsspeicher`n"
-                foreach ($m in $memModules) {
-                    $sizeGB = [math]::Round($m.Capacity / 1GB, 0)
-                    $output += @"
-    Modul
-        Hersteller    = $($m.Manufacturer)
-        Modell        = $($m.PartNumber)
-        Seriennummer  = $($m.SerialNumber)
-        Steckplatz    = $($m.DeviceLocator)
-        Speicher      = ${sizeGB} GB
-        Taktfrequenz  = $($m.ConfiguredClockSpeed) MHz
-
-"@
-                }
-            }
-
-            if ($disks) {
-                $output += "Laufwerke`n"
-                foreach ($disk in $disks) {
-                    $sizeGB = [math]::Round($disk.Size / 1GB, 0)
-
-                    $volName = ""
-                    $volLetter = ""
-                    try {
-                        $partitions = Get-CimInstance -Query "ASSOCIATORS OF {Win32_DiskDrive.DeviceID='$($disk.DeviceID)'} WHERE AssocClass=Win32_DiskDriveToDiskPartition"
-                        foreach ($part in $partitions) {
-                            $logical = Get-CimInstance -Query "ASSOCIATORS OF {Win32_DiskPartition.DeviceID='$($part.DeviceID)'} WHERE AssocClass=Win32_LogicalDiskToPartition" | Select-Object -First 1
-                            if ($logical) {
-                                $volLetter = $logical.DeviceID
-                                $volName   = $logical.VolumeName
-                                break
-                            }
-                        }
-                    } catch {
-                        # ignorieren
-                    }
-
-                    $output += @"
-    Datenträger
-        Modell        = $($disk.Model)
-        Größe         = ${sizeGB} GB
-        Schnittstelle = $($disk.InterfaceType)
-        Laufwerk      = $volLetter
-        Volumename    = $volName
-
-"@
-                }
-            }
-
-            Set-Content -Path $filePath -Encoding UTF8 -Value $output
-            Start-Process "notepad.exe" -ArgumentList "`"$filePath`""
-
-            Write-Output ""
-            Write-Output "Systeminformationen wurden nach:"
-            Write-Output "  $filePath"
-            Write-Output "geschrieben und in Notepad geöffnet."
-            exit 0
-        }
-        catch {
-            Write-Output ""
-            Write-Output "FEHLER beim Erstellen des Systeminfo-Reports:"
-            Write-Output $_.Exception.Message
-            exit 1
-        }
-    }
-
     # -------------------------------------------------------------------------
     # 7: Netzwerkeinstellungen zurücksetzen
     # -------------------------------------------------------------------------
@@ -327,6 +484,7 @@ Mainboard
 
         try {
             # 1) Adapter auf DHCP setzen (IPv4/IPv6/DNS)
+            Start-WinRepStep 1 6 "Adapter auf DHCP setzen"
             Write-Output "1/6: IPv4/IPv6 & DNS aller aktiven Adapter auf DHCP setzen ..."
             $networkAdapters = Get-NetAdapter | Where-Object { $_.Status -eq 'Up' }
             foreach ($adapter in $networkAdapters) {
@@ -336,24 +494,29 @@ Mainboard
             }
 
             # 2) Winsock-Katalog zurücksetzen
+            Start-WinRepStep 2 6 "Winsock-Katalog zurücksetzen"
             Write-Output "2/6: Winsock-Katalog zurücksetzen ..."
             netsh winsock reset | Out-Null
 
             # 3) TCP/IP-Stack zurücksetzen
+            Start-WinRepStep 3 6 "TCP/IP zurücksetzen"
             Write-Output "3/6: TCP/IP-Einstellungen auf Standard zurücksetzen ..."
             netsh int ip reset | Out-Null
 
             # 4) IP erneuern + DNS-Cache leeren
+            Start-WinRepStep 4 6 "IP erneuern & DNS-Cache leeren"
             Write-Output "4/6: IP-Adresse erneuern & DNS-Cache leeren ..."
             ipconfig /release  | Out-Null
             ipconfig /renew    | Out-Null
             ipconfig /flushdns | Out-Null
 
             # 5) Windows-Firewall zurücksetzen
+            Start-WinRepStep 5 6 "Firewall zurücksetzen"
             Write-Output "5/6: Windows-Firewall auf Standardregeln zurücksetzen ..."
             netsh advfirewall reset | Out-Null
 
             # 6) Proxy zurücksetzen
+            Start-WinRepStep 6 6 "Proxy zurücksetzen"
             Write-Output "6/6: Proxy-Einstellungen zurücksetzen ..."
             netsh winhttp reset proxy | Out-Null
 
@@ -366,6 +529,8 @@ Mainboard
 
             Write-Output ""
             Write-Output "Netzwerk-Reset abgeschlossen. Ein Neustart des Systems wird empfohlen."
+            Send-WinRepEvent "warning" @{ message = "Neustart empfohlen" }
+            Send-WinRepResult "ok" "Netzwerk zurückgesetzt"
             exit 0
         }
         catch {
@@ -389,16 +554,19 @@ Mainboard
             attrib -h -r -s "$env:windir\system32\catroot2"      2>$null
             attrib -h -r -s "$env:windir\system32\catroot2\*.*"  2>$null
 
+            Start-WinRepStep 1 3 "Dienste anhalten"
             Write-Output "• Dienste anhalten (wuauserv, CryptSvc, BITS, msiserver) ..."
             Stop-Service -Name wuauserv -Force
             Stop-Service -Name CryptSvc -Force
             Stop-Service -Name BITS     -Force
             Stop-Service -Name msiserver -Force
 
+            Start-WinRepStep 2 3 "Cache-Ordner umbenennen"
             Write-Output "• Cache-Ordner umbenennen ..."
             Rename-Item -Path "$env:windir\SoftwareDistribution" -NewName "SoftwareDistribution.old" -ErrorAction SilentlyContinue
             Rename-Item -Path "$env:windir\system32\catroot2"   -NewName "catroot2.old"             -ErrorAction SilentlyContinue
 
+            Start-WinRepStep 3 3 "Dienste starten"
             Write-Output "• Dienste wieder starten ..."
             Start-Service -Name wuauserv
             Start-Service -Name CryptSvc
@@ -407,6 +575,7 @@ Mainboard
 
             Write-Output ""
             Write-Output "Windows-Update-Komponenten wurden zurückgesetzt."
+            Send-WinRepResult "ok" "Windows Update zurückgesetzt"
             exit 0
         }
         catch {
@@ -425,47 +594,24 @@ Mainboard
         Write-Output ""
 
         try {
-            $Keys = @(
-                "Active Setup Temp Folders",
-                "Downloaded Program Files",
-                "Internet Cache Files",
-                "Memory Dump Files",
-                "Old ChkDsk Files",
-                "Previous Installations",
-                "Recycle Bin",
-                "Service Pack Cleanup",
-                "Setup Log Files",
-                "System error memory dump files",
-                "System error minidump files",
-                "Temporary Files",
-                "Temporary Setup Files",
-                "Thumbnail Cache",
-                "Update Cleanup",
-                "Upgrade Discarded Files",
-                "Windows Error Reporting Archive Files",
-                "Windows Error Reporting Queue Files",
-                "Windows Error Reporting System Archive Files",
-                "Windows Error Reporting System Queue Files",
-                "Windows Upgrade Log Files"
-            )
-
-            $BaseKey = "HKLM:\SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\VolumeCaches"
-
-            Write-Output "• Cleanup-Kategorien für cleanmgr (/sagerun:200) aktivieren ..."
-            foreach ($Key in $Keys) {
-                New-ItemProperty -Path "$BaseKey\$Key" `
-                    -Name "StateFlags0200" `
-                    -PropertyType DWORD `
-                    -Value 0x2 `
-                    -Force `
-                    -ErrorAction SilentlyContinue | Out-Null
-            }
+            $freeBefore = (Get-PSDrive -Name C -ErrorAction SilentlyContinue).Free
+
+            Start-WinRepStep 1 2 "Cleanup-Kategorien aktivieren"
+            Write-Output "• Cleanup-Kategorien für cleanmgr (/sagerun:200) abgleichen ..."
+            Invoke-WinRepSettings "temp_cleanup"
 
+            Start-WinRepStep 2 2 "Datenträgerbereinigung"
             Write-Output "• Datenträgerbereinigung wird gestartet, dies kann einige Minuten dauern ..."
             Start-Process -Wait -FilePath "$env:SystemRoot\System32\cleanmgr.exe" -ArgumentList "/sagerun:200" -NoNewWindow
 
+            $freeAfter = (Get-PSDrive -Name C -ErrorAction SilentlyContinue).Free
+            if ($freeBefore -and $freeAfter) {
+                Send-WinRepEvent "metric" @{ name = "freed_mb"; value = [math]::Round(($freeAfter - $freeBefore) / 1MB, 1); unit = "MB" }
+            }
+
             Write-Output ""
             Write-Output "Bereinigung abgeschlossen."
+            Send-WinRepResult "ok" "Bereinigung abgeschlossen"
             exit 0
         }
         catch {
@@ -494,10 +640,13 @@ Mainboard
                 Changepk.exe /ProductKey VK7JG-NPHTM-C97JM-9MPGT-3V66T
                 Write-Output ""
                 Write-Output "Der Key wurde gesetzt. Ein Neustart und anschließende Aktivierung sind ggf. erforderlich."
+                Send-WinRepEvent "warning" @{ message = "Neustart und Aktivierung erforderlich" }
+                Send-WinRepResult "ok" "Pro-Key gesetzt"
                 exit 0
             }
             else {
                 Write-Output "Dieses System ist keine unterstützte Home-Edition – Upgrade wird nicht ausgeführt."
+                Send-WinRepResult "skipped" "Keine Home-Edition"
                 exit 0
             }
         }
@@ -526,12 +675,14 @@ Mainboard
 
                 if ($vol.ProtectionStatus -eq 0) {
                     Write-Output "BitLocker ist auf Laufwerk C: bereits deaktiviert."
+                    Send-WinRepResult "skipped" "BitLocker bereits aus"
                     exit 0
                 }
 
                 Disable-BitLocker -MountPoint 'C:' | Out-Null
                 Write-Output "BitLocker-Deaktivierung wurde gestartet."
                 Write-Output "Die Entschlüsselung läuft im Hintergrund und kann je nach Laufwerksgröße lange dauern."
+                Send-WinRepResult "ok" "Entschlüsselung gestartet"
                 exit 0
             }
             else {
@@ -556,137 +707,43 @@ Mainboard
 
         try {
             # Energiesparplan: Höchstleistung aktivieren (GUID 8c5e7fda-...)
-            $planGUID    = "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c"
-            $powerPlans  = powercfg.exe /list
-            $planExists  = $powerPlans -match $planGUID
+            $planGUID = "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c"
+            $powerKey = "HKLM:\SYSTEM\CurrentControlSet\Control\Power"
+            $activePlan = (Get-ItemProperty -Path "$powerKey\User\PowerSchemes" -Name ActivePowerScheme -ErrorAction SilentlyContinue).ActivePowerScheme
 
-            if (-not $planExists) {
-                Write-Output "• Höchstleistungsplan nicht gefunden – Standardplan wird dupliziert ..."
-                powercfg -duplicatescheme "$planGUID" | Out-Null 2>$null
+            Start-WinRepStep 1 3 "Energieplan aktivieren"
+            if ($activePlan -eq $planGUID) {
+                Write-Output "• Höchstleistungs-Energieplan ist bereits aktiv."
+            } else {
+                $powerPlans = powercfg.exe /list
+                if (-not ($powerPlans -match $planGUID)) {
+                    Write-Output "• Höchstleistungsplan nicht gefunden – Standardplan wird dupliziert ..."
+                    powercfg -duplicatescheme "$planGUID" | Out-Null 2>$null
+                }
+                Write-Output "• Aktiviere Höchstleistungs-Energieplan ..."
+                powercfg -setactive $planGUID | Out-Null
             }
 
-            Write-Output "• Aktiviere Höchstleistungs-Energieplan ..."
-            # PreferredPlan in der Systemsteuerung setzen (optional, für UI)
-            Set-ItemProperty `
-                -Path 'HKLM:\SOFTWARE\Microsoft\Windows\CurrentVersion\explorer\ControlPanel\NameSpace\{025A5937-A6BE-4686-A844-36FE4BEC8B6D}' `
-                -Name PreferredPlan `
-                -Value $planGUID `
-                -ErrorAction SilentlyContinue
-
-            powercfg -setactive $planGUID | Out-Null
-
             # Ruhezustand deaktivieren
-            Write-Output "• Deaktiviere Ruhezustand ..."
-            powercfg -hibernate off | Out-Null
-
-            # Mindest-CPU-Zustand
-            Write-Output "• Optimiere Mindest-CPU-Zustand [AC: 50% | DC: 5%] ..."
-            # Subgroup: Prozessorenergieverwaltung
-            # Setting: Mindestprozessorzustand
-            $subProcessor = "54533251-82be-4824-96c1-47b60b740d00"
-            $setMinProc   = "893dee8e-2bef-41e0-89c6-b55d0929964c"
-            powercfg -SETACVALUEINDEX SCHEME_CURRENT $subProcessor $setMinProc 50 | Out-Null
-            powercfg -SETDCVALUEINDEX SCHEME_CURRENT $subProcessor $setMinProc 5  | Out-Null
-
-            # Core Parking
-            Write-Output "• Optimiere Core Parking [AC: 100% | DC: 50%] ..."
-            # Setting: Prozessor-Leerlaufzustand – Minimaler Prozessorzustand für Core-Parking
-            $setCoreParking = "0cc5b647-c1df-4637-891a-dec35c318583"
-            powercfg -SETACVALUEINDEX SCHEME_CURRENT $subProcessor $setCoreParking 100 | Out-Null
-            powercfg -SETDCVALUEINDEX SCHEME_CURRENT $subProcessor $setCoreParking 50  | Out-Null
-
-            # Festplatten-Timeout
-            Write-Output "• Optimiere Festplatten-Timeout [AC: 0 Minuten | DC: 15 Minuten] ..."
-            powercfg -change -disk-timeout-ac 0  | Out-Null
-            powercfg -change -disk-timeout-dc 15 | Out-Null
-
-            # USB selektiver Energiesparmodus
-            Write-Output "• Optimiere USB-Selektivmodus [AC: Aus | DC: Ein] ..."
-            $subUsb    = "2a737441-1930-4402-8d77-b2bebba308a3"
-            $setUsbSel = "48e6b7a6-50f5-4782-a5d4-53bb8f07e226"
-            powercfg -SETACVALUEINDEX SCHEME_CURRENT $subUsb $setUsbSel 0 | Out-Null  # aus
-            powercfg -SETDCVALUEINDEX SCHEME_CURRENT $subUsb $setUsbSel 1 | Out-Null  # ein
-
-            # Monitor- und Standby-Timeout
-            Write-Output "• Optimiere Monitor/Standby-Timeout [AC: 0 Min | DC: 10 Min (Monitor)] ..."
-            powercfg -change -standby-timeout-ac 0  | Out-Null
-            powercfg -change -standby-timeout-dc 0  | Out-Null
-            powercfg -change -monitor-timeout-ac 0  | Out-Null
-            powercfg -change -monitor-timeout-dc 10 | Out-Null
-
-            # Tasten-/Deckel-Aktionen (sub_buttons)
-            $subButtons = "sub_buttons"
-
-            Write-Output "• Optimiere Aktion beim Schließen des Notebook-Deckels [AC/DC: Nichts tun] ..."
-            $lidAction = "5ca83367-6e45-459f-a27b-476b1d01c936"
-            powercfg -setdcvalueindex scheme_current $subButtons $lidAction 0 | Out-Null
-            powercfg -setacvalueindex scheme_current $subButtons $lidAction 0 | Out-Null
-
-            Write-Output "• Optimiere Schlaftaste [AC/DC: Nichts tun] ..."
-            $sleepAction = "96996bc0-ad50-47ec-923b-6f41874dd9eb"
-            powercfg -setdcvalueindex scheme_current $subButtons $sleepAction 0 | Out-Null
-            powercfg -setacvalueindex scheme_current $subButtons $sleepAction 0 | Out-Null
-
-            Write-Output "• Optimiere Ein-/Ausschalter [AC/DC: Herunterfahren] ..."
-            $powerButton = "7648efa3-dd9c-4e3e-b566-50f929386280"
-            powercfg -setdcvalueindex scheme_current $subButtons $powerButton 3 | Out-Null
-            powercfg -setacvalueindex scheme_current $subButtons $powerButton 3 | Out-Null
-
-            # Optionale weitere Tasten-/UI-Anpassung wie im Original
-            $extraButtons = "a7066653-8d6c-40a8-910e-a1f54b84c7e5"
-            powercfg -setdcvalueindex scheme_current $subButtons $extraButtons 2 | Out-Null
-            powercfg -setacvalueindex scheme_current $subButtons $extraButtons 2 | Out-Null
-
-            # Aktuellen Plan mit allen Änderungen aktiv setzen
-            powercfg /setactive SCHEME_CURRENT | Out-Null
-
-            # Hintergrund-Apps deaktivieren (wie im Originalscript)
-            Write-Output "• Deaktiviere Hintergrundzugriff für ausgewählte Apps ..."
-            $apps = @(
-                "Microsoft.MicrosoftEdge.Stable_8wekyb3d8bbwe",
-                "Microsoft.Microsoft3DViewer_8wekyb3d8bbwe",
-                "Microsoft.WindowsAlarms_8wekyb3d8bbwe",
-                "Microsoft.WindowsCalculator_8wekyb3d8bbwe",
-                "Microsoft.WindowsCamera_8wekyb3d8bbwe",
-                "Microsoft.549981C3F5F10_8wekyb3d8bbwe",
-                "Microsoft.WindowsFeedbackHub_8wekyb3d8bbwe",
-                "Microsoft.GetHelp_8wekyb3d8bbwe",
-                "Microsoft.ZuneMusic_8wekyb3d8bbwe",
-                "microsoft.windowscommunicationsapps_8wekyb3d8bbwe",
-                "Microsoft.WindowsMaps_8wekyb3d8bbwe",
-                "Microsoft.MicrosoftSolitaireCollection_8wekyb3d8bbwe",
-                "Microsoft.WindowsStore_8wekyb3d8bbwe",
-                "Microsoft.ZuneVideo_8wekyb3d8bbwe",
-                "Microsoft.MicrosoftOfficeHub_8wekyb3d8bbwe",
-                "Microsoft.Office.OneNote_8wekyb3d8bbwe",
-                "Microsoft.MSPaint_8wekyb3d8bbwe",
-                "Microsoft.People_8wekyb3d8bbwe",
-                "Microsoft.Windows.Photos_8wekyb3d8bbwe",
-                "windows.immersivecontrolpanel_cw5n1h2txyewy",
-                "Microsoft.SkypeApp_kzf8qxf38zg5c",
-                "Microsoft.ScreenSketch_8wekyb3d8bbwe",
-                "Microsoft.MicrosoftStickyNotes_8wekyb3d8bbwe",
-                "Microsoft.Getstarted_8wekyb3d8bbwe",
-                "Microsoft.WindowsSoundRecorder_8wekyb3d8bbwe",
-                "Microsoft.BingWeather_8wekyb3d8bbwe",
-                "Microsoft.XboxApp_8wekyb3d8bbwe",
-                "Microsoft.YourPhone_8wekyb3d8bbwe",
-                "Microsoft.MixedReality.Portal_8wekyb3d8bbwe",
-                "Microsoft.Xbox.TCUI_8wekyb3d8bbwe"
-            )
-
-            foreach ($app in $apps) {
-                $path = "HKCU:\SOFTWARE\Microsoft\Windows\CurrentVersion\BackgroundAccessApplications\$app"
-                if (!(Test-Path $path)) {
-                    New-Item -Path $path -Force | Out-Null
-                }
-                Set-ItemProperty -Path $path -Name "Disabled"      -Value 1 -Type DWord
-                Set-ItemProperty -Path $path -Name "DisabledByUser" -Value 1 -Type DWord
+            Start-WinRepStep 2 3 "Ruhezustand"
+            $hibernate = (Get-ItemProperty -Path $powerKey -Name HibernateEnabled -ErrorAction SilentlyContinue).HibernateEnabled
+            if ($hibernate -eq 0) {
+                Write-Output "• Ruhezustand ist bereits deaktiviert."
+            } else {
+                Write-Output "• Deaktiviere Ruhezustand ..."
+                powercfg -hibernate off | Out-Null
             }
 
+            # Energieoptionen (CPU, Core Parking, Timeouts, USB, Tasten/Deckel) und
+            # Hintergrund-Apps: Zeilen aus winrep_settings.json, nur Abweichungen schreiben
+            Start-WinRepStep 3 3 "Einstellungen abgleichen"
+            Write-Output "• Energieoptionen und Hintergrund-Apps abgleichen ..."
+            Invoke-WinRepSettings "power_high"
+
             Write-Output ""
             Write-Output "Performance-Optimierung abgeschlossen."
             Write-Output "Hinweis: Einige Einstellungen (Tasten/Deckel) wirken sich v. a. auf Notebooks aus."
+            Send-WinRepResult "ok" "Performance-Optimierung abgeschlossen"
             exit 0
         }
         catch {
@@ -708,6 +765,7 @@ Mainboard
         $bat = Get-CimInstance -ClassName Win32_Battery -ErrorAction SilentlyContinue
         if (-not $bat) {
             Write-Output "Es wurde kein Akku gefunden (Desktop-PC oder kein Akku verbaut)."
+            Send-WinRepResult "skipped" "Kein Akku gefunden"
             exit 0
         }
 
@@ -726,6 +784,9 @@ Mainboard
 
         # Battery-Report erstellen (überschreibt vorhandenen Report)
         $null = powercfg /batteryreport /output "$reportPath" /format HTML 2>$null
+        if (Test-Path $reportPath) {
+            Send-WinRepEvent "artifact" @{ path = $reportPath; kind = "battery_report" }
+        }
 
         # Schnell-Daten aus WMI/WMI ermitteln
         $static = Get-WmiObject -Class "BatteryStaticData" -Namespace "ROOT\WMI" -ErrorAction SilentlyContinue | Select-Object -First 1
@@ -748,6 +809,13 @@ Mainboard
             $health = [math]::Round(($fullCap * 100.0 / $design), 1)
         }
 
+        if ($design)  { Send-WinRepEvent "metric" @{ name = "design_capacity"; value = $design; unit = "mWh" } }
+        if ($fullCap) { Send-WinRepEvent "metric" @{ name = "full_charge_capacity"; value = $fullCap; unit = "mWh" } }
+        if ($health -ne $null) { Send-WinRepEvent "metric" @{ name = "health"; value = $health; unit = "%" } }
+        if ($cycle -and $cycle.CycleCount -ne $null) {
+            Send-WinRepEvent "metric" @{ name = "cycle_count"; value = $cycle.CycleCount; unit = "" }
+        }
+
         Write-Output "Schnellübersicht Akkuzustand:"
         if ($design)  { Write-Output ("  Designkapazität:        {0} mWh" -f $design) }
         if ($fullCap) { Write-Output ("  Volle Ladekapazität:    {0} mWh" -f $fullCap) }
@@ -769,6 +837,9 @@ Mainboard
             }
 
             Write-Output ("  Bewertung:              {0}" -f $rating)
+            if ($health -lt 65) {
+                Send-WinRepEvent "warning" @{ message = "Akkugesundheit $health % – Akkutausch empfohlen" }
+            }
         }
 
         if ($cycle -and $cycle.CycleCount -ne $null) {
@@ -780,6 +851,9 @@ Mainboard
         Write-Output "Der vollständige Windows-Batteriereport wurde auf dem Desktop gespeichert:"
         Write-Output "  $reportPath"
 
+        if ($health -ne $null) {
+            Send-WinRepResult "ok" ("Akkugesundheit {0} %" -f $health)
+        }
         exit 0
     }
     catch {
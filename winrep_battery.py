@@ -0,0 +1,448 @@
+"""
+Auswertung des Windows-Batteriereports (``powercfg /batteryreport``).
+
+``battery_info`` legt ``CLS-BatteryReport.html`` auf dem Desktop ab. Der
+Report wird hier in Blöcken gelesen und an den Tabellengrenzen zerlegt –
+ohne DOM, es liegt immer nur die gerade offene Tabelle im Speicher.
+Ausgewertet werden drei Tabellen:
+
+    - Installierte Akkus (Design- und volle Ladekapazität, Ladezyklen)
+    - Kapazitätsverlauf (volle Ladekapazität je Zeitraum)
+    - Nutzungsverlauf (Akku-/Netzbetrieb je Zeitraum)
+
+Tabellen werden an ihrem Aufbau erkannt (Datum + zwei mWh-Werte für den
+Kapazitätsverlauf), Überschriften nur wo nötig – englische und deutsche
+Reports funktionieren gleichermaßen. Aus dem Kapazitätsverlauf ergibt
+eine lineare Regression den Verlust in Prozentpunkten je Monat und die
+voraussichtliche Zeit bis 65 % Akkugesundheit (Schwelle für „kritisch“
+in ``battery_info``).
+
+Funktioniert mit jeder gespeicherten Reportdatei (auch unter Linux):
+``winrep.py battery CLS-BatteryReport.html``.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BATTERY_ACTION = "battery_info"
+BATTERY_ARTIFACT = "battery_report"
+BATTERY_THRESHOLD = 65.0           # % – ab hier bewertet battery_info als „kritisch“
+BATTERY_WARN_MONTHS = 6.0          # Hinweis, wenn die Schwelle früher erreicht wird
+TREND_WINDOW_DAYS = 365            # Regression über das letzte Jahr …
+TREND_MIN_POINTS = 4               # … sofern dort genug Messpunkte liegen
+DAYS_PER_MONTH = 30.44
+READ_CHUNK = 256 * 1024
+TABLE_PROBE_ROWS = 12              # so viele Zeilen entscheiden, ob eine Tabelle gebraucht wird
+
+_RE_DATE = re.compile(r"(\d{4})-(\d\d)-(\d\d)|(\d\d)\.(\d\d)\.(\d{4})")
+_RE_MWH = re.compile(r"^([\d.,\s  ]+)\s*mWh$", re.IGNORECASE)
+_RE_DURATION = re.compile(r"^(?:(\d+):)?(\d+):(\d\d):(\d\d)$")
+
+_RE_TABLE_START = re.compile(r"<table\b[^>]*>", re.IGNORECASE)
+_RE_TABLE_END = re.compile(r"</table\s*>", re.IGNORECASE)
+_RE_SKIP = re.compile(r"<(script|style)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_RE_HEADING = re.compile(r"<h[12]\b[^>]*>(.*?)</h[12]\s*>", re.IGNORECASE | re.DOTALL)
+_RE_ROW = re.compile(r"<tr\b[^>]*>(.*?)</tr\s*>", re.IGNORECASE | re.DOTALL)
+_RE_CELL = re.compile(r"<t[dh]\b[^>]*>(.*?)</t[dh]\s*>", re.IGNORECASE | re.DOTALL)
+_RE_TAG = re.compile(r"<[^>]*>")
+
+_BATTERY_HEADINGS = ("installed batter", "installierte akkus", "installierte batterie")
+_USAGE_HEADINGS = ("usage history", "nutzungsverlauf", "verwendungsverlauf")
+# Tabellenzeilen der installierten Akkus (Beschriftung in Großbuchstaben)
+_LABELS: Dict[str, Tuple[str, ...]] = {
+    "name": ("NAME",),
+    "manufacturer": ("MANUFACTURER", "HERSTELLER"),
+    "chemistry": ("CHEMISTRY", "CHEMIE"),
+    "design": ("DESIGN CAPACITY", "AUSLEGUNGSKAPAZITÄT", "ENTWURFSKAPAZITÄT"),
+    "full": ("FULL CHARGE CAPACITY", "KAPAZITÄT BEI VOLLER LADUNG", "KAPAZITÄT BEI VOLLSTÄNDIGER AUFLADUNG"),
+    "cycles": ("CYCLE COUNT", "ZYKLUSANZAHL", "ANZAHL DER ZYKLEN", "LADEZYKLEN"),
+}
+
+
+# =============================================================================
+# Modell
+# =============================================================================
+
+@dataclass
+class BatteryInfo:
+    name: str = ""
+    manufacturer: str = ""
+    chemistry: str = ""
+    design_mwh: int = 0
+    full_mwh: int = 0
+    cycle_count: int | None = None
+
+    @property
+    def health(self) -> float | None:
+        return 100.0 * self.full_mwh / self.design_mwh if self.design_mwh and self.full_mwh else None
+
+
+@dataclass
+class CapacityPoint:
+    start: date
+    end: date
+    full_mwh: int
+    design_mwh: int
+
+    @property
+    def health(self) -> float:
+        return 100.0 * self.full_mwh / self.design_mwh
+
+
+@dataclass
+class UsagePeriod:
+    start: date
+    end: date
+    battery_s: int                  # aktiv + Connected Standby
+    ac_s: int
+
+
+@dataclass
+class BatteryTrend:
+    health: float | None            # aktuell, %
+    loss_per_month: float | None    # Prozentpunkte je Monat (positiv = Verlust)
+    months_to_threshold: float | None
+    points: int = 0                 # Messpunkte in der Regression
+    span_days: int = 0              # Zeitraum der Regression
+    history_days: int = 0           # gesamter Kapazitätsverlauf
+
+    def format_text(self) -> str:
+        if self.health is None:
+            return "Keine Kapazitätsdaten im Batteriereport."
+        lines = [f"Akkugesundheit {self.health:.1f} %"]
+        if self.loss_per_month is None:
+            lines.append(f"  Zu wenig Verlauf für eine Prognose ({self.points} Messpunkte).")
+            return "\n".join(lines)
+        lines.append(f"  Kapazitätsverlust: {self.loss_per_month:.2f} %-Punkte/Monat "
+                     f"({self.points} Messpunkte über {self.span_days} Tage)")
+        if self.months_to_threshold is None:
+            lines.append(f"  Kein messbarer Verlust – {BATTERY_THRESHOLD:.0f} % nicht absehbar.")
+        elif self.months_to_threshold <= 0:
+            lines.append(f"  {BATTERY_THRESHOLD:.0f} % bereits unterschritten.")
+        else:
+            lines.append(f"  {BATTERY_THRESHOLD:.0f} % voraussichtlich in ~{self.months_to_threshold:.0f} Monaten.")
+        return "\n".join(lines)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "health": None if self.health is None else round(self.health, 1),
+            "loss_per_month": None if self.loss_per_month is None else round(self.loss_per_month, 3),
+            "months_to_threshold": None if self.months_to_threshold is None else round(self.months_to_threshold, 1),
+            "threshold": BATTERY_THRESHOLD,
+            "points": self.points,
+            "span_days": self.span_days,
+            "history_days": self.history_days,
+        }
+
+
+@dataclass
+class BatteryReport:
+    path: str
+    batteries: List[BatteryInfo] = field(default_factory=list)
+    capacity: List[CapacityPoint] = field(default_factory=list)
+    usage: List[UsagePeriod] = field(default_factory=list)
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def health(self) -> float | None:
+        """Aktuell: aus den installierten Akkus (Summe), sonst letzter Verlaufspunkt."""
+        design = sum(b.design_mwh for b in self.batteries if b.full_mwh)
+        full = sum(b.full_mwh for b in self.batteries if b.design_mwh)
+        if design and full:
+            return 100.0 * full / design
+        return self.capacity[-1].health if self.capacity else None
+
+    def trend(self) -> BatteryTrend:
+        points = self.capacity
+        health = self.health
+        history_days = (points[-1].end - points[0].start).days if points else 0
+        if points:
+            cutoff = points[-1].end.toordinal() - TREND_WINDOW_DAYS
+            recent = [p for p in points if p.end.toordinal() >= cutoff]
+            if len(recent) >= TREND_MIN_POINTS:
+                points = recent
+        if len(points) < TREND_MIN_POINTS or points[-1].end == points[0].end:
+            return BatteryTrend(health, None, None, len(points), 0, history_days)
+        slope = _slope([(p.end.toordinal(), p.health) for p in points]) * DAYS_PER_MONTH
+        loss = -slope
+        if health is not None and health <= BATTERY_THRESHOLD:
+            months = 0.0
+        elif health is None or loss <= 0.01:
+            months = None
+        else:
+            months = (health - BATTERY_THRESHOLD) / loss
+        return BatteryTrend(health, loss, months, len(points), (points[-1].end - points[0].end).days, history_days)
+
+    def usage_totals(self) -> Tuple[float, float]:
+        """(Stunden auf Akku, Stunden am Netz) über den gesamten Nutzungsverlauf."""
+        return (sum(u.battery_s for u in self.usage) / 3600.0, sum(u.ac_s for u in self.usage) / 3600.0)
+
+    def format_text(self) -> str:
+        lines = [f"{Path(self.path).name}: {self.bytes / 1024:.0f} KB in {self.seconds:.2f} s"]
+        for b in self.batteries:
+            cycles = f", {b.cycle_count} Zyklen" if b.cycle_count is not None else ""
+            lines.append(f"  {b.name or 'Akku'} ({b.manufacturer or '?'}): {b.full_mwh} / {b.design_mwh} mWh{cycles}")
+        lines.extend("  " + line for line in self.trend().format_text().splitlines())
+        if self.usage:
+            battery_h, ac_h = self.usage_totals()
+            lines.append(f"  Nutzung ({len(self.usage)} Zeiträume): {battery_h:.0f} h Akku, {ac_h:.0f} h Netz")
+        return "\n".join(lines)
+
+    def as_dict(self) -> Dict[str, object]:
+        battery_h, ac_h = self.usage_totals()
+        return {
+            "path": self.path,
+            "seconds": round(self.seconds, 3),
+            "batteries": [b.__dict__ for b in self.batteries],
+            "capacity_points": len(self.capacity),
+            "usage_periods": len(self.usage),
+            "battery_hours": round(battery_h, 1),
+            "ac_hours": round(ac_h, 1),
+            **self.trend().as_dict(),
+        }
+
+
+def _slope(xy: List[Tuple[float, float]]) -> float:
+    """Steigung der Regressionsgeraden (kleinste Quadrate)."""
+    n = len(xy)
+    mx = sum(x for x, _ in xy) / n
+    my = sum(y for _, y in xy) / n
+    sxx = sum((x - mx) ** 2 for x, _ in xy)
+    return sum((x - mx) * (y - my) for x, y in xy) / sxx if sxx else 0.0
+
+
+# =============================================================================
+# Parser
+# =============================================================================
+
+def _dates(text: str) -> List[date]:
+    out = []
+    for m in _RE_DATE.finditer(text):
+        try:
+            if m.group(1):
+                out.append(date(int(m.group(1)), int(m.group(2)), int(m.group(3))))
+            else:
+                out.append(date(int(m.group(6)), int(m.group(5)), int(m.group(4))))
+        except ValueError:
+            pass
+    return out
+
+
+def _mwh(text: str) -> int | None:
+    m = _RE_MWH.match(text)
+    if not m:
+        return None
+    digits = re.sub(r"\D", "", m.group(1))
+    return int(digits) if digits else None
+
+
+def _duration(text: str) -> int:
+    m = _RE_DURATION.match(text)
+    if not m:
+        return 0   # "-" = keine Nutzung
+    days, h, mi, s = (int(g or 0) for g in m.groups())
+    return ((days * 24 + h) * 60 + mi) * 60 + s
+
+
+class _TableStream:
+    """
+    Schneidet den Text an ``</table>`` in Abschnitte (Überschriften + eine
+    Tabelle) und wertet jede Tabelle sofort aus. Offen bleibt nur das
+    Stück nach der letzten vollständigen Tabelle. Reguläre Ausdrücke statt
+    ``html.parser``: der Report ist maschinell erzeugt und flach, und die
+    „Letzte Nutzung“-Tabelle hat oft Zehntausende Zeilen.
+    """
+
+    def __init__(self, report: BatteryReport):
+        self.report = report
+        self.heading = ""
+        self._buf = ""
+
+    def feed(self, text: str):
+        buf = self._buf + text
+        pos = 0
+        while True:
+            m = _RE_TABLE_END.search(buf, pos)
+            if m is None:
+                break
+            self._on_section(buf[pos:m.end()])
+            pos = m.end()
+        self._buf = buf[pos:]
+
+    def close(self):
+        self._on_section(self._buf)
+        self._buf = ""
+
+    def _on_section(self, section: str):
+        section = _RE_SKIP.sub("", section)
+        start = _RE_TABLE_START.search(section)
+        head = section if start is None else section[:start.start()]
+        headings = _RE_HEADING.findall(head)
+        if headings:
+            self.heading = " ".join(_text(headings[-1]).split()).lower()
+        if start is None:
+            return
+        rows = _RE_ROW.finditer(section, start.end())
+        probe = _cells(rows, TABLE_PROBE_ROWS)
+        kind = self._classify(probe)
+        if kind is None:
+            return   # z. B. „Letzte Nutzung“ – Rest der Tabelle gar nicht erst zerlegen
+        table = probe + _cells(rows)
+        if kind == "batteries":
+            self.report.batteries.extend(_parse_batteries(table))
+        elif kind == "capacity":
+            self.report.capacity.extend(_parse_capacity(table))
+        else:
+            self.report.usage.extend(_parse_usage(table))
+
+    def _classify(self, probe: List[List[str]]) -> str | None:
+        """Einordnung anhand der ersten Zeilen (Kopfzeilen inklusive)."""
+        if any(h in self.heading for h in _BATTERY_HEADINGS) or _looks_like_batteries(probe):
+            return "batteries"
+        if _parse_capacity(probe):
+            return "capacity"
+        if any(h in self.heading for h in _USAGE_HEADINGS):
+            return "usage"
+        return None
+
+
+def _cells(rows, limit: int | None = None) -> List[List[str]]:
+    out = []
+    for m in rows:
+        cells = [_text(c) for c in _RE_CELL.findall(m.group(1))]
+        if cells:
+            out.append(cells)
+            if limit is not None and len(out) >= limit:
+                break
+    return out
+
+
+def _text(fragment: str) -> str:
+    if "<" not in fragment and "&" not in fragment:
+        return " ".join(fragment.split())
+    return " ".join(html.unescape(_RE_TAG.sub(" ", fragment)).split())
+
+
+def _label_key(label: str) -> str | None:
+    label = label.upper()
+    for key, names in _LABELS.items():
+        if label in names:
+            return key
+    return None
+
+
+def _looks_like_batteries(rows: List[List[str]]) -> bool:
+    return any(len(r) >= 2 and _label_key(r[0]) == "design" for r in rows)
+
+
+def _parse_batteries(rows: List[List[str]]) -> List[BatteryInfo]:
+    """Je Akku eine Spalte; unbekannte Beschriftungen: erste zwei mWh-Zeilen = Design / voll."""
+    columns = max((len(r) for r in rows), default=1) - 1
+    batteries = [BatteryInfo() for _ in range(columns)]
+    unlabeled_mwh = 0
+    for row in rows:
+        if len(row) < 2:
+            continue
+        key = _label_key(row[0])
+        if key is None and _mwh(row[1]) is not None and not _dates(row[0]):
+            key = ("design", "full")[unlabeled_mwh] if unlabeled_mwh < 2 else None
+            unlabeled_mwh += 1
+        if key is None:
+            continue
+        for b, value in zip(batteries, row[1:]):
+            if key in ("design", "full"):
+                setattr(b, f"{key}_mwh", _mwh(value) or 0)
+            elif key == "cycles":
+                digits = re.sub(r"\D", "", value)
+                b.cycle_count = int(digits) if digits else None
+            else:
+                setattr(b, key, value)
+    return [b for b in batteries if b.design_mwh or b.full_mwh]
+
+
+def _parse_capacity(rows: List[List[str]]) -> List[CapacityPoint]:
+    points = []
+    for row in rows:
+        if len(row) != 3:
+            continue
+        days = _dates(row[0])
+        full, design = _mwh(row[1]), _mwh(row[2])
+        if not days or full is None or design is None:
+            continue
+        if full and design and full <= 1.2 * design:   # 0 = keine Messung; Ausreißer nach Kalibrierung
+            points.append(CapacityPoint(days[0], days[-1], full, design))
+    return points
+
+
+def _parse_usage(rows: List[List[str]]) -> List[UsagePeriod]:
+    periods = []
+    for row in rows:
+        if len(row) != 5:
+            continue
+        days = _dates(row[0])
+        if not days:
+            continue
+        battery_s = _duration(row[1]) + _duration(row[2])
+        ac_s = _duration(row[3]) + _duration(row[4])
+        periods.append(UsagePeriod(days[0], days[-1], battery_s, ac_s))
+    return periods
+
+
+def parse_report(path: Path) -> BatteryReport:
+    """Report blockweise einlesen; nur die drei Tabellen werden behalten."""
+    t0 = time.perf_counter()
+    report = BatteryReport(str(path))
+    parser = _TableStream(report)
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            report.bytes += len(chunk)
+            parser.feed(chunk)
+    parser.close()
+    report.capacity.sort(key=lambda p: p.end)
+    report.usage.sort(key=lambda u: u.end)
+    report.seconds = time.perf_counter() - t0
+    return report
+
+
+# =============================================================================
+# Anbindung an den Lauf
+# =============================================================================
+
+def analyze_battery_report(report) -> BatteryReport | None:
+    """
+    Nach ``battery_info``: den abgelegten Report auswerten und Ergebnis als
+    Metriken, Diagnose und ggf. Hinweis an den ``ActionReport`` hängen.
+    """
+    if report.action != BATTERY_ACTION:
+        return None
+    path = next((a["path"] for a in report.artifacts if a.get("kind") == BATTERY_ARTIFACT), None)
+    if path is None or not Path(path).is_file():
+        return None
+    try:
+        parsed = parse_report(Path(path))
+    except OSError:
+        return None
+    trend = parsed.trend()
+    if trend.loss_per_month is not None:
+        report.metrics["capacity_loss_per_month"] = {"value": round(trend.loss_per_month, 3), "unit": "%/Monat"}
+    if trend.months_to_threshold is not None:
+        report.metrics["months_to_65"] = {"value": round(trend.months_to_threshold, 1), "unit": "Monate"}
+    if parsed.capacity:
+        report.metrics["capacity_history_days"] = {"value": trend.history_days, "unit": "d"}
+    if trend.months_to_threshold is not None and 0 < trend.months_to_threshold < BATTERY_WARN_MONTHS:
+        report.warnings.append(
+            f"Akku erreicht voraussichtlich in ~{trend.months_to_threshold:.0f} Monaten {BATTERY_THRESHOLD:.0f} %"
+        )
+    report.diagnostics.append({"kind": BATTERY_ARTIFACT, **parsed.as_dict()})
+    return parsed
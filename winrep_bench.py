@@ -0,0 +1,368 @@
+"""
+Benchmarks für SD TechTools.
+
+    python winrep_bench.py category-switch --actions 14 56 224
+    python winrep_bench.py record sfc_scannow dism_restorehealth --sysinfo --out rec\
+    python winrep_bench.py synth --out rec/
+    python winrep_bench.py replay --dir rec/ --speed 1 10 0 [--headless]
+
+``category-switch`` misst, wie lange ein Kategoriewechsel in der Aktionsliste
+dauert, abhängig von der Anzahl Aktionen (synthetische Einträge werden nur im
+Benchmark-Prozess in ``ACTIONS`` ergänzt).
+
+``record`` zeichnet echte Ausgaben auf (nur Windows), ``synth`` erzeugt
+nachgebildete Aufnahmen. ``replay`` spielt sie über den Wiedergabe-Host aus
+``winrep_replay`` durch ``_run_ps1_action``/``_run_powershell`` der GUI ab
+(Geschwindigkeit 0 = so schnell wie möglich) und misst Zeilen/s, Verzögerung
+der Tk-Ereignisschleife und Arbeitsspeicher. ``--headless`` nimmt stattdessen
+den CLI-Pfad ohne Tk. GUI-Benchmarks benötigen eine grafische Sitzung.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from winrep_core import ACTION_ORDER, ACTIONS, WinRepAction, run_ps1_action
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _inflate_actions(total: int):
+    """Ergänzt synthetische Aktionen, bis ``total`` Einträge existieren."""
+    categories = sorted({a.category for a in ACTIONS.values()})
+    i = 0
+    while len(ACTIONS) < total:
+        key = f"bench_{i:04d}"
+        ACTIONS[key] = WinRepAction(
+            key,
+            f"Benchmark-Aktion {i}",
+            "Synthetischer Eintrag für den Kategorie-Benchmark.",
+            categories[i % len(categories)],
+        )
+        ACTION_ORDER.append(key)
+        i += 1
+
+
+def _reset_actions(original: Dict[str, WinRepAction], order: List[str]):
+    ACTIONS.clear()
+    ACTIONS.update(original)
+    ACTION_ORDER[:] = order
+
+
+# =============================================================================
+# Kategoriewechsel
+# =============================================================================
+
+def bench_category_switch(action_counts: List[int], repeats: int) -> List[dict]:
+    from winrep_gui import WinRepApp
+
+    original, order = dict(ACTIONS), list(ACTION_ORDER)
+    results = []
+    for count in action_counts:
+        _inflate_actions(count)
+        app = WinRepApp()
+        try:
+            app.update()
+            cats = [b.cget("text") for b in app.cat_buttons]
+
+            t0 = time.perf_counter()
+            app._render_action_list()
+            app.update_idletasks()
+            first_ms = (time.perf_counter() - t0) * 1000
+
+            samples = []
+            for _ in range(repeats):
+                for cat in cats:
+                    t0 = time.perf_counter()
+                    app._set_category(cat)
+                    app.update_idletasks()
+                    samples.append((time.perf_counter() - t0) * 1000)
+
+            results.append({
+                "actions": len(ACTIONS),
+                "first_render_ms": round(first_ms, 2),
+                "switch_p50_ms": round(statistics.median(samples), 2),
+                "switch_p95_ms": round(_percentile(samples, 95), 2),
+                "switch_max_ms": round(max(samples), 2),
+                "rows_built": len(app.rows),
+            })
+        finally:
+            app.destroy()
+            _reset_actions(original, order)
+    return results
+
+
+# =============================================================================
+# Aufnahme / Wiedergabe
+# =============================================================================
+
+def bench_record(keys: List[str], out_dir: Path, sysinfo: bool) -> List[dict]:
+    """Zeichnet echte Ausgaben über warme PowerShell-Hosts auf (Windows)."""
+    from winrep_pshost import PSHostPool
+    from winrep_replay import Recorder
+    from winrep_sysinfo import PROBES
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pool = PSHostPool(warm=0, max_size=1)
+    rows = []
+    try:
+        for key in keys:
+            rec = Recorder(action=key, encoding=pool.launcher.encoding)
+            recording = rec.finish(run_ps1_action(pool, ACTIONS[key], on_output=rec.capture))
+            recording.save(out_dir / f"{key}.jsonl")
+            rows.append(_recording_row(recording))
+        if sysinfo:
+            for probe in PROBES:
+                rec = Recorder(script=probe.script, encoding=pool.launcher.encoding)
+                recording = rec.finish(pool.run(probe.script, on_output=rec.capture, timeout=probe.timeout))
+                recording.save(out_dir / f"probe-{probe.key}.jsonl")
+                rows.append(_recording_row(recording))
+    finally:
+        pool.close()
+    return rows
+
+
+def bench_synth(out_dir: Path, flood_lines: int, seconds: float) -> List[dict]:
+    from winrep_replay import synthetic_probe_recordings, synthetic_recordings
+    from winrep_sysinfo import PROBES
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows = []
+    for rec in synthetic_recordings(flood_lines, seconds):
+        rec.save(out_dir / f"{rec.action}.jsonl")
+        rows.append(_recording_row(rec))
+    for probe, rec in zip(PROBES, synthetic_probe_recordings(PROBES)):
+        rec.save(out_dir / f"probe-{probe.key}.jsonl")
+        rows.append(_recording_row(rec))
+    return rows
+
+
+def _recording_row(rec) -> dict:
+    return {
+        "recording": rec.name,
+        "events": len(rec.events),
+        "lines": rec.lines,
+        "chars": rec.chars,
+        "duration_s": round(rec.duration, 2),
+        "returncode": rec.returncode,
+    }
+
+
+class LoopLagMonitor:
+    """Misst, wie verspätet ein ``after()``-Tick im Tk-Mainloop drankommt."""
+
+    def __init__(self, widget, interval_ms: int = 10):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.samples: List[float] = []
+        self._due = 0.0
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self._due = time.perf_counter() + self.interval_ms / 1000
+        self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        self._running = False
+
+    def take(self) -> List[float]:
+        samples, self.samples = self.samples, []
+        return samples
+
+    def _tick(self):
+        if not self._running:
+            return
+        now = time.perf_counter()
+        self.samples.append(max(0.0, (now - self._due) * 1000))
+        self._due = now + self.interval_ms / 1000
+        self.widget.after(self.interval_ms, self._tick)
+
+
+def _replay_row(speed: float, key: str, rec, seconds: float, lag: List[float] | None, counters, rss: int) -> dict:
+    return {
+        "speed": f"x{speed:g}" if speed else "max",
+        "action": key,
+        "lines": rec.lines if rec is not None else 0,
+        "wall_s": round(seconds, 2),
+        "lines_per_s": round(rec.lines / seconds) if rec is not None and seconds > 0 else 0,
+        "lag_p50_ms": round(statistics.median(lag), 1) if lag else "-",
+        "lag_p95_ms": round(_percentile(lag, 95), 1) if lag else "-",
+        "lag_max_ms": round(max(lag), 1) if lag else "-",
+        "log_latency_max_ms": round(counters.max_latency_ms, 1),
+        "cr_collapsed": counters.cr_collapsed,
+        "rss_peak_mb": round(rss / (1024 * 1024), 1),
+    }
+
+
+def bench_replay_gui(directory: Path, keys: List[str], speed: float) -> List[dict]:
+    from winrep_gui import WinRepApp
+    from winrep_log import LogCounters
+    from winrep_metrics import MemorySampler
+    from winrep_replay import load_recordings, replay_launcher
+
+    by_action, _ = load_recordings(directory)
+    app = WinRepApp(host_launcher=replay_launcher(directory, speed))
+    lag = LoopLagMonitor(app)
+    rows = []
+
+    def wait_until(done):
+        def poll():
+            if done():
+                app.quit()
+            else:
+                app.after(20, poll)
+
+        app.after(20, poll)
+        app.mainloop()
+
+    try:
+        lag.start()
+        with MemorySampler(os.getpid()) as mem:
+            t0 = time.perf_counter()
+            wait_until(lambda: "sysinfo_filled" in app.startup.marks)
+            counters = app.log_pipeline.counters
+            rows.append(_replay_row(speed, "(startup)", None, time.perf_counter() - t0, lag.take(), counters, mem.peak))
+
+        for key in keys:
+            app.log_pipeline.counters = LogCounters()
+            finished = threading.Event()
+
+            def worker(action=ACTIONS[key]):
+                try:
+                    app._run_ps1_action(action)
+                finally:
+                    finished.set()
+
+            with MemorySampler(os.getpid()) as mem:
+                t0 = time.perf_counter()
+                threading.Thread(target=worker, daemon=True).start()
+                wait_until(lambda: finished.is_set() and not app.log_pipeline.pending)
+                seconds = time.perf_counter() - t0
+            rows.append(_replay_row(speed, key, by_action.get(key), seconds, lag.take(), app.log_pipeline.counters, mem.peak))
+    finally:
+        lag.stop()
+        app.destroy()
+    return rows
+
+
+def bench_replay_headless(directory: Path, keys: List[str], speed: float) -> List[dict]:
+    """Wie ``bench_replay_gui``, aber über den CLI-Pfad – ohne Tk, daher ohne Lag-Messung."""
+    from winrep_log import LOG_FRAME_MS, LogPipeline
+    from winrep_metrics import MemorySampler
+    from winrep_pshost import PSHostPool
+    from winrep_replay import load_recordings, replay_launcher
+    from winrep_sysinfo import run_probes
+
+    by_action, _ = load_recordings(directory)
+    pool = PSHostPool(replay_launcher(directory, speed), warm=1, max_size=4)
+    rows = []
+    try:
+        with MemorySampler(os.getpid()) as mem:
+            t0 = time.perf_counter()
+            run_probes(lambda ps, timeout: pool.run(ps, timeout=timeout).output, lambda res: None)
+            rows.append(_replay_row(speed, "(sysinfo)", None, time.perf_counter() - t0, None, LogPipeline().counters, mem.peak))
+
+        for key in keys:
+            pipeline = LogPipeline()
+            stop = threading.Event()
+
+            def drainer():
+                # Ersatz für den GUI-Takt: alle LOG_FRAME_MS einen Frame abholen
+                while not stop.is_set() or pipeline.pending:
+                    t_frame = time.perf_counter()
+                    pipeline.drain()
+                    pipeline.record_frame(time.perf_counter() - t_frame)
+                    time.sleep(LOG_FRAME_MS / 1000)
+
+            with MemorySampler(os.getpid()) as mem:
+                t0 = time.perf_counter()
+                thread = threading.Thread(target=drainer, daemon=True)
+                thread.start()
+                run_ps1_action(pool, ACTIONS[key], on_output=pipeline.push, sample_memory=False)
+                stop.set()
+                thread.join()
+                seconds = time.perf_counter() - t0
+            rows.append(_replay_row(speed, key, by_action.get(key), seconds, None, pipeline.counters, mem.peak))
+    finally:
+        pool.close()
+    return rows
+
+
+def _print_table(rows: List[dict]):
+    if not rows:
+        return
+    cols = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    print("  ".join(c.rjust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r[c]).rjust(widths[c]) for c in cols))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="winrep_bench", description="SD TechTools Benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_cat = sub.add_parser("category-switch", help="Kategoriewechsel in der Aktionsliste")
+    p_cat.add_argument("--actions", type=int, nargs="+", default=[len(ACTIONS), 56, 224])
+    p_cat.add_argument("--repeats", type=int, default=10)
+
+    p_rec = sub.add_parser("record", help="echte Ausgaben aufzeichnen (Windows)")
+    p_rec.add_argument("actions", nargs="*", metavar="ACTION")
+    p_rec.add_argument("--sysinfo", action="store_true", help="auch die Systeminfo-Abfragen aufzeichnen")
+    p_rec.add_argument("--out", type=Path, required=True)
+
+    p_synth = sub.add_parser("synth", help="nachgebildete Aufnahmen erzeugen")
+    p_synth.add_argument("--out", type=Path, required=True)
+    p_synth.add_argument("--flood-lines", type=int, default=50_000)
+    p_synth.add_argument("--seconds", type=float, default=30.0, help="Dauer der langen Aufnahmen in Echtzeit")
+
+    p_replay = sub.add_parser("replay", help="Aufnahmen abspielen und messen")
+    p_replay.add_argument("--dir", type=Path, required=True)
+    p_replay.add_argument("--speed", type=float, nargs="+", default=[10.0, 0.0], help="1 = Echtzeit, 0 = max.")
+    p_replay.add_argument("--actions", nargs="+", help="Standard: alle aufgezeichneten Aktionen")
+    p_replay.add_argument("--headless", action="store_true", help="CLI-Pfad ohne Tk")
+
+    args = parser.parse_args(argv)
+
+    # Benchmarks schreiben Caches/Logs in einen Wegwerf-Ordner
+    os.environ.setdefault("WINREP_DATA_DIR", tempfile.mkdtemp(prefix="winrep-bench-"))
+
+    if args.command == "category-switch":
+        _print_table(bench_category_switch(args.actions, args.repeats))
+    elif args.command == "record":
+        unknown = [k for k in args.actions if k not in ACTIONS]
+        if unknown:
+            parser.error(f"unbekannte Aktion(en): {', '.join(unknown)}")
+        _print_table(bench_record(args.actions, args.out, args.sysinfo))
+    elif args.command == "synth":
+        _print_table(bench_synth(args.out, args.flood_lines, args.seconds))
+    elif args.command == "replay":
+        from winrep_replay import load_recordings
+
+        recorded = load_recordings(args.dir)[0]
+        keys = args.actions or [k for k in ACTION_ORDER if k in recorded]
+        bench = bench_replay_headless if args.headless else bench_replay_gui
+        rows = []
+        for speed in args.speed:
+            rows.extend(bench(args.dir, keys, speed))
+        _print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
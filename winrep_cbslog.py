@@ -0,0 +1,361 @@
+"""
+Auswertung von CBS.log / dism.log nach fehlgeschlagenen Reparaturen.
+
+Die Logs werden per ``mmap`` gelesen, nie komplett dekodiert. Ein dünner
+Index (Zeitstempel der ersten Zeile je ``INDEX_STRIDE`` Bytes → Offset)
+findet den Beginn des Laufs; ab dort suchen einige Bytes-Regexe mit festem
+Anfang (schnelle Literalsuche, ~1 s/GB je Muster – eine Alternation wäre
+zehnmal langsamer) nur die interessanten Zeilen:
+
+    - beschädigte / reparierte / nicht reparierbare Dateien ([SR]-Zeilen der SFC)
+    - fehlende Reparaturquelle (0x800f081f, 0x800f0906, …)
+    - HRESULTs in Fehler-/Warnzeilen (Häufigkeit, erstes Auftreten)
+
+Funktioniert mit jeder kopierten Logdatei (auch unter Linux); UTF-16-Logs
+werden nicht unterstützt und liefern eine leere Auswertung mit Hinweis.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+INDEX_STRIDE = 4 * 1024 * 1024     # ein Indexeintrag je 4 MB
+TRIAGE_SLACK_S = 5.0               # Zeitstempel im Log sind sekundengenau, Uhr kann leicht abweichen
+TRIAGE_MAX_FILES = 200             # mehr Dateien werden nur gezählt
+TRIAGE_STATUSES_OK = ("ok", "healthy", "skipped")
+
+# Logs, die nach einer Aktion ausgewertet werden
+TRIAGE_LOGS: Dict[str, Tuple[str, ...]] = {
+    "sfc_scannow": ("cbs",),
+    "dism_scanhealth": ("dism", "cbs"),
+    "dism_checkhealth": ("dism",),
+    "dism_restorehealth": ("dism", "cbs"),
+    "dism_componentcleanup": ("dism", "cbs"),
+}
+
+HRESULT_NAMES: Dict[str, str] = {
+    "0x800f081f": "CBS_E_SOURCE_MISSING – Reparaturquelle nicht gefunden",
+    "0x800f0906": "CBS_E_DOWNLOAD_FAILURE – Quelle konnte nicht geladen werden",
+    "0x800f0907": "CBS_E_GROUPPOLICY_DISALLOWED – Download per Gruppenrichtlinie gesperrt",
+    "0x800f0950": "CBS_E_INSTALLERS_FAILED",
+    "0x800f0831": "CBS_E_STORE_CORRUPTION – Paket fehlt im Komponentenspeicher",
+    "0x80073712": "ERROR_SXS_COMPONENT_STORE_CORRUPT",
+    "0x800f0922": "CBS_E_INSTALLERS_FAILED (Systemreservierte Partition / .NET)",
+    "0x80070002": "ERROR_FILE_NOT_FOUND",
+    "0x80070005": "E_ACCESSDENIED",
+    "0x80070020": "ERROR_SHARING_VIOLATION – Datei in Benutzung",
+    "0x800706be": "RPC_S_CALL_FAILED",
+    "0x80004005": "E_FAIL",
+}
+SOURCE_MISSING = ("0x800f081f", "0x800f0906", "0x800f0907")
+
+_RE_TS = re.compile(rb"(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)")
+
+# Je Muster ein Durchlauf über den Rest der Datei; nur Trefferzeilen werden dekodiert
+_INTEREST = (
+    re.compile(rb"\[SR\] "),
+    re.compile(rb"Hashes for file member"),
+    re.compile(rb"ource files could not be found"),
+    re.compile(rb"0x8[0-9A-Fa-f]{7}"),
+)
+_RE_HRESULT = re.compile(r"0x8[0-9A-Fa-f]{7}")
+# [l:..]"datei" bzw. [ml:..]"\??\C:\Windows\System32"\[l:..]"datei"
+_RE_FILE = re.compile(r'\[[lm]l?:[^\]]*\]\s*"([^"]+)"(?:\\(?:\[l:[^\]]*\])?"([^"]+)")?')
+_RE_LEVEL = re.compile(r"^\S+ \S+, (\w+)")
+
+
+def default_log_paths() -> Dict[str, Path]:
+    windir = Path(os.environ.get("WINDIR", r"C:\Windows"))
+    return {
+        "cbs": windir / "Logs" / "CBS" / "CBS.log",
+        "dism": windir / "Logs" / "DISM" / "dism.log",
+    }
+
+
+def _parse_ts(raw: bytes) -> float | None:
+    m = _RE_TS.match(raw)
+    if m is None:
+        return None
+    try:
+        return datetime(*(int(g) for g in m.groups())).timestamp()
+    except ValueError:
+        return None
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+class LogIndex:
+    """Zeitstempel → Byte-Offset, ein Eintrag je ``stride`` Bytes (Zeilenanfang)."""
+
+    def __init__(self, mm, stride: int = INDEX_STRIDE):
+        self.mm = mm
+        self.size = len(mm)
+        self.times: List[float] = []
+        self.offsets: List[int] = []
+        pos = 0
+        while pos < self.size:
+            hit = self._first_stamp(pos, min(self.size, pos + stride))
+            if hit is not None:
+                ts, off = hit
+                if not self.times or ts >= self.times[-1]:
+                    self.times.append(ts)
+                    self.offsets.append(off)
+            pos += stride
+
+    def _first_stamp(self, start: int, end: int) -> Tuple[float, int] | None:
+        """Erste Zeile mit Zeitstempel ab ``start`` (innerhalb von ``end``)."""
+        mm = self.mm
+        pos = start
+        if pos > 0:
+            nl = mm.find(b"\n", pos - 1, end)
+            if nl < 0:
+                return None
+            pos = nl + 1
+        while pos < end:
+            ts = _parse_ts(mm[pos:pos + 19])
+            if ts is not None:
+                return ts, pos
+            nl = mm.find(b"\n", pos, end)
+            if nl < 0:
+                return None
+            pos = nl + 1
+        return None
+
+    def offset_for(self, since: float) -> int:
+        """Offset der ersten Zeile mit Zeitstempel >= ``since`` (Blockanfang + linearer Rest)."""
+        i = bisect_right(self.times, since) - 1
+        if i < 0:
+            return 0
+        pos = self.offsets[i]
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else self.size
+        mm = self.mm
+        while pos < end:
+            ts = _parse_ts(mm[pos:pos + 19])
+            if ts is not None and ts >= since:
+                return pos
+            nl = mm.find(b"\n", pos, end)
+            if nl < 0:
+                break
+            pos = nl + 1
+        return end
+
+
+# =============================================================================
+# Auswertung
+# =============================================================================
+
+@dataclass
+class HresultStat:
+    code: str
+    count: int = 0
+    first_line: str = ""
+
+    @property
+    def name(self) -> str:
+        return HRESULT_NAMES.get(self.code, "")
+
+
+@dataclass
+class LogSummary:
+    path: str
+    kind: str
+    since: float | None = None
+    scanned_bytes: int = 0
+    seconds: float = 0.0
+    first_ts: float | None = None      # erster ausgewerteter Eintrag
+    files: Dict[str, str] = field(default_factory=dict)   # Datei → corrupt/repaired/unrepairable
+    files_truncated: int = 0
+    source_missing: int = 0
+    source_missing_line: str = ""
+    hresults: Dict[str, HresultStat] = field(default_factory=dict)
+    note: str = ""
+
+    @property
+    def unrepairable(self) -> List[str]:
+        return [f for f, state in self.files.items() if state == "unrepairable"]
+
+    @property
+    def repaired(self) -> List[str]:
+        return [f for f, state in self.files.items() if state == "repaired"]
+
+    @property
+    def empty(self) -> bool:
+        return not (self.files or self.source_missing or self.hresults)
+
+    def top_hresults(self, n: int = 5) -> List[HresultStat]:
+        return sorted(self.hresults.values(), key=lambda h: -h.count)[:n]
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "path": self.path,
+            "kind": self.kind,
+            "since": self.since,
+            "scanned_mb": round(self.scanned_bytes / (1024 * 1024), 1),
+            "seconds": round(self.seconds, 3),
+            "unrepairable": self.unrepairable,
+            "repaired": self.repaired,
+            "corrupt": [f for f, state in self.files.items() if state == "corrupt"],
+            "files_truncated": self.files_truncated,
+            "source_missing": self.source_missing,
+            "hresults": [
+                {"code": h.code, "count": h.count, "name": h.name, "first": h.first_line}
+                for h in self.top_hresults(10)
+            ],
+            "note": self.note,
+        }
+
+    def format_text(self) -> str:
+        """Kurzfassung für Log-Fenster und CLI."""
+        head = f"{Path(self.path).name}: {self.scanned_bytes / (1024 * 1024):.0f} MB in {self.seconds:.1f} s"
+        if self.note:
+            return f"{head} – {self.note}"
+        if self.empty:
+            return f"{head} – keine Auffälligkeiten"
+        lines = [head]
+        unrepairable = self.unrepairable
+        if unrepairable:
+            lines.append(f"  Nicht reparierbar ({len(unrepairable)}): " + ", ".join(unrepairable[:10])
+                         + (" …" if len(unrepairable) > 10 else ""))
+        repaired = self.repaired
+        if repaired:
+            lines.append(f"  Repariert ({len(repaired)}): " + ", ".join(repaired[:10])
+                         + (" …" if len(repaired) > 10 else ""))
+        corrupt = [f for f, state in self.files.items() if state == "corrupt"]
+        if corrupt:
+            lines.append(f"  Beschädigt ({len(corrupt)}): " + ", ".join(corrupt[:10])
+                         + (" …" if len(corrupt) > 10 else ""))
+        if self.files_truncated:
+            lines.append(f"  … und {self.files_truncated} weitere Datei-Einträge")
+        if self.source_missing:
+            lines.append(f"  Reparaturquelle fehlt ({self.source_missing}×) – /Source bzw. Windows Update prüfen")
+        for h in self.top_hresults():
+            name = f" {h.name}" if h.name else ""
+            lines.append(f"  {h.code}{name}: {h.count}×")
+        return "\n".join(lines)
+
+
+_FILE_STATES = {"corrupt": 0, "repaired": 1, "unrepairable": 2}   # höherer Zustand gewinnt
+
+
+def _file_name(line: str) -> str | None:
+    m = _RE_FILE.search(line)
+    if m is None:
+        return None
+    if m.group(2):
+        return m.group(2)
+    return m.group(1).rsplit("\\", 1)[-1]
+
+
+def _classify(line: str) -> str | None:
+    if "[SR]" not in line and "Hashes for file member" not in line:
+        return None
+    if "Cannot repair" in line or "Could not reproject" in line:
+        return "unrepairable"
+    if "Repaired file" in line:
+        return "repaired"
+    if "Repairing corrupted" in line or "Hashes for file member" in line:
+        return "corrupt"
+    return None
+
+
+def analyze_log(path: Path, kind: str = "", since: float | None = None) -> LogSummary:
+    """Wertet ``path`` ab ``since`` (Unix-Zeit, lokale Log-Zeitstempel) aus."""
+    t0 = time.perf_counter()
+    summary = LogSummary(str(path), kind or path.stem.lower(), since)
+    try:
+        fh = open(path, "rb")
+    except OSError as exc:
+        summary.note = f"nicht lesbar ({exc.strerror or exc})"
+        return summary
+    with fh:
+        try:
+            size = os.fstat(fh.fileno()).st_size
+            if size == 0:
+                summary.note = "leer"
+                return summary
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            summary.note = f"nicht lesbar ({exc})"
+            return summary
+        try:
+            if mm[:2] in (b"\xff\xfe", b"\xfe\xff"):
+                summary.note = "UTF-16-Log wird nicht unterstützt"
+                return summary
+            start = LogIndex(mm).offset_for(since) if since is not None else 0
+            summary.scanned_bytes = size - start
+            summary.first_ts = _parse_ts(mm[start:start + 19])
+            _scan(mm, start, summary)
+        finally:
+            mm.close()
+    summary.seconds = time.perf_counter() - t0
+    return summary
+
+
+def _scan(mm, start: int, summary: LogSummary):
+    starts = set()   # mehrere Treffer in derselben Zeile nur einmal auswerten
+    for pattern in _INTEREST:
+        for m in pattern.finditer(mm, start):
+            starts.add(mm.rfind(b"\n", 0, m.start()) + 1)
+    for line_start in sorted(starts):
+        line_end = mm.find(b"\n", line_start)
+        if line_end < 0:
+            line_end = len(mm)
+        line = mm[line_start:line_end].decode("utf-8", "replace").rstrip("\r")
+        _take_line(line, summary)
+
+
+def _take_line(line: str, summary: LogSummary):
+    state = _classify(line)
+    if state is not None:
+        name = _file_name(line)
+        if name:
+            old = summary.files.get(name)
+            if old is None and len(summary.files) >= TRIAGE_MAX_FILES:
+                summary.files_truncated += 1
+            elif old is None or _FILE_STATES[state] > _FILE_STATES[old]:
+                summary.files[name] = state
+    codes = {c.lower() for c in _RE_HRESULT.findall(line)}
+    if any(c in SOURCE_MISSING for c in codes) or "ource files could not be found" in line:
+        summary.source_missing += 1
+        if not summary.source_missing_line:
+            summary.source_missing_line = line[:300]
+    if not codes:
+        return
+    level = _RE_LEVEL.match(line)
+    if level is not None and level.group(1) not in ("Error", "Warning") and "fail" not in line.lower():
+        return   # Info-Zeilen mit 0x8… (z. B. Flags) nicht als Fehler zählen
+    for code in codes:
+        stat = summary.hresults.get(code)
+        if stat is None:
+            stat = summary.hresults[code] = HresultStat(code, first_line=line[:300])
+        stat.count += 1
+
+
+def triage(action: str, since: float | None, paths: Dict[str, Path] | None = None) -> List[LogSummary]:
+    """Logs zur Aktion (``TRIAGE_LOGS``) ab Laufbeginn auswerten."""
+    paths = paths or default_log_paths()
+    since = None if since is None else since - TRIAGE_SLACK_S
+    return [analyze_log(paths[kind], kind, since) for kind in TRIAGE_LOGS.get(action, ()) if kind in paths]
+
+
+def needs_triage(action: str, returncode: int | None, status: str | None) -> bool:
+    return action in TRIAGE_LOGS and (returncode != 0 or status not in TRIAGE_STATUSES_OK)
+
+
+def triage_report(report, since: float | None) -> List[LogSummary]:
+    """Nach ``report.finish()``: bei Fehlschlag Logs auswerten und an den Bericht hängen."""
+    if not needs_triage(report.action, report.returncode, report.status):
+        return []
+    summaries = triage(report.action, since)
+    report.diagnostics = [s.as_dict() for s in summaries]
+    return summaries
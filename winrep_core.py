@@ -0,0 +1,345 @@
+"""
+Gemeinsamer Kern von SD TechTools: Aktions-Registry und PS1-Runner.
+
+Bewusst ohne GUI-Abhängigkeiten, damit CLI/Batch-Modus und Benchmarks
+ohne tkinter/customtkinter/PIL starten.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from winrep_pshost import (
+    ALERT_RESUMED,
+    ALERT_SOFT_TIMEOUT,
+    ALERT_STALL,
+    HostResult,
+    PSHostPool,
+    RunControl,
+)
+
+# =============================================================================
+# Basis-Konfiguration
+# =============================================================================
+
+APP_TITLE = "SD TechTools – Windows Repair Toolbox"
+
+CMD_ENCODING = "cp850"   # kannst du für andere Dinge behalten
+PS_ENCODING = "cp850"
+
+ACTIONS_SCRIPT = "winrep_actions.ps1"
+
+
+def resource_path(rel: str) -> str:
+    """Pfad-Helfer (PyInstaller-kompatibel)."""
+    base = getattr(sys, "_MEIPASS", str(Path(__file__).resolve().parent))
+    return str(Path(base) / rel)
+
+
+# =============================================================================
+# Aktionen
+# =============================================================================
+
+# Ressourcenklassen: Aktionen mit gemeinsamer Klasse laufen nacheinander,
+# Aktionen mit disjunkten Klassen dürfen parallel laufen (winrep_scheduler).
+RES_COMPONENT_STORE = "component_store"
+RES_NETWORK = "network"
+RES_DISK = "disk"
+RES_POWER = "power"
+
+RESOURCE_LABELS: Dict[str, str] = {
+    RES_COMPONENT_STORE: "Komponentenspeicher",
+    RES_NETWORK: "Netzwerk",
+    RES_DISK: "Datenträger",
+    RES_POWER: "Energieverwaltung",
+}
+
+
+# Rückgabecodes, die nicht vom Skript stammen (angelehnt an timeout(1)/Shell)
+RC_TIMEOUT = 124
+RC_HOST_CRASHED = 125
+RC_START_FAILED = 126
+RC_SCRIPT_MISSING = 127
+RC_CANCELLED = 130
+
+RETURN_CODE_LABELS: Dict[int, str] = {
+    RC_TIMEOUT: "Zeitlimit überschritten",
+    RC_HOST_CRASHED: "PowerShell-Host abgestürzt",
+    RC_START_FAILED: "PowerShell-Startfehler",
+    RC_SCRIPT_MISSING: "PS1 fehlt",
+    RC_CANCELLED: "abgebrochen",
+}
+
+
+def describe_returncode(rc: int | None) -> str:
+    if rc == 0:
+        return "OK"
+    if rc is None:
+        return "Fehler"
+    if rc in RETURN_CODE_LABELS:
+        return RETURN_CODE_LABELS[rc]
+    return f"Fehlercode {rc}"
+
+
+@dataclass(frozen=True)
+class ActionLimits:
+    """Zeitlimits in Sekunden; None = keine Überwachung."""
+    soft: float | None = None    # Hinweis "dauert ungewöhnlich lange"
+    hard: float | None = None    # Prozessbaum wird beendet (RC_TIMEOUT)
+    stall: float | None = None   # so lange ohne Ausgabe → Hinweis "hängt evtl."
+
+    def control(self, on_alert: Callable[[str, float], None] | None = None) -> RunControl:
+        return RunControl(self.soft, self.hard, self.stall, on_alert=on_alert)
+
+
+def _minutes(soft: float, hard: float, stall: float) -> ActionLimits:
+    return ActionLimits(soft * 60, hard * 60, stall * 60)
+
+
+DEFAULT_LIMITS = _minutes(15, 60, 10)
+
+
+def describe_alert(kind: str, seconds: float) -> str:
+    """Text für Watchdog-Hinweise (Log, Statuszeile, CLI)."""
+    minutes = f"{seconds / 60:.0f} min" if seconds >= 120 else f"{seconds:.0f} s"
+    if kind == ALERT_SOFT_TIMEOUT:
+        return f"läuft bereits {minutes} – ungewöhnlich lange"
+    if kind == ALERT_STALL:
+        return f"seit {minutes} keine Ausgabe – hängt evtl."
+    if kind == ALERT_RESUMED:
+        return "Ausgabe läuft wieder"
+    return kind
+
+
+@dataclass(frozen=True)
+class WinRepAction:
+    key: str
+    title: str
+    description: str
+    category: str
+    ps_command: str | None = None  # nur informativ, Logik liegt in PS1
+    invalidates: Tuple[str, ...] = ()  # Systemübersicht-Felder, die danach neu abgefragt werden
+    confirm: bool = False  # vor dem Start Rückfrage (GUI) bzw. --yes (CLI)
+    resources: Tuple[str, ...] = ()  # Ressourcenklassen (RES_*), leer = läuft immer parallel
+    limits: ActionLimits = DEFAULT_LIMITS  # weich/hart/Stillstand, überschreibbar per limits.json
+
+
+ACTIONS: Dict[str, WinRepAction] = {
+    "dism_scanhealth": WinRepAction(
+        "dism_scanhealth",
+        "Windows Komponentenspeicher auf Fehler prüfen [ScanHealth]",
+        "Prüft den Komponentenstore auf Beschädigungen.",
+        "Systemdateien / DISM",
+        ps_command="DISM /Online /Cleanup-Image /ScanHealth",
+        resources=(RES_COMPONENT_STORE,),
+        limits=_minutes(20, 60, 15),
+    ),
+    "dism_checkhealth": WinRepAction(
+        "dism_checkhealth",
+        "Prüfen, ob Windows als beschädigt markiert ist [CheckHealth]",
+        "Zeigt an, ob Windows als beschädigt markiert wurde.",
+        "Systemdateien / DISM",
+        ps_command="DISM /Online /Cleanup-Image /CheckHealth",
+        resources=(RES_COMPONENT_STORE,),
+        limits=_minutes(2, 10, 5),
+    ),
+    "dism_restorehealth": WinRepAction(
+        "dism_restorehealth",
+        "Automatische Reparaturvorgänge durchführen [RestoreHealth]",
+        "Versucht, beschädigte Dateien zu reparieren.",
+        "Systemdateien / DISM",
+        ps_command="DISM /Online /Cleanup-Image /RestoreHealth",
+        resources=(RES_COMPONENT_STORE, RES_NETWORK),  # lädt ggf. über Windows Update nach
+        limits=_minutes(45, 120, 20),  # bleibt gern lange bei 62,3 % stehen
+    ),
+    "dism_componentcleanup": WinRepAction(
+        "dism_componentcleanup",
+        "Abgelöste Startkomponenten bereinigen [ComponentCleanup]",
+        "Bereinigt den Komponentenstore und entfernt veraltete Komponenten.",
+        "Systemdateien / DISM",
+        ps_command="DISM /Online /Cleanup-Image /StartComponentCleanup",
+        invalidates=("Disk",),
+        resources=(RES_COMPONENT_STORE, RES_DISK),
+        limits=_minutes(30, 120, 20),
+    ),
+    "sfc_scannow": WinRepAction(
+        "sfc_scannow",
+        "Systemdateien prüfen & reparieren [sfc /scannow]",
+        "Prüft Systemdateien und stellt Originale wieder her.",
+        "Systemdateien / DISM",
+        ps_command="sfc /scannow",
+        resources=(RES_COMPONENT_STORE,),
+        limits=_minutes(30, 90, 15),
+    ),
+    "net_reset": WinRepAction(
+        "net_reset",
+        "Netzwerkeinstellungen zurücksetzen [FlushDNS usw.]",
+        "Setzt DNS-Cache, Winsock und wichtige Netzwerk-Stacks zurück.",
+        "Netzwerk",
+        invalidates=("IPv4",),
+        resources=(RES_NETWORK,),
+        limits=_minutes(2, 10, 3),
+    ),
+    "wu_reset": WinRepAction(
+        "wu_reset",
+        "Windows Updates zurücksetzen / Cache bereinigen",
+        "Bereinigt den Update-Cache und setzt Windows Update Komponenten zurück.",
+        "Cleanup / Updates",
+        invalidates=("Disk",),
+        resources=(RES_COMPONENT_STORE, RES_NETWORK, RES_DISK),
+        limits=_minutes(10, 30, 5),
+    ),
+    "temp_cleanup": WinRepAction(
+        "temp_cleanup",
+        "Temporäre Dateien bereinigen",
+        "Löscht TEMP-Ordner & unnötige Dateien.",
+        "Cleanup / Updates",
+        invalidates=("Disk",),
+        resources=(RES_DISK, RES_COMPONENT_STORE),  # cleanmgr "Update Cleanup" = Komponentenspeicher
+        limits=_minutes(15, 45, 10),  # cleanmgr /sagerun gibt nichts aus
+    ),
+    "upgrade_pro": WinRepAction(
+        "upgrade_pro",
+        "Upgrade von Windows Home auf Windows Pro",
+        "Setzt den Product Key für das Upgrade auf Windows Pro.",
+        "Leistung / Tuning",
+        invalidates=("OS",),
+        confirm=True,
+        resources=(RES_COMPONENT_STORE,),
+        limits=_minutes(5, 20, 10),
+    ),
+    "power_high": WinRepAction(
+        "power_high",
+        "Windows Höchstleistungsmodus aktivieren",
+        "Aktiviert den Windows-Höchstleistungsmodus, sofern verfügbar.",
+        "Leistung / Tuning",
+        resources=(RES_POWER,),
+        limits=_minutes(0.5, 2, 1),
+    ),
+    "chkdsk_c": WinRepAction(
+        "chkdsk_c",
+        "Dateisystem von C: prüfen [chkdsk]",
+        "Führt eine Dateisystemprüfung von Laufwerk C: (online /scan) durch.",
+        "Systemdateien / DISM",
+        resources=(RES_DISK,),
+        limits=_minutes(30, 120, 15),
+    ),
+    "bitlocker_disable": WinRepAction(
+        "bitlocker_disable",
+        "BitLocker auf Laufwerk C: deaktivieren",
+        "Deaktiviert BitLocker auf C:. Achtung: Entschlüsselung kann lange dauern!",
+        "Info & Tools",
+        invalidates=("BitLocker",),
+        resources=(RES_DISK,),
+        limits=_minutes(2, 10, 5),
+    ),
+    "battery_info": WinRepAction(
+        "battery_info",
+        "Akkuinformationen anzeigen",
+        "Zeigt Informationen zum Akku (Ladestand, Status usw.), falls vorhanden.",
+        "Info & Tools",
+        resources=(RES_POWER,),
+        limits=_minutes(0.5, 3, 1),
+    ),
+    # läuft ohne PS1 in Python (winrep_inventory)
+    "sysinfo": WinRepAction(
+        "sysinfo",
+        "Systeminformationen anzeigen",
+        "Zeigt ausführliche Systeminformationen an.",
+        "Info & Tools",
+    ),
+    # läuft ohne PS1 in Python (winrep_crashdump)
+    "crash_scan": WinRepAction(
+        "crash_scan",
+        "Abstürze (Bluescreens) auswerten",
+        "Wertet Minidumps und MEMORY.DMP aus: Bugcheck-Codes, Häufigkeit, verursachender Treiber.",
+        "Info & Tools",
+        limits=_minutes(1, 5, 2),
+    ),
+}
+
+ACTION_ORDER: List[str] = [
+    "dism_scanhealth",
+    "dism_checkhealth",
+    "dism_restorehealth",
+    "dism_componentcleanup",
+    "sfc_scannow",
+    "chkdsk_c",
+    "net_reset",
+    "wu_reset",
+    "temp_cleanup",
+    "upgrade_pro",
+    "power_high",
+    "bitlocker_disable",
+    "battery_info",
+    "sysinfo",
+    "crash_scan",
+]
+
+
+def sorted_action_keys(keys: List[str]) -> List[str]:
+    order = {k: i for i, k in enumerate(ACTION_ORDER)}
+    missing = len(ACTION_ORDER) + 1
+    return sorted(keys, key=lambda k: order.get(k, missing))
+
+
+# =============================================================================
+# PS1-Runner
+# =============================================================================
+
+def actions_script_path() -> Path:
+    return Path(resource_path(ACTIONS_SCRIPT))
+
+
+def load_limits(user_file: Path | None = None) -> Dict[str, ActionLimits]:
+    """
+    Zeitlimits je Aktion; ``limits.json`` im Datenordner überschreibt einzelne
+    Werte, z. B. ``{"temp_cleanup": {"hard": 3600, "stall": null}}``.
+    """
+    limits = {key: action.limits for key, action in ACTIONS.items()}
+    if user_file is None:
+        from winrep_paths import app_data_dir
+
+        user_file = app_data_dir() / "limits.json"
+    if not user_file.exists():
+        return limits
+    data = json.loads(user_file.read_text(encoding="utf-8"))
+    for key, raw in data.items():
+        if key not in limits or not isinstance(raw, dict):
+            raise ValueError(f"{user_file.name}: unbekannte Aktion {key!r}")
+        fields = {k: (None if v is None else float(v)) for k, v in raw.items() if k in ("soft", "hard", "stall")}
+        limits[key] = replace(limits[key], **fields)
+    return limits
+
+
+def run_ps1_action(
+    pool: PSHostPool,
+    action: WinRepAction,
+    on_output: Callable[[str], None] | None = None,
+    timeout: float | None = None,
+    sample_memory: bool = True,
+    control: RunControl | None = None,
+) -> HostResult:
+    """
+    Führt eine Aktion über die externe winrep_actions.ps1 in einem warmen Host aus.
+    Wirft FileNotFoundError, wenn die PS1 fehlt, und HostError/OSError, wenn
+    PowerShell nicht startet. Abbruch bzw. hartes Zeitlimit über ``control``
+    liefern RC_CANCELLED bzw. RC_TIMEOUT, ein mitten im Lauf beendeter Host
+    RC_HOST_CRASHED (mit der bis dahin gelesenen Ausgabe).
+    """
+    script_path = actions_script_path()
+    if not script_path.exists():
+        raise FileNotFoundError(str(script_path))
+    ps_cmd = f"& '{script_path}' -Action '{action.key}'"
+    result = pool.run(ps_cmd, on_output=on_output, timeout=timeout, sample_memory=sample_memory, control=control)
+    if result.timed_out:
+        result.returncode = RC_TIMEOUT
+    elif result.cancelled:
+        result.returncode = RC_CANCELLED
+    elif result.crashed:
+        result.returncode = RC_HOST_CRASHED
+    return result
@@ -0,0 +1,457 @@
+"""
+Absturzanalyse: Kernel-Speicherabbilder (Bluescreens) auswerten.
+
+Gelesen werden ``%SystemRoot%\\Minidump\\*.dmp`` und ``%SystemRoot%\\MEMORY.DMP``
+– per ``mmap``, nur die Kopfdaten (4 bzw. 8 KB) und bei Minidumps der
+Triage-Block dahinter. Ein mehrere GB großes MEMORY.DMP wird nie gelesen,
+nur die ersten Seiten werden eingeblendet.
+
+Aus dem Kopf (DUMP_HEADER32/64, Signatur ``PAGEDUMP``/``PAGEDU64``):
+
+    - Bugcheck-Code und die vier Parameter
+    - Zeitpunkt des Absturzes, Laufzeit seit dem Start, Windows-Build
+
+Verursachender Treiber (nur Minidumps, Heuristik wie BlueScreenView): die
+Treiberliste im Triage-Block liefert Adressbereiche; die Ausnahmeadresse,
+dann die Bugcheck-Parameter, dann der gesicherte Stack werden dagegen
+geprüft. Der erste Treiber außerhalb des Kernels gewinnt.
+
+Funktioniert mit kopierten Abbildern und synthetischen Kopfdateien (auch
+unter Linux): ``winrep.py crashes ordner\\*.dmp``.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from winrep_events import ActionReport
+
+CRASHSCAN_ACTION = "crash_scan"
+CRASHSCAN_REPEAT_WARN = 3           # gleicher Bugcheck so oft → Hinweis
+CRASHSCAN_VERBOSE_MAX = 20          # bis zu so vielen Abbildern jedes einzeln auflisten
+
+SIG_KERNEL32 = b"PAGEDUMP"
+SIG_KERNEL64 = b"PAGEDU64"
+SIG_USER = b"MDMP"
+
+# Offsets in DUMP_HEADER64 / DUMP_HEADER32 (wdbgexts.h)
+_HEADER64 = {"size": 0x2000, "bugcheck": 0x38, "params": 0x40, "param_fmt": "<4Q", "build": 0x0C,
+             "cpus": 0x34, "dump_type": 0xF98, "system_time": 0xFA8, "uptime": 0x1030}
+_HEADER32 = {"size": 0x1000, "bugcheck": 0x28, "params": 0x2C, "param_fmt": "<4I", "build": 0x0C,
+             "cpus": 0x24, "dump_type": 0xF88, "system_time": 0xFC0, "uptime": 0xFB8}
+
+DUMP_TYPES = {1: "vollständig", 2: "Kernel", 4: "Minidump", 5: "automatisch", 6: "aktiv"}
+DUMP_TYPE_TRIAGE = 4
+
+# Treibereinträge im Triage-Block: DriverNameOffset + KLDR_DATA_TABLE_ENTRY,
+# Größe je Windows-Version verschieden → wird anhand der Namensverweise ermittelt
+_DRIVER_LAYOUT = {
+    True: {"base": 0x38, "size": 0x48, "word": "<Q", "strides": range(0x80, 0x120, 8)},
+    False: {"base": 0x1C, "size": 0x24, "word": "<I", "strides": range(0x40, 0xA0, 4)},
+}
+KERNEL_MODULES = frozenset({
+    "ntoskrnl.exe", "ntkrnlmp.exe", "ntkrnlpa.exe", "ntkrpamp.exe",
+    "hal.dll", "halmacpi.dll", "halacpi.dll",
+})
+
+BUGCHECK_NAMES: Dict[int, str] = {
+    0x0A: "IRQL_NOT_LESS_OR_EQUAL",
+    0x19: "BAD_POOL_HEADER",
+    0x1A: "MEMORY_MANAGEMENT",
+    0x1E: "KMODE_EXCEPTION_NOT_HANDLED",
+    0x3B: "SYSTEM_SERVICE_EXCEPTION",
+    0x4E: "PFN_LIST_CORRUPT",
+    0x50: "PAGE_FAULT_IN_NONPAGED_AREA",
+    0x77: "KERNEL_STACK_INPAGE_ERROR",
+    0x7A: "KERNEL_DATA_INPAGE_ERROR",
+    0x7B: "INACCESSIBLE_BOOT_DEVICE",
+    0x7E: "SYSTEM_THREAD_EXCEPTION_NOT_HANDLED",
+    0x7F: "UNEXPECTED_KERNEL_MODE_TRAP",
+    0x9F: "DRIVER_POWER_STATE_FAILURE",
+    0xA0: "INTERNAL_POWER_ERROR",
+    0xBE: "ATTEMPTED_WRITE_TO_READONLY_MEMORY",
+    0xC2: "BAD_POOL_CALLER",
+    0xC4: "DRIVER_VERIFIER_DETECTED_VIOLATION",
+    0xC5: "DRIVER_CORRUPTED_EXPOOL",
+    0xD1: "DRIVER_IRQL_NOT_LESS_OR_EQUAL",
+    0xEA: "THREAD_STUCK_IN_DEVICE_DRIVER",
+    0xED: "UNMOUNTABLE_BOOT_VOLUME",
+    0xEF: "CRITICAL_PROCESS_DIED",
+    0xF4: "CRITICAL_OBJECT_TERMINATION",
+    0xFC: "ATTEMPTED_EXECUTE_OF_NOEXECUTE_MEMORY",
+    0x101: "CLOCK_WATCHDOG_TIMEOUT",
+    0x109: "CRITICAL_STRUCTURE_CORRUPTION",
+    0x116: "VIDEO_TDR_FAILURE",
+    0x117: "VIDEO_TDR_TIMEOUT_DETECTED",
+    0x119: "VIDEO_SCHEDULER_INTERNAL_ERROR",
+    0x124: "WHEA_UNCORRECTABLE_ERROR",
+    0x133: "DPC_WATCHDOG_VIOLATION",
+    0x139: "KERNEL_SECURITY_CHECK_FAILURE",
+    0x13A: "KERNEL_MODE_HEAP_CORRUPTION",
+    0x154: "UNEXPECTED_STORE_EXCEPTION",
+    0x15F: "CONNECTED_STANDBY_WATCHDOG_TIMEOUT_LIVEDUMP",
+    0x1D2: "WORKER_THREAD_INVALID_STATE",
+}
+
+# Erste Einschätzung für die Annahme; ersetzt keine Analyse mit WinDbg
+BUGCHECK_HINTS: Dict[int, str] = {
+    0x124: "Hardwarefehler – CPU/RAM-Übertaktung, Temperatur und Netzteil prüfen",
+    0x116: "Grafiktreiber/GPU – Treiber sauber neu installieren, GPU-Temperatur prüfen",
+    0x117: "Grafiktreiber/GPU – Treiber sauber neu installieren, GPU-Temperatur prüfen",
+    0x1A: "häufig RAM – Speichertest (mdsched/MemTest86) empfohlen",
+    0x50: "häufig RAM oder Treiber – Speichertest empfohlen",
+    0x4E: "häufig RAM – Speichertest empfohlen",
+    0x19: "Treiber oder RAM – Speichertest empfohlen",
+    0x7A: "Datenträger-Lesefehler – SMART-Werte, Kabel und Auslagerungsdatei prüfen",
+    0x77: "Datenträger-Lesefehler – SMART-Werte, Kabel und Auslagerungsdatei prüfen",
+    0x9F: "Treiber beim Energiesparen – Chipsatz-/WLAN-Treiber aktualisieren",
+    0xEF: "kritischer Prozess beendet – Datenträger und Systemdateien (sfc/DISM) prüfen",
+    0xF4: "kritischer Prozess beendet – Datenträger und Systemdateien (sfc/DISM) prüfen",
+    0x133: "Treiber/Firmware hängt – Chipsatz-Treiber und SSD-Firmware aktualisieren",
+    0x101: "CPU-Kern reagiert nicht – Übertaktung zurücknehmen, BIOS aktualisieren",
+    0xD1: "Treiberfehler – genannten Treiber aktualisieren oder entfernen",
+    0x0A: "Treiberfehler – genannten Treiber aktualisieren oder entfernen",
+}
+
+
+def base_code(code: int) -> int:
+    """0x1000007E → 0x7E (Varianten mit gesetztem Bit 28 haben dieselbe Bedeutung)."""
+    return code & ~0x10000000 if code & 0x10000000 else code
+
+
+def bugcheck_name(code: int) -> str:
+    return BUGCHECK_NAMES.get(base_code(code), "")
+
+
+# =============================================================================
+# Modell
+# =============================================================================
+
+@dataclass
+class CrashDump:
+    path: str
+    size: int = 0
+    kind: str = ""                  # "kernel64" | "kernel32" | "user" | ""
+    dump_type: str = ""
+    bugcheck: int | None = None
+    params: Tuple[int, ...] = ()
+    crashed: datetime | None = None  # Ortszeit
+    uptime_s: float | None = None
+    build: int = 0
+    processors: int = 0
+    module: str = ""                # verursachender Treiber (Heuristik)
+    module_source: str = ""         # "exception" | "parameter" | "stack"
+    error: str = ""
+
+    @property
+    def code_text(self) -> str:
+        return "" if self.bugcheck is None else f"0x{self.bugcheck:08X}"
+
+    @property
+    def name(self) -> str:
+        return "" if self.bugcheck is None else bugcheck_name(self.bugcheck)
+
+    def format_text(self) -> str:
+        head = f"{Path(self.path).name}: "
+        if self.error:
+            return head + self.error
+        when = self.crashed.strftime("%d.%m.%Y %H:%M") if self.crashed else "?"
+        text = f"{head}{when} {self.code_text} {self.name}".rstrip()
+        if self.module:
+            text += f" – {self.module}"
+        params = ", ".join(f"0x{p:X}" for p in self.params)
+        return text + (f"\n    Parameter: {params}" if params else "")
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "path": self.path,
+            "size": self.size,
+            "kind": self.kind,
+            "dump_type": self.dump_type,
+            "bugcheck": self.code_text,
+            "name": self.name,
+            "params": [f"0x{p:X}" for p in self.params],
+            "crashed": self.crashed.isoformat(timespec="seconds") if self.crashed else None,
+            "uptime_s": None if self.uptime_s is None else round(self.uptime_s),
+            "build": self.build,
+            "module": self.module,
+            "module_source": self.module_source,
+            "error": self.error,
+        }
+
+
+@dataclass
+class CrashGroup:
+    code: int
+    count: int = 0
+    last: datetime | None = None
+    modules: Counter = field(default_factory=Counter)
+
+    @property
+    def name(self) -> str:
+        return bugcheck_name(self.code)
+
+    @property
+    def hint(self) -> str:
+        return BUGCHECK_HINTS.get(self.code, "")
+
+
+@dataclass
+class CrashSummary:
+    dumps: List[CrashDump] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def crashes(self) -> List[CrashDump]:
+        return [d for d in self.dumps if d.bugcheck is not None]
+
+    def frequency(self) -> List[CrashGroup]:
+        """Häufigkeitstabelle je Bugcheck (Varianten zusammengefasst), häufigste zuerst."""
+        groups: Dict[int, CrashGroup] = {}
+        for d in self.crashes:
+            g = groups.setdefault(base_code(d.bugcheck), CrashGroup(base_code(d.bugcheck)))
+            g.count += 1
+            if d.crashed and (g.last is None or d.crashed > g.last):
+                g.last = d.crashed
+            if d.module:
+                g.modules[d.module] += 1
+        return sorted(groups.values(), key=lambda g: (-g.count, -(g.last.timestamp() if g.last else 0)))
+
+    def format_text(self, verbose: bool = False) -> str:
+        crashes = self.crashes
+        if not self.dumps:
+            return "Keine Absturzabbilder gefunden."
+        lines = [f"{len(self.dumps)} Abbild(er), {len(crashes)} mit Bugcheck – {self.seconds * 1000:.0f} ms"]
+        for g in self.frequency():
+            last = g.last.strftime("%d.%m.%Y") if g.last else "?"
+            lines.append(f"  {g.count:>3}× 0x{g.code:X} {g.name or '(unbekannt)'} – zuletzt {last}")
+            if g.modules:
+                lines.append("        Treiber: " + ", ".join(f"{m} ({n}×)" for m, n in g.modules.most_common(3)))
+            if g.hint:
+                lines.append(f"        {g.hint}")
+        modules = Counter(d.module for d in crashes if d.module)
+        if len(modules) > 0 and modules.most_common(1)[0][1] >= 2:
+            m, n = modules.most_common(1)[0]
+            lines.append(f"  Häufigster Treiber: {m} ({n} von {len(crashes)} Abstürzen)")
+        for d in self.dumps:
+            if d.error or verbose:
+                lines.append("  " + d.format_text().replace("\n", "\n  "))
+        return "\n".join(lines)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "kind": "crash_dumps",
+            "seconds": round(self.seconds, 4),
+            "dumps": [d.as_dict() for d in sorted(self.dumps, key=lambda d: d.crashed or datetime.min, reverse=True)],
+            "frequency": [
+                {"bugcheck": f"0x{g.code:X}", "name": g.name, "count": g.count,
+                 "last": g.last.isoformat(timespec="seconds") if g.last else None,
+                 "modules": dict(g.modules.most_common(5)), "hint": g.hint}
+                for g in self.frequency()
+            ],
+        }
+
+
+# =============================================================================
+# Parser
+# =============================================================================
+
+def _read(buf, fmt: str, offset: int):
+    """Ein Wert oder ``None``, wenn die Datei dort schon endet (gekürzte Kopfdateien)."""
+    if offset < 0 or offset + struct.calcsize(fmt) > len(buf):
+        return None
+    value = struct.unpack_from(fmt, buf, offset)
+    return value[0] if len(value) == 1 else value
+
+
+def _filetime(value: int | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        utc = datetime(1601, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=value // 10)
+    except OverflowError:
+        return None
+    return utc.astimezone().replace(tzinfo=None)
+
+
+def _dump_string(buf, offset: int) -> str:
+    """DUMP_STRING: ULONG Länge (Zeichen) + UTF-16."""
+    length = _read(buf, "<I", offset)
+    if not length or length > 260:
+        return ""
+    raw = buf[offset + 4:offset + 4 + 2 * length]
+    return bytes(raw).decode("utf-16-le", errors="replace")
+
+
+def _drivers(buf, triage: int, wide: bool) -> List[Tuple[int, int, str]]:
+    """(Basis, Größe, Name) aus der Treiberliste des Triage-Blocks."""
+    fields = _read(buf, "<16I", triage)
+    if fields is None:
+        return []
+    list_offset, count, pool_offset, pool_size = fields[12], fields[13], fields[14], fields[15]
+    if not (0 < count <= 1024 and list_offset and pool_offset):
+        return []
+    layout = _DRIVER_LAYOUT[wide]
+    for stride in layout["strides"]:
+        # passende Eintragsgröße: jeder Namensverweis zeigt in den String-Pool
+        names = [_read(buf, "<I", list_offset + i * stride) for i in range(count)]
+        if all(n is not None and pool_offset <= n < pool_offset + pool_size for n in names):
+            break
+    else:
+        return []
+    drivers = []
+    for i, name_offset in enumerate(names):
+        entry = list_offset + i * stride
+        base = _read(buf, layout["word"], entry + layout["base"])
+        size = _read(buf, "<I", entry + layout["size"])
+        if base and size:
+            drivers.append((base, size, _dump_string(buf, name_offset)))
+    return drivers
+
+
+def _find_module(buf, triage: int, wide: bool, params: Tuple[int, ...]) -> Tuple[str, str]:
+    drivers = _drivers(buf, triage, wide)
+    if not drivers:
+        return "", ""
+
+    def owner(address: int) -> str:
+        for base, size, name in drivers:
+            if base <= address < base + size:
+                return name
+        return ""
+
+    fields = _read(buf, "<16I", triage)
+    word = "<Q" if wide else "<I"
+    candidates: List[Tuple[str, int]] = []
+    exception = fields[4]
+    if exception:
+        address = _read(buf, word, exception + (0x10 if wide else 0x0C))   # ExceptionAddress
+        if address:
+            candidates.append(("exception", address))
+    candidates.extend(("parameter", p) for p in params if p)
+    stack, stack_size = fields[10], fields[11]
+    step = 8 if wide else 4
+    if stack and 0 < stack_size <= 0x10000:
+        for off in range(stack, stack + stack_size, step):
+            value = _read(buf, word, off)
+            if value is None:
+                break
+            candidates.append(("stack", value))
+
+    kernel_hit = ("", "")
+    for source, address in candidates:
+        name = owner(address)
+        if not name:
+            continue
+        if name.lower() not in KERNEL_MODULES:
+            return name, source
+        if not kernel_hit[0]:
+            kernel_hit = (name, source)
+    return kernel_hit
+
+
+def parse_dump(path: Path) -> CrashDump:
+    dump = CrashDump(str(path))
+    try:
+        with open(path, "rb") as f:
+            dump.size = os.fstat(f.fileno()).st_size
+            if dump.size < 8:
+                dump.error = "zu klein für ein Speicherabbild"
+                return dump
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _parse_header(mm, dump)
+    except (OSError, ValueError) as exc:
+        dump.error = f"nicht lesbar: {getattr(exc, 'strerror', None) or exc}"
+    return dump
+
+
+def _parse_header(buf, dump: CrashDump) -> None:
+    sig = bytes(buf[:8])
+    if sig == SIG_KERNEL64:
+        dump.kind, wide, h = "kernel64", True, _HEADER64
+    elif sig == SIG_KERNEL32:
+        dump.kind, wide, h = "kernel32", False, _HEADER32
+    elif sig[:4] == SIG_USER:
+        dump.kind = "user"
+        dump.error = "Anwendungs-Minidump (kein Bluescreen) – nicht ausgewertet"
+        return
+    else:
+        dump.error = "kein Windows-Speicherabbild"
+        return
+    dump.bugcheck = _read(buf, "<I", h["bugcheck"])
+    dump.params = _read(buf, h["param_fmt"], h["params"]) or ()
+    dump.build = _read(buf, "<I", h["build"]) or 0
+    dump.processors = _read(buf, "<I", h["cpus"]) or 0
+    dump_type = _read(buf, "<I", h["dump_type"])
+    dump.dump_type = DUMP_TYPES.get(dump_type, "" if dump_type is None else str(dump_type))
+    dump.crashed = _filetime(_read(buf, "<Q", h["system_time"]))
+    uptime = _read(buf, "<Q", h["uptime"])
+    dump.uptime_s = uptime / 1e7 if uptime else None
+    if dump.bugcheck is None:
+        dump.error = "Kopf unvollständig"
+        return
+    if dump_type == DUMP_TYPE_TRIAGE:
+        dump.module, dump.module_source = _find_module(buf, h["size"], wide, dump.params)
+
+
+# =============================================================================
+# Suche
+# =============================================================================
+
+def default_dump_paths() -> List[Path]:
+    root = Path(os.environ.get("SystemRoot", r"C:\Windows"))
+    paths = sorted((root / "Minidump").glob("*.dmp"))
+    full = root / "MEMORY.DMP"
+    if full.is_file():
+        paths.append(full)
+    return paths
+
+
+def expand_paths(args: List[str]) -> List[Path]:
+    """Dateien und Ordner (darin ``*.dmp``)."""
+    out: List[Path] = []
+    for arg in args:
+        p = Path(arg)
+        if p.is_dir():
+            out.extend(sorted(q for q in p.iterdir() if q.suffix.lower() == ".dmp" and q.is_file()))
+        else:
+            out.append(p)
+    return out
+
+
+def scan_dumps(paths: List[Path] | None = None) -> CrashSummary:
+    t0 = time.perf_counter()
+    summary = CrashSummary([parse_dump(p) for p in (default_dump_paths() if paths is None else paths)])
+    summary.seconds = time.perf_counter() - t0
+    return summary
+
+
+def crashscan_report(summary: CrashSummary) -> ActionReport:
+    """``ActionReport`` für die Aktion ``crash_scan`` (Ergebnisse, Historie, Metriken)."""
+    report = ActionReport(CRASHSCAN_ACTION)
+    crashes = summary.crashes
+    groups = summary.frequency()
+    report.metrics["dumps"] = {"value": len(summary.dumps), "unit": ""}
+    report.metrics["crashes"] = {"value": len(crashes), "unit": ""}
+    report.metrics["scan_ms"] = {"value": round(summary.seconds * 1000, 1), "unit": "ms"}
+    for d in summary.dumps:
+        report.artifacts.append({"path": d.path, "kind": "crash_dump"})
+    for g in groups:
+        if g.count >= CRASHSCAN_REPEAT_WARN:
+            report.warnings.append(f"{g.count}× 0x{g.code:X} {g.name}".rstrip())
+    report.diagnostics.append(summary.as_dict())
+    if not crashes:
+        report.message = "Keine Absturzabbilder gefunden" if not summary.dumps else "Keine auswertbaren Abbilder"
+    else:
+        top = groups[0]
+        report.message = f"{len(crashes)} Absturz/Abstürze, häufigster: {top.name or f'0x{top.code:X}'} ({top.count}×)"
+    report.finish(0)
+    return report
@@ -0,0 +1,292 @@
+"""
+Ordnergrößen-Index für das Systemlaufwerk ("wo ist der Platz hin?").
+
+Ein paralleler ``os.scandir``-Walker (gleiche Warteschlange wie
+winrep_tempscan) erfasst je Ordner die Größe und Anzahl der direkt darin
+liegenden Dateien sowie seine Änderungszeit. Das Ergebnis liegt in
+``cache/diskindex.db`` (SQLite); Gesamtgrößen je Ordner werden beim Laden
+im Speicher aufsummiert, eine Top-N-Liste braucht daher keinen neuen Scan.
+
+Inkrementell: Hat sich die Änderungszeit eines Ordners nicht geändert, ist
+seine Liste von Einträgen gleich geblieben – er wird nicht neu aufgelistet,
+nur seine Unterordner werden per ``stat`` geprüft. Ein erneuter Scan kostet
+so einen ``stat`` je Ordner statt ``scandir`` plus ``stat`` je Datei.
+Grenze: Dateien, die an Ort und Stelle wachsen (Logs, pagefile.sys), ändern
+die Ordnerzeit nicht; ``full=True`` bzw. ``--full`` scannt alles neu.
+
+Symbolische Links, Junctions und andere Dateisysteme (``st_dev``) werden
+nicht betreten. Plattformneutral – läuft auch auf großen Linux-Bäumen.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from winrep_tempscan import TEMPSCAN_WORKERS, is_link
+
+DISKINDEX_FILE = "diskindex.db"
+DISKINDEX_SCHEMA = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    parent TEXT,                       -- NULL für den Wurzelordner
+    mtime REAL NOT NULL,
+    bytes INTEGER NOT NULL,            -- nur Dateien direkt in diesem Ordner
+    files INTEGER NOT NULL,
+    errors INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (root, path)
+) WITHOUT ROWID;
+"""
+
+
+def default_root() -> str:
+    if os.name == "nt":
+        return os.environ.get("SystemDrive", "C:") + "\\"
+    return "/"
+
+
+@dataclass
+class DirEntry:
+    path: str
+    parent: str | None
+    mtime: float
+    bytes: int
+    files: int
+    errors: int = 0
+    total_bytes: int = 0               # inkl. Unterordner (beim Laden berechnet)
+    total_files: int = 0
+
+
+@dataclass
+class ScanStats:
+    dirs: int = 0
+    listed: int = 0                    # neu aufgelistet (geändert oder neu)
+    reused: int = 0                    # aus dem Index übernommen
+    removed: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    def format_text(self) -> str:
+        return (f"{self.dirs} Ordner ({self.listed} neu gelesen, {self.reused} unverändert, "
+                f"{self.removed} entfernt) in {self.seconds:.1f} s")
+
+
+class DiskIndex:
+    """Index eines Wurzelordners. Nicht threadsicher; der Walker schreibt nur über ``scan``."""
+
+    def __init__(self, path: Path, root: str):
+        self.path = path
+        self.root = os.path.abspath(root)
+        self.entries: Dict[str, DirEntry] = {}
+        self.scanned: float | None = None
+        self._db = sqlite3.connect(str(path), timeout=10)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('schema', ?)", (str(DISKINDEX_SCHEMA),))
+        self._db.commit()
+        self._load()
+
+    def close(self):
+        self._db.close()
+
+    def _load(self):
+        rows = self._db.execute(
+            "SELECT path, parent, mtime, bytes, files, errors FROM dirs WHERE root = ?", (self.root,)
+        )
+        self.entries = {r[0]: DirEntry(*r) for r in rows}
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", ("scanned:" + self.root,)).fetchone()
+        self.scanned = float(row[0]) if row else None
+        self._summarize()
+
+    def _summarize(self):
+        """Gesamtgrößen von unten nach oben aufsummieren (tiefste Pfade zuerst)."""
+        entries = self.entries
+        for e in entries.values():
+            e.total_bytes = e.bytes
+            e.total_files = e.files
+        for path in sorted(entries, key=len, reverse=True):
+            e = entries[path]
+            parent = entries.get(e.parent) if e.parent is not None else None
+            if parent is not None:
+                parent.total_bytes += e.total_bytes
+                parent.total_files += e.total_files
+
+    # ------------------------------------------------------------ Scannen
+
+    def scan(
+        self,
+        workers: int = TEMPSCAN_WORKERS,
+        full: bool = False,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> ScanStats:
+        t0 = time.perf_counter()
+        stats = ScanStats()
+        old = self.entries
+        children: Dict[str, List[str]] = {}
+        for path, e in old.items():
+            if e.parent is not None:
+                children.setdefault(e.parent, []).append(path)
+        try:
+            root_dev = os.stat(self.root).st_dev
+        except OSError as exc:
+            raise FileNotFoundError(f"{self.root}: {exc.strerror or exc}") from exc
+
+        found: Dict[str, DirEntry] = {}
+        lock = threading.Lock()
+        work: "queue.Queue[Tuple[str, str | None] | None]" = queue.Queue()
+        work.put((self.root, None))
+
+        def visit(path: str, parent: str | None) -> None:
+            try:
+                st = os.stat(path, follow_symlinks=False)
+            except OSError:
+                return   # inzwischen gelöscht
+            if st.st_dev != root_dev:
+                return
+            cached = old.get(path)
+            if cached is not None and not full and cached.mtime == st.st_mtime and cached.parent == parent:
+                entry = DirEntry(path, parent, st.st_mtime, cached.bytes, cached.files, cached.errors)
+                subdirs = children.get(path, [])
+                reused = True
+            else:
+                entry, subdirs = _list_dir(path, parent, st.st_mtime)
+                reused = False
+            for sub in subdirs:
+                work.put((sub, path))
+            with lock:
+                found[path] = entry
+                if reused:
+                    stats.reused += 1
+                else:
+                    stats.listed += 1
+
+        def worker() -> None:
+            while True:
+                item = work.get()
+                try:
+                    if item is None:
+                        return
+                    if cancelled is None or not cancelled():
+                        visit(*item)
+                finally:
+                    work.task_done()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+        for th in threads:
+            th.start()
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for th in threads:
+            th.join()
+        if cancelled is not None and cancelled():
+            stats.seconds = time.perf_counter() - t0
+            return stats   # unvollständig → Index nicht überschreiben
+
+        removed = [p for p in old if p not in found]
+        changed = [e for p, e in found.items() if _stored(old.get(p)) != _stored(e)]
+        with self._db:
+            self._db.executemany("DELETE FROM dirs WHERE root = ? AND path = ?", ((self.root, p) for p in removed))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO dirs(root, path, parent, mtime, bytes, files, errors) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((self.root, e.path, e.parent, e.mtime, e.bytes, e.files, e.errors) for e in changed),
+            )
+            self.scanned = time.time()
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("scanned:" + self.root, str(self.scanned))
+            )
+        self.entries = found
+        self._summarize()
+        stats.dirs = len(found)
+        stats.removed = len(removed)
+        stats.errors = sum(e.errors for e in found.values())
+        stats.seconds = time.perf_counter() - t0
+        return stats
+
+    # ------------------------------------------------------------ Abfragen
+
+    @property
+    def total(self) -> DirEntry | None:
+        return self.entries.get(self.root)
+
+    def top(self, n: int = 20, leaves: bool = True) -> List[DirEntry]:
+        """
+        Größte Ordner ohne den Wurzelordner (steht als Summe darüber).
+        ``leaves``: Ordner ausblenden, deren Größe fast ganz (≥ 90 %) in einem
+        einzigen aufgeführten Unterordner steckt – sonst bestünde die Liste
+        nur aus C:\\Windows, C:\\Windows\\WinSxS … Ein Ordner, der nur aus
+        einem bereits aufgeführten besteht (gleiche Größe, Reihenfolge
+        beliebig), wird gar nicht erst aufgenommen.
+        """
+        ranked = sorted((e for e in self.entries.values() if e.path != self.root), key=lambda e: -e.total_bytes)
+        if not leaves:
+            return ranked[:n]
+        picked: List[DirEntry] = []
+        for e in ranked:
+            if len(picked) >= n:
+                break
+            if any(_is_ancestor(e, p) for p in picked):
+                continue
+            picked = [p for p in picked if not _dominated_by(p, e)]
+            picked.append(e)
+        return picked
+
+    def children(self, path: str) -> List[DirEntry]:
+        """Direkte Unterordner, größte zuerst (zum Aufklappen)."""
+        path = os.path.abspath(path)
+        return sorted((e for e in self.entries.values() if e.parent == path), key=lambda e: -e.total_bytes)
+
+
+def _stored(e: DirEntry | None) -> Tuple | None:
+    return None if e is None else (e.parent, e.mtime, e.bytes, e.files, e.errors)
+
+
+def _is_ancestor(ancestor: DirEntry, child: DirEntry) -> bool:
+    return child.path.startswith(ancestor.path.rstrip("\\/") + os.sep)
+
+
+def _dominated_by(ancestor: DirEntry, child: DirEntry) -> bool:
+    """``ancestor`` ist kaum mehr als ``child`` – nur das Kind zeigen."""
+    return _is_ancestor(ancestor, child) and child.total_bytes >= 0.9 * ancestor.total_bytes
+
+
+def _list_dir(path: str, parent: str | None, mtime: float) -> Tuple[DirEntry, List[str]]:
+    size = files = errors = 0
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if is_link(entry):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    size += entry.stat(follow_symlinks=False).st_size
+                    files += 1
+                except OSError:
+                    errors += 1
+    except OSError:
+        errors += 1
+    return DirEntry(path, parent, mtime, size, files, errors), subdirs
+
+
+def default_index(root: str | None = None) -> DiskIndex:
+    from winrep_paths import app_data_dir
+
+    return DiskIndex(app_data_dir("cache") / DISKINDEX_FILE, root or default_root())
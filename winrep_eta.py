@@ -0,0 +1,103 @@
+"""
+Restzeit-Prognose für lange Aktionen (RestoreHealth, SFC, Update-Reset …).
+
+Grundlage sind die Laufzeiten erfolgreicher Läufe aus der Historie
+(winrep_history), gestaffelt nach Passgenauigkeit: gleiche CPU und gleicher
+Datenträgertyp → gleicher Datenträgertyp → alle Rechner. Der Median davon
+ist die Ausgangsschätzung.
+
+Sobald die Aktion echten Fortschritt meldet, mischt ``EtaEstimator`` die
+Hochrechnung aus dem bisherigen Tempo hinzu – anfangs kaum, gegen Ende fast
+ausschließlich (DISM steht z. B. lange bei 62,3 %, da hilft die Historie).
+Ein ``update()`` ist reine Arithmetik; die Datenbankabfrage passiert einmal
+beim Start im Worker-Thread.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import List
+
+ETA_MIN_SAMPLES = 3     # weniger passende Läufe → nächstgröbere Stufe
+ETA_MAX_SAMPLES = 50
+ETA_SMOOTHING = 0.3     # Anteil des neuen Werts pro Update (glättet Sprünge)
+
+
+@dataclass(frozen=True)
+class EtaPrior:
+    seconds: float      # Median der passenden Läufe
+    samples: int
+    basis: str          # woraus die Schätzung stammt (für Tooltips/Log)
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[mid]
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def predict(history, action: str, cpu: str = "", disk: str = "") -> EtaPrior | None:
+    """Ausgangsschätzung aus ``RunHistory.durations``; None ohne verwertbare Läufe."""
+    tiers = []
+    if cpu and disk:
+        tiers.append((cpu, disk, "gleiche CPU und Datenträger"))
+    if disk:
+        tiers.append((None, disk, f"Datenträger {disk}"))
+    tiers.append((None, None, "alle Rechner"))
+    fallback: List[float] = []
+    for tier_cpu, tier_disk, basis in tiers:
+        values = history.durations(action, cpu=tier_cpu, disk=tier_disk, limit=ETA_MAX_SAMPLES)
+        if len(values) >= ETA_MIN_SAMPLES:
+            return EtaPrior(_median(values), len(values), basis)
+        fallback = fallback or values
+    if fallback:
+        return EtaPrior(_median(fallback), len(fallback), "wenige Läufe")
+    return None
+
+
+class EtaEstimator:
+    """Laufende Schätzung einer Aktion; ``update()`` liefert die Restzeit in Sekunden."""
+
+    def __init__(self, prior: EtaPrior | None, started: float | None = None):
+        self.prior = prior
+        self.started = time.monotonic() if started is None else started
+        self.total: float | None = prior.seconds if prior is not None else None
+        self.fraction: float | None = None
+
+    def update(self, fraction: float | None = None, now: float | None = None) -> float | None:
+        now = time.monotonic() if now is None else now
+        elapsed = max(0.0, now - self.started)
+        if fraction is not None and fraction > (self.fraction or 0.0):
+            self.fraction = min(1.0, fraction)  # Balken laufen nie rückwärts
+        f = self.fraction
+        if f is not None and f >= 0.02 and elapsed > 1.0:
+            from_rate = elapsed / f
+            if self.prior is None:
+                target = from_rate
+            else:
+                # Gewicht des Tempos wächst mit dem Fortschritt
+                target = f * from_rate + (1.0 - f) * self.prior.seconds
+            self.total = target if self.total is None else self.total + ETA_SMOOTHING * (target - self.total)
+        if self.total is None:
+            return None
+        return max(0.0, self.total - elapsed)
+
+    def overdue(self, now: float | None = None) -> bool:
+        """Läuft bereits länger als die Schätzung."""
+        now = time.monotonic() if now is None else now
+        return self.total is not None and now - self.started > self.total
+
+
+def format_eta(remaining: float | None, overdue: bool = False) -> str:
+    if remaining is None:
+        return ""
+    if overdue:
+        return "länger als üblich"
+    if remaining < 60:
+        return "noch < 1 min"
+    if remaining < 3600:
+        return f"noch ~{remaining / 60:.0f} min"
+    return f"noch ~{remaining / 3600:.1f} h"
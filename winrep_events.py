@@ -0,0 +1,216 @@
+"""
+Strukturierte Ereignisse aus winrep_actions.ps1.
+
+Neben der lesbaren Ausgabe schreibt das Skript Ereigniszeilen der Form
+
+    \\x1fWINREP-EVENT {"type": "step_start", "index": 2, "total": 6, "title": "..."}
+
+``EventStream`` trennt sie inkrementell vom Text (auch wenn eine Zeile in
+mehreren Stücken ankommt), ``ActionReport`` sammelt sie zu Schritten,
+Messwerten, Dateien, Warnungen und Ergebnis, ``ResultStore`` merkt sich den
+letzten Bericht je Aktion.
+
+Ereignistypen:
+    step_start  index, total, title
+    step_end    index, total, ok
+    progress    value (0.0–1.0, innerhalb des laufenden Schritts)
+    metric      name, value, unit
+    artifact    path, kind
+    warning     message
+    result      status, message
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+EVENT_PREFIX = "\x1fWINREP-EVENT "
+
+EVENT_TYPES = ("step_start", "step_end", "progress", "metric", "artifact", "warning", "result")
+
+
+@dataclass
+class ActionEvent:
+    type: str
+    data: Dict[str, object]
+    t: float = 0.0   # perf_counter beim Empfang
+
+
+def parse_event(line: str) -> ActionEvent | None:
+    """Ereigniszeile → ActionEvent; None für normale Ausgabe oder kaputtes JSON."""
+    if not line.startswith(EVENT_PREFIX):
+        return None
+    try:
+        data = json.loads(line[len(EVENT_PREFIX):])
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("type") not in EVENT_TYPES:
+        return None
+    return ActionEvent(str(data.pop("type")), data, time.perf_counter())
+
+
+class EventStream:
+    """
+    Filtert Ereigniszeilen aus den Ausgabestücken eines Hosts.
+
+    ``feed()`` bekommt, was ``on_output`` liefert (ganze Zeilen oder
+    Zeilenstücke) und gibt (sichtbarer Text, Ereignisse) zurück. Ein Stück,
+    das mit ``\\x1f`` beginnt, wird bis zum Zeilenende zurückgehalten –
+    normale Ausgabe beginnt nie mit diesem Steuerzeichen.
+    """
+
+    def __init__(self):
+        self._held = ""
+        self.malformed = 0
+
+    def feed(self, text: str) -> Tuple[str, List[ActionEvent]]:
+        if self._held:
+            text, self._held = self._held + text, ""
+        if not text.startswith(EVENT_PREFIX[0]):
+            return text, []
+        if not text.endswith(("\n", "\r")):
+            self._held = text
+            return "", []
+        event = parse_event(text.rstrip("\r\n"))
+        if event is None:
+            self.malformed += 1
+            return "", []
+        return "", [event]
+
+    def flush(self) -> str:
+        """Rest ohne Zeilenende am Ende der Aktion (als Text, falls kein Ereignis)."""
+        held, self._held = self._held, ""
+        return "" if held.startswith(EVENT_PREFIX) else held
+
+
+# =============================================================================
+# Bericht je Lauf
+# =============================================================================
+
+@dataclass
+class ActionReport:
+    action: str
+    started: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    step_total: int = 0
+    step_current: int = 0           # laufender Schritt (0 = keiner)
+    step_title: str = ""
+    steps_done: List[Dict[str, object]] = field(default_factory=list)
+    step_fraction: float = 0.0      # Fortschritt innerhalb des laufenden Schritts
+    metrics: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    artifacts: List[Dict[str, str]] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    diagnostics: List[Dict[str, object]] = field(default_factory=list)   # LogSummary / BatteryReport .as_dict()
+    status: str | None = None
+    message: str = ""
+    returncode: int | None = None
+
+    def apply(self, event: ActionEvent):
+        d = event.data
+        if event.type == "step_start":
+            self.step_total = int(d.get("total") or self.step_total or 0)
+            self.step_current = int(d.get("index") or self.step_current + 1)
+            self.step_title = str(d.get("title") or "")
+            self.step_fraction = 0.0
+        elif event.type == "step_end":
+            index = int(d.get("index") or self.step_current)
+            self.step_total = int(d.get("total") or self.step_total or 0)
+            self.steps_done.append({"index": index, "title": self.step_title, "ok": bool(d.get("ok", True))})
+            if index == self.step_current:
+                self.step_current = 0
+                self.step_fraction = 0.0
+        elif event.type == "progress":
+            try:
+                self.step_fraction = max(0.0, min(1.0, float(d.get("value", 0.0))))
+            except (TypeError, ValueError):
+                pass
+        elif event.type == "metric":
+            name = str(d.get("name") or "")
+            if name:
+                self.metrics[name] = {"value": d.get("value"), "unit": str(d.get("unit") or "")}
+        elif event.type == "artifact":
+            path = str(d.get("path") or "")
+            if path:
+                self.artifacts.append({"path": path, "kind": str(d.get("kind") or "")})
+        elif event.type == "warning":
+            self.warnings.append(str(d.get("message") or ""))
+        elif event.type == "result":
+            self.status = str(d.get("status") or "")
+            self.message = str(d.get("message") or "")
+
+    @property
+    def has_steps(self) -> bool:
+        return self.step_total > 0
+
+    def fraction(self, within: float | None = None) -> float | None:
+        """
+        Gesamtfortschritt 0.0–1.0 aus den Schritten. ``within`` ist optionaler
+        Fortschritt im laufenden Schritt (z. B. DISM-Balken); ohne Schritte
+        wird er direkt zurückgegeben.
+        """
+        if not self.step_total:
+            return within
+        if self.step_current:
+            sub = self.step_fraction if within is None else within
+            return min(1.0, (self.step_current - 1 + sub) / self.step_total)
+        done = max((int(s["index"]) for s in self.steps_done), default=0)
+        return min(1.0, done / self.step_total)
+
+    def step_label(self) -> str:
+        if not self.step_current:
+            return ""
+        return f"Schritt {self.step_current}/{self.step_total}: {self.step_title}"
+
+    def finish(self, returncode: int):
+        self.returncode = returncode
+        if self.status is None:
+            self.status = "ok" if returncode == 0 else "failed"
+
+    def as_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+class ResultStore:
+    """Letzter ``ActionReport`` je Aktion, als JSON im Datenordner (atomar gespeichert)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, object]] = {}
+        try:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(loaded, dict):
+                self._data = loaded
+        except (OSError, ValueError):
+            pass
+
+    def get(self, action: str) -> Dict[str, object] | None:
+        with self._lock:
+            return self._data.get(action)
+
+    def put(self, report: ActionReport):
+        with self._lock:
+            self._data[report.action] = report.as_dict()
+        self.save()
+
+    def save(self):
+        with self._lock:
+            payload = json.dumps(self._data, ensure_ascii=False, indent=1)
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def default_result_store() -> ResultStore:
+    from winrep_paths import app_data_dir
+
+    return ResultStore(app_data_dir("cache") / "results.json")
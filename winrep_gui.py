@@ -0,0 +1,1464 @@
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple
+import webbrowser
+from tkinter import messagebox
+
+import tkinter as tk
+import customtkinter as ctk
+from PIL import Image
+
+from winrep_core import (
+    ACTIONS,
+    APP_TITLE,
+    RC_SCRIPT_MISSING,
+    RC_START_FAILED,
+    RESOURCE_LABELS,
+    ActionLimits,
+    WinRepAction,
+    actions_script_path,
+    describe_alert,
+    describe_returncode,
+    load_limits,
+    resource_path,
+    run_ps1_action,
+    sorted_action_keys,
+)
+from winrep_battery import analyze_battery_report
+from winrep_cbslog import triage_report
+from winrep_crashdump import CRASHSCAN_ACTION, CRASHSCAN_VERBOSE_MAX, crashscan_report, scan_dumps
+from winrep_events import ActionReport, EventStream, default_result_store
+from winrep_eta import EtaEstimator, format_eta, predict
+from winrep_history import current_machine, default_history
+from winrep_inventory import (
+    INVENTORY_ACTION,
+    INVENTORY_WORKERS,
+    PowerShellBackend,
+    collect_inventory,
+    desktop_dir,
+    inventory_report,
+    write_reports,
+)
+from winrep_journal import ResumePlan, SessionJournal, find_resumable, mark_resolved
+from winrep_log import (
+    LOG_FRAME_MS,
+    LOG_PAGE_LINES,
+    LOG_VIEW_LINES,
+    LOG_VIEW_MAX_LINES,
+    LogHistory,
+    LogPipeline,
+)
+from winrep_metrics import Stopwatch, default_writer, host_result_fields
+from winrep_paths import app_data_dir
+from winrep_progress import ProgressParser, ProgressThrottle, is_transient_line
+from winrep_pshost import ALERT_RESUMED, HostError, HostLauncher, PSHostPool
+from winrep_recipes import Recipe, StepOutcome, describe_record, load_recipes, run_recipe
+from winrep_scheduler import JOB_QUEUED, JOB_RUNNING, SCHED_MAX_PARALLEL, ActionScheduler, Job, describe_job
+from winrep_sysinfo import (
+    PROBE_WORKERS,
+    PROBES,
+    PROBES_BY_KEY,
+    ProbeResult,
+    SysInfoCache,
+    SysProbe,
+    run_probes,
+)
+from winrep_tempscan import TEMPSCAN_ACTIONS, estimate_cleanup
+
+# =============================================================================
+# Basis-Konfiguration
+# =============================================================================
+
+WINDOW_SIZE = "1120x620"
+
+BG_WINDOW = "#F3F4F6"
+BG_CARD = "#FFFFFF"
+BG_CARD_SELECTED = "#E7F1FF"
+BORDER_CARD = "#E5E7EB"
+BORDER_CARD_SELECTED = "#3B82F6"
+BG_RIGHT_PANEL = "#EFF4FF"
+TEXT_MUTED = "#6B7280"
+ACCENT = "#3B82F6"
+
+README_URL = "https://github.com/SD-ITLab/SD-TechTools"
+LOGO_URL   = "https://sd-itlab.de"
+BRAND_URL  = "https://sd-itlab.de"
+
+LOG_PLACEHOLDER = "Hier erscheinen Ausgaben von WinRep-Aktionen …"
+
+
+# =============================================================================
+# UI: ActionRow
+# =============================================================================
+
+_FONTS: Dict[Tuple[int, str], ctk.CTkFont] = {}
+
+
+def shared_font(size: int, weight: str = "normal") -> ctk.CTkFont:
+    """CTkFont-Instanzen einmal anlegen und wiederverwenden (erst nach Tk-Root aufrufen)."""
+    font = _FONTS.get((size, weight))
+    if font is None:
+        font = _FONTS[(size, weight)] = ctk.CTkFont(size=size, weight=weight)
+    return font
+
+
+class ActionRow(ctk.CTkFrame):
+    def __init__(self, master, action: WinRepAction, on_click, width: int = 540, height: int = 80):
+        super().__init__(
+            master,
+            fg_color=BG_CARD,
+            corner_radius=14,
+            width=width,
+            height=height,
+        )
+        self.grid_propagate(False)
+
+        self.action_key = action.key
+        self.on_click = on_click
+        self.selected = False
+        self.width = width
+        self.grid_pos: int | None = None  # aktuelle Grid-Zeile, None = ausgeblendet
+
+        self.configure(border_width=1, border_color=BORDER_CARD)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.title_lbl = ctk.CTkLabel(
+            self,
+            text=action.title,
+            font=shared_font(12, "bold"),
+            anchor="w",
+        )
+        self.title_lbl.grid(row=0, column=0, sticky="w", padx=12, pady=(8, 0))
+
+        self.desc_lbl = ctk.CTkLabel(
+            self,
+            text=action.description,
+            font=shared_font(10),
+            text_color=TEXT_MUTED,
+            anchor="w",
+            justify="left",
+            wraplength=width - 40,
+        )
+        self.desc_lbl.grid(row=1, column=0, sticky="w", padx=12, pady=(0, 8))
+
+        for w in (self, self.title_lbl, self.desc_lbl):
+            w.bind("<Button-1>", self._on_click_internal)
+
+    def _on_click_internal(self, _event=None):
+        if callable(self.on_click):
+            self.on_click(self.action_key)
+
+    def set_selected(self, selected: bool):
+        if selected == self.selected:
+            return
+        self.selected = selected
+        try:
+            if selected:
+                self.configure(fg_color=BG_CARD_SELECTED, border_color=BORDER_CARD_SELECTED)
+            else:
+                self.configure(fg_color=BG_CARD, border_color=BORDER_CARD)
+        except tk.TclError:
+            pass
+
+    def set_width(self, width: int):
+        if width == self.width:
+            return
+        self.width = width
+        self.configure(width=width)
+        self.desc_lbl.configure(wraplength=max(180, width - 40))
+
+    def place_at(self, pos: int | None):
+        """Zeigt die Zeile an Grid-Position ``pos`` bzw. blendet sie aus (None)."""
+        if pos == self.grid_pos:
+            return
+        if pos is None:
+            self.grid_remove()
+        else:
+            self.grid(row=pos, column=0, sticky="ew", padx=4, pady=4)
+        self.grid_pos = pos
+
+
+# =============================================================================
+# Main-App
+# =============================================================================
+
+class WinRepApp(ctk.CTk):
+    def __init__(self, host_launcher: HostLauncher | None = None):
+        self.startup = Stopwatch()  # __init__ → Layout → erste Liste → Systeminfos
+        super().__init__()
+        _FONTS.clear()  # Fonts gehören zum jeweiligen Tk-Root
+
+        ctk.set_appearance_mode("light")
+        ctk.set_default_color_theme("blue")
+
+        self.title(APP_TITLE)
+        self.geometry(WINDOW_SIZE)
+        self.minsize(1120, 620)
+        self.resizable(False, False)  # bewusst fix
+        self.configure(fg_color=BG_WINDOW)
+
+        self._set_window_icon()
+
+        # Aktionen + Abläufe aus winrep_recipes.json (als Pseudo-Aktionen "recipe:<key>")
+        self.entries: Dict[str, WinRepAction] = dict(ACTIONS)
+        self.recipes: Dict[str, Recipe] = {}
+        self._recipe_error = ""
+        try:
+            for recipe in load_recipes().values():
+                entry = recipe.as_action()
+                self.entries[entry.key] = entry
+                self.recipes[entry.key] = recipe
+        except (OSError, ValueError) as exc:
+            self._recipe_error = f"Abläufe konnten nicht geladen werden: {exc}\n"
+
+        # Zeitlimits je Aktion (limits.json im Datenordner überschreibt die Vorgaben)
+        try:
+            self.limits: Dict[str, ActionLimits] = load_limits()
+        except (OSError, ValueError) as exc:
+            self.limits = {k: a.limits for k, a in ACTIONS.items()}
+            self._recipe_error += f"limits.json wird ignoriert: {exc}\n"
+
+        self.category_var = tk.StringVar(value="Alle")
+        self.selected_action: str | None = None
+
+        self.rows: Dict[str, ActionRow] = {}
+        self._list_resize_after_id: str | None = None
+
+        self.sys_computer = tk.StringVar(value="-")
+        self.sys_os = tk.StringVar(value="-")
+        self.sys_ip = tk.StringVar(value="-")
+        self.sys_cpu = tk.StringVar(value="-")
+        self.sys_boot = tk.StringVar(value="-")
+        self.sys_bitlocker = tk.StringVar(value="-")
+        self.sys_disk = tk.StringVar(value="-")
+        self.sysinfo_timings: Dict[str, float] = {}  # Probe → Sekunden (letzter Lauf)
+        self.sysinfo_cache = SysInfoCache(app_data_dir("cache") / "sysinfo.json")
+
+        self.bottom_logo = None  # Referenz für CTkImage
+
+        # Warme PowerShell-Hosts statt ein powershell.exe pro Aufruf
+        # (host_launcher: z. B. Wiedergabe-Host aus winrep_replay für Benchmarks)
+        self.ps_pool = PSHostPool(host_launcher, warm=1, max_size=PROBE_WORKERS + SCHED_MAX_PARALLEL)
+        threading.Thread(target=self._prewarm_hosts, daemon=True).start()
+
+        # Log-Ausgaben laufen über eine Queue, der GUI-Thread holt sie im Takt ab
+        self.log_pipeline = LogPipeline()
+        # Widget hält nur die letzten Zeilen, der Rest liegt im Sitzungslog
+        self.log_history = LogHistory.for_session(app_data_dir("logs"))
+        self.log_history.feed(LOG_PLACEHOLDER)
+        if self._recipe_error:
+            self._append_log(self._recipe_error)
+        self._log_view_first = 0      # Sitzungszeile der ersten Widget-Zeile
+        self._log_detached = False    # Ende der Ausgabe nicht im Widget (hochgeblättert)
+
+        self.metrics = default_writer()
+        self.results = default_result_store()  # letzter strukturierter Bericht je Aktion
+        try:
+            self.history = default_history()   # alle Läufe mit Ausgabe (SQLite)
+        except (OSError, sqlite3.Error) as exc:
+            self.history = None
+            self._append_log(f"Lauf-Historie nicht verfügbar: {exc}\n")
+
+        # Aktionen laufen über die Warteschlange (Ressourcenklassen statt freier Threads)
+        self.scheduler = ActionScheduler(self._run_job, on_change=self._schedule_queue_render)
+        self._queue_render_pending = False
+        self._queue_ticking = False
+        self._etas: Dict[int, EtaEstimator] = {}   # Job-ID → Restzeit-Schätzung
+
+        # Journal: offene Jobs der letzten Sitzung (Absturz/Neustart) vor dem neuen Journal suchen
+        journal_dir = app_data_dir("journal")
+        self._resume_plan = find_resumable(journal_dir)
+        self.journal = SessionJournal.for_session(journal_dir)
+        self._journaled_jobs: Set[int] = set()
+        self._resume_done: Dict[str, Dict[str, StepOutcome]] = {}  # Ablauf → bereits erledigte Schritte
+
+        self._build_layout()
+        self.startup.mark("layout")
+
+        self.after(0, self._initial_render)
+        self.after(LOG_FRAME_MS, self._drain_log)
+        self.after(200, self._load_system_info_async)
+        if self._resume_plan is not None:
+            self.after(500, self._offer_resume)
+
+    def _prewarm_hosts(self):
+        try:
+            self.ps_pool.prewarm()
+        except Exception:
+            pass  # Start wird beim ersten Aufruf erneut versucht
+
+    def destroy(self):
+        self.journal.close(pending=sum(1 for j in self.scheduler.jobs() if j.active))
+        try:
+            self.ps_pool.close()
+        except Exception:
+            pass
+        self.log_history.close()
+        if self.history is not None:
+            self.history.close()
+        super().destroy()
+
+    def _open_url(self, url: str):
+        try:
+            webbrowser.open(url, new=2)
+        except Exception as exc:
+            messagebox.showinfo(
+                "Info",
+                f"Link konnte nicht geöffnet werden:\n{exc}"
+            )
+    # -------------------------------------------------------------------------
+    # Icon
+    # -------------------------------------------------------------------------
+
+    def _set_window_icon(self):
+        candidates = ["winrep.ico", "WinRep.ico", "icon.ico"]
+        for name in candidates:
+            path = Path(resource_path(name))
+            if path.exists():
+                try:
+                    self.iconbitmap(str(path))
+                except Exception:
+                    pass
+                break
+
+    # -------------------------------------------------------------------------
+    # Layout
+    # -------------------------------------------------------------------------
+
+    def _build_layout(self):
+        # Root: 2 Zeilen (Hauptbereich + Footer), 2 Spalten (links + Hauptbereich)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=0)
+        self.grid_columnconfigure(0, weight=0)  # linke Spalte
+        self.grid_columnconfigure(1, weight=1)  # Mitte + Rechts + Footer
+
+        # --------------------------- Linke Spalte -----------------------------
+        LEFT_PANEL_WIDTH = 190
+        left = ctk.CTkFrame(self, fg_color=BG_WINDOW, width=LEFT_PANEL_WIDTH)
+        left.grid(row=0, column=0, rowspan=2, sticky="nsw", padx=(16, 8), pady=8)
+        left.grid_propagate(False)
+        left.grid_columnconfigure(0, weight=1)
+
+        ctk.CTkLabel(
+            left,
+            text="Kategorien",
+            font=shared_font(13, "bold"),
+        ).grid(row=0, column=0, sticky="w", padx=4, pady=(4, 6))
+
+        cats = ["Alle"] + sorted({a.category for a in self.entries.values()})
+        self.cat_buttons: List[ctk.CTkButton] = []
+
+        for i, cat in enumerate(cats, start=1):
+            btn = ctk.CTkButton(
+                left,
+                text=cat,
+                width=170,
+                height=34,
+                fg_color=BG_CARD_SELECTED if cat == "Alle" else BG_CARD,
+                border_width=1,
+                border_color=(BORDER_CARD_SELECTED if cat == "Alle" else BORDER_CARD),
+                text_color="#111827",
+                hover_color="#E5E7EB",
+                command=lambda c=cat: self._set_category(c),
+            )
+            btn.grid(row=i, column=0, sticky="ew", padx=4, pady=4)
+            self.cat_buttons.append(btn)
+
+        spacer_row = len(cats) + 1
+        left.grid_rowconfigure(spacer_row, weight=1)
+
+        logo_box = ctk.CTkFrame(
+            left,
+            fg_color=BG_CARD,
+            corner_radius=18,
+            border_width=1,
+            border_color=BORDER_CARD,
+            width=LEFT_PANEL_WIDTH,
+            height=120,
+        )
+        logo_box.grid(row=spacer_row + 1, column=0, sticky="sew", padx=4, pady=(0, 4))
+        logo_box.grid_propagate(False)
+
+        self.logo_label = ctk.CTkLabel(logo_box, text="")
+        self.logo_label.place(relx=0.5, rely=0.5, anchor="center")
+        self.logo_label.configure(cursor="hand2")
+        self.logo_label.bind("<Button-1>", lambda e: self._open_url(LOGO_URL))
+        self._load_bottom_logo()
+
+        # -------------------------- Hauptbereich ------------------------------
+        main = ctk.CTkFrame(self, fg_color=BG_WINDOW)
+        main.grid(row=0, column=1, sticky="nsew", padx=(0, 16), pady=(8, 0))
+        main.grid_rowconfigure(0, weight=1)
+        main.grid_columnconfigure(0, weight=1)  # Mitte
+        main.grid_columnconfigure(1, weight=0)  # Rechts
+
+        # Mitte: Aktionen
+        mid = ctk.CTkFrame(main, fg_color=BG_WINDOW, width=540)
+        mid.grid(row=0, column=0, sticky="nsw", padx=(8, 4), pady=(0, 8))
+        mid.grid_propagate(False)
+        mid.grid_columnconfigure(0, weight=1)
+        mid.grid_rowconfigure(1, weight=1)
+
+        ctk.CTkLabel(
+            mid,
+            text="Aktionen auswählen",
+            font=shared_font(17, "bold"),
+        ).grid(row=0, column=0, sticky="w", padx=4, pady=(4, 8))
+
+        list_wrapper = ctk.CTkFrame(mid, fg_color=BG_WINDOW)
+        list_wrapper.grid(row=1, column=0, sticky="nsew", padx=4, pady=(0, 4))
+        list_wrapper.grid_columnconfigure(0, weight=1)
+        list_wrapper.grid_rowconfigure(0, weight=1)
+
+        self.list_scroll = ctk.CTkScrollableFrame(
+            list_wrapper,
+            fg_color=BG_WINDOW,
+            corner_radius=0,
+        )
+        self.list_scroll.grid(row=0, column=0, sticky="nsew")
+        self.list_scroll.grid_columnconfigure(0, weight=1)
+
+        canvas = getattr(self.list_scroll, "_parent_canvas", None)
+        if canvas is not None:
+            canvas.bind("<Configure>", self._on_list_canvas_configure)
+
+        # Rechts: Systeminfos + Log
+        right = ctk.CTkFrame(main, fg_color=BG_WINDOW, width=400)
+        right.grid(row=0, column=1, sticky="nse", padx=(1, 0), pady=(0, 8))
+        right.grid_propagate(False)
+        right.grid_columnconfigure(0, weight=1)
+        right.grid_rowconfigure(3, weight=1)
+        right.grid_rowconfigure(5, weight=0)
+
+        header = ctk.CTkFrame(right, fg_color="transparent")
+        header.grid(row=0, column=0, sticky="ew", padx=6, pady=(4, 6))
+        header.grid_columnconfigure(0, weight=1)
+
+        ctk.CTkLabel(
+            header,
+            text="SD - TechTools",
+            font=shared_font(18, "bold"),
+        ).grid(row=0, column=0, sticky="w")
+
+        sys_box = ctk.CTkFrame(
+            right,
+            fg_color=BG_RIGHT_PANEL,
+            corner_radius=18,
+            border_width=1,
+            border_color=BORDER_CARD,
+        )
+        sys_box.grid(row=1, column=0, sticky="ew", padx=4, pady=(4, 6))
+        sys_box.grid_columnconfigure(0, weight=0)
+        sys_box.grid_columnconfigure(1, weight=1)
+
+        def add_row(r: int, label: str, var: ctk.StringVar):
+            ctk.CTkLabel(
+                sys_box,
+                text=label,
+                text_color=TEXT_MUTED,
+                anchor="w",
+                font=shared_font(10),
+            ).grid(row=r, column=0, sticky="w", padx=12, pady=(1, 1))
+
+            ctk.CTkLabel(
+                sys_box,
+                textvariable=var,
+                anchor="w",
+                justify="left",
+                wraplength=230,
+                font=shared_font(11),
+            ).grid(row=r, column=1, sticky="w", padx=12, pady=(1, 1))
+
+        add_row(0, "Betriebssystem:", self.sys_os)
+        add_row(1, "Boot:", self.sys_boot)
+        add_row(2, "BitLocker:", self.sys_bitlocker)
+        add_row(3, "Netzwerk-IP:", self.sys_ip)
+        add_row(4, "Systemlaufwerk C:\\", self.sys_disk)
+        add_row(5, "Prozessor:", self.sys_cpu)
+
+        ctk.CTkLabel(
+            right,
+            text="Aktuelles Log:",
+            font=shared_font(11, "bold"),
+        ).grid(row=2, column=0, sticky="w", padx=6, pady=(6, 2))
+
+        self.log_text = ctk.CTkTextbox(
+            right,
+            height=260,
+            fg_color=BG_CARD,
+            text_color="#111827",
+            wrap="word",
+            font=shared_font(10),
+        )
+        self.log_text.grid(row=3, column=0, sticky="nsew", padx=6, pady=(0, 8))
+        self.log_text.insert("end", LOG_PLACEHOLDER)
+        self.log_text.configure(state="disabled")
+
+        ctk.CTkLabel(
+            right,
+            text="Warteschlange:",
+            font=shared_font(11, "bold"),
+        ).grid(row=4, column=0, sticky="w", padx=6, pady=(0, 2))
+
+        self.queue_text = ctk.CTkTextbox(
+            right,
+            height=84,
+            fg_color=BG_CARD,
+            text_color="#111827",
+            wrap="none",
+            font=shared_font(10),
+        )
+        self.queue_text.grid(row=5, column=0, sticky="ew", padx=6, pady=(0, 8))
+        self.queue_text.insert("end", "Keine Aktionen eingereiht.")
+        self.queue_text.configure(state="disabled")
+
+        # ------------------------------ Footer -------------------------------
+        footer = ctk.CTkFrame(self, corner_radius=0, fg_color=BG_WINDOW)
+        footer.grid(row=1, column=1, sticky="ew", padx=(0, 16), pady=(4, 8))
+        footer.grid_columnconfigure(0, weight=1)
+        footer.grid_columnconfigure(1, weight=0)
+        footer.grid_columnconfigure(2, weight=0)
+        footer.grid_columnconfigure(3, weight=0)
+
+        self.progress = ctk.CTkProgressBar(
+            footer,
+            progress_color=ACCENT,
+            fg_color="#E5E7EB",
+            height=10,
+            corner_radius=999,
+        )
+        self.progress.grid(row=0, column=0, columnspan=5, sticky="ew", padx=(8, 0), pady=(4, 8))
+        self.progress.set(0.0)
+
+        self.eta_lbl = ctk.CTkLabel(
+            footer,
+            text="",
+            text_color=TEXT_MUTED,
+            font=shared_font(10),
+        )
+        self.eta_lbl.grid(row=0, column=5, sticky="e", padx=(8, 0), pady=(4, 8))
+
+        self.status_lbl = ctk.CTkLabel(
+            footer,
+            text="Bereit.",
+            text_color=TEXT_MUTED,
+            font=shared_font(10),
+        )
+        self.status_lbl.grid(row=1, column=0, sticky="w", padx=8, pady=(0, 8))
+
+        self.footer_brand = ctk.CTkLabel(
+            footer,
+            text="© 2026 SD-ITLab – MIT licensed",
+            font=shared_font(10),
+            text_color=TEXT_MUTED,
+            cursor="hand2",
+        )
+        self.footer_brand.grid(row=1, column=1, sticky="e", padx=(0, 10), pady=(0, 8))
+        self.footer_brand.bind("<Button-1>", lambda e: self._open_url(BRAND_URL))
+        self.footer_brand.bind("<Enter>", lambda e: self.footer_brand.configure(text_color=ACCENT))
+        self.footer_brand.bind("<Leave>", lambda e: self.footer_brand.configure(text_color=TEXT_MUTED))
+
+
+        self.btn_readme = ctk.CTkButton(
+            footer,
+            text="Readme",
+            width=100,
+            command=lambda: self._open_url(README_URL),
+        )
+        self.btn_readme.grid(row=1, column=2, padx=6, pady=(0, 8))
+
+        self.btn_run = ctk.CTkButton(
+            footer,
+            text="Aktion ausführen",
+            width=130,
+            command=self._run_selected_action,
+        )
+        self.btn_run.grid(row=1, column=3, padx=6, pady=(0, 8))
+
+        self.btn_cancel = ctk.CTkButton(
+            footer,
+            text="Abbrechen",
+            width=100,
+            fg_color="#9CA3AF",
+            hover_color="#6B7280",
+            command=self._cancel_action,
+        )
+        self.btn_cancel.grid(row=1, column=4, padx=6, pady=(0, 8))
+
+        self.btn_close = ctk.CTkButton(
+            footer,
+            text="Schließen",
+            width=110,
+            command=self.destroy,
+        )
+        self.btn_close.grid(row=1, column=5, padx=(6, 0), pady=(0, 8))
+
+
+
+    # -------------------------------------------------------------------------
+    # Logo
+    # -------------------------------------------------------------------------
+
+    def _load_bottom_logo(self):
+        try:
+            logo_path = resource_path("logo1.png")
+            img = Image.open(logo_path).convert("RGBA")
+        except Exception:
+            self.logo_label.configure(
+                text="SD-ITLAB",
+                text_color=TEXT_MUTED,
+                font=shared_font(11, "bold"),
+            )
+            return
+
+        max_width, max_height = 190, 100
+        ratio = img.width / img.height
+
+        if ratio > (max_width / max_height):
+            new_w = max_width
+            new_h = int(max_width / ratio)
+        else:
+            new_h = max_height
+            new_w = int(max_height * ratio)
+
+        img = img.resize((new_w, new_h), Image.LANCZOS)
+
+        self.bottom_logo = ctk.CTkImage(
+            light_image=img,
+            dark_image=img,
+            size=(new_w, new_h),
+        )
+        self.logo_label.configure(image=self.bottom_logo, text="")
+
+    # -------------------------------------------------------------------------
+    # Rendering / Filter
+    # -------------------------------------------------------------------------
+
+    def _get_row_width(self) -> int:
+        try:
+            canvas = getattr(self.list_scroll, "_parent_canvas", None)
+            if canvas is not None:
+                w = int(canvas.winfo_width() or 0)
+                if w > 50:
+                    return max(1, w - 28)
+        except Exception:
+            pass
+        return 520 - 24
+
+    def _on_list_canvas_configure(self, _event=None):
+        if self._list_resize_after_id is not None:
+            try:
+                self.after_cancel(self._list_resize_after_id)
+            except Exception:
+                pass
+        self._list_resize_after_id = self.after(50, self._resize_rows_to_canvas)
+
+    def _resize_rows_to_canvas(self):
+        self._list_resize_after_id = None
+        if not self.rows:
+            return
+        new_w = self._get_row_width()
+        if not new_w:
+            return
+        for r in self.rows.values():
+            r.set_width(new_w)
+
+    def _initial_render(self):
+        self._render_action_list()
+        self.update_idletasks()
+        self.startup.mark("first_render")
+        self.after(80, self._resize_rows_to_canvas)
+
+    def _set_category(self, cat: str):
+        self.category_var.set(cat)
+        for b in self.cat_buttons:
+            if b.cget("text") == cat:
+                b.configure(fg_color=BG_CARD_SELECTED, border_color=BORDER_CARD_SELECTED)
+            else:
+                b.configure(fg_color=BG_CARD, border_color=BORDER_CARD)
+        self._render_action_list()
+
+    def _filtered_keys(self) -> List[str]:
+        cat = self.category_var.get()
+        keys = list(self.entries.keys())
+        if cat and cat != "Alle":
+            keys = [k for k in keys if self.entries[k].category == cat]
+        return sorted_action_keys(keys)
+
+    def _render_action_list(self):
+        """
+        Jede ActionRow wird nur einmal gebaut (Pool in ``self.rows``).
+        Ein Kategoriewechsel blendet Zeilen nur ein/aus bzw. sortiert sie um.
+        """
+        keys = self._filtered_keys()
+        row_width = self._get_row_width()
+
+        visible = set(keys)
+        for k, r in self.rows.items():
+            if k not in visible:
+                r.place_at(None)
+
+        for i, k in enumerate(keys):
+            r = self.rows.get(k)
+            if r is None:
+                r = ActionRow(self.list_scroll, self.entries[k], on_click=self._on_action_clicked, width=row_width)
+                r.set_selected(k == self.selected_action)
+                self.rows[k] = r
+            r.place_at(i)
+
+    def _on_action_clicked(self, action_key: str):
+        self.selected_action = action_key
+        for k, row in self.rows.items():
+            row.set_selected(k == action_key)
+
+    # -------------------------------------------------------------------------
+    # PowerShell Helper
+    # -------------------------------------------------------------------------
+
+    def _run_ps1_action(
+        self,
+        action: WinRepAction,
+        job: Job | None = None,
+        clear_log: bool = True,
+        on_report: Callable[[ActionReport], None] | None = None,
+    ) -> int | None:
+        """
+        Führt eine Aktion über die externe winrep_actions.ps1 aus.
+        Die PS1 bekommt den Parameter -Action <action_key>.
+        Ausgabe-Kodierung: CP850 (damit Umlaute von DISM/SFC korrekt sind).
+        Laufen mehrere Aktionen parallel, gehört der Fortschrittsbalken der
+        zuerst gestarteten; alle Ausgaben landen im selben Log.
+        Rückgabe: Rückgabecode des Skripts (127 = PS1 fehlt, 126 = Startfehler).
+        """
+        script_path = actions_script_path()
+
+        if not script_path.exists():
+            self._append_log(
+                "winrep_actions.ps1 wurde nicht gefunden.\n"
+                "Bitte die Datei im gleichen Verzeichnis wie WinRep ablegen.\n"
+            )
+            self.after(
+                0,
+                self.status_lbl.configure,
+                {"text": f"Aktion fehlgeschlagen: {action.title} (PS1 fehlt)"},
+            )
+            self.after(1200, self._set_progress, job, 0.0)
+            return RC_SCRIPT_MISSING
+
+        if clear_log and len(self.scheduler.running()) <= 1:
+            self._clear_log()
+        else:
+            self._append_log("\n" + "=" * 40 + "\n")
+        self._append_log(f"Starte Aktion: {action.title}\n")
+        self._append_log(f"Script: {script_path.name}\n\n")
+
+        self.after(0, self._set_progress, job, 0.2)
+
+        parser = ProgressParser()
+        throttle = ProgressThrottle()
+        events = EventStream()
+        report = ActionReport(action.key)
+        if action.key in TEMPSCAN_ACTIONS:
+            scan = estimate_cleanup(report)
+            self._append_log(f"Vorschau (eigener Scan, cleanmgr entfernt ggf. mehr):\n{scan.format_text()}\n\n")
+
+        pending = ""        # Zeilenstück ohne Zeilenende (für den Parser)
+        in_bar = False      # letzte Zeile war ein umgewandelter Balken
+
+        def on_event(event):
+            report.apply(event)
+            if event.type.startswith("step_"):
+                parser.steps = False  # echte Schritte statt "n/m:"-Zeilen
+                # Schrittwechsel immer anzeigen (neuer Text in der Statuszeile)
+                self.after(0, self._show_progress, action, report.fraction(), report.step_label(), job)
+            elif event.type == "progress":
+                fraction = report.fraction()
+                if fraction is not None and throttle.should_emit(fraction):
+                    self.after(0, self._show_progress, action, fraction, report.step_label(), job)
+
+        def on_output(text: str):
+            nonlocal pending, in_bar
+            if job is not None:
+                self.journal.output(job.id, text)
+            text, found = events.feed(text)
+            for event in found:
+                on_event(event)
+            if not text:
+                return
+            if text.endswith("\n") and is_transient_line(text):
+                text = text[:-1] + "\r"
+                in_bar = True
+            elif in_bar:
+                # Balken abschließen, damit der Endstand im Log stehen bleibt
+                text = "\n" + text
+                in_bar = False
+            self._append_log(text)
+            if not text.endswith(("\n", "\r")):
+                pending += text
+                return
+            line, pending = pending + text, ""
+            within = parser.feed(line)
+            if within is None:
+                return
+            fraction = report.fraction(within)  # z. B. DISM-Balken innerhalb eines Schritts
+            if throttle.should_emit(fraction):
+                self.after(0, self._show_progress, action, fraction, report.step_label(), job)
+
+        def on_alert(kind: str, seconds: float):
+            # Watchdog-Thread: nur melden, Beenden übernimmt das harte Limit
+            text = describe_alert(kind, seconds)
+            self._append_log(f"\n[Watchdog] {action.title}: {text}\n")
+            if job is not None:
+                self.scheduler.set_alert(job, "" if kind == ALERT_RESUMED else text)
+            if kind != ALERT_RESUMED and self._owns_progress(job):
+                self.after(0, self.status_lbl.configure, {"text": f"{action.title}: {text}"})
+
+        control = self.limits.get(action.key, action.limits).control(on_alert)
+        if job is not None:
+            self.scheduler.attach(job, control)
+            self._start_eta(action, job)
+        started = time.time()
+        try:
+            result = run_ps1_action(self.ps_pool, action, on_output=on_output, control=control)
+        except (HostError, OSError) as exc:
+            self._append_log(f"[Fehler beim Start von PowerShell] {exc}\n")
+            self.after(
+                0,
+                self.status_lbl.configure,
+                {"text": f"Fehler bei Aktion: {action.title}"},
+            )
+            self.after(1200, self._set_progress, job, 0.0)
+            return RC_START_FAILED
+        finally:
+            if job is not None:
+                self.scheduler.attach(job, None)
+                self._etas.pop(job.id, None)
+                job.eta = ""
+                self.scheduler.set_alert(job, "")
+
+        rc = result.returncode
+        rest = events.flush()
+        if rest:
+            self._append_log(rest)
+        report.finish(rc)
+        triage_text = self._triage(report, started)
+        battery_text = self._analyze_battery(report)
+        self.results.put(report)
+        if on_report is not None:
+            on_report(report)
+        self.metrics.write("action", action.key, status=report.status, **host_result_fields(result))
+        self._record_history(report, result, triage_text, battery_text)
+        self._invalidate_system_info(action.invalidates)
+
+        self.after(0, self._set_progress, job, 1.0)
+        if rc == 0:
+            self.after(
+                0,
+                self.status_lbl.configure,
+                {"text": self._result_text(action, report, "OK")},
+            )
+
+            # Spezielles Verhalten für CHKDSK: Neustart anbieten
+            if action.key == "chkdsk_c":
+                def ask_restart():
+                    from tkinter import messagebox
+
+                    if messagebox.askyesno(
+                        "Neustart für CHKDSK",
+                        "Die Reparatur von Laufwerk C: wurde mit CHKDSK /F "
+                        "für den nächsten Systemstart eingeplant.\n\n"
+                        "Möchten Sie den Computer jetzt neu starten?",
+                    ):
+                        self._append_log(
+                            "\nNeustart wird vorbereitet ...\n"
+                            "Windows führt CHKDSK vor dem Hochfahren aus.\n"
+                        )
+                        # offene Jobs nach dem Neustart zum Fortsetzen anbieten
+                        self.journal.append("reboot", durable=True, reason=action.key)
+                        try:
+                            subprocess.Popen(
+                                ["shutdown", "/r", "/t", "0"],
+                                stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL,
+                            )
+                        except Exception as exc:
+                            self._append_log(
+                                f"[Fehler beim Neustart] {exc}\n"
+                            )
+                    else:
+                        self._append_log(
+                            "\nNeustart wurde vom Benutzer abgebrochen. "
+                            "CHKDSK wird beim nächsten manuellen Neustart "
+                            "trotzdem ausgeführt.\n"
+                        )
+
+                # Dialog im GUI-Thread anzeigen
+                self.after(0, ask_restart)
+
+        else:
+            if result.timed_out or result.cancelled:
+                self._append_log(f"\n[{control.reason}] Prozessbaum von {action.title} wurde beendet.\n")
+            elif result.crashed:
+                self._append_log(
+                    f"\n[PowerShell-Host unerwartet beendet] {action.title} ist nicht vollständig gelaufen.\n"
+                )
+            self._append_log(f"\nScript Rückgabecode: {rc}\n")
+            self.after(
+                0,
+                self.status_lbl.configure,
+                {"text": self._result_text(action, report, describe_returncode(rc))},
+            )
+
+        self.after(1500, self._set_progress, job, 0.0)
+        return rc
+
+    def _triage(self, report: ActionReport, started: float) -> str:
+        """CBS.log/dism.log ab Laufbeginn auswerten, wenn die Aktion fehlgeschlagen ist."""
+        summaries = triage_report(report, started)
+        if not summaries:
+            return ""
+        text = "\n".join(s.format_text() for s in summaries)
+        self._append_log(f"\n[Log-Auswertung]\n{text}\n")
+        return text
+
+    def _analyze_battery(self, report: ActionReport) -> str:
+        """Nach battery_info: Kapazitätsverlauf aus dem Batteriereport auswerten."""
+        parsed = analyze_battery_report(report)
+        if parsed is None:
+            return ""
+        text = parsed.format_text()
+        self._append_log(f"\n[Akku-Verlauf]\n{text}\n")
+        return text
+
+    def _record_history(self, report: ActionReport, result, triage_text: str = "", battery_text: str = ""):
+        if self.history is None:
+            return
+        try:
+            self.history.record(
+                current_machine(self.sysinfo_cache.values(), self.sysinfo_cache.machine),
+                report.action,
+                report.returncode,
+                wall_s=result.duration,
+                status=report.status,
+                message=report.message,
+                metrics=report.metrics,
+                output=result.output
+                + (f"\n[Log-Auswertung]\n{triage_text}\n" if triage_text else "")
+                + (f"\n[Akku-Verlauf]\n{battery_text}\n" if battery_text else ""),
+                timings=host_result_fields(result),
+            )
+        except sqlite3.Error as exc:
+            self._append_log(f"[Historie] Lauf nicht gespeichert: {exc}\n")
+
+    def _start_eta(self, action: WinRepAction, job: Job):
+        """Worker-Thread: Erfahrungswert aus der Historie holen (einmal je Aktion)."""
+        prior = None
+        if self.history is not None:
+            # dieselbe Normalisierung wie beim Schreiben der Historie ("Unbekannt" → "")
+            machine = current_machine(self.sysinfo_cache.values(), self.sysinfo_cache.machine)
+            try:
+                prior = predict(self.history, action.key, machine.cpu, machine.disk)
+            except sqlite3.Error:
+                prior = None
+        if prior is not None:
+            self._append_log(
+                f"Erfahrungswert: ~{prior.seconds / 60:.0f} min ({prior.samples} Läufe, {prior.basis})\n\n"
+            )
+        self._etas[job.id] = EtaEstimator(prior)
+
+    def _update_etas(self):
+        """GUI-Thread: Restzeiten aller laufenden Jobs fortschreiben (reine Arithmetik)."""
+        owner_text = ""
+        running = self.scheduler.running()
+        for job in running:
+            estimator = self._etas.get(job.id)
+            if estimator is None:
+                continue
+            remaining = estimator.update(job.fraction)
+            job.eta = format_eta(remaining, estimator.overdue())
+            if job is running[0]:
+                owner_text = job.eta
+        self.eta_lbl.configure(text=owner_text)
+
+    def _owns_progress(self, job: Job | None) -> bool:
+        """Fortschrittsbalken/Statuszeile gehören der ältesten laufenden Aktion."""
+        running = self.scheduler.running()
+        return job is None or not running or running[0] is job
+
+    def _set_progress(self, job: Job | None, value: float):
+        if self._owns_progress(job):
+            self.progress.set(value)
+
+    def _show_progress(self, action: WinRepAction, fraction: float, detail: str = "", job: Job | None = None):
+        """GUI-Thread: echten Fortschritt aus der Ausgabe anzeigen."""
+        if job is not None:
+            self.scheduler.set_fraction(job, fraction)
+        if not self._owns_progress(job):
+            return
+        self.progress.set(fraction)
+        text = f"Führe Aktion aus: {action.title} – {fraction * 100:.0f} %"
+        if detail:
+            text += f" – {detail}"
+        self.status_lbl.configure(text=text)
+
+    @staticmethod
+    def _result_text(action: WinRepAction, report: ActionReport, outcome: str) -> str:
+        text = f"Fertig: {action.title} ({outcome})"
+        if report.message:
+            text += f" – {report.message}"
+        if report.warnings:
+            text += f" – {len(report.warnings)} Hinweis(e): {'; '.join(report.warnings)}"
+        return text
+
+    # -------------------------------------------------------------------------
+    # Aktionen ausführen – alles über winrep_actions.ps1
+    # -------------------------------------------------------------------------
+
+    def _run_selected_action(self):
+        if not self.selected_action:
+            self._append_log("Bitte zuerst eine Aktion auswählen.\n")
+            return
+
+        action = self.entries[self.selected_action]
+
+        if action.confirm:
+            from tkinter import messagebox
+
+            if not messagebox.askyesno(
+                "Windows-Edition upgraden",
+                "Diese Aktion versucht, ein Windows Home auf Windows Pro zu upgraden.\n"
+                "Nur auf Systemen ausführen, auf denen du das wirklich möchtest.\n\n"
+                "Fortfahren?",
+            ):
+                return
+
+        job = self._submit(action)
+        if job.state == JOB_QUEUED:
+            reason = RESOURCE_LABELS.get(job.blocked_by, "")
+            self.status_lbl.configure(
+                text=f"Eingereiht: {action.title}" + (f" (wartet auf {reason})" if reason else "")
+            )
+        elif job.state == JOB_RUNNING and self._owns_progress(job):
+            self.status_lbl.configure(text=f"Führe Aktion aus: {action.title}")
+            self.progress.set(0.1)
+
+    def _cancel_action(self):
+        """Job der ausgewählten Aktion abbrechen, sonst die älteste laufende Aktion."""
+        jobs = [j for j in self.scheduler.jobs() if j.active]
+        target = next((j for j in jobs if j.action.key == self.selected_action), None)
+        if target is None:
+            running = self.scheduler.running()
+            target = running[0] if running else None
+        if target is None:
+            self.status_lbl.configure(text="Keine laufende Aktion zum Abbrechen.")
+            return
+        if target.state == JOB_RUNNING and not messagebox.askyesno(
+            "Aktion abbrechen",
+            f"„{target.action.title}“ läuft gerade.\n\n"
+            "Die Aktion wird samt aller gestarteten Programme (DISM, SFC, cleanmgr …) "
+            "sofort beendet. Fortfahren?",
+        ):
+            return
+        if self.scheduler.cancel(target.id):
+            self.journal.append("cancelled", durable=True, job=target.id)
+            self.status_lbl.configure(text=f"Abgebrochen: {target.action.title}")
+
+    def _submit(self, action: WinRepAction) -> Job:
+        """Einreihen und (einmal je Job) dauerhaft im Journal vermerken."""
+        job = self.scheduler.submit(action)
+        if job.id not in self._journaled_jobs:
+            self._journaled_jobs.add(job.id)
+            self.journal.append("queued", durable=True, job=job.id, key=action.key, title=action.title)
+        return job
+
+    def _run_job(self, job: Job) -> int | None:
+        """Läuft im Worker-Thread des Schedulers."""
+        action = job.action
+        self.journal.append("started", job=job.id)
+        rc: int | None = None
+        try:
+            recipe = self.recipes.get(action.key)
+            if recipe is not None:
+                rc = self._run_recipe(recipe, job)
+            else:
+                rc = self._run_action(action, job)
+            return rc
+        except Exception as exc:
+            self._append_log(f"\n[Fehler] {exc}\n")
+            self.after(
+                0,
+                self.status_lbl.configure,
+                {"text": f"Fehler bei Aktion: {action.title}"},
+            )
+            self.after(1200, self._set_progress, job, 0.0)
+            return None
+        finally:
+            self.journal.append("finished", durable=True, job=job.id, rc=rc)
+
+    def _run_action(
+        self,
+        action: WinRepAction,
+        job: Job,
+        clear_log: bool = True,
+        on_report: Callable[[ActionReport], None] | None = None,
+    ) -> int | None:
+        """Einzelne Aktion (auch als Ablaufschritt): Python-Aktionen direkt, alle übrigen über die PS1."""
+        if action.key == INVENTORY_ACTION:
+            return self._run_inventory(action, job, clear_log, on_report)
+        if action.key == CRASHSCAN_ACTION:
+            return self._run_crashscan(action, job, clear_log, on_report)
+        return self._run_ps1_action(action, job, clear_log=clear_log, on_report=on_report)
+
+    def _start_native(self, action: WinRepAction, job: Job, clear_log: bool = True):
+        """Kopf für Aktionen, die ohne PS1 in Python laufen."""
+        if clear_log and len(self.scheduler.running()) <= 1:
+            self._clear_log()
+        self._append_log(f"Starte Aktion: {action.title}\n\n")
+        self.after(0, self._set_progress, job, 0.2)
+
+    def _finish_native(self, action: WinRepAction, job: Job, report: ActionReport, seconds: float,
+                       output: str, timings: Dict[str, object] | None = None,
+                       on_report: Callable[[ActionReport], None] | None = None) -> int:
+        """Ergebnis, Metriken und Historie wie bei PS1-Aktionen ablegen."""
+        self.results.put(report)
+        if on_report is not None:
+            on_report(report)
+        self.metrics.write("action", action.key, status=report.status, wall_s=round(seconds, 3), **(timings or {}))
+        if self.history is not None:
+            try:
+                self.history.record(
+                    current_machine(self.sysinfo_cache.values(), self.sysinfo_cache.machine),
+                    action.key, report.returncode, wall_s=seconds, status=report.status,
+                    message=report.message, metrics=report.metrics, timings=timings, output=output,
+                )
+            except sqlite3.Error as exc:
+                self._append_log(f"[Historie] Lauf nicht gespeichert: {exc}\n")
+        self.after(0, self._set_progress, job, 1.0)
+        outcome = "OK" if report.returncode == 0 else "Fehler"
+        self.after(0, self.status_lbl.configure, {"text": self._result_text(action, report, outcome)})
+        self.after(1500, self._set_progress, job, 0.0)
+        return report.returncode
+
+    def _run_inventory(self, action: WinRepAction, job: Job, clear_log: bool = True,
+                       on_report: Callable[[ActionReport], None] | None = None) -> int:
+        """Systeminformationen in Python sammeln (Abschnitte parallel) und als TXT/JSON/HTML ablegen."""
+        self._start_native(action, job, clear_log)
+        t0 = time.perf_counter()
+        backend = PowerShellBackend(lambda ps, timeout: self._run_powershell(ps, timeout, "inventory"))
+        inv = collect_inventory(backend, max_workers=INVENTORY_WORKERS)
+        seconds = time.perf_counter() - t0
+        paths = write_reports(inv, desktop_dir()) if len(inv.errors) < len(inv.timings) else []
+        report = inventory_report(inv, paths, seconds)
+
+        for warning in report.warnings:
+            self._append_log(f"Nicht verfügbar – {warning}\n")
+        for path in paths:
+            self._append_log(f"Geschrieben: {path}\n")
+        html_path = next((p for p in paths if p.suffix == ".html"), None)
+        if html_path is not None and hasattr(os, "startfile"):
+            try:
+                os.startfile(str(html_path))
+            except OSError as exc:
+                self._append_log(f"[Report konnte nicht geöffnet werden] {exc}\n")
+        return self._finish_native(action, job, report, seconds, "\n".join(str(p) for p in paths),
+                                   {"sections": dict(inv.timings)}, on_report)
+
+    def _run_crashscan(self, action: WinRepAction, job: Job, clear_log: bool = True,
+                       on_report: Callable[[ActionReport], None] | None = None) -> int:
+        """Minidumps und MEMORY.DMP auswerten (nur Kopfdaten) – Häufigkeit je Bugcheck."""
+        self._start_native(action, job, clear_log)
+        summary = scan_dumps()
+        report = crashscan_report(summary)
+        text = summary.format_text(verbose=len(summary.dumps) <= CRASHSCAN_VERBOSE_MAX)
+        self._append_log(text + "\n")
+        return self._finish_native(action, job, report, summary.seconds, text, on_report=on_report)
+
+    def _run_recipe(self, recipe: Recipe, job: Job) -> int:
+        """Ablauf: Schritte direkt nacheinander, ohne Pause; Bedingungen entscheiden über Überspringen."""
+        total = len(recipe.steps)
+        if len(self.scheduler.running()) <= 1:
+            self._clear_log()
+        self._append_log(f"Starte Ablauf: {recipe.title}\n{recipe.description}\n\n")
+
+        def execute(step) -> StepOutcome:
+            reports: List[ActionReport] = []
+            rc = self._run_action(ACTIONS[step.action], job, clear_log=False, on_report=reports.append)
+            return StepOutcome(rc, reports[0].status if reports else None)
+
+        def on_start(index: int, step):
+            self._append_log("\n" + "=" * 40 + f"\n[Ablauf {index}/{total}]\n")
+
+        def on_step(index: int, record):
+            self._append_log("\n" + describe_record(index, total, record) + "\n")
+            self.journal.append(
+                "step", durable=True, job=job.id, step=record.step.id,
+                state=record.state, rc=record.returncode, status=record.status,
+            )
+
+        done = self._resume_done.pop(job.action.key, None)
+        run = run_recipe(
+            recipe, execute, on_step=on_step, on_start=on_start, done=done,
+            cancelled=lambda: job.cancel_requested,
+        )
+        self.metrics.write(
+            "recipe",
+            recipe.key,
+            wall_s=round(run.seconds, 3),
+            returncode=run.returncode,
+            steps=[{"id": r.step.id, "state": r.state, "rc": r.returncode, "status": r.status,
+                    "s": round(r.seconds, 1)} for r in run.records],
+        )
+        self._append_log(f"\nAblauf beendet: {run.summary()} ({run.seconds / 60:.1f} min)\n")
+        self.after(
+            0,
+            self.status_lbl.configure,
+            {"text": f"Ablauf fertig: {recipe.title} – {run.summary()}"},
+        )
+        return run.returncode
+
+    def _offer_resume(self):
+        """GUI-Thread: offene Jobs der letzten Sitzung erneut einreihen?"""
+        plan: ResumePlan = self._resume_plan
+        self._resume_plan = None
+        items = [i for i in plan.items if i.key in self.entries]
+        if not items:
+            mark_resolved(plan, False)
+            return
+        lines = []
+        for item in items:
+            note = " (lief gerade)" if item.was_running else ""
+            if item.done_steps:
+                note += f" – {len(item.done_steps)} Schritt(e) bereits erledigt"
+            lines.append(f"• {item.title.split(' [')[0]}{note}")
+        reason = "wurde für einen Neustart beendet" if plan.reboot else "wurde nicht sauber beendet"
+        resume = messagebox.askyesno(
+            "Letzte Sitzung fortsetzen",
+            f"Die Sitzung vom {plan.started} {reason}.\n"
+            "Offen waren:\n\n" + "\n".join(lines) + "\n\nJetzt erneut einreihen?",
+        )
+        mark_resolved(plan, resume)
+        if not resume:
+            return
+        self._append_log(f"Setze Sitzung vom {plan.started} fort ({len(items)} Aktion(en)).\n")
+        for item in items:
+            if item.done_steps:
+                self._resume_done[item.key] = {
+                    step: StepOutcome(d.get("returncode"), d.get("status"))
+                    for step, d in item.done_steps.items()
+                }
+            self._submit(self.entries[item.key])
+
+    # -------------------------------------------------------------------------
+    # Warteschlange
+    # -------------------------------------------------------------------------
+
+    def _schedule_queue_render(self):
+        """Aus beliebigem Thread: Ansicht höchstens einmal pro Frame neu aufbauen."""
+        if self._queue_render_pending:
+            return
+        self._queue_render_pending = True
+        try:
+            self.after(LOG_FRAME_MS, self._render_queue)
+        except RuntimeError:
+            pass  # Fenster wird gerade geschlossen
+
+    def _render_queue(self):
+        self._queue_render_pending = False
+        self._update_etas()
+        jobs = self.scheduler.jobs()
+        order = {JOB_RUNNING: 0, JOB_QUEUED: 1}
+        active = sorted((j for j in jobs if j.active), key=lambda j: (order[j.state], j.id))
+        finished = sorted((j for j in jobs if not j.active), key=lambda j: -(j.finished or 0.0))
+        lines = [describe_job(j) for j in active + finished]
+
+        self.queue_text.configure(state="normal")
+        self.queue_text.delete("1.0", "end")
+        self.queue_text.insert("end", "\n".join(lines) if lines else "Keine Aktionen eingereiht.")
+        self.queue_text.configure(state="disabled")
+
+        if not self._queue_ticking and any(j.state == JOB_RUNNING for j in jobs):
+            # Laufzeit der laufenden Aktionen aktuell halten
+            self._queue_ticking = True
+            self.after(1000, self._queue_tick)
+
+    def _queue_tick(self):
+        self._queue_ticking = False
+        self._render_queue()
+
+    # -------------------------------------------------------------------------
+    # Log Helpers
+    # -------------------------------------------------------------------------
+
+    def _clear_log(self):
+        """Threadsicher: das Leeren passiert beim nächsten Frame im GUI-Thread."""
+        self.log_pipeline.clear()
+
+    def _append_log(self, text: str):
+        """Threadsicher: Text wird gesammelt und gebündelt eingefügt."""
+        self.log_pipeline.push(text)
+
+    def _drain_log(self):
+        try:
+            clear, replace, text = self.log_pipeline.drain()
+            if clear or text or replace:
+                t0 = time.perf_counter()
+                self.log_text.configure(state="normal")
+                if clear:
+                    self.log_text.delete("1.0", "end")
+                    self.log_history.mark_clear()
+                    self._log_view_first = self.log_history.total
+                    self._log_detached = False
+                if text or replace:
+                    self.log_history.feed(text, replace_partial=replace)
+                    if not self._log_detached:
+                        following = self.log_text.yview()[1] >= 0.999
+                        if not following and self._log_widget_lines() >= LOG_VIEW_MAX_LINES:
+                            # Benutzer liest gerade weiter oben – Widget nicht weiter wachsen lassen
+                            self._log_detached = True
+                        else:
+                            if replace:
+                                # "\r"-Update (z. B. DISM-Balken): letzte Zeile ersetzen
+                                self.log_text.delete("end-1c linestart", "end-1c")
+                            self.log_text.insert("end", text)
+                            self._trim_log_top()
+                            if following:
+                                self.log_text.see("end")
+                self.log_text.configure(state="disabled")
+                self.log_pipeline.record_frame(time.perf_counter() - t0)
+            self._page_log_view()
+        except tk.TclError:
+            return  # Fenster wird gerade geschlossen
+        self.after(LOG_FRAME_MS, self._drain_log)
+
+    def _log_widget_lines(self) -> int:
+        return int(self.log_text.index("end-1c").split(".")[0])
+
+    def _trim_log_top(self):
+        """Hält das Widget bei ~LOG_VIEW_LINES Zeilen; Älteres bleibt im Sitzungslog."""
+        excess = self._log_widget_lines() - LOG_VIEW_LINES
+        if excess > LOG_PAGE_LINES // 5 and self.log_text.yview()[1] >= 0.999:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self._log_view_first += excess
+
+    def _page_log_view(self):
+        """Lädt beim Hochscrollen ältere Zeilen nach bzw. springt am Ende zurück zum Live-Log."""
+        top, bottom = self.log_text.yview()
+        history = self.log_history
+
+        if top <= 0.0 and self._log_view_first > history.floor:
+            start = max(history.floor, self._log_view_first - LOG_PAGE_LINES)
+            lines = history.read_lines(start, self._log_view_first)
+            if not lines:
+                return
+            self.log_text.configure(state="normal")
+            self.log_text.insert("1.0", "".join(lines))
+            self._log_view_first = start
+            overflow = self._log_widget_lines() - LOG_VIEW_MAX_LINES
+            if overflow > 0:
+                # Unten abschneiden, das Live-Ende kommt beim Zurückscrollen aus dem Ringpuffer
+                self.log_text.delete(f"{LOG_VIEW_MAX_LINES}.0", "end")
+                self._log_detached = True
+            self.log_text.configure(state="disabled")
+            self.log_text.yview("moveto", len(lines) / max(1, self._log_widget_lines()))
+
+        elif bottom >= 1.0 and self._log_detached:
+            first, text = history.tail_view()
+            self.log_text.configure(state="normal")
+            self.log_text.delete("1.0", "end")
+            self.log_text.insert("end", text)
+            self.log_text.configure(state="disabled")
+            self.log_text.see("end")
+            self._log_view_first = first
+            self._log_detached = False
+
+    # -------------------------------------------------------------------------
+    # Systeminfo
+    # -------------------------------------------------------------------------
+
+    def _run_powershell(self, ps: str, timeout: float = 60.0, label: str = "powershell") -> str:
+        try:
+            result = self.ps_pool.run(ps, timeout=timeout)
+        except Exception:
+            return ""
+        self.metrics.write("probe", label, **host_result_fields(result))
+        if result.timed_out or result.crashed:
+            return ""
+        return (result.output or "").strip()
+
+    def _sys_var_for(self, key: str) -> tk.StringVar | None:
+        return {
+            "OS": self.sys_os,
+            "Boot": self.sys_boot,
+            "BitLocker": self.sys_bitlocker,
+            "IPv4": self.sys_ip,
+            "CPU": self.sys_cpu,
+            "Disk": self.sys_disk,
+        }.get(key)
+
+    def _on_probe_result(self, res: ProbeResult):
+        """Aus dem Probe-Thread: Wert sofort im GUI-Thread setzen."""
+        self.sysinfo_timings[res.key] = res.seconds
+        self.sysinfo_cache.put(res)
+        var = self._sys_var_for(res.key)
+        if var is not None:
+            self.after(0, var.set, res.value)
+
+    def _refresh_system_info(self, probes: List[SysProbe], on_done=None):
+        if not probes:
+            if on_done is not None:
+                on_done()
+            return
+
+        labels = {p.script: f"sysinfo:{p.key}" for p in probes}
+
+        def worker():
+            run_probes(
+                lambda ps, timeout: self._run_powershell(ps, timeout, labels.get(ps, "sysinfo")),
+                self._on_probe_result,
+                probes,
+            )
+            self.sysinfo_cache.save()
+            if on_done is not None:
+                on_done()
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _record_startup(self):
+        self.startup.mark("sysinfo_filled")
+        self.metrics.write(
+            "startup",
+            "gui",
+            wall_s=self.startup.marks["sysinfo_filled"],
+            phases=dict(self.startup.marks),
+            probes={k: round(v, 4) for k, v in self.sysinfo_timings.items()},
+            hosts=self.ps_pool.stats.as_dict(),
+        )
+
+    def _load_system_info_async(self):
+        # Computername lokal holen, das ist instant
+        try:
+            name = socket.gethostname()
+        except Exception:
+            name = "-"
+        self.sys_computer.set(name)
+
+        # Gecachte Werte sofort zeigen, nur abgelaufene Felder neu abfragen
+        for key, value in self.sysinfo_cache.values().items():
+            var = self._sys_var_for(key)
+            if var is not None:
+                var.set(value)
+        self._refresh_system_info(self.sysinfo_cache.stale_probes(PROBES), on_done=self._record_startup)
+
+    def _invalidate_system_info(self, keys: Tuple[str, ...]):
+        """Nach zustandsändernden Aktionen: Cache-Felder verwerfen und neu abfragen."""
+        if not keys:
+            return
+        self.sysinfo_cache.invalidate(keys)
+        self._refresh_system_info([PROBES_BY_KEY[k] for k in keys if k in PROBES_BY_KEY])
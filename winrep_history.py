@@ -0,0 +1,368 @@
+"""
+Lauf-Historie in SQLite (``history.db`` im Datenordner).
+
+Jeder Aktionslauf wird mit Rechner, Zeiten, Rückgabecode, Ergebnis,
+Messwerten (``metric``-Ereignisse) und zlib-komprimierter Ausgabe abgelegt.
+Indizes auf Rechner, Aktion und Zeit halten Abfragen wie "letzter SFC-Lauf
+auf diesem PC" oder "Rechner mit Akkugesundheit < 65 %" auch bei
+Zehntausenden Läufen im Millisekundenbereich.
+
+Aufbewahrung: Ausgaben älter als ``HISTORY_OUTPUT_DAYS`` werden entfernt,
+Läufe älter als ``HISTORY_KEEP_DAYS`` bzw. über ``HISTORY_MAX_RUNS`` hinaus
+gelöscht; danach gibt ``incremental_vacuum`` alle freien Seiten an das
+Dateisystem zurück und ein WAL-Checkpoint verkleinert die Datei. Das gilt
+nur für Datenbanken, die mit ``auto_vacuum = INCREMENTAL`` angelegt wurden
+(jede neue ``history.db``). ``compact()`` läuft höchstens einmal am Tag
+automatisch beim Öffnen.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from winrep_events import EVENT_PREFIX
+
+HISTORY_FILE = "history.db"
+HISTORY_SCHEMA = 1
+HISTORY_KEEP_DAYS = 730
+HISTORY_OUTPUT_DAYS = 90
+HISTORY_MAX_RUNS = 50_000
+HISTORY_OUTPUT_MAX = 4 * 1024 * 1024     # Zeichen je Lauf vor der Kompression
+HISTORY_COMPACT_INTERVAL = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS machines (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,          -- MachineGuid (winrep_sysinfo.machine_id)
+    name TEXT NOT NULL,
+    os TEXT NOT NULL DEFAULT '',
+    cpu TEXT NOT NULL DEFAULT '',
+    disk TEXT NOT NULL DEFAULT '',     -- Datenträgertyp von C: (NVMe/SSD/HDD)
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_machines_name ON machines(name);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    machine_id INTEGER NOT NULL REFERENCES machines(id),
+    action TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT 'gui',
+    started REAL NOT NULL,             -- Unix-Zeit
+    wall_s REAL,
+    returncode INTEGER,
+    status TEXT,
+    message TEXT NOT NULL DEFAULT '',
+    timings TEXT,                      -- JSON (host_result_fields)
+    metrics TEXT,                      -- JSON {name: {value, unit}}
+    output BLOB,                       -- zlib, NULL nach Ablauf von HISTORY_OUTPUT_DAYS
+    output_chars INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_runs_machine_action ON runs(machine_id, action, started);
+CREATE INDEX IF NOT EXISTS ix_runs_action ON runs(action, started);
+CREATE INDEX IF NOT EXISTS ix_runs_started ON runs(started);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    machine_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT NOT NULL DEFAULT '',
+    started REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_metrics_latest ON metrics(action, name, machine_id, started);
+CREATE INDEX IF NOT EXISTS ix_metrics_run ON metrics(run_id);
+"""
+
+_OPERATORS = {"<": "<", "<=": "<=", ">": ">", ">=": ">=", "=": "=", "==": "=", "!=": "!="}
+
+
+@dataclass(frozen=True)
+class MachineInfo:
+    key: str
+    name: str
+    os: str = ""
+    cpu: str = ""
+    disk: str = ""
+
+
+def current_machine(values: Dict[str, str] | None = None, key: str | None = None) -> MachineInfo:
+    """Dieser Rechner; ``values`` = Felder der Systemübersicht (z. B. ``SysInfoCache.values()``)."""
+    from winrep_sysinfo import machine_id
+
+    values = values or {}
+    key = key or machine_id()
+    try:
+        name = socket.gethostname()
+    except Exception:
+        name = "unbekannt"
+    disk = values.get("DiskType", "")
+    return MachineInfo(key, name, values.get("OS", ""), values.get("CPU", ""), "" if disk == "Unbekannt" else disk)
+
+
+@dataclass
+class RunRow:
+    id: int
+    machine: str
+    action: str
+    source: str
+    started: float
+    wall_s: float | None
+    returncode: int | None
+    status: str | None
+    message: str
+    metrics: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    output_chars: int = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        return dict(self.__dict__)
+
+
+def _visible_output(text: str) -> str:
+    """Ereigniszeilen gehören nicht in die gespeicherte Ausgabe."""
+    if EVENT_PREFIX[0] not in text:
+        return text
+    return "".join(ln for ln in text.splitlines(True) if not ln.startswith(EVENT_PREFIX))
+
+
+class RunHistory:
+    """Threadsicher (eine Verbindung, ein Lock) – Aktionen schreiben aus Worker-Threads."""
+
+    def __init__(self, path: Path, auto_compact: bool = True):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=10)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA auto_vacuum = INCREMENTAL")  # wirkt nur bei neuer Datei
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA synchronous = NORMAL")
+            self._db.execute("PRAGMA foreign_keys = ON")
+            self._db.executescript(_SCHEMA)
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta(key, value) VALUES ('schema', ?)", (str(HISTORY_SCHEMA),)
+            )
+            self._db.commit()
+        if auto_compact and time.time() - float(self._meta("compacted") or 0) > HISTORY_COMPACT_INTERVAL:
+            self.compact()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    # ------------------------------------------------------------ Schreiben
+
+    def _machine_id_locked(self, machine: MachineInfo) -> int:
+        self._db.execute(
+            "INSERT INTO machines(key, name, os, cpu, disk, last_seen) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET name = excluded.name, last_seen = excluded.last_seen, "
+            "os = CASE WHEN excluded.os != '' THEN excluded.os ELSE os END, "
+            "cpu = CASE WHEN excluded.cpu != '' THEN excluded.cpu ELSE cpu END, "
+            "disk = CASE WHEN excluded.disk != '' THEN excluded.disk ELSE disk END",
+            (machine.key, machine.name, machine.os, machine.cpu, machine.disk, time.time()),
+        )
+        return self._db.execute("SELECT id FROM machines WHERE key = ?", (machine.key,)).fetchone()[0]
+
+    def record(
+        self,
+        machine: MachineInfo,
+        action: str,
+        returncode: int | None,
+        wall_s: float | None = None,
+        status: str | None = None,
+        message: str = "",
+        metrics: Dict[str, Dict[str, object]] | None = None,
+        output: str = "",
+        timings: Dict[str, object] | None = None,
+        source: str = "gui",
+        started: float | None = None,
+    ) -> int:
+        """Einen Lauf ablegen; liefert die Lauf-ID."""
+        metrics = metrics or {}
+        if started is None:
+            started = time.time() - (wall_s or 0.0)
+        output = _visible_output(output)[:HISTORY_OUTPUT_MAX]
+        blob = zlib.compress(output.encode("utf-8", "replace"), 6) if output else None
+        numeric: List[Tuple[str, float, str]] = []
+        for name, m in metrics.items():
+            try:
+                numeric.append((name, float(m.get("value")), str(m.get("unit") or "")))
+            except (TypeError, ValueError):
+                pass  # nur Zahlen sind abfragbar, der Rest steht im JSON
+        with self._lock:
+            machine_id = self._machine_id_locked(machine)
+            cur = self._db.execute(
+                "INSERT INTO runs(machine_id, action, source, started, wall_s, returncode, status, message, "
+                "timings, metrics, output, output_chars) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    machine_id, action, source, started, wall_s, returncode, status, message,
+                    json.dumps(timings) if timings else None,
+                    json.dumps(metrics, ensure_ascii=False) if metrics else None,
+                    blob, len(output),
+                ),
+            )
+            run_id = cur.lastrowid
+            self._db.executemany(
+                "INSERT INTO metrics(run_id, machine_id, action, name, value, unit, started) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, machine_id, action, n, v, u, started) for n, v, u in numeric],
+            )
+            self._db.commit()
+        return run_id
+
+    # -------------------------------------------------------------- Lesen
+
+    _RUN_COLUMNS = (
+        "r.id, m.name AS machine, r.action, r.source, r.started, r.wall_s, r.returncode, "
+        "r.status, r.message, r.metrics, r.output_chars"
+    )
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> RunRow:
+        return RunRow(
+            row["id"], row["machine"], row["action"], row["source"], row["started"], row["wall_s"],
+            row["returncode"], row["status"], row["message"],
+            json.loads(row["metrics"]) if row["metrics"] else {},
+            row["output_chars"],
+        )
+
+    def runs(
+        self,
+        action: str | None = None,
+        machine: str | None = None,
+        since: float | None = None,
+        limit: int = 50,
+    ) -> List[RunRow]:
+        """Neueste zuerst. ``machine``: Rechnername oder -Kennung."""
+        where, params = [], []
+        if action:
+            where.append("r.action = ?")
+            params.append(action)
+        if machine:
+            where.append("r.machine_id IN (SELECT id FROM machines WHERE name = ? COLLATE NOCASE OR key = ?)")
+            params += [machine, machine]
+        if since is not None:
+            where.append("r.started >= ?")
+            params.append(since)
+        sql = f"SELECT {self._RUN_COLUMNS} FROM runs r JOIN machines m ON m.id = r.machine_id"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.started DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [self._row(r) for r in self._db.execute(sql, params)]
+
+    def last_run(self, action: str, machine: str | None = None) -> RunRow | None:
+        rows = self.runs(action=action, machine=machine, limit=1)
+        return rows[0] if rows else None
+
+    def output(self, run_id: int) -> str | None:
+        """Gespeicherte Ausgabe; None, wenn es den Lauf nicht gibt oder sie schon entfernt wurde."""
+        with self._lock:
+            row = self._db.execute("SELECT output FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8", "replace")
+
+    def machines_where(self, action: str, metric: str, op: str, value: float) -> List[Tuple[str, float, float]]:
+        """
+        Rechner, deren *letzter* Messwert ``metric`` von ``action`` die Bedingung
+        erfüllt, z. B. ``("battery_info", "health", "<", 65)``.
+        Liefert (Rechnername, Wert, Zeitpunkt).
+        """
+        if op not in _OPERATORS:
+            raise ValueError(f"unbekannter Vergleich {op!r}")
+        # SQLite: nicht aggregierte Spalten stammen bei MAX() aus der Zeile mit dem Maximum
+        sql = (
+            "SELECT m.name, x.value, x.ts FROM ("
+            "  SELECT machine_id, value, MAX(started) AS ts FROM metrics"
+            "  WHERE action = ? AND name = ? GROUP BY machine_id"
+            f") x JOIN machines m ON m.id = x.machine_id WHERE x.value {_OPERATORS[op]} ? ORDER BY x.value"
+        )
+        with self._lock:
+            return [(r[0], r[1], r[2]) for r in self._db.execute(sql, (action, metric, value))]
+
+    def durations(
+        self,
+        action: str,
+        cpu: str | None = None,
+        disk: str | None = None,
+        limit: int = 50,
+    ) -> List[float]:
+        """Laufzeiten der letzten erfolgreichen Läufe, optional nur gleiche CPU/gleicher Datenträgertyp."""
+        sql = (
+            "SELECT r.wall_s FROM runs r JOIN machines m ON m.id = r.machine_id "
+            "WHERE r.action = ? AND r.returncode = 0 AND r.wall_s IS NOT NULL"
+        )
+        params: List[object] = [action]
+        if cpu:
+            sql += " AND m.cpu = ?"
+            params.append(cpu)
+        if disk:
+            sql += " AND m.disk = ?"
+            params.append(disk)
+        sql += " ORDER BY r.started DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [r[0] for r in self._db.execute(sql, params)]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    # -------------------------------------------------------- Aufbewahrung
+
+    def compact(self, now: float | None = None) -> Dict[str, int]:
+        """Alte Ausgaben/Läufe entfernen und Platz freigeben."""
+        now = time.time() if now is None else now
+        with self._lock:
+            db = self._db
+            outputs = db.execute(
+                "UPDATE runs SET output = NULL WHERE output IS NOT NULL AND started < ?",
+                (now - HISTORY_OUTPUT_DAYS * 86400,),
+            ).rowcount
+            old = db.execute("DELETE FROM runs WHERE started < ?", (now - HISTORY_KEEP_DAYS * 86400,)).rowcount
+            over = db.execute(
+                "DELETE FROM runs WHERE id IN (SELECT id FROM runs ORDER BY started DESC LIMIT -1 OFFSET ?)",
+                (HISTORY_MAX_RUNS,),
+            ).rowcount
+            db.execute("DELETE FROM machines WHERE id NOT IN (SELECT DISTINCT machine_id FROM runs)")
+            db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('compacted', ?)", (str(now),))
+            db.commit()
+            # executescript: sqlite3.execute() führt das Pragma nur einen Schritt aus (= eine Seite)
+            db.executescript("PRAGMA incremental_vacuum;")
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {"outputs_dropped": outputs, "runs_expired": old, "runs_over_limit": over}
+
+
+def parse_condition(text: str) -> Tuple[str, str, str, float]:
+    """``"battery_info.health<65"`` → ("battery_info", "health", "<", 65.0)."""
+    for op in ("<=", ">=", "!=", "==", "<", ">", "="):
+        if op in text:
+            left, right = text.split(op, 1)
+            action, _, metric = left.strip().partition(".")
+            if not metric:
+                raise ValueError(f"{text!r}: erwartet <aktion>.<messwert><vergleich><zahl>")
+            return action, metric, op, float(right)
+    raise ValueError(f"{text!r}: kein Vergleich (<, <=, >, >=, =, !=)")
+
+
+def default_history() -> RunHistory:
+    from winrep_paths import app_data_dir
+
+    return RunHistory(app_data_dir() / HISTORY_FILE)
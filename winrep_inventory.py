@@ -0,0 +1,503 @@
+"""
+Systeminformationen-Report (Aktion ``sysinfo``) – Inventar als Datenmodell.
+
+Die Erfassung ist in unabhängige Abschnitte geteilt (Betriebssystem, CPU,
+Grafik, Mainboard, Arbeitsspeicher, Datenträger), die gleichzeitig laufen.
+Jeder Abschnitt liefert Rohdaten (JSON-artig) aus einem austauschbaren
+Backend:
+
+    - ``PowerShellBackend``: CIM-Abfragen im warmen PowerShell-Host. Die
+      Zuordnung Datenträger → Partition → Laufwerk kommt aus je einer
+      Abfrage der Assoziationsklassen statt zwei ``ASSOCIATORS OF`` je
+      Datenträger und Partition; verknüpft wird in Python.
+    - ``FixtureBackend``: gespeicherte Rohdaten (``--save-raw``), damit
+      Modell und Ausgabe ohne Windows geprüft werden können.
+
+Aus dem gemeinsamen ``Inventory`` entstehen TXT, JSON und HTML.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from winrep_events import ActionReport
+
+INVENTORY_ACTION = "sysinfo"
+INVENTORY_WORKERS = 3
+INVENTORY_FORMATS = ("txt", "json", "html")
+INVENTORY_BASENAME = "WinRep_Systeminfo"
+
+SECTIONS = ("os", "cpu", "gpu", "board", "memory", "disks")
+SECTION_TITLES = {
+    "os": "Betriebssystem",
+    "cpu": "Prozessor",
+    "gpu": "Grafik",
+    "board": "Mainboard",
+    "memory": "Arbeitsspeicher",
+    "disks": "Laufwerke",
+}
+
+
+# =============================================================================
+# Modell
+# =============================================================================
+
+@dataclass
+class OsInfo:
+    caption: str = ""
+    version: str = ""
+    architecture: str = ""
+    install_date: str = ""
+    last_boot: str = ""
+
+
+@dataclass
+class CpuInfo:
+    name: str = ""
+    cores: int = 0
+    threads: int = 0
+    socket: str = ""
+    max_mhz: int = 0
+
+
+@dataclass
+class GpuInfo:
+    name: str = ""
+    driver_version: str = ""
+    driver_date: str = ""
+    memory_bytes: int = 0
+
+
+@dataclass
+class BoardInfo:
+    manufacturer: str = ""
+    product: str = ""
+    serial: str = ""
+    revision: str = ""
+    bios_version: str = ""
+    bios_date: str = ""
+
+
+@dataclass
+class MemoryModule:
+    manufacturer: str = ""
+    part_number: str = ""
+    serial: str = ""
+    slot: str = ""
+    capacity_bytes: int = 0
+    speed_mhz: int = 0
+
+
+@dataclass
+class VolumeInfo:
+    letter: str = ""
+    label: str = ""
+    size_bytes: int = 0
+    free_bytes: int = 0
+
+
+@dataclass
+class DiskInfo:
+    model: str = ""
+    size_bytes: int = 0
+    interface: str = ""
+    serial: str = ""
+    volumes: List[VolumeInfo] = field(default_factory=list)
+
+
+@dataclass
+class Inventory:
+    host: str = ""
+    collected: str = ""
+    os: OsInfo | None = None
+    cpus: List[CpuInfo] = field(default_factory=list)
+    gpus: List[GpuInfo] = field(default_factory=list)
+    board: BoardInfo | None = None
+    memory: List[MemoryModule] = field(default_factory=list)
+    disks: List[DiskInfo] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)      # Abschnitt → Fehlertext
+    timings: Dict[str, float] = field(default_factory=dict)   # Abschnitt → Sekunden
+
+    @property
+    def memory_total(self) -> int:
+        return sum(m.capacity_bytes for m in self.memory)
+
+    def as_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+# =============================================================================
+# Rohdaten → Modell
+# =============================================================================
+
+def _rows(raw) -> List[dict]:
+    """ConvertTo-Json liefert bei genau einem Element kein Array."""
+    if raw is None:
+        return []
+    if isinstance(raw, dict):
+        return [raw]
+    return [r for r in raw if isinstance(r, dict)]
+
+
+def _str(row: dict, key: str) -> str:
+    value = row.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _int(row: dict, key: str) -> int:
+    try:
+        return int(float(row.get(key) or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _parse_os(raw) -> OsInfo | None:
+    rows = _rows(raw)
+    if not rows:
+        return None
+    r = rows[0]
+    return OsInfo(_str(r, "Caption"), _str(r, "Version"), _str(r, "OSArchitecture"),
+                  _str(r, "InstallDate"), _str(r, "LastBootUpTime"))
+
+
+def _parse_board(raw) -> BoardInfo | None:
+    rows = _rows(raw)
+    if not rows:
+        return None
+    r = rows[0]
+    return BoardInfo(_str(r, "Manufacturer"), _str(r, "Product"), _str(r, "SerialNumber"),
+                     _str(r, "Version"), _str(r, "BIOSVersion"), _str(r, "BIOSDate"))
+
+
+def _parse_disks(raw) -> List[DiskInfo]:
+    """Verknüpft Datenträger, Partitionen und Laufwerke aus den Assoziationstabellen."""
+    raw = raw if isinstance(raw, dict) else {}
+    partitions: Dict[str, List[str]] = {}
+    for link in _rows(raw.get("DiskPartitions")):
+        partitions.setdefault(_str(link, "Disk"), []).append(_str(link, "Partition"))
+    logical_of: Dict[str, List[str]] = {}
+    for link in _rows(raw.get("PartitionVolumes")):
+        logical_of.setdefault(_str(link, "Partition"), []).append(_str(link, "Volume"))
+    volumes = {
+        _str(v, "DeviceID"): VolumeInfo(_str(v, "DeviceID"), _str(v, "VolumeName"), _int(v, "Size"), _int(v, "FreeSpace"))
+        for v in _rows(raw.get("Volumes"))
+    }
+    disks = []
+    for d in _rows(raw.get("Disks")):
+        disk = DiskInfo(_str(d, "Model"), _int(d, "Size"), _str(d, "InterfaceType"), _str(d, "SerialNumber"))
+        for part in sorted(partitions.get(_str(d, "DeviceID"), [])):
+            for letter in logical_of.get(part, []):
+                if letter in volumes:
+                    disk.volumes.append(volumes[letter])
+        disks.append(disk)
+    return disks
+
+
+def apply_section(inv: Inventory, section: str, raw) -> None:
+    if section == "os":
+        inv.os = _parse_os(raw)
+    elif section == "cpu":
+        inv.cpus = [CpuInfo(_str(r, "Name"), _int(r, "NumberOfCores"), _int(r, "NumberOfLogicalProcessors"),
+                            _str(r, "SocketDesignation"), _int(r, "MaxClockSpeed")) for r in _rows(raw)]
+    elif section == "gpu":
+        inv.gpus = [GpuInfo(_str(r, "Name"), _str(r, "DriverVersion"), _str(r, "DriverDate"), _int(r, "AdapterRAM"))
+                    for r in _rows(raw)]
+    elif section == "board":
+        inv.board = _parse_board(raw)
+    elif section == "memory":
+        inv.memory = [MemoryModule(_str(r, "Manufacturer"), _str(r, "PartNumber"), _str(r, "SerialNumber"),
+                                   _str(r, "DeviceLocator"), _int(r, "Capacity"), _int(r, "ConfiguredClockSpeed"))
+                      for r in _rows(raw)]
+    elif section == "disks":
+        inv.disks = _parse_disks(raw)
+    else:
+        raise ValueError(f"unbekannter Abschnitt {section!r}")
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+# Nicht-ASCII als \uXXXX, damit Umlaute die CP850-Ausgabe des Hosts überstehen
+_PS_EMIT = r"""
+function Out-WinRepJson($obj) {
+    $json = ConvertTo-Json -InputObject $obj -Compress -Depth 4
+    [regex]::Replace($json, '[^\x00-\x7F]', { param($m) '\u{0:x4}' -f [int][char]$m.Value })
+}
+function Format-WinRepDate($d) { if ($d) { ([datetime]$d).ToString('yyyy-MM-dd HH:mm') } else { '' } }
+$ErrorActionPreference = 'Stop'
+"""
+
+_PS_SECTIONS: Dict[str, str] = {
+    "os": r"""
+        $os = Get-CimInstance Win32_OperatingSystem
+        Out-WinRepJson ([pscustomobject]@{
+            Caption = $os.Caption; Version = $os.Version; OSArchitecture = $os.OSArchitecture
+            InstallDate = (Format-WinRepDate $os.InstallDate); LastBootUpTime = (Format-WinRepDate $os.LastBootUpTime)
+        })
+    """,
+    "cpu": r"""
+        Out-WinRepJson @(Get-CimInstance Win32_Processor |
+            Select-Object Name, NumberOfCores, NumberOfLogicalProcessors, SocketDesignation, MaxClockSpeed)
+    """,
+    "gpu": r"""
+        Out-WinRepJson @(Get-CimInstance Win32_VideoController | ForEach-Object {
+            [pscustomobject]@{ Name = $_.Name; DriverVersion = $_.DriverVersion
+                               DriverDate = (Format-WinRepDate $_.DriverDate); AdapterRAM = $_.AdapterRAM }
+        })
+    """,
+    "board": r"""
+        $board = Get-CimInstance Win32_BaseBoard | Select-Object -First 1
+        $bios = Get-CimInstance Win32_BIOS | Select-Object -First 1
+        Out-WinRepJson ([pscustomobject]@{
+            Manufacturer = $board.Manufacturer; Product = $board.Product; SerialNumber = $board.SerialNumber
+            Version = $board.Version; BIOSVersion = $bios.SMBIOSBIOSVersion; BIOSDate = (Format-WinRepDate $bios.ReleaseDate)
+        })
+    """,
+    "memory": r"""
+        Out-WinRepJson @(Get-CimInstance Win32_PhysicalMemory |
+            Select-Object Manufacturer, PartNumber, SerialNumber, DeviceLocator, Capacity, ConfiguredClockSpeed)
+    """,
+    # Vier Abfragen unabhängig von der Anzahl der Datenträger/Partitionen
+    "disks": r"""
+        Out-WinRepJson ([pscustomobject]@{
+            Disks = @(Get-CimInstance Win32_DiskDrive |
+                Select-Object DeviceID, Model, Size, InterfaceType, SerialNumber)
+            DiskPartitions = @(Get-CimInstance Win32_DiskDriveToDiskPartition | ForEach-Object {
+                [pscustomobject]@{ Disk = $_.Antecedent.DeviceID; Partition = $_.Dependent.DeviceID } })
+            PartitionVolumes = @(Get-CimInstance Win32_LogicalDiskToPartition | ForEach-Object {
+                [pscustomobject]@{ Partition = $_.Antecedent.DeviceID; Volume = $_.Dependent.DeviceID } })
+            Volumes = @(Get-CimInstance Win32_LogicalDisk |
+                Select-Object DeviceID, VolumeName, Size, FreeSpace)
+        })
+    """,
+}
+
+
+class PowerShellBackend:
+    """``runner(script, timeout) -> Ausgabe`` – z. B. ``PSHostPool``-basiert wie die Übersichts-Proben."""
+
+    name = "powershell"
+
+    def __init__(self, runner: Callable[[str, float], str], timeout: float = 30.0):
+        self.runner = runner
+        self.timeout = timeout
+
+    def collect(self, section: str):
+        out = self.runner(_PS_EMIT + _PS_SECTIONS[section], self.timeout) or ""
+        lines = [ln.strip() for ln in out.splitlines() if ln.strip().startswith(("{", "["))]
+        if not lines:
+            raise RuntimeError(out.strip().splitlines()[-1] if out.strip() else "keine Antwort (Timeout?)")
+        return json.loads(lines[-1])
+
+
+class FixtureBackend:
+    """Rohdaten aus einer mit ``--save-raw`` gespeicherten Datei (oder einem Dict)."""
+
+    name = "fixture"
+
+    def __init__(self, data: Dict[str, object]):
+        self.data = data.get("sections", data)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "FixtureBackend":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def collect(self, section: str):
+        if section not in self.data:
+            raise LookupError(f"Abschnitt {section!r} fehlt in den Testdaten")
+        return self.data[section]
+
+
+def collect_inventory(
+    backend,
+    sections: tuple = SECTIONS,
+    max_workers: int = INVENTORY_WORKERS,
+    raw_out: Dict[str, object] | None = None,
+) -> Inventory:
+    """
+    Alle Abschnitte gleichzeitig erfassen. Ein fehlgeschlagener Abschnitt
+    landet in ``errors``, die übrigen bleiben gültig. ``raw_out`` erhält die
+    Rohdaten (für ``--save-raw``).
+    """
+    inv = Inventory(socket.gethostname(), datetime.now().isoformat(timespec="seconds"))
+
+    def task(section: str):
+        t0 = time.perf_counter()
+        try:
+            raw = backend.collect(section)
+            apply_section(inv, section, raw)   # jeder Abschnitt schreibt nur eigene Felder
+            if raw_out is not None:
+                raw_out[section] = raw
+        except Exception as exc:
+            inv.errors[section] = str(exc) or exc.__class__.__name__
+        inv.timings[section] = round(time.perf_counter() - t0, 3)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inventory") as pool:
+        for section in sections:
+            pool.submit(task, section)
+    # Reihenfolge der Abschnitte statt Fertigstellungsreihenfolge
+    inv.errors = {s: inv.errors[s] for s in sections if s in inv.errors}
+    inv.timings = {s: inv.timings[s] for s in sections if s in inv.timings}
+    return inv
+
+
+# =============================================================================
+# Ausgabe
+# =============================================================================
+
+def _gb(n: int) -> str:
+    return f"{n / 1024 ** 3:.0f} GB" if n else "-"
+
+
+def _sections(inv: Inventory) -> List[tuple]:
+    """(Titel, [(Untertitel, [(Feld, Wert), ...]), ...]) – gemeinsame Grundlage für TXT und HTML."""
+    out = []
+    if inv.os is not None:
+        o = inv.os
+        out.append(("Betriebssystem", [("", [
+            ("Edition", o.caption), ("Build-Nummer", o.version), ("Architektur", o.architecture),
+            ("Installiert", o.install_date), ("Letzter Start", o.last_boot),
+        ])]))
+    if inv.cpus:
+        out.append(("Prozessor", [("", [
+            ("Name", c.name), ("Kerne/Threads", f"{c.cores} C / {c.threads} T"),
+            ("Sockel", c.socket), ("Takt (max.)", f"{c.max_mhz} MHz" if c.max_mhz else ""),
+        ]) for c in inv.cpus]))
+    if inv.gpus:
+        out.append(("Grafik", [("", [
+            ("Chip-Name", g.name), ("Treiberversion", g.driver_version), ("Treiberdatum", g.driver_date),
+        ]) for g in inv.gpus]))
+    if inv.board is not None:
+        b = inv.board
+        out.append(("Mainboard", [("", [
+            ("Hersteller", b.manufacturer), ("Modell", b.product), ("Seriennummer", b.serial),
+            ("Revision", b.revision), ("BIOS-Version", b.bios_version), ("BIOS-Datum", b.bios_date),
+        ])]))
+    if inv.memory:
+        out.append((f"Arbeitsspeicher ({_gb(inv.memory_total)})", [("Modul", [
+            ("Hersteller", m.manufacturer), ("Modell", m.part_number), ("Seriennummer", m.serial),
+            ("Steckplatz", m.slot), ("Speicher", _gb(m.capacity_bytes)),
+            ("Taktfrequenz", f"{m.speed_mhz} MHz" if m.speed_mhz else ""),
+        ]) for m in inv.memory]))
+    if inv.disks:
+        out.append(("Laufwerke", [("Datenträger", [
+            ("Modell", d.model), ("Größe", _gb(d.size_bytes)), ("Schnittstelle", d.interface),
+            ("Laufwerk", ", ".join(v.letter for v in d.volumes)),
+            ("Volumename", ", ".join(v.label for v in d.volumes if v.label)),
+        ]) for d in inv.disks]))
+    return out
+
+
+def render_text(inv: Inventory) -> str:
+    lines = ["Systeminformationen", f"{inv.host} – {inv.collected}", ""]
+    for title, groups in _sections(inv):
+        lines.append(title)
+        for sub, fields in groups:
+            indent = "    "
+            if sub:
+                lines.append(f"    {sub}")
+                indent = "        "
+            for name, value in fields:
+                lines.append(f"{indent}{name.ljust(14)}= {value}")
+            lines.append("")
+    for section, error in inv.errors.items():
+        lines.append(f"[{SECTION_TITLES.get(section, section)} nicht verfügbar: {error}]")
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def render_json(inv: Inventory) -> str:
+    return json.dumps(inv.as_dict(), ensure_ascii=False, indent=2) + "\n"
+
+
+_HTML_STYLE = """
+body { font-family: Segoe UI, sans-serif; margin: 2em; color: #222; }
+h1 { font-size: 1.4em; margin-bottom: 0; }
+h2 { font-size: 1.1em; margin-top: 1.6em; border-bottom: 1px solid #ccc; }
+table { border-collapse: collapse; margin: .4em 0 1em; }
+th { text-align: left; font-weight: normal; color: #666; padding: 2px 1.5em 2px 0; }
+td { padding: 2px 0; }
+.meta, .error { color: #888; }
+.error { color: #b00; }
+"""
+
+
+def render_html(inv: Inventory) -> str:
+    esc = html.escape
+    parts = [
+        "<!DOCTYPE html>",
+        '<html lang="de"><head><meta charset="utf-8">',
+        f"<title>Systeminformationen – {esc(inv.host)}</title>",
+        f"<style>{_HTML_STYLE}</style></head><body>",
+        "<h1>Systeminformationen</h1>",
+        f'<p class="meta">{esc(inv.host)} – {esc(inv.collected)}</p>',
+    ]
+    for title, groups in _sections(inv):
+        parts.append(f"<h2>{esc(title)}</h2>")
+        for sub, fields in groups:
+            if sub:
+                parts.append(f"<h3>{esc(sub)}</h3>")
+            parts.append("<table>")
+            parts.extend(f"<tr><th>{esc(name)}</th><td>{esc(str(value))}</td></tr>" for name, value in fields)
+            parts.append("</table>")
+    for section, error in inv.errors.items():
+        parts.append(f'<p class="error">{esc(SECTION_TITLES.get(section, section))} nicht verfügbar: {esc(error)}</p>')
+    parts.append("</body></html>")
+    return "\n".join(parts) + "\n"
+
+
+RENDERERS: Dict[str, Callable[[Inventory], str]] = {
+    "txt": render_text,
+    "json": render_json,
+    "html": render_html,
+}
+
+
+def write_reports(
+    inv: Inventory,
+    directory: Path,
+    formats: tuple = INVENTORY_FORMATS,
+    basename: str = INVENTORY_BASENAME,
+) -> List[Path]:
+    paths = []
+    for fmt in formats:
+        path = Path(directory) / f"{basename}.{fmt}"
+        # TXT mit BOM, damit der Windows-Editor Umlaute sicher erkennt
+        path.write_text(RENDERERS[fmt](inv), encoding="utf-8-sig" if fmt == "txt" else "utf-8")
+        paths.append(path)
+    return paths
+
+
+def inventory_report(inv: Inventory, paths: List[Path], seconds: float) -> ActionReport:
+    """``ActionReport`` wie bei den PS1-Aktionen (Ergebnisse, Historie, Metriken)."""
+    report = ActionReport(INVENTORY_ACTION)
+    ok = len(inv.timings) - len(inv.errors)
+    report.metrics["sections_ok"] = {"value": ok, "unit": ""}
+    report.metrics["collect_s"] = {"value": round(seconds, 2), "unit": "s"}
+    for path in paths:
+        fmt = path.suffix.lstrip(".")
+        report.artifacts.append({"path": str(path), "kind": "sysinfo_report" if fmt == "txt" else f"sysinfo_{fmt}"})
+    for section, error in inv.errors.items():
+        report.warnings.append(f"{SECTION_TITLES.get(section, section)}: {error}")
+    if ok == 0:
+        report.message = "Keine Systeminformationen erfasst"
+    else:
+        report.message = f"{ok}/{len(inv.timings)} Abschnitte in {seconds:.1f} s"
+    report.finish(0 if ok else 1)
+    return report
+
+
+def desktop_dir() -> Path:
+    """Desktop des Benutzers (wie der bisherige PS1-Report), sonst das Profil."""
+    home = Path(os.environ.get("USERPROFILE") or Path.home())
+    desktop = home / "Desktop"
+    return desktop if desktop.is_dir() else home
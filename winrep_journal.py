@@ -0,0 +1,219 @@
+"""
+Sitzungsjournal – übersteht Abstürze und Neustarts.
+
+Jede Sitzung schreibt ``journal-<Zeit>.jsonl`` (nur anhängen): eingereihte
+Aktionen, Start/Ende, Ablaufschritte, Ausgabe und Rückgabecodes. Ausgabe wird
+gesammelt und vom Hintergrund-Thread gebündelt geschrieben (ein ``fsync`` pro
+Intervall); Zustandswechsel (eingereiht, fertig, Schritt, Neustart) gehen
+sofort und dauerhaft auf die Platte.
+
+Fehlt der Abschluss-Datensatz oder wurde ein Neustart angekündigt (CHKDSK),
+liefert ``find_resumable()`` beim nächsten Start, was noch offen war –
+inklusive bereits erledigter Ablaufschritte, die nicht wiederholt werden.
+Eine abgeschnittene letzte Zeile (Absturz beim Schreiben) wird ignoriert.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+JOURNAL_FSYNC_INTERVAL = 0.5            # s – Ausgabe wird höchstens so lange gepuffert
+JOURNAL_BUFFER_MAX = 256 * 1024         # ab hier sofort schreiben
+JOURNAL_OUTPUT_MAX = 2 * 1024 * 1024    # Ausgabe je Job im Journal (Rest steht im Sitzungslog)
+JOURNAL_KEEP_SESSIONS = 10
+
+
+class SessionJournal:
+    def __init__(self, path: Path, fsync_interval: float = JOURNAL_FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.records = 0
+        self.fsyncs = 0
+        self._fh = open(path, "ab")
+        self._buf: List[bytes] = []
+        self._buf_size = 0
+        self._output_size: Dict[int, int] = {}
+        self._lock = threading.Lock()      # Puffer
+        self._io_lock = threading.Lock()   # Datei
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._flusher, daemon=True)
+        self._thread.start()
+        self.append("session_start", durable=True, pid=os.getpid())
+
+    @classmethod
+    def for_session(cls, journal_dir: Path) -> "SessionJournal":
+        old = sorted(journal_dir.glob("journal-*.jsonl"))
+        for f in old[: max(0, len(old) - (JOURNAL_KEEP_SESSIONS - 1))]:
+            try:
+                f.unlink()
+            except OSError:
+                pass
+        name = datetime.now().strftime("journal-%Y%m%d-%H%M%S.jsonl")
+        return cls(journal_dir / name)
+
+    # ------------------------------------------------------------------ API
+
+    def append(self, type_: str, durable: bool = False, **fields):
+        """``durable``: sofort schreiben und fsyncen (Zustandswechsel)."""
+        if self._closed:
+            return
+        record = {"t": round(time.time(), 3), "type": type_}
+        record.update(fields)
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._buf.append(data)
+            self._buf_size += len(data)
+            self.records += 1
+            full = self._buf_size >= JOURNAL_BUFFER_MAX
+        if durable:
+            self.sync()
+        elif full:
+            self._wake.set()
+
+    def output(self, job: int, text: str):
+        """Ausgabe eines Jobs – gepuffert, nicht einzeln gefsynct."""
+        size = self._output_size.get(job, 0)
+        if size >= JOURNAL_OUTPUT_MAX or not text:
+            return
+        if size + len(text) > JOURNAL_OUTPUT_MAX:
+            text = text[: JOURNAL_OUTPUT_MAX - size]
+            self.append("output", job=job, text=text, truncated=True)
+        else:
+            self.append("output", job=job, text=text)
+        self._output_size[job] = size + len(text)
+
+    def sync(self):
+        """Puffer schreiben und auf die Platte zwingen."""
+        with self._io_lock:
+            with self._lock:
+                chunks, self._buf, self._buf_size = self._buf, [], 0
+            if self._fh is None:
+                return
+            try:
+                if chunks:
+                    self._fh.write(b"".join(chunks))
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                self.fsyncs += 1
+            except OSError:
+                pass  # Journal darf eine Aktion nie scheitern lassen
+
+    def close(self, pending: int = 0):
+        """Sauberes Ende. ``pending`` = noch offene Jobs (nur zur Info, kein Fortsetzen)."""
+        if self._closed:
+            return
+        self.append("session_end", pending=pending)
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=2)
+        self.sync()
+        with self._io_lock:
+            fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+
+    def _flusher(self):
+        while not self._closed:
+            self._wake.wait(self.fsync_interval)
+            self._wake.clear()
+            if self._buf:
+                self.sync()
+
+
+# =============================================================================
+# Fortsetzen
+# =============================================================================
+
+def read_journal(path: Path) -> List[dict]:
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # abgeschnittene Zeile nach Absturz
+    except OSError:
+        pass
+    return records
+
+
+@dataclass
+class ResumeItem:
+    key: str                     # Aktions- bzw. Pseudo-Schlüssel ("recipe:intake")
+    title: str
+    was_running: bool = False
+    done_steps: Dict[str, Dict[str, object]] = field(default_factory=dict)  # Schritt-ID → rc/status
+
+
+@dataclass
+class ResumePlan:
+    path: Path
+    started: str
+    reboot: bool
+    items: List[ResumeItem]
+
+
+def build_plan(path: Path, records: List[dict]) -> ResumePlan | None:
+    if not records:
+        return None
+    ended = any(r.get("type") in ("session_end", "resolved") for r in records)
+    reboot = False
+    jobs: Dict[int, ResumeItem] = {}
+    order: List[int] = []
+    for r in records:
+        kind = r.get("type")
+        job = r.get("job")
+        if kind == "reboot":
+            reboot = True
+        elif kind == "resolved":
+            return None
+        elif kind == "queued" and job is not None:
+            jobs[job] = ResumeItem(str(r.get("key")), str(r.get("title") or r.get("key")))
+            order.append(job)
+        elif kind == "started" and job in jobs:
+            jobs[job].was_running = True
+        elif kind == "step" and job in jobs and r.get("state") == "done":
+            jobs[job].done_steps[str(r.get("step"))] = {"returncode": r.get("rc"), "status": r.get("status")}
+        elif kind in ("finished", "cancelled") and job in jobs:
+            del jobs[job]
+    if ended and not reboot:
+        return None
+    items = [jobs[j] for j in order if j in jobs]
+    if not items:
+        return None
+    started = datetime.fromtimestamp(records[0].get("t", 0)).strftime("%d.%m.%Y %H:%M")
+    return ResumePlan(path, started, reboot, items)
+
+
+def find_resumable(journal_dir: Path, exclude: Path | None = None) -> ResumePlan | None:
+    """Jüngste Sitzung mit offenen Jobs (ohne sauberes Ende oder mit angekündigtem Neustart)."""
+    for path in sorted(journal_dir.glob("journal-*.jsonl"), reverse=True):
+        if exclude is not None and path == exclude:
+            continue
+        return build_plan(path, read_journal(path))
+    return None
+
+
+def mark_resolved(plan: ResumePlan, resumed: bool):
+    """Alte Sitzung als erledigt markieren, damit sie nicht erneut angeboten wird."""
+    record = {"t": round(time.time(), 3), "type": "resolved", "resumed": resumed}
+    try:
+        with open(plan.path, "ab") as fh:
+            # führendes "\n" schließt eine evtl. abgeschnittene letzte Zeile ab
+            fh.write(("\n" + json.dumps(record) + "\n").encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+    except OSError:
+        pass
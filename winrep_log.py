@@ -0,0 +1,290 @@
+"""
+Log-Pipeline für das Log-Fenster.
+
+Worker-Threads schieben Text nur noch in eine Warteschlange. Der GUI-Thread
+holt sie in festem Takt (``after()``) ab und fügt pro Frame höchstens einen
+Block ein. So bleibt die Oberfläche bedienbar, egal wie schnell DISM & Co.
+schreiben.
+
+``LogHistory`` hält nur die letzten Zeilen im Speicher und schreibt die
+komplette Sitzung in eine Logdatei, aus der ältere Abschnitte beim
+Hochscrollen seitenweise nachgeladen werden.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Tuple
+
+LOG_FRAME_MS = 50                 # Abholtakt im GUI-Thread
+LOG_FRAME_BUDGET = 64 * 1024      # max. Zeichen pro Frame
+LOG_MAX_PENDING = 4 * 1024 * 1024  # ab hier werden Schreiber gebremst
+LOG_LATENCY_TARGET_MS = 150       # Ziel: Ausgabe spätestens nach so vielen ms sichtbar
+
+LOG_VIEW_LINES = 2000             # Zeilen im Widget im Normalbetrieb
+LOG_PAGE_LINES = 500              # Nachladen beim Hochscrollen
+LOG_VIEW_MAX_LINES = LOG_VIEW_LINES + 4 * LOG_PAGE_LINES
+LOG_KEEP_SESSIONS = 10            # ältere Sitzungslogs werden gelöscht
+
+
+@dataclass
+class LogCounters:
+    chunks_in: int = 0
+    chars_in: int = 0
+    frames: int = 0
+    chars_out: int = 0
+    cr_collapsed: int = 0        # per "\r" überschriebene Zwischenstände
+    max_pending: int = 0
+    backlogged_frames: int = 0   # Frames, nach denen noch Text wartete
+    producer_waits: int = 0      # wie oft ein Schreiber gebremst wurde
+    producer_wait_s: float = 0.0
+    last_frame_ms: float = 0.0
+    max_frame_ms: float = 0.0
+    last_latency_ms: float = 0.0  # Lesen aus der Pipe → im Widget
+    max_latency_ms: float = 0.0
+    latency_over_target: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.__dict__)
+
+
+def _visible(line: str) -> str:
+    """Was ein Terminal von einer per ``\r`` überschriebenen Zeile noch zeigt."""
+    if "\r" not in line:
+        return line
+    for seg in reversed(line.split("\r")):
+        if seg:
+            return seg
+    return ""
+
+
+class LogPipeline:
+    """
+    Threadsichere Warteschlange zwischen Worker-Threads und dem Log-Widget.
+
+    Ein ``\r`` ohne ``\n`` gilt als Aktualisierung der aktuellen Zeile: pro
+    Frame wird nur der letzte Stand eingefügt bzw. die letzte Zeile ersetzt.
+    """
+
+    def __init__(
+        self,
+        frame_budget: int = LOG_FRAME_BUDGET,
+        max_pending: int = LOG_MAX_PENDING,
+        max_wait: float = 0.5,
+        latency_target_ms: float = LOG_LATENCY_TARGET_MS,
+    ):
+        self.frame_budget = frame_budget
+        self.max_pending = max_pending
+        self.max_wait = max_wait
+        self.latency_target_ms = latency_target_ms
+        self.counters = LogCounters()
+        self._chunks: Deque[Tuple[str, float]] = deque()
+        self._pending = 0
+        self._clear = False
+        self._open = ""          # offene (noch nicht mit \n beendete) Zeile im Widget
+        self._frame_oldest = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def push(self, text: str, t_read: float | None = None):
+        """
+        Aus beliebigem Thread aufrufbar. ``t_read`` = Zeitpunkt (perf_counter),
+        zu dem der Text aus der Pipe gelesen wurde – für die Latenzmessung.
+        """
+        if not text:
+            return
+        stamp = time.perf_counter() if t_read is None else t_read
+        with self._cond:
+            if self._pending >= self.max_pending:
+                # Backpressure: Schreiber kurz warten lassen statt unbegrenzt puffern
+                t0 = time.perf_counter()
+                self._cond.wait_for(lambda: self._pending < self.max_pending, self.max_wait)
+                self.counters.producer_waits += 1
+                self.counters.producer_wait_s += time.perf_counter() - t0
+            self._chunks.append((text, stamp))
+            self._pending += len(text)
+            self.counters.chunks_in += 1
+            self.counters.chars_in += len(text)
+            self.counters.max_pending = max(self.counters.max_pending, self._pending)
+
+    def clear(self):
+        """Verwirft Ausstehendes und fordert das Leeren des Widgets an."""
+        with self._cond:
+            self._chunks.clear()
+            self._pending = 0
+            self._clear = True
+            self._cond.notify_all()
+
+    def drain(self) -> Tuple[bool, bool, str]:
+        """
+        Holt höchstens ``frame_budget`` Zeichen ab (GUI-Thread).
+        Rückgabe: (Widget leeren?, letzte Widget-Zeile ersetzen?, einzufügender Text).
+        """
+        with self._cond:
+            clear, self._clear = self._clear, False
+            if clear:
+                self._open = ""
+            parts = []
+            taken = 0
+            self._frame_oldest = self._chunks[0][1] if self._chunks else 0.0
+            while self._chunks and taken < self.frame_budget:
+                chunk, stamp = self._chunks.popleft()
+                room = self.frame_budget - taken
+                if len(chunk) > room:
+                    self._chunks.appendleft((chunk[room:], stamp))
+                    chunk = chunk[:room]
+                parts.append(chunk)
+                taken += len(chunk)
+            self._pending -= taken
+            if self._chunks:
+                self.counters.backlogged_frames += 1
+            if taken:
+                self.counters.frames += 1
+            self._cond.notify_all()
+
+        replace, text = self._collapse("".join(parts))
+        self.counters.chars_out += len(text)
+        return clear, replace, text
+
+    def _collapse(self, text: str) -> Tuple[bool, str]:
+        """Wendet ``\r``-Updates innerhalb des Frames an (nur GUI-Thread)."""
+        if not text:
+            return False, ""
+        if "\r" not in text and "\r" not in self._open:
+            nl = text.rfind("\n")
+            self._open = self._open + text if nl < 0 else text[nl + 1:]
+            return False, text
+
+        text = text.replace("\r\n", "\n")
+        lines = text.split("\n")
+        self.counters.cr_collapsed += text.count("\r")
+        first = self._open + lines[0]
+        replace = bool(self._open) and "\r" in first
+        out = [_visible(first) if replace or "\r" in first else lines[0]]
+        for line in lines[1:]:
+            out.append(_visible(line))
+        last = lines[-1] if len(lines) > 1 else first
+        # offene Zeile klein halten: nur der sichtbare Stand wird gebraucht
+        self._open = _visible(last) + ("\r" if last.endswith("\r") else "")
+        return replace, "\n".join(out)
+
+    def record_frame(self, seconds: float):
+        ms = seconds * 1000
+        self.counters.last_frame_ms = round(ms, 2)
+        self.counters.max_frame_ms = round(max(self.counters.max_frame_ms, ms), 2)
+        if self._frame_oldest:
+            latency = (time.perf_counter() - self._frame_oldest) * 1000
+            self.counters.last_latency_ms = round(latency, 2)
+            self.counters.max_latency_ms = round(max(self.counters.max_latency_ms, latency), 2)
+            if latency > self.latency_target_ms:
+                self.counters.latency_over_target += 1
+
+
+# =============================================================================
+# Begrenzte Log-Historie mit Auslagerung auf Platte
+# =============================================================================
+
+class LogHistory:
+    """
+    Ringpuffer der letzten ``tail_lines`` Zeilen plus Sitzungslog auf Platte.
+
+    Jede abgeschlossene Zeile landet in der Datei; ein dünner Index (jede
+    ``INDEX_STRIDE``-te Zeile → Byte-Offset) erlaubt das gezielte Nachladen.
+    Nur vom GUI-Thread benutzen.
+    """
+
+    INDEX_STRIDE = 256
+
+    def __init__(self, path: Path, tail_lines: int = LOG_VIEW_LINES):
+        self.path = path
+        self.tail: Deque[str] = deque(maxlen=tail_lines)
+        self.total = 0   # abgeschlossene Zeilen der Sitzung
+        self.floor = 0   # erste Zeile seit dem letzten Leeren
+        self.partial = ""
+        self._fh = None
+        self._offset = 0
+        self._index = array("q")
+
+    @classmethod
+    def for_session(cls, log_dir: Path, tail_lines: int = LOG_VIEW_LINES) -> "LogHistory":
+        old = sorted(log_dir.glob("session-*.log"))
+        for f in old[: max(0, len(old) - (LOG_KEEP_SESSIONS - 1))]:
+            try:
+                f.unlink()
+            except OSError:
+                pass
+        name = datetime.now().strftime("session-%Y%m%d-%H%M%S.log")
+        return cls(log_dir / name, tail_lines)
+
+    def _write(self, line: str):
+        if self._fh is None:
+            self._fh = open(self.path, "ab+")
+            self._offset = self._fh.seek(0, 2)
+        if self.total % self.INDEX_STRIDE == 0:
+            self._index.append(self._offset)
+        data = line.encode("utf-8", "replace")
+        self._fh.write(data)
+        self._offset += len(data)
+        self.tail.append(line)
+        self.total += 1
+
+    def feed(self, text: str, replace_partial: bool = False):
+        """``replace_partial``: die offene letzte Zeile wurde per ``\\r`` überschrieben."""
+        if replace_partial:
+            self.partial = ""
+        if not text:
+            return
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        for line in lines:
+            self._write(line + "\n")
+
+    def mark_clear(self):
+        """Beginnt einen neuen Abschnitt (z. B. neue Aktion); die Datei bleibt erhalten."""
+        if self.partial:
+            self._write(self.partial + "\n")
+            self.partial = ""
+        self.floor = self.total
+
+    def read_lines(self, start: int, stop: int) -> List[str]:
+        """Liest die Zeilen [start, stop) aus dem Sitzungslog."""
+        start = max(start, 0)
+        stop = min(stop, self.total)
+        if start >= stop or self._fh is None:
+            return []
+        self._fh.flush()
+        block = start // self.INDEX_STRIDE
+        skip = start - block * self.INDEX_STRIDE
+        out: List[str] = []
+        with open(self.path, "rb") as fh:
+            fh.seek(self._index[block])
+            for i, raw in enumerate(fh):
+                if i < skip:
+                    continue
+                out.append(raw.decode("utf-8", "replace"))
+                if len(out) >= stop - start:
+                    break
+        return out
+
+    def tail_view(self) -> Tuple[int, str]:
+        """Erste Zeilennummer und Text der im Speicher gehaltenen Endzeilen."""
+        count = min(len(self.tail), self.total - self.floor)
+        lines = list(self.tail)[len(self.tail) - count:] if count else []
+        return self.total - count, "".join(lines) + self.partial
+
+    def close(self):
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+            self._fh = None
@@ -0,0 +1,246 @@
+"""
+Laufzeit-Metriken als JSON-Lines.
+
+Jede Aktion, jede PowerShell-Abfrage und der Programmstart schreiben einen
+Datensatz nach ``metrics.jsonl`` (rotierend). ``summarize()`` wertet die
+Dateien aus (p50/p95 je Aktion), z. B. über ``winrep.py metrics``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+METRICS_MAX_BYTES = 2 * 1024 * 1024
+METRICS_BACKUPS = 3
+MEMORY_SAMPLE_INTERVAL = 0.5
+
+try:  # optional: genauerer Speicher über den ganzen Prozessbaum (DISM ist Enkelprozess)
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover - psutil ist keine Pflicht
+    psutil = None
+
+
+# =============================================================================
+# Speicher des Kindprozesses
+# =============================================================================
+
+def _rss_windows(pid: int) -> int:
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return 0
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return int(counters.WorkingSetSize)
+        return 0
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _rss_proc(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def process_tree_rss(pid: int) -> int:
+    """Arbeitsspeicher (Bytes) des Prozesses – mit psutil inkl. aller Kindprozesse."""
+    if psutil is not None:
+        try:
+            proc = psutil.Process(pid)
+            total = proc.memory_info().rss
+            for child in proc.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total
+        except psutil.Error:
+            return 0
+    try:
+        return _rss_windows(pid) if os.name == "nt" else _rss_proc(pid)
+    except Exception:
+        return 0
+
+
+class MemorySampler:
+    """Misst im Hintergrund den Spitzenwert von ``process_tree_rss(pid)``."""
+
+    def __init__(self, pid: int, interval: float = MEMORY_SAMPLE_INTERVAL):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while True:
+            self.peak = max(self.peak, process_tree_rss(self.pid))
+            if self._stop.wait(self.interval):
+                break
+
+    def __enter__(self) -> "MemorySampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self.peak = max(self.peak, process_tree_rss(self.pid))
+
+
+# =============================================================================
+# Schreiben
+# =============================================================================
+
+class MetricsWriter:
+    """Threadsicheres, rotierendes JSONL-Log (metrics.jsonl, .1, .2, …)."""
+
+    def __init__(self, path: Path, max_bytes: int = METRICS_MAX_BYTES, backups: int = METRICS_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+    def write(self, kind: str, key: str, **fields):
+        record = {"ts": datetime.now().isoformat(timespec="seconds"), "kind": kind, "key": key}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                if self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                    self._rotate()
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    fh.write(line)
+            except OSError:
+                pass  # Metriken dürfen nie eine Aktion scheitern lassen
+
+    def files(self) -> List[Path]:
+        """Alle Dateien, älteste zuerst."""
+        older = [self.path.with_name(f"{self.path.name}.{i}") for i in range(self.backups, 0, -1)]
+        return [p for p in older + [self.path] if p.exists()]
+
+
+def default_writer() -> MetricsWriter:
+    from winrep_paths import app_data_dir
+
+    return MetricsWriter(app_data_dir("metrics") / "metrics.jsonl")
+
+
+def host_result_fields(result) -> Dict[str, object]:
+    """Standardfelder aus einem ``HostResult``."""
+    return {
+        "wall_s": round(result.duration, 4),
+        "spawn_s": round(result.spawn_s, 4),
+        "first_output_s": None if result.first_output_s is None else round(result.first_output_s, 4),
+        "output_bytes": result.output_bytes,
+        "output_lines": result.output_lines,
+        "returncode": result.returncode,
+        "timed_out": result.timed_out,
+        "cancelled": result.cancelled,
+        "crashed": result.crashed,
+        "max_silence_s": round(result.max_silence_s, 1),
+        "peak_rss_mb": round(result.peak_rss / (1024 * 1024), 1) if result.peak_rss else None,
+    }
+
+
+# =============================================================================
+# Auswertung
+# =============================================================================
+
+def read_records(paths: Iterable[Path]) -> Iterator[dict]:
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except OSError:
+            continue
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(records: Iterable[dict], kind: str = "action") -> List[dict]:
+    groups: Dict[str, List[dict]] = {}
+    for rec in records:
+        if rec.get("kind") == kind and rec.get("wall_s") is not None:
+            groups.setdefault(str(rec.get("key")), []).append(rec)
+
+    rows = []
+    for key in sorted(groups):
+        recs = groups[key]
+        wall = [float(r["wall_s"]) for r in recs]
+        first = [float(r["first_output_s"]) for r in recs if r.get("first_output_s") is not None]
+        peaks = [float(r["peak_rss_mb"]) for r in recs if r.get("peak_rss_mb")]
+        failed = sum(1 for r in recs if r.get("returncode") not in (0, None))
+        rows.append({
+            "key": key,
+            "n": len(recs),
+            "fail": failed,
+            "p50_s": round(percentile(wall, 50), 2),
+            "p95_s": round(percentile(wall, 95), 2),
+            "first_out_p50_s": round(percentile(first, 50), 2) if first else "-",
+            "peak_mb_max": round(max(peaks), 1) if peaks else "-",
+        })
+    return rows
+
+
+class Stopwatch:
+    """Benannte Zeitmarken relativ zu einem Startpunkt (Startup-Phasen)."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str):
+        if name not in self.marks:
+            self.marks[name] = round(time.perf_counter() - self.t0, 4)
@@ -0,0 +1,26 @@
+"""Ablageorte für Laufzeitdaten (Logs, Caches, Metriken)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+APP_DIR_NAME = "SD-TechTools"
+
+
+def app_data_dir(*parts: str) -> Path:
+    """
+    Liefert (und erzeugt) ein Unterverzeichnis im Datenordner der App.
+    Windows: %LOCALAPPDATA%\\SD-TechTools, sonst ~/.local/share/SD-TechTools.
+    Mit WINREP_DATA_DIR lässt sich der Ordner überschreiben (Tests/Benchmarks).
+    """
+    base = os.environ.get("WINREP_DATA_DIR")
+    if base:
+        root = Path(base)
+    elif os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        root = Path(os.environ["LOCALAPPDATA"]) / APP_DIR_NAME
+    else:
+        root = Path.home() / ".local" / "share" / APP_DIR_NAME
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,120 @@
+"""
+Fortschritt aus der laufenden Ausgabe von DISM, SFC und CHKDSK ableiten.
+
+``ProgressParser.feed()`` bekommt Ausgabezeilen (auch per ``\\r`` aktualisierte
+Zeilen) und liefert einen Anteil 0.0–1.0, sobald ein Marker erkannt wurde.
+``ProgressThrottle`` sorgt dafür, dass die GUI nur selten neu zeichnet.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Optional
+
+# DISM: "[==========                 42.3%                          ]"
+_RE_DISM = re.compile(r"\[[=\s-]*?(\d{1,3}(?:[.,]\d+)?)\s*%[=\s-]*\]")
+# SFC: "Verification 42% complete." / "Überprüfung 42 % abgeschlossen."
+_RE_SFC = re.compile(
+    r"(\d{1,3})\s*%\s*(?:complete|abgeschlossen|durchgeführt)",
+    re.IGNORECASE,
+)
+# CHKDSK: "Stage 2: Examining file name linkage ..." / "Phase 2: ..."
+_RE_CHKDSK_STAGE = re.compile(r"^\s*(?:Stage|Phase|Stufe)\s+(\d)\s*[:.]", re.IGNORECASE)
+# CHKDSK: "Progress: 1234 of 5678 done; Stage: 21%; Total: 7%; ETA: ..."
+_RE_CHKDSK_TOTAL = re.compile(r"(?:Total|Gesamt)\s*:\s*(\d{1,3})\s*%", re.IGNORECASE)
+_RE_CHKDSK_STAGE_PCT = re.compile(r"(?:Stage|Phase|Stufe)\s*:\s*(\d{1,3})\s*%", re.IGNORECASE)
+# Mehrschritt-Aktionen aus winrep_actions.ps1: "3/6: TCP/IP-Einstellungen ..."
+_RE_STEP = re.compile(r"^\s*(\d{1,2})/(\d{1,2}):")
+
+CHKDSK_STAGES = 3
+
+# Reiner Fortschrittsbalken ohne weiteren Text
+_RE_BAR_ONLY = re.compile(r"^\s*\[[=\s-]*\d{1,3}(?:[.,]\d+)?\s*%[=\s-]*\]\s*$")
+
+
+def is_transient_line(line: str) -> bool:
+    """
+    True für DISM-Balkenzeilen. PowerShell zerlegt ``\\r``-Updates nativer
+    Programme in einzelne Zeilen – solche Zeilen werden wieder als
+    In-Place-Update behandelt, statt das Log zu fluten.
+    """
+    return "%" in line and bool(_RE_BAR_ONLY.match(line))
+
+
+def _pct(value: str) -> float:
+    return max(0.0, min(100.0, float(value.replace(",", ".")))) / 100.0
+
+
+class ProgressParser:
+    """Zustandsbehafteter Parser; eine Instanz pro laufender Aktion."""
+
+    def __init__(self):
+        self.fraction: Optional[float] = None
+        self.steps = True   # "n/m:"-Zeilen auswerten; aus, sobald das Skript Schritt-Ereignisse sendet
+        self._chkdsk_stage = 0
+
+    def feed(self, line: str) -> Optional[float]:
+        """Liefert den neuen Anteil oder None, wenn die Zeile keinen Marker enthält."""
+        if "\x00" in line:
+            line = line.replace("\x00", "")   # sfc: UTF-16 ohne Umkodierung (siehe Get-SfcState)
+        value = self._parse(line)
+        if value is not None:
+            self.fraction = value
+        return value
+
+    def _parse(self, line: str) -> Optional[float]:
+        if "%" in line:
+            m = _RE_DISM.search(line)
+            if m:
+                return _pct(m.group(1))
+
+            m = _RE_CHKDSK_TOTAL.search(line)
+            if m:
+                return _pct(m.group(1))
+
+            m = _RE_CHKDSK_STAGE_PCT.search(line)
+            if m and self._chkdsk_stage:
+                return self._stage_fraction(_pct(m.group(1)))
+
+            m = _RE_SFC.search(line)
+            if m:
+                return _pct(m.group(1))
+
+        m = _RE_CHKDSK_STAGE.match(line)
+        if m:
+            self._chkdsk_stage = int(m.group(1))
+            return self._stage_fraction(0.0)
+
+        m = _RE_STEP.match(line) if self.steps else None
+        if m:
+            step, total = int(m.group(1)), int(m.group(2))
+            if 0 < step <= total:
+                # Zeile kündigt Schritt an → die vorherigen sind fertig
+                return (step - 1) / total
+
+        return None
+
+    def _stage_fraction(self, within: float) -> float:
+        stage = min(max(self._chkdsk_stage, 1), CHKDSK_STAGES)
+        return ((stage - 1) + within) / CHKDSK_STAGES
+
+
+class ProgressThrottle:
+    """Lässt Updates nur durch, wenn sie sichtbar sind und nicht zu dicht aufeinander folgen."""
+
+    def __init__(self, min_interval: float = 0.1, min_delta: float = 0.005):
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self._last_value = -1.0
+        self._last_time = 0.0
+
+    def should_emit(self, value: float, now: float | None = None) -> bool:
+        now = time.perf_counter() if now is None else now
+        if abs(value - self._last_value) < self.min_delta:
+            return False
+        if now - self._last_time < self.min_interval and value < 1.0:
+            return False
+        self._last_value = value
+        self._last_time = now
+        return True
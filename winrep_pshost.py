@@ -0,0 +1,650 @@
+"""
+Langlebige PowerShell-Hosts für WinRep.
+
+Statt für jede Aktion / jede Abfrage ein neues ``powershell.exe`` zu starten
+(0,5–2 s Startzeit), hält der Pool einen oder mehrere "warme" Prozesse vor.
+Befehle werden über ein einfaches Zeilenprotokoll auf stdin übergeben:
+
+    Anfrage:  "<id> <base64(utf-8 Skript)>\\n"
+    Antwort:  beliebige Ausgabezeilen, danach "<SENTINEL> <id> <rc>\\n"
+
+Hängt oder stirbt ein Host, wird er verworfen und beim nächsten Aufruf neu
+gestartet. Der Launcher ist austauschbar (z. B. ``standin_launcher()`` für
+Tests unter Linux).
+
+Laufende Aufrufe überwacht ``RunControl``: Abbruch von außen, weiches
+Zeitlimit (nur Hinweis), hartes Zeitlimit und Stillstand (keine Ausgabe).
+Abbruch und hartes Limit beenden den ganzen Prozessbaum des Hosts
+(DISM, cleanmgr, …), nicht nur powershell.exe.
+"""
+
+from __future__ import annotations
+
+import base64
+import codecs
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PS_ENCODING = "cp850"
+
+SENTINEL = "\x1eWINREP-END"
+
+# Bootstrap-Schleife, die im warmen powershell.exe läuft
+_PS_BOOTSTRAP = r"""
+$enc = [System.Text.Encoding]::GetEncoding(850)
+[Console]::OutputEncoding = $enc
+$OutputEncoding = $enc
+$ProgressPreference = 'SilentlyContinue'
+$stdin = [Console]::In
+while ($true) {
+    $line = $stdin.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line.Split(' ', 2)
+    if ($parts.Length -lt 2) { continue }
+    $id = $parts[0]
+    $code = [System.Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($parts[1]))
+    $global:LASTEXITCODE = 0
+    $rc = 0
+    try {
+        & ([scriptblock]::Create($code)) 2>&1 |
+            Out-String -Stream -Width 4096 |
+            ForEach-Object { [Console]::Out.WriteLine($_); [Console]::Out.Flush() }
+        if ($global:LASTEXITCODE) { $rc = [int]$global:LASTEXITCODE }
+    } catch {
+        [Console]::Out.WriteLine($_.Exception.Message)
+        $rc = 1
+    }
+    [Console]::Out.WriteLine("__SENTINEL__ $id $rc")
+    [Console]::Out.Flush()
+}
+""".replace("__SENTINEL__", SENTINEL)
+
+
+# =============================================================================
+# Launcher
+# =============================================================================
+
+@dataclass(frozen=True)
+class HostLauncher:
+    name: str
+    argv: List[str]
+    encoding: str = PS_ENCODING
+
+
+def hidden_popen_kwargs() -> dict:
+    """Popen-Argumente, die unter Windows kein Konsolenfenster öffnen."""
+    if os.name != "nt":
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {
+        "startupinfo": startupinfo,
+        "creationflags": subprocess.CREATE_NO_WINDOW,
+    }
+
+
+def kill_process_tree(proc: subprocess.Popen):
+    """Host samt allen Kindprozessen beenden (DISM/SFC laufen als eigene Prozesse)."""
+    if proc.poll() is None:
+        try:
+            if os.name == "nt":
+                subprocess.run(
+                    ["taskkill", "/PID", str(proc.pid), "/T", "/F"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=10,
+                    **hidden_popen_kwargs(),
+                )
+            else:
+                import signal
+
+                os.killpg(proc.pid, signal.SIGKILL)  # Host läuft in eigener Sitzung
+        except Exception:
+            pass
+    try:
+        proc.kill()
+    except Exception:
+        pass
+
+
+def powershell_launcher() -> HostLauncher:
+    encoded = base64.b64encode(_PS_BOOTSTRAP.encode("utf-16-le")).decode("ascii")
+    return HostLauncher(
+        "powershell",
+        [
+            "powershell.exe",
+            "-NoProfile",
+            "-NonInteractive",
+            "-WindowStyle", "Hidden",
+            "-ExecutionPolicy", "Bypass",
+            "-EncodedCommand", encoded,
+        ],
+    )
+
+
+def standin_launcher() -> HostLauncher:
+    """Python-Ersatzhost: führt die Befehle über die lokale Shell aus."""
+    return HostLauncher(
+        "standin",
+        [sys.executable, "-u", str(Path(__file__).resolve()), "--standin"],
+        encoding="utf-8",
+    )
+
+
+# =============================================================================
+# Chunk-Reader
+# =============================================================================
+
+READ_CHUNK = 64 * 1024
+
+_RE_TERMINATOR = re.compile(r"\r\n|\n|\r")
+
+
+class SegmentReader:
+    """
+    Dekodiert Byte-Chunks inkrementell (z. B. CP850) und zerlegt sie an
+    Zeilenenden. ``\r\n`` wird zu ``\n``; ein alleinstehendes ``\r`` bleibt
+    erhalten und bedeutet "Zeile an Ort und Stelle aktualisieren" (DISM-Balken).
+    NUL-Zeichen fallen weg: sfc schreibt UTF-16 in die Pipe, nach CP850
+    dekodiert steht zwischen allen Zeichen ein ``\0``.
+    """
+
+    def __init__(self, encoding: str):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.buffer = ""
+
+    def feed(self, data: bytes, final: bool = False) -> List[str]:
+        text = self._decoder.decode(data, final)
+        self.buffer += text.replace("\x00", "") if "\x00" in text else text
+        buf = self.buffer
+        out: List[str] = []
+        start = 0
+        for m in _RE_TERMINATOR.finditer(buf):
+            term = m.group()
+            if term == "\r" and m.end() == len(buf) and not final:
+                break  # evtl. folgt noch "\n" im nächsten Chunk
+            out.append(buf[start:m.start()] + ("\n" if term == "\r\n" else term))
+            start = m.end()
+        self.buffer = buf[start:]
+        return out
+
+    def take_partial(self) -> str:
+        """Unvollständige Restzeile abholen, damit Text ohne Zeilenende sofort sichtbar wird."""
+        partial = self.buffer
+        if not partial or SENTINEL[0] in partial or partial == "\r":
+            return ""
+        self.buffer = ""
+        return partial
+
+
+# =============================================================================
+# Host
+# =============================================================================
+
+class HostError(RuntimeError):
+    pass
+
+
+ALERT_SOFT_TIMEOUT = "soft_timeout"
+ALERT_STALL = "stall"
+ALERT_RESUMED = "resumed"      # nach Stillstand kommt wieder Ausgabe
+
+WATCHDOG_INTERVAL = 0.25
+
+
+class RunControl:
+    """
+    Steuerung eines laufenden Aufrufs (threadsicher).
+
+    ``soft``: Sekunden bis zum Hinweis "dauert ungewöhnlich lange",
+    ``hard``: Sekunden bis zum Beenden des Prozessbaums,
+    ``stall``: Sekunden ohne Ausgabe bis zum Hinweis "hängt evtl.".
+    ``on_alert(kind, seconds)`` wird aus dem Watchdog-Thread aufgerufen.
+    """
+
+    def __init__(
+        self,
+        soft: float | None = None,
+        hard: float | None = None,
+        stall: float | None = None,
+        on_alert: Callable[[str, float], None] | None = None,
+    ):
+        self.soft = soft
+        self.hard = hard
+        self.stall = stall
+        self.on_alert = on_alert
+        self.reason = ""
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._host: PSHost | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self, reason: str = "abgebrochen"):
+        with self._lock:
+            if self._cancel.is_set():
+                return
+            self.reason = reason
+            self._cancel.set()
+            host = self._host
+        if host is not None:
+            host.kill()
+
+    def _attach(self, host: PSHost | None):
+        with self._lock:
+            self._host = host
+            cancelled = self._cancel.is_set()
+        if host is not None and cancelled:
+            host.kill()
+
+    def _alert(self, kind: str, seconds: float):
+        if self.on_alert is not None:
+            try:
+                self.on_alert(kind, seconds)
+            except Exception:
+                pass
+
+    def _watch(self, t0: float, last_output: List[float], done: threading.Event, timed_out: threading.Event):
+        """Watchdog-Schleife; ``last_output[0]`` setzt der Lesethread."""
+        soft_sent = False
+        stalled = False
+        while not done.wait(WATCHDOG_INTERVAL):
+            if self._cancel.is_set():
+                break
+            now = time.perf_counter()
+            elapsed = now - t0
+            if self.hard is not None and elapsed >= self.hard:
+                timed_out.set()
+                self.cancel(f"Zeitlimit {self.hard:.0f} s überschritten")
+                break
+            if self.soft is not None and not soft_sent and elapsed >= self.soft:
+                soft_sent = True
+                self._alert(ALERT_SOFT_TIMEOUT, elapsed)
+            silent = now - last_output[0]
+            if self.stall is not None:
+                if not stalled and silent >= self.stall:
+                    stalled = True
+                    self._alert(ALERT_STALL, silent)
+                elif stalled and silent < self.stall:
+                    stalled = False
+                    self._alert(ALERT_RESUMED, elapsed)
+
+
+@dataclass
+class HostResult:
+    output: str
+    returncode: int
+    duration: float
+    timed_out: bool = False
+    cancelled: bool = False                # von außen abgebrochen (RunControl.cancel)
+    crashed: bool = False                  # Host-Prozess während des Aufrufs unerwartet beendet
+    max_silence_s: float = 0.0             # längste Phase ohne Ausgabe
+    spawn_s: float = 0.0                   # Startzeit eines neuen Hosts für diesen Aufruf (0 = warm)
+    first_output_s: float | None = None    # Zeit bis zum ersten Ausgabe-Byte
+    output_bytes: int = 0
+    output_lines: int = 0
+    peak_rss: int = 0                      # Spitzen-Arbeitsspeicher des Hosts (nur mit sample_memory)
+
+
+class PSHost:
+    """Ein einzelner warmer Host-Prozess. Nicht threadsicher – dafür gibt es den Pool."""
+
+    def __init__(self, launcher: HostLauncher):
+        self.launcher = launcher
+        self.proc: subprocess.Popen | None = None
+        self.spawn_seconds = 0.0
+        self.calls = 0
+        self._next_id = 0
+        self._reader = SegmentReader(launcher.encoding)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        t0 = time.perf_counter()
+        try:
+            self.proc = subprocess.Popen(
+                self.launcher.argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                start_new_session=os.name != "nt",  # eigene Prozessgruppe für kill_process_tree
+                **hidden_popen_kwargs(),
+            )
+        except OSError as exc:
+            raise HostError(f"{self.launcher.argv[0]} konnte nicht gestartet werden: {exc}") from exc
+        self._reader = SegmentReader(self.launcher.encoding)
+        # Ping: erst wenn der Host antwortet, gilt er als warm
+        self.run("")
+        self.spawn_seconds = time.perf_counter() - t0
+        self.calls = 0
+
+    def kill(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        kill_process_tree(proc)
+        try:
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    def close(self):
+        proc = self.proc
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            pass
+        self.kill()
+
+    def run(
+        self,
+        script: str,
+        on_output: Callable[[str], None] | None = None,
+        timeout: float | None = None,
+        sample_memory: bool = False,
+        control: RunControl | None = None,
+    ) -> HostResult:
+        """``timeout`` = hartes Limit ohne eigenes ``RunControl``."""
+        if not self.alive:
+            raise HostError("PowerShell-Host läuft nicht.")
+        if sample_memory:
+            from winrep_metrics import MemorySampler
+
+            with MemorySampler(self.proc.pid) as sampler:
+                result = self.run(script, on_output, timeout, control=control)
+            result.peak_rss = sampler.peak
+            return result
+
+        proc = self.proc
+        self._next_id += 1
+        req_id = str(self._next_id)
+        payload = base64.b64encode(script.encode("utf-8")).decode("ascii")
+
+        if control is None and timeout is not None:
+            control = RunControl(hard=timeout)
+        timed_out = threading.Event()
+        done = threading.Event()
+        last_output = [time.perf_counter()]
+        max_silence = 0.0
+
+        t0 = time.perf_counter()
+        chunks: List[str] = []
+        marker = f"{SENTINEL} {req_id} "
+        rc: int | None = None
+        reader = self._reader
+        fd = proc.stdout.fileno()
+        nbytes = 0
+        first_output: float | None = None
+        try:
+            proc.stdin.write(f"{req_id} {payload}\n".encode("ascii"))
+            proc.stdin.flush()
+            if control is not None:
+                control._attach(self)
+                threading.Thread(
+                    target=control._watch, args=(t0, last_output, done, timed_out), daemon=True
+                ).start()
+            while rc is None:
+                data = os.read(fd, READ_CHUNK)
+                if not data:
+                    break
+                now = time.perf_counter()
+                max_silence = max(max_silence, now - last_output[0])
+                last_output[0] = now
+                nbytes += len(data)
+                if first_output is None:
+                    first_output = now - t0
+                for seg in reader.feed(data):
+                    pos = seg.find(SENTINEL)
+                    if pos > 0:
+                        # Ausgabe ohne abschließendes Zeilenende direkt vor dem Sentinel
+                        head, seg = seg[:pos], seg[pos:]
+                        chunks.append(head)
+                        if on_output is not None:
+                            on_output(head)
+                    if seg.startswith(marker):
+                        try:
+                            rc = int(seg[len(marker):].strip() or 0)
+                        except ValueError:
+                            rc = 1
+                        break
+                    if seg.startswith(SENTINEL):
+                        continue  # Restantwort eines früheren Aufrufs
+                    chunks.append(seg)
+                    if on_output is not None:
+                        on_output(seg)
+                if rc is None:
+                    partial = reader.take_partial()
+                    if partial:
+                        chunks.append(partial)
+                        if on_output is not None:
+                            on_output(partial)
+        except KeyboardInterrupt:
+            self.kill()  # Strg+C in der CLI: Kindprozesse nicht weiterlaufen lassen
+            raise
+        except (OSError, ValueError):
+            pass
+        finally:
+            done.set()
+            if control is not None:
+                control._attach(None)
+
+        duration = time.perf_counter() - t0
+        if rc is None:
+            max_silence = max(max_silence, time.perf_counter() - last_output[0])
+        output = "".join(chunks)
+        result = HostResult(
+            output,
+            -1 if rc is None else rc,
+            duration,
+            first_output_s=first_output if output else None,
+            output_bytes=min(nbytes, len(output.encode(self.launcher.encoding, "replace"))),
+            output_lines=output.count("\n"),
+            max_silence_s=max_silence,
+        )
+        if rc is None:
+            # Host ist abgestürzt, wurde abgebrochen oder wegen Timeout beendet
+            self.kill()
+            if timed_out.is_set():
+                result.timed_out = True
+                return result
+            if control is not None and control.cancelled:
+                result.cancelled = True
+                return result
+            # Teilausgabe behalten – der Aufrufer wertet den Lauf als Fehlschlag
+            result.crashed = True
+            return result
+
+        self.calls += 1
+        return result
+
+
+# =============================================================================
+# Pool
+# =============================================================================
+
+@dataclass
+class HostStats:
+    spawns: int = 0
+    restarts: int = 0
+    calls: int = 0
+    timeouts: int = 0
+    cancels: int = 0
+    spawn_seconds: List[float] = field(default_factory=list)
+    call_seconds: List[float] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, float]:
+        def avg(values: List[float]) -> float:
+            return round(sum(values) / len(values) * 1000, 1) if values else 0.0
+
+        return {
+            "spawns": self.spawns,
+            "restarts": self.restarts,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "cancels": self.cancels,
+            "spawn_ms_avg": avg(self.spawn_seconds),
+            "spawn_ms_last": round(self.spawn_seconds[-1] * 1000, 1) if self.spawn_seconds else 0.0,
+            "call_ms_avg": avg(self.call_seconds),
+        }
+
+
+class PSHostPool:
+    """
+    Pool warmer Hosts. ``warm`` Hosts werden vorab gestartet, bei Bedarf
+    wachsen bis zu ``max_size`` Hosts (z. B. Aktion + parallele Abfragen).
+    """
+
+    HISTORY = 200
+
+    def __init__(self, launcher: HostLauncher | None = None, warm: int = 1, max_size: int = 3):
+        self.launcher = launcher or powershell_launcher()
+        self.warm = warm
+        self.max_size = max(1, max_size)
+        self.stats = HostStats()
+        self._idle: List[PSHost] = []
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def prewarm(self):
+        """Startet ``warm`` Hosts (blockierend – gedacht für einen Hintergrund-Thread)."""
+        hosts = []
+        try:
+            for _ in range(self.warm):
+                hosts.append(self._acquire()[0])
+        finally:
+            for h in hosts:
+                self._release(h)
+
+    def _spawn(self) -> PSHost:
+        host = PSHost(self.launcher)
+        host.start()
+        with self._cond:
+            self.stats.spawns += 1
+            self.stats.spawn_seconds.append(host.spawn_seconds)
+            del self.stats.spawn_seconds[:-self.HISTORY]
+        return host
+
+    def _acquire(self) -> Tuple[PSHost, bool]:
+        """Liefert (Host, für diesen Aufruf neu gestartet?)."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise HostError("Host-Pool wurde geschlossen.")
+                while self._idle:
+                    host = self._idle.pop()
+                    if host.alive:
+                        return host, False
+                    self._count -= 1
+                    self.stats.restarts += 1
+                if self._count < self.max_size:
+                    self._count += 1
+                    break
+                self._cond.wait()
+        try:
+            return self._spawn(), True
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, host: PSHost):
+        with self._cond:
+            if self._closed or not host.alive:
+                if not host.alive and not self._closed:
+                    self.stats.restarts += 1
+                self._count -= 1
+                host.close()
+            else:
+                self._idle.append(host)
+            self._cond.notify()
+
+    def run(
+        self,
+        script: str,
+        on_output: Callable[[str], None] | None = None,
+        timeout: float | None = None,
+        sample_memory: bool = False,
+        control: RunControl | None = None,
+    ) -> HostResult:
+        host, spawned = self._acquire()
+        try:
+            result = host.run(
+                script, on_output=on_output, timeout=timeout, sample_memory=sample_memory, control=control
+            )
+        finally:
+            self._release(host)
+        if spawned:
+            result.spawn_s = host.spawn_seconds
+        with self._cond:
+            self.stats.calls += 1
+            self.stats.timeouts += int(result.timed_out)
+            self.stats.cancels += int(result.cancelled)
+            self.stats.call_seconds.append(result.duration)
+            del self.stats.call_seconds[:-self.HISTORY]
+        return result
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self._cond.notify_all()
+        for h in idle:
+            h.close()
+
+
+# =============================================================================
+# Stand-in-Host (Tests / Linux)
+# =============================================================================
+
+def _standin_main():
+    """Spricht dasselbe Protokoll wie der PowerShell-Bootstrap, führt aber Shell-Befehle aus."""
+    for line in sys.stdin:
+        parts = line.rstrip("\n").split(" ", 1)
+        if len(parts) < 2:
+            continue
+        req_id, payload = parts
+        code = base64.b64decode(payload).decode("utf-8")
+        rc = 0
+        if code.strip():
+            proc = subprocess.Popen(
+                code,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+            )
+            # Rohe Bytes durchreichen, damit "\r"-Updates nicht hängen bleiben
+            out = sys.stdout.buffer
+            while True:
+                data = os.read(proc.stdout.fileno(), READ_CHUNK)
+                if not data:
+                    break
+                out.write(data)
+                out.flush()
+            rc = proc.wait()
+        sys.stdout.write(f"{SENTINEL} {req_id} {rc}\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    if "--standin" in sys.argv[1:]:
+        _standin_main()
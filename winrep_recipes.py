@@ -0,0 +1,298 @@
+"""
+Reparatur-Abläufe ("Rezepte") aus ``winrep_recipes.json``.
+
+Ein Rezept ist eine Folge von Schritten, die je eine Aktion aus ``ACTIONS``
+ausführen. Schritte können an Bedingungen geknüpft sein, die sich auf
+Rückgabecode und Ergebnis (``result``-Ereignis aus winrep_actions.ps1)
+früherer Schritte beziehen – so entfällt z. B. RestoreHealth, wenn
+CheckHealth/ScanHealth einen intakten Komponentenspeicher melden.
+
+Bedingungen (``"if"``):
+
+    {"step": "scan", "status": ["repairable", "not_repairable"]}
+    {"step": "scan", "returncode": 0}            bzw. [0, 3010] / {"not": 0}
+    {"step": "scan", "skipped": true}
+    {"all": [...]}, {"any": [...]}, {"not": {...}}
+
+Ein übersprungener Schritt erfüllt nur ``"skipped": true``. Mit
+``"on_fail": "stop"`` bricht das Rezept ab, wenn der Schritt fehlschlägt.
+
+Eigene Rezepte: ``recipes.json`` im Datenordner (gleiches Format, gleiche
+Schlüssel überschreiben die mitgelieferten).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from winrep_core import ACTIONS, RC_CANCELLED, WinRepAction, resource_path
+
+RECIPES_FILE = "winrep_recipes.json"
+RECIPES_VERSION = 1
+RECIPE_CATEGORY = "Abläufe"
+RECIPE_KEY_PREFIX = "recipe:"
+
+STEP_DONE = "done"
+STEP_FAILED = "failed"
+STEP_SKIPPED = "skipped"
+STEP_NOT_RUN = "not_run"   # nach Abbruch durch "on_fail": "stop"
+
+STEP_RESUMED_NOTE = "aus vorheriger Sitzung übernommen"
+
+
+@dataclass(frozen=True)
+class RecipeStep:
+    id: str
+    action: str
+    condition: Dict[str, object] | None = None
+    skip_note: str = ""
+    stop_on_fail: bool = False
+
+
+@dataclass(frozen=True)
+class Recipe:
+    key: str
+    title: str
+    description: str
+    steps: Tuple[RecipeStep, ...]
+
+    def as_action(self) -> WinRepAction:
+        """Pseudo-Aktion für Liste und Warteschlange (Ressourcen = Vereinigung aller Schritte)."""
+        resources: List[str] = []
+        for step in self.steps:
+            for r in ACTIONS[step.action].resources:
+                if r not in resources:
+                    resources.append(r)
+        return WinRepAction(
+            RECIPE_KEY_PREFIX + self.key,
+            self.title,
+            self.description,
+            RECIPE_CATEGORY,
+            invalidates=tuple(sorted({k for s in self.steps for k in ACTIONS[s.action].invalidates})),
+            confirm=any(ACTIONS[s.action].confirm for s in self.steps),
+            resources=tuple(resources),
+        )
+
+
+# =============================================================================
+# Laden / Prüfen
+# =============================================================================
+
+def _parse_recipe(raw: dict, origin: str) -> Recipe:
+    key = str(raw.get("key") or "")
+    if not key:
+        raise ValueError(f"{origin}: Rezept ohne 'key'")
+    steps: List[RecipeStep] = []
+    seen: List[str] = []
+    for i, s in enumerate(raw.get("steps") or [], 1):
+        step_id = str(s.get("id") or f"step{i}")
+        action = str(s.get("action") or "")
+        if action not in ACTIONS:
+            raise ValueError(f"{origin}/{key}: unbekannte Aktion {action!r} in Schritt {step_id!r}")
+        if step_id in seen:
+            raise ValueError(f"{origin}/{key}: Schritt-ID {step_id!r} doppelt")
+        condition = s.get("if")
+        for ref in _referenced_steps(condition):
+            if ref not in seen:
+                raise ValueError(f"{origin}/{key}: Schritt {step_id!r} bezieht sich auf {ref!r}, der nicht vorher läuft")
+        seen.append(step_id)
+        steps.append(RecipeStep(
+            step_id,
+            action,
+            condition,
+            str(s.get("skip_note") or ""),
+            s.get("on_fail") == "stop",
+        ))
+    if not steps:
+        raise ValueError(f"{origin}/{key}: Rezept ohne Schritte")
+    return Recipe(key, str(raw.get("title") or key), str(raw.get("description") or ""), tuple(steps))
+
+
+def _referenced_steps(condition) -> List[str]:
+    if not isinstance(condition, dict):
+        return []
+    refs = []
+    if "step" in condition:
+        refs.append(str(condition["step"]))
+    for k in ("all", "any"):
+        for sub in condition.get(k) or []:
+            refs.extend(_referenced_steps(sub))
+    if isinstance(condition.get("not"), dict):
+        refs.extend(_referenced_steps(condition["not"]))
+    return refs
+
+
+def parse_recipes(data: dict, origin: str = RECIPES_FILE) -> Dict[str, Recipe]:
+    if data.get("version") != RECIPES_VERSION:
+        raise ValueError(f"{origin}: unbekannte Version {data.get('version')!r}")
+    recipes: Dict[str, Recipe] = {}
+    for raw in data.get("recipes") or []:
+        recipe = _parse_recipe(raw, origin)
+        recipes[recipe.key] = recipe
+    return recipes
+
+
+def load_recipes(user_file: Path | None = None) -> Dict[str, Recipe]:
+    """Mitgelieferte Rezepte plus (optional) eigene aus dem Datenordner."""
+    path = Path(resource_path(RECIPES_FILE))
+    recipes = parse_recipes(json.loads(path.read_text(encoding="utf-8")), path.name)
+    if user_file is None:
+        from winrep_paths import app_data_dir
+
+        user_file = app_data_dir() / "recipes.json"
+    if user_file.exists():
+        recipes.update(parse_recipes(json.loads(user_file.read_text(encoding="utf-8")), str(user_file)))
+    return recipes
+
+
+# =============================================================================
+# Ausführen
+# =============================================================================
+
+@dataclass
+class StepOutcome:
+    returncode: int | None
+    status: str | None = None
+
+
+@dataclass
+class StepRecord:
+    step: RecipeStep
+    state: str
+    returncode: int | None = None
+    status: str | None = None
+    seconds: float = 0.0
+    note: str = ""
+
+
+@dataclass
+class RecipeRun:
+    recipe: Recipe
+    records: List[StepRecord] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def returncode(self) -> int:
+        """Erster Fehlercode eines ausgeführten Schritts, sonst 0."""
+        for rec in self.records:
+            if rec.state == STEP_FAILED:
+                return rec.returncode if rec.returncode not in (None, 0) else 1
+        return 0
+
+    def summary(self) -> str:
+        counts: Dict[str, int] = {}
+        for rec in self.records:
+            counts[rec.state] = counts.get(rec.state, 0) + 1
+        parts = [f"{counts.get(STEP_DONE, 0)} ausgeführt"]
+        if counts.get(STEP_SKIPPED):
+            parts.append(f"{counts[STEP_SKIPPED]} übersprungen")
+        if counts.get(STEP_FAILED):
+            parts.append(f"{counts[STEP_FAILED]} fehlgeschlagen")
+        if counts.get(STEP_NOT_RUN):
+            parts.append(f"{counts[STEP_NOT_RUN]} abgebrochen")
+        return ", ".join(parts)
+
+
+def _match(value, expected) -> bool:
+    if isinstance(expected, dict) and "not" in expected:
+        return not _match(value, expected["not"])
+    if isinstance(expected, list):
+        return value in expected
+    return value == expected
+
+
+def evaluate(condition, outcomes: Dict[str, StepOutcome | None]) -> bool:
+    """``outcomes``: Schritt-ID → Ergebnis (None = übersprungen)."""
+    if condition is None:
+        return True
+    if "all" in condition:
+        return all(evaluate(c, outcomes) for c in condition["all"])
+    if "any" in condition:
+        return any(evaluate(c, outcomes) for c in condition["any"])
+    if "not" in condition:
+        return not evaluate(condition["not"], outcomes)
+
+    outcome = outcomes.get(str(condition.get("step")))
+    if outcome is None:
+        return bool(condition.get("skipped", False))
+    if condition.get("skipped") is True:
+        return False
+    if "returncode" in condition and not _match(outcome.returncode, condition["returncode"]):
+        return False
+    if "status" in condition and not _match(outcome.status, condition["status"]):
+        return False
+    return True
+
+
+def run_recipe(
+    recipe: Recipe,
+    execute: Callable[[RecipeStep], StepOutcome],
+    on_step: Callable[[int, StepRecord], None] | None = None,
+    on_start: Callable[[int, RecipeStep], None] | None = None,
+    done: Dict[str, StepOutcome] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> RecipeRun:
+    """
+    Führt die Schritte direkt nacheinander aus (``execute`` blockiert bis
+    zum Ende der Aktion). ``on_start``/``on_step`` erhalten den 1-basierten
+    Index, z. B. für Log und Statuszeile. ``done`` enthält bereits erledigte
+    Schritte (Fortsetzen aus dem Journal) – sie werden nicht erneut ausgeführt,
+    ihr Ergebnis zählt aber für spätere Bedingungen. Liefert ``cancelled()``
+    True, werden die restlichen Schritte nicht mehr ausgeführt.
+    """
+    run = RecipeRun(recipe)
+    outcomes: Dict[str, StepOutcome | None] = {}
+    done = done or {}
+    t_run = time.perf_counter()
+    stopped = False
+    for index, step in enumerate(recipe.steps, 1):
+        if not stopped and cancelled is not None and cancelled():
+            stopped = True
+        if step.id in done and not stopped:
+            outcome = done[step.id]
+            outcomes[step.id] = outcome
+            record = StepRecord(step, STEP_DONE, outcome.returncode, outcome.status, note=STEP_RESUMED_NOTE)
+        elif stopped:
+            record = StepRecord(step, STEP_NOT_RUN, note="Ablauf abgebrochen")
+        elif not evaluate(step.condition, outcomes):
+            outcomes[step.id] = None
+            record = StepRecord(step, STEP_SKIPPED, note=step.skip_note)
+        else:
+            if on_start is not None:
+                on_start(index, step)
+            t0 = time.perf_counter()
+            outcome = execute(step)
+            outcomes[step.id] = outcome
+            ok = outcome.returncode == 0
+            record = StepRecord(
+                step,
+                STEP_DONE if ok else STEP_FAILED,
+                outcome.returncode,
+                outcome.status,
+                time.perf_counter() - t0,
+            )
+            if not ok and (step.stop_on_fail or outcome.returncode == RC_CANCELLED):
+                stopped = True
+        run.records.append(record)
+        if on_step is not None:
+            on_step(index, record)
+    run.seconds = time.perf_counter() - t_run
+    return run
+
+
+def describe_record(index: int, total: int, record: StepRecord) -> str:
+    title = ACTIONS[record.step.action].title.split(" [")[0]
+    head = f"[Ablauf {index}/{total}] {title}"
+    if record.state == STEP_SKIPPED:
+        return f"{head}: übersprungen" + (f" – {record.note}" if record.note else "")
+    if record.state == STEP_NOT_RUN:
+        return f"{head}: nicht ausgeführt – {record.note}"
+    status = f", {record.status}" if record.status else ""
+    rc = "OK" if record.state == STEP_DONE else f"Fehlercode {record.returncode}"
+    if record.note == STEP_RESUMED_NOTE:
+        return f"{head}: {rc}{status} – {record.note}"
+    return f"{head}: {rc}{status} ({record.seconds:.0f} s)"
@@ -0,0 +1,281 @@
+"""
+Aufnahme und Wiedergabe von PowerShell-Ausgaben.
+
+Auf einem echten Windows-System wird die Ausgabe einer Aktion (bzw. einer
+Systeminfo-Abfrage) mit Zeitstempeln aufgezeichnet. Unter Linux spielt ein
+Ersatzhost (``replay_launcher()``) diese Aufnahmen über dasselbe
+Host-Protokoll wieder ab – in Echtzeit, beschleunigt oder so schnell wie
+möglich. GUI, Log-Pipeline und Fortschrittsanzeige laufen dabei unverändert.
+
+Format (JSON-Lines, eine Datei pro Aufnahme):
+
+    {"version": 1, "action": "sfc_scannow", "script_sha1": null,
+     "encoding": "cp850", "returncode": 0, "duration": 812.4}
+    [0.412, "Beginning system scan.  This process will take some time.\\n"]
+    [3.918, "Verification 1% complete.\\r"]
+    ...
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from winrep_events import EVENT_PREFIX
+from winrep_pshost import PS_ENCODING, SENTINEL, HostLauncher
+
+RECORDING_VERSION = 1
+RECORDING_SUFFIX = ".jsonl"
+
+# Skript aus run_ps1_action(): & '...\winrep_actions.ps1' -Action 'sfc_scannow'
+_RE_ACTION = re.compile(r"-Action\s+'([A-Za-z0-9_]+)'")
+
+
+def script_sha1(script: str) -> str:
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Aufnahme
+# =============================================================================
+
+@dataclass
+class Recording:
+    action: str | None
+    script_sha1: str | None
+    returncode: int = 0
+    duration: float = 0.0
+    encoding: str = PS_ENCODING
+    events: List[Tuple[float, str]] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.action or f"script-{self.script_sha1[:12]}"
+
+    @property
+    def lines(self) -> int:
+        return sum(text.count("\n") + text.count("\r") for _, text in self.events)
+
+    @property
+    def chars(self) -> int:
+        return sum(len(text) for _, text in self.events)
+
+    def save(self, path: Path):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            header = {
+                "version": RECORDING_VERSION,
+                "action": self.action,
+                "script_sha1": self.script_sha1,
+                "encoding": self.encoding,
+                "returncode": self.returncode,
+                "duration": round(self.duration, 4),
+            }
+            fh.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for t, text in self.events:
+                fh.write(json.dumps([round(t, 4), text], ensure_ascii=False) + "\n")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Recording":
+        with open(path, "r", encoding="utf-8") as fh:
+            header = json.loads(fh.readline())
+            if header.get("version") != RECORDING_VERSION:
+                raise ValueError(f"{path.name}: unbekannte Aufnahme-Version {header.get('version')!r}")
+            events = [(float(t), str(text)) for t, text in map(json.loads, filter(str.strip, fh))]
+        return cls(
+            header.get("action"),
+            header.get("script_sha1"),
+            int(header.get("returncode", 0)),
+            float(header.get("duration", 0.0)),
+            header.get("encoding", PS_ENCODING),
+            events,
+        )
+
+
+class Recorder:
+    """
+    ``capture`` als ``on_output`` übergeben, danach ``finish(result)``:
+
+        rec = Recorder(action="sfc_scannow")
+        result = run_ps1_action(pool, ACTIONS["sfc_scannow"], on_output=rec.capture)
+        rec.finish(result).save(path)
+    """
+
+    def __init__(self, action: str | None = None, script: str | None = None, encoding: str = PS_ENCODING):
+        self.recording = Recording(action, None if action else script_sha1(script or ""), encoding=encoding)
+        self._t0 = time.perf_counter()
+
+    def capture(self, text: str):
+        self.recording.events.append((time.perf_counter() - self._t0, text))
+
+    def finish(self, result) -> Recording:
+        self.recording.returncode = result.returncode
+        self.recording.duration = result.duration
+        return self.recording
+
+
+def load_recordings(directory: Path) -> Tuple[Dict[str, Recording], Dict[str, Recording]]:
+    """Liefert (Aktion → Aufnahme, Skript-SHA1 → Aufnahme)."""
+    by_action: Dict[str, Recording] = {}
+    by_script: Dict[str, Recording] = {}
+    for path in sorted(directory.glob(f"*{RECORDING_SUFFIX}")):
+        rec = Recording.load(path)
+        if rec.action:
+            by_action[rec.action] = rec
+        elif rec.script_sha1:
+            by_script[rec.script_sha1] = rec
+    return by_action, by_script
+
+
+# =============================================================================
+# Synthetische Aufnahmen (ohne Windows)
+# =============================================================================
+
+def _dism_bar(pct: float) -> str:
+    filled = int(pct / 100 * 26)
+    return "[" + "=" * filled + " " * (26 - filled) + f"{pct:4.1f}%" + " " * 26 + "]"
+
+
+def _event(type_: str, **data) -> str:
+    return EVENT_PREFIX + json.dumps({"type": type_, **data}) + "\n"
+
+
+def synthetic_recordings(flood_lines: int = 50_000, seconds: float = 30.0) -> List[Recording]:
+    """
+    Nachgebildete Ausgaben für Benchmarks ohne echte Aufnahme: DISM mit
+    ``\\r``-Balken, SFC mit Prozentzeilen, net_reset in Schritten und eine
+    Aktion, die das Log mit vielen Zeilen flutet.
+    """
+    recs: List[Recording] = []
+
+    dism = Recording("dism_restorehealth", None, duration=seconds)
+    dism.events.append((0.2, "\nTool zur Imageverwaltung für die Bereitstellung\nVersion: 10.0.19041.3636\n\n"))
+    dism.events.append((0.4, "Abbildversion: 10.0.19045.4291\n\n"))
+    for i in range(1001):
+        dism.events.append((0.5 + i / 1000 * (seconds - 1), _dism_bar(i / 10) + "\r"))
+    dism.events.append((seconds - 0.3, "\nDer Wiederherstellungsvorgang wurde erfolgreich abgeschlossen.\n"))
+    dism.events.append((seconds - 0.1, "Der Vorgang wurde erfolgreich beendet.\n"))
+    recs.append(dism)
+
+    sfc = Recording("sfc_scannow", None, duration=seconds)
+    sfc.events.append((0.1, "Systemüberprüfung wird gestartet. Dieser Vorgang kann einige Zeit dauern.\n\n"))
+    for pct in range(101):
+        sfc.events.append((0.5 + pct / 100 * (seconds - 1), f"Überprüfung {pct} % abgeschlossen.\r"))
+    sfc.events.append((seconds - 0.2, "\nDer Windows-Ressourcenschutz hat keine Integritätsverletzungen gefunden.\n"))
+    recs.append(sfc)
+
+    net = Recording("net_reset", None, duration=6.0)
+    steps = ["DNS-Cache leeren", "IP freigeben", "IP erneuern", "Winsock zurücksetzen",
+             "TCP/IP-Einstellungen zurücksetzen", "Firewall-Regeln prüfen"]
+    for i, step in enumerate(steps, 1):
+        net.events.append((i - 0.9, _event("step_start", index=i, total=len(steps), title=step)))
+        net.events.append((i - 0.9, f"{i}/{len(steps)}: {step} ...\n"))
+        net.events.append((i - 0.4, "OK\n"))
+        net.events.append((i - 0.1, _event("step_end", index=i, total=len(steps), ok=True)))
+    net.events.append((5.9, _event("warning", message="Neustart empfohlen")))
+    net.events.append((5.95, _event("result", status="ok", message="Netzwerk zurückgesetzt")))
+    recs.append(net)
+
+    flood = Recording("temp_cleanup", None, duration=seconds)
+    for i in range(flood_lines):
+        flood.events.append((i / flood_lines * seconds, f"Gelöscht: C:\\Users\\demo\\AppData\\Local\\Temp\\tmp{i:06x}.tmp\n"))
+    recs.append(flood)
+
+    return recs
+
+
+def synthetic_probe_recordings(probes) -> List[Recording]:
+    """Kurze Antworten für die Systeminfo-Abfragen (``winrep_sysinfo.PROBES``)."""
+    samples = {
+        "OS": "Windows 10 Pro (22H2, Build 19045)",
+        "Boot": "UEFI / Secure Boot an",
+        "BitLocker": "C: aus",
+        "IPv4": "192.168.178.23",
+        "CPU": "Intel(R) Core(TM) i5-8500 CPU @ 3.00GHz",
+        "Disk": "C: 118,4 GB frei von 476,3 GB",
+    }
+    delays = {"OS": 0.8, "Boot": 1.2, "BitLocker": 2.5, "IPv4": 0.3, "CPU": 0.4, "Disk": 0.5}
+    recs = []
+    for probe in probes:
+        rec = Recording(None, script_sha1(probe.script), duration=delays.get(probe.key, 0.5))
+        rec.events.append((rec.duration, samples.get(probe.key, probe.key) + "\n"))
+        recs.append(rec)
+    return recs
+
+
+# =============================================================================
+# Wiedergabe-Host
+# =============================================================================
+
+def replay_launcher(directory: Path, speed: float = 1.0) -> HostLauncher:
+    """
+    Host, der Aufnahmen aus ``directory`` abspielt. ``speed`` 1 = Echtzeit,
+    10 = zehnfach, 0 = so schnell wie möglich.
+    """
+    return HostLauncher(
+        f"replay x{speed:g}" if speed else "replay max",
+        [
+            sys.executable, "-u", str(Path(__file__).resolve()),
+            "--replay-host", str(Path(directory).resolve()),
+            "--speed", str(speed),
+        ],
+        encoding=PS_ENCODING,
+    )
+
+
+def _play(rec: Recording, out, encoding: str, speed: float):
+    t0 = time.perf_counter()
+    for t, text in rec.events:
+        if speed > 0:
+            delay = t0 + t / speed - time.perf_counter()
+            if delay > 0:
+                out.flush()
+                time.sleep(delay)
+        out.write(text.encode(encoding, "replace"))
+    if speed > 0:
+        rest = t0 + rec.duration / speed - time.perf_counter()
+        if rest > 0:
+            out.flush()
+            time.sleep(rest)
+
+
+def _replay_main(directory: Path, speed: float):
+    """Spricht das Host-Protokoll (siehe winrep_pshost) und spielt passende Aufnahmen ab."""
+    by_action, by_script = load_recordings(directory)
+    out = sys.stdout.buffer
+    for line in sys.stdin:
+        parts = line.rstrip("\n").split(" ", 1)
+        if len(parts) < 2:
+            continue
+        req_id, payload = parts
+        script = base64.b64decode(payload).decode("utf-8")
+        rc = 0
+        if script.strip():
+            m = _RE_ACTION.search(script)
+            rec = by_action.get(m.group(1)) if m else by_script.get(script_sha1(script))
+            if rec is None:
+                what = m.group(1) if m else script_sha1(script)[:12]
+                out.write(f"[replay] keine Aufnahme für {what}\n".encode(PS_ENCODING, "replace"))
+                rc = 1
+            else:
+                _play(rec, out, PS_ENCODING, speed)
+                rc = rec.returncode
+        out.write(f"{SENTINEL} {req_id} {rc}\n".encode(PS_ENCODING))
+        out.flush()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--replay-host" in args:
+        directory = Path(args[args.index("--replay-host") + 1])
+        speed = float(args[args.index("--speed") + 1]) if "--speed" in args else 1.0
+        _replay_main(directory, speed)
@@ -0,0 +1,236 @@
+"""
+Warteschlange für Aktionen mit Ressourcenklassen.
+
+Jede Aktion belegt die Klassen aus ``WinRepAction.resources``
+(Komponentenspeicher, Netzwerk, Datenträger, Energieverwaltung). Aktionen mit
+gemeinsamer Klasse laufen nacheinander in Reihenfolge der Anmeldung, Aktionen
+mit disjunkten Klassen parallel (z. B. ``battery_info`` während
+``temp_cleanup``). Eine wartende Aktion wird nie von einer später angemeldeten
+Aktion mit überschneidenden Klassen überholt.
+
+Laufende Jobs lassen sich abbrechen: der Runner hinterlegt sein
+``RunControl`` am Job, ``cancel()`` beendet darüber den Prozessbaum.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Set
+
+from winrep_core import RESOURCE_LABELS, WinRepAction, describe_returncode
+from winrep_pshost import RunControl
+
+SCHED_MAX_PARALLEL = 3
+SCHED_KEEP_FINISHED = 20
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+@dataclass
+class Job:
+    id: int
+    action: WinRepAction
+    state: str = JOB_QUEUED
+    submitted: float = 0.0
+    started: float | None = None
+    finished: float | None = None
+    returncode: int | None = None
+    fraction: float | None = None   # letzter bekannter Fortschritt (für die Warteschlangenansicht)
+    blocked_by: str = ""            # Klasse, auf die gewartet wird
+    control: RunControl | None = None   # vom Runner gesetzt, solange ein Host-Aufruf läuft
+    cancel_requested: bool = False
+    alert: str = ""                 # letzter Watchdog-Hinweis (Zeitlimit, Stillstand)
+    eta: str = ""                   # Restzeit-Text (winrep_eta), von der GUI gesetzt
+
+    @property
+    def active(self) -> bool:
+        return self.state in (JOB_QUEUED, JOB_RUNNING)
+
+    @property
+    def seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+
+class ActionScheduler:
+    """
+    ``runner(job)`` führt eine Aktion blockierend aus (in einem eigenen Thread)
+    und liefert den Rückgabecode. ``on_change`` wird nach jeder
+    Zustandsänderung aufgerufen – aus beliebigem Thread.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job], int | None],
+        on_change: Callable[[], None] | None = None,
+        max_parallel: int = SCHED_MAX_PARALLEL,
+    ):
+        self.runner = runner
+        self.on_change = on_change
+        self.max_parallel = max(1, max_parallel)
+        self._jobs: List[Job] = []
+        self._busy: Dict[str, int] = {}   # Ressourcenklasse → Job-ID
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    # ------------------------------------------------------------------ API
+
+    def submit(self, action: WinRepAction) -> Job:
+        """Reiht eine Aktion ein. Läuft oder wartet sie bereits, wird der vorhandene Job geliefert."""
+        with self._lock:
+            for job in self._jobs:
+                if job.active and job.action.key == action.key:
+                    return job
+            job = Job(next(self._ids), action, submitted=time.monotonic())
+            self._jobs.append(job)
+            started = self._dispatch_locked()
+        self._start(started)
+        self._notify()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Wartende Jobs fallen weg, laufende werden über ihr ``RunControl`` beendet."""
+        control = None
+        with self._lock:
+            for job in self._jobs:
+                if job.id == job_id and job.state == JOB_RUNNING:
+                    job.cancel_requested = True
+                    control = job.control
+                    break
+                if job.id == job_id and job.state == JOB_QUEUED:
+                    job.state = JOB_CANCELLED
+                    job.finished = time.monotonic()
+                    break
+            else:
+                return False
+            if job.state == JOB_RUNNING:
+                started = []
+            else:
+                started = self._dispatch_locked()
+            self._trim_locked()
+        if control is not None:
+            control.cancel()
+        self._start(started)
+        self._notify()
+        return True
+
+    def attach(self, job: Job, control: RunControl | None):
+        """Runner: aktuelles ``RunControl`` hinterlegen (Abläufe: je Schritt ein neues)."""
+        with self._lock:
+            job.control = control
+            cancel = control is not None and job.cancel_requested
+        if cancel:
+            control.cancel()
+
+    def set_alert(self, job: Job, text: str):
+        job.alert = text
+        self._notify()
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs)
+
+    def running(self) -> List[Job]:
+        with self._lock:
+            return [j for j in self._jobs if j.state == JOB_RUNNING]
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: not any(j.active for j in self._jobs), timeout)
+
+    def set_fraction(self, job: Job, fraction: float | None):
+        job.fraction = fraction
+        self._notify()
+
+    # ------------------------------------------------------------ intern
+
+    def _dispatch_locked(self) -> List[Job]:
+        """Startbare Jobs in Anmeldereihenfolge wählen und ihre Klassen belegen."""
+        running = sum(1 for j in self._jobs if j.state == JOB_RUNNING)
+        claimed: Set[str] = set()   # Klassen früherer wartender Jobs – nicht überholen
+        ready = []
+        for job in self._jobs:
+            if job.state != JOB_QUEUED:
+                continue
+            wanted = set(job.action.resources)
+            busy = [r for r in job.action.resources if r in self._busy or r in claimed]
+            if busy or running >= self.max_parallel:
+                job.blocked_by = busy[0] if busy else ""
+                claimed |= wanted
+                continue
+            job.state = JOB_RUNNING
+            job.started = time.monotonic()
+            job.blocked_by = ""
+            for r in wanted:
+                self._busy[r] = job.id
+            running += 1
+            ready.append(job)
+        return ready
+
+    def _start(self, jobs: List[Job]):
+        for job in jobs:
+            threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _run(self, job: Job):
+        rc: int | None = None
+        try:
+            rc = self.runner(job)
+        except Exception:
+            rc = None
+        with self._lock:
+            job.finished = time.monotonic()
+            job.returncode = rc
+            job.control = None
+            if job.cancel_requested:
+                job.state = JOB_CANCELLED
+            else:
+                job.state = JOB_DONE if rc == 0 else JOB_FAILED
+            for r in job.action.resources:
+                if self._busy.get(r) == job.id:
+                    del self._busy[r]
+            started = self._dispatch_locked()
+            self._trim_locked()
+            self._idle.notify_all()
+        self._start(started)
+        self._notify()
+
+    def _trim_locked(self):
+        finished = [j for j in self._jobs if not j.active]
+        for job in finished[:-SCHED_KEEP_FINISHED]:
+            self._jobs.remove(job)
+
+    def _notify(self):
+        if self.on_change is not None:
+            try:
+                self.on_change()
+            except Exception:
+                pass
+
+
+def describe_job(job: Job) -> str:
+    """Eine Zeile für die Warteschlangenansicht."""
+    title = job.action.title.split(" [")[0]
+    if job.state == JOB_RUNNING:
+        pct = f" – {job.fraction * 100:.0f} %" if job.fraction is not None else ""
+        if job.eta:
+            pct += f", {job.eta}"
+        alert = f" – {job.alert}" if job.alert else ""
+        if job.cancel_requested:
+            alert = " – wird abgebrochen …"
+        return f"▶ {title}{pct} ({job.seconds:.0f} s){alert}"
+    if job.state == JOB_QUEUED:
+        reason = RESOURCE_LABELS.get(job.blocked_by, job.blocked_by)
+        return f"⏳ {title}" + (f" – wartet auf {reason}" if reason else " – wartet")
+    if job.state == JOB_CANCELLED:
+        return f"✗ {title} – abgebrochen" + (f" ({job.seconds:.0f} s)" if job.started else "")
+    mark = "✓" if job.state == JOB_DONE else "⚠"
+    return f"{mark} {title} – {describe_returncode(job.returncode)} ({job.seconds:.0f} s)"
@@ -0,0 +1,170 @@
+"""
+Deklarative Einstellungen aus ``winrep_settings.json``.
+
+Jede Einstellung ist eine Zeile – ein Registry-Wert oder eine Energieoption
+mit AC/DC-Index. ``winrep_actions.ps1`` (``Invoke-WinRepSettings``) liest die
+Zeilen einer Aktion, vergleicht sie mit den aktuellen Werten und schreibt nur
+die abweichenden gesammelt: eine generierte .reg-Datei per ``reg import``,
+danach ein ``powercfg /setactive``. Ein zweiter Lauf findet nichts zu tun.
+
+Dieses Modul prüft die Datei (gleiche Regeln wie das Skript) und zeigt bzw.
+exportiert die Zeilen – ``winrep.py settings power_high [--reg datei.reg]``.
+
+Zeilenformat:
+
+    {"title": "...", "reg": "HKLM\\\\...", "name": "Wert", "type": "dword", "value": 1}
+    {"title": "...", "reg": "HKCU\\\\...\\\\{item}", "values": {"A": 1, "B": 1}, "items": "liste"}
+    {"title": "...", "power": "<Untergruppe>", "setting": "<GUID>", "ac": 50, "dc": 5}
+
+``items`` verweist auf eine Liste unter ``lists``; ``{item}`` in ``title``
+und ``reg`` wird je Eintrag ersetzt. ``existing_only``: nur setzen, wenn
+der Schlüssel schon existiert (z. B. VolumeCaches-Handler).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from winrep_core import resource_path
+
+SETTINGS_FILE = "winrep_settings.json"
+SETTINGS_VERSION = 1
+SETTING_TYPES = ("dword", "string")
+
+REG_HIVES = {
+    "HKLM": "HKEY_LOCAL_MACHINE",
+    "HKCU": "HKEY_CURRENT_USER",
+    "HKCR": "HKEY_CLASSES_ROOT",
+    "HKU": "HKEY_USERS",
+}
+POWER_SCHEMES_KEY = r"HKLM\SYSTEM\CurrentControlSet\Control\Power\User\PowerSchemes"
+
+_RE_GUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+
+@dataclass(frozen=True)
+class SettingRow:
+    title: str
+    kind: str                       # "reg" | "power"
+    key: str = ""                   # reg: HKLM\...
+    name: str = ""
+    type: str = "dword"
+    value: object = None
+    existing_only: bool = False
+    subgroup: str = ""              # power: GUIDs, Werte als AC/DC-Index
+    setting: str = ""
+    ac: int = 0
+    dc: int = 0
+
+    def describe(self) -> str:
+        if self.kind == "power":
+            return f"{self.title}: AC {self.ac} / DC {self.dc}"
+        return f"{self.title}: {self.name or '(Standard)'} = {self.value!r}"
+
+
+def _check_value(origin: str, type_: str, value) -> None:
+    if type_ not in SETTING_TYPES:
+        raise ValueError(f"{origin}: unbekannter Typ {type_!r} (erlaubt: {', '.join(SETTING_TYPES)})")
+    if type_ == "dword" and not (isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 0xFFFFFFFF):
+        raise ValueError(f"{origin}: DWORD erwartet, nicht {value!r}")
+    if type_ == "string" and not isinstance(value, str):
+        raise ValueError(f"{origin}: Zeichenkette erwartet, nicht {value!r}")
+
+
+def _expand_entry(raw: dict, lists: Dict[str, List[str]], origin: str) -> List[SettingRow]:
+    title = str(raw.get("title") or "")
+    items: List[str | None] = [None]
+    if raw.get("items") is not None:
+        if raw["items"] not in lists:
+            raise ValueError(f"{origin}: unbekannte Liste {raw['items']!r}")
+        items = list(lists[raw["items"]])
+
+    if "power" in raw:
+        sub, setting = str(raw["power"]).lower(), str(raw.get("setting") or "").lower()
+        if not (_RE_GUID.match(sub) and _RE_GUID.match(setting)):
+            raise ValueError(f"{origin}: 'power' und 'setting' müssen GUIDs sein")
+        for side in ("ac", "dc"):
+            _check_value(f"{origin}/{side}", "dword", raw.get(side))
+        return [SettingRow(title, "power", subgroup=sub, setting=setting, ac=raw["ac"], dc=raw["dc"])]
+
+    if "reg" not in raw:
+        raise ValueError(f"{origin}: Zeile ohne 'reg' oder 'power'")
+    type_ = str(raw.get("type") or "dword")
+    if "values" in raw:
+        values = dict(raw["values"])
+    elif "name" in raw:
+        values = {str(raw["name"]): raw.get("value")}
+    else:
+        raise ValueError(f"{origin}: 'name'/'value' oder 'values' fehlt")
+    rows = []
+    for item in items:
+        key = str(raw["reg"]) if item is None else str(raw["reg"]).replace("{item}", item)
+        hive = key.split("\\", 1)[0].upper()
+        if hive not in REG_HIVES or "\\" not in key:
+            raise ValueError(f"{origin}: Schlüssel {key!r} beginnt nicht mit {'/'.join(REG_HIVES)}")
+        row_title = title if item is None else title.replace("{item}", item)
+        for name, value in values.items():
+            _check_value(f"{origin}/{name}", type_, value)
+            rows.append(SettingRow(row_title, "reg", key, name, type_, value, bool(raw.get("existing_only"))))
+    return rows
+
+
+def parse_settings(data: dict, origin: str = SETTINGS_FILE) -> Dict[str, List[SettingRow]]:
+    if data.get("version") != SETTINGS_VERSION:
+        raise ValueError(f"{origin}: unbekannte Version {data.get('version')!r}")
+    lists = {str(k): [str(i) for i in v] for k, v in (data.get("lists") or {}).items()}
+    sets: Dict[str, List[SettingRow]] = {}
+    for name, entries in (data.get("sets") or {}).items():
+        rows: List[SettingRow] = []
+        for i, raw in enumerate(entries, 1):
+            rows.extend(_expand_entry(raw, lists, f"{origin}/{name}[{i}]"))
+        sets[name] = rows
+    return sets
+
+
+def load_settings() -> Dict[str, List[SettingRow]]:
+    path = Path(resource_path(SETTINGS_FILE))
+    return parse_settings(json.loads(path.read_text(encoding="utf-8")), path.name)
+
+
+# =============================================================================
+# .reg-Export (gleiches Format wie Invoke-WinRepSettings)
+# =============================================================================
+
+def _reg_path(key: str) -> str:
+    hive, rest = key.split("\\", 1)
+    return f"{REG_HIVES[hive.upper()]}\\{rest}"
+
+
+def _reg_line(name: str, type_: str, value) -> str:
+    left = "@" if name == "" else '"' + name.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    if type_ == "dword":
+        return f"{left}=dword:{int(value):08x}"
+    return left + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def render_reg(rows: List[SettingRow], scheme: str = "SCHEME_GUID") -> str:
+    """
+    Sollzustand als .reg-Text (ohne Prüfung des Istzustands). Energieoptionen
+    landen unter ``PowerSchemes\\<scheme>``; wirksam erst nach
+    ``powercfg /setactive <scheme>``.
+    """
+    sections: Dict[str, List[str]] = {}
+    for row in rows:
+        if row.kind == "power":
+            key = f"{POWER_SCHEMES_KEY}\\{scheme}\\{row.subgroup}\\{row.setting}"
+            lines = sections.setdefault(_reg_path(key), [])
+            lines.append(_reg_line("ACSettingIndex", "dword", row.ac))
+            lines.append(_reg_line("DCSettingIndex", "dword", row.dc))
+        else:
+            sections.setdefault(_reg_path(row.key), []).append(_reg_line(row.name, row.type, row.value))
+    out = ["Windows Registry Editor Version 5.00"]
+    for key, lines in sections.items():
+        out.append("")
+        out.append(f"[{key}]")
+        out.extend(lines)
+    return "\r\n".join(out) + "\r\n"
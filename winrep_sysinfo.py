@@ -0,0 +1,305 @@
+"""
+Einzel-Abfragen für die Systemübersicht.
+
+Jedes Feld der rechten Übersicht ist eine eigene Probe mit eigenem Timeout.
+Alle Proben laufen gleichzeitig auf einem begrenzten Thread-Pool; jedes
+Ergebnis wird sofort gemeldet, statt auf die langsamste Abfrage
+(typisch: ``Get-BitLockerVolume``) zu warten.
+
+``SysInfoCache`` legt die Werte pro Rechner auf Platte ab. Beim Start werden
+sie sofort angezeigt; nur Felder mit abgelaufener TTL werden neu abgefragt.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+PROBE_WORKERS = 3
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+@dataclass(frozen=True)
+class SysProbe:
+    key: str
+    script: str
+    timeout: float = 20.0
+    fallback: str = "-"
+    ttl: float = HOUR  # wie lange ein Cache-Wert als aktuell gilt
+
+
+@dataclass
+class ProbeResult:
+    key: str
+    value: str
+    seconds: float
+    ok: bool
+
+
+_PS_FORMAT_SIZE = r"""
+function Format-Size([double]$bytes) {
+    if ($bytes -ge 1TB) { "{0} TB" -f [math]::Round($bytes / 1TB, 0) }
+    elseif ($bytes -ge 1GB) { "{0} GB" -f [math]::Round($bytes / 1GB, 0) }
+    else { "{0} MB" -f [math]::Round($bytes / 1MB, 0) }
+}
+"""
+
+PROBES: List[SysProbe] = [
+    SysProbe("OS", r"""
+        $ErrorActionPreference = 'SilentlyContinue'
+        $os = Get-CimInstance Win32_OperatingSystem
+        $cv = Get-ItemProperty -Path 'HKLM:\SOFTWARE\Microsoft\Windows NT\CurrentVersion' -ErrorAction SilentlyContinue
+        $edition = $os.Caption -replace '^Microsoft\s+', ''
+
+        $arch = $os.OSArchitecture
+        if ($arch) {
+            $arch = $arch -replace 'bit','Bit'
+            $arch = $arch -replace '-', ' '
+        }
+
+        $disp = $cv.DisplayVersion
+        if (-not $disp -and $cv.ReleaseId) { $disp = $cv.ReleaseId }
+        if (-not $disp) { $disp = $os.Version }
+
+        if ($arch) { "$edition - $arch ($disp)" } else { "$edition ($disp)" }
+    """, timeout=15.0, ttl=7 * DAY),
+
+    SysProbe("Boot", r"""
+        $ErrorActionPreference = 'SilentlyContinue'
+        $boot = 'Unbekannt'
+        try {
+            $fw = (Get-ItemProperty -Path 'HKLM:\SYSTEM\CurrentControlSet\Control' -Name 'PEFirmwareType' -ErrorAction SilentlyContinue).PEFirmwareType
+            if ($fw) {
+                $boot = switch ($fw) {
+                    1 { 'Legacy / BIOS' }
+                    2 { 'UEFI' }
+                    Default { 'Unbekannt' }
+                }
+            }
+        } catch {}
+
+        if ($boot -eq 'Unbekannt') {
+            if (Test-Path 'HKLM:\SYSTEM\CurrentControlSet\Control\SecureBoot\State') {
+                $boot = 'UEFI'
+            } else {
+                $boot = 'Legacy / BIOS'
+            }
+        }
+
+        $style = $null
+        try {
+            $style = (Get-Partition -DriveLetter C -ErrorAction SilentlyContinue | Get-Disk).PartitionStyle
+        } catch {}
+
+        if ($style) { "$boot ($style)" } else { $boot }
+    """, timeout=15.0, ttl=30 * DAY),
+
+    SysProbe("BitLocker", r"""
+        $ErrorActionPreference = 'SilentlyContinue'
+        if (-not (Get-Command -Name Get-BitLockerVolume -ErrorAction SilentlyContinue)) {
+            'BitLocker-Cmdlets nicht vorhanden'
+            return
+        }
+        $vol = Get-BitLockerVolume -MountPoint 'C:' -ErrorAction SilentlyContinue
+        if (-not $vol) {
+            'BitLocker: Kein Volume gefunden'
+            return
+        }
+        $prot = [int]$vol.ProtectionStatus
+        $protText = switch ($prot) {
+            0 { 'Aus' }
+            1 { 'Aktiv' }
+            2 { 'Ausgesetzt' }
+            default { "Unbekannt ($prot)" }
+        }
+        if ($vol.VolumeStatus) {
+            "BitLocker: $protText – VolumeStatus: $($vol.VolumeStatus)"
+        } else {
+            "BitLocker: $protText"
+        }
+    """, timeout=30.0, fallback="BitLocker: Unbekannt", ttl=HOUR),
+
+    SysProbe("IPv4", r"""
+        $ErrorActionPreference = 'SilentlyContinue'
+        $adapters = Get-NetIPAddress -AddressFamily IPv4 -PrefixOrigin Dhcp,Manual -ErrorAction SilentlyContinue |
+                    Where-Object { $_.IPAddress -notlike '169.254.*' -and $_.IPAddress -ne '127.0.0.1' } |
+                    Sort-Object -Property InterfaceMetric, AddressFamily
+        if ($adapters) { $adapters[0].IPAddress } else { '-' }
+    """, timeout=10.0, ttl=2 * MINUTE),
+
+    SysProbe("CPU", r"""
+        $ErrorActionPreference = 'SilentlyContinue'
+        $cpu = Get-CimInstance Win32_Processor | Select-Object -First 1
+        if ($cpu -and $cpu.Name) { $cpu.Name.Trim() } else { '-' }
+    """, timeout=10.0, ttl=30 * DAY),
+
+    SysProbe("Disk", _PS_FORMAT_SIZE + r"""
+        $ErrorActionPreference = 'SilentlyContinue'
+        $drive = Get-CimInstance Win32_LogicalDisk -Filter "DeviceID='C:'" -ErrorAction SilentlyContinue
+        if ($drive -and $drive.Size) {
+            $size = [double]$drive.Size
+            $used = $size - [double]$drive.FreeSpace
+            "Disk C:\ $(Format-Size $used) genutzt von $(Format-Size $size)"
+        } else {
+            'Nicht verfügbar'
+        }
+    """, timeout=10.0, ttl=5 * MINUTE),
+
+    # Nicht in der Übersicht angezeigt – Grundlage für Laufzeitprognosen (winrep_eta)
+    SysProbe("DiskType", r"""
+        $ErrorActionPreference = 'SilentlyContinue'
+        $part = Get-Partition -DriveLetter C -ErrorAction SilentlyContinue
+        $disk = $null
+        if ($part) {
+            $disk = Get-PhysicalDisk -ErrorAction SilentlyContinue |
+                    Where-Object { $_.DeviceId -eq [string]$part.DiskNumber } | Select-Object -First 1
+        }
+        if (-not $disk) { 'Unbekannt' }
+        elseif ([string]$disk.BusType -eq 'NVMe') { 'NVMe' }
+        elseif ([string]$disk.MediaType -in @('SSD', 'HDD')) { [string]$disk.MediaType }
+        else { 'Unbekannt' }
+    """, timeout=15.0, fallback="Unbekannt", ttl=30 * DAY),
+]
+
+PROBES_BY_KEY: Dict[str, SysProbe] = {p.key: p for p in PROBES}
+
+
+def run_probe(probe: SysProbe, runner: Callable[[str, float], str]) -> ProbeResult:
+    t0 = time.perf_counter()
+    try:
+        raw = runner(probe.script, probe.timeout)
+    except Exception:
+        raw = ""
+    # Letzte nicht-leere Zeile ist der Wert (Warnungen davor ignorieren)
+    lines = [ln.strip() for ln in (raw or "").splitlines() if ln.strip()]
+    value = lines[-1] if lines else ""
+    return ProbeResult(probe.key, value or probe.fallback, time.perf_counter() - t0, bool(value))
+
+
+def run_probes(
+    runner: Callable[[str, float], str],
+    on_result: Callable[[ProbeResult], None],
+    probes: List[SysProbe] | None = None,
+    max_workers: int = PROBE_WORKERS,
+) -> Dict[str, ProbeResult]:
+    """
+    Führt alle Proben parallel aus und ruft ``on_result`` je Probe auf,
+    sobald sie fertig ist (aus dem Pool-Thread heraus). Blockiert bis alle fertig sind.
+    """
+    probes = PROBES if probes is None else probes
+    results: Dict[str, ProbeResult] = {}
+
+    def task(probe: SysProbe):
+        res = run_probe(probe, runner)
+        results[probe.key] = res
+        on_result(res)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sysprobe") as pool:
+        # Langsame Proben (großer Timeout) zuerst starten
+        for probe in sorted(probes, key=lambda p: -p.timeout):
+            pool.submit(task, probe)
+    return results
+
+
+# =============================================================================
+# Persistenter Cache
+# =============================================================================
+
+def machine_id() -> str:
+    """Stabile Rechner-Kennung: MachineGuid (Windows) bzw. machine-id, sonst Hostname+MAC."""
+    if os.name == "nt":
+        try:
+            import winreg
+
+            with winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"SOFTWARE\Microsoft\Cryptography",
+                0,
+                winreg.KEY_READ | winreg.KEY_WOW64_64KEY,
+            ) as key:
+                return str(winreg.QueryValueEx(key, "MachineGuid")[0]).lower()
+        except OSError:
+            pass
+    else:
+        for path in ("/etc/machine-id", "/var/lib/dbus/machine-id"):
+            try:
+                value = Path(path).read_text().strip()
+                if value:
+                    return value
+            except OSError:
+                pass
+    try:
+        host = socket.gethostname()
+    except Exception:
+        host = "unknown"
+    return f"{host}-{uuid.getnode():012x}"
+
+
+class SysInfoCache:
+    """
+    JSON-Datei: {machine_id: {Feld: {"value": ..., "ts": ...}}}.
+    Threadsicher, damit die Probe-Threads direkt hineinschreiben können.
+    """
+
+    def __init__(self, path: Path, machine: str | None = None):
+        self.path = path
+        self.machine = machine or machine_id()
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, dict]] = {}
+        try:
+            self._data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._data = {}
+        if not isinstance(self._data, dict):
+            self._data = {}
+
+    def _fields(self) -> Dict[str, dict]:
+        return self._data.setdefault(self.machine, {})
+
+    def values(self) -> Dict[str, str]:
+        with self._lock:
+            return {k: v.get("value", "") for k, v in self._fields().items() if v.get("value")}
+
+    def is_fresh(self, probe: SysProbe, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._fields().get(probe.key)
+            return bool(entry) and now - float(entry.get("ts", 0)) < probe.ttl
+
+    def stale_probes(self, probes: Iterable[SysProbe] | None = None) -> List[SysProbe]:
+        now = time.time()
+        return [p for p in (PROBES if probes is None else probes) if not self.is_fresh(p, now)]
+
+    def put(self, res: ProbeResult):
+        if not res.ok:
+            return  # leere Antworten/Timeouts nicht cachen
+        with self._lock:
+            self._fields()[res.key] = {"value": res.value, "ts": time.time()}
+
+    def invalidate(self, keys: Iterable[str]):
+        with self._lock:
+            fields = self._fields()
+            for key in keys:
+                fields.pop(key, None)
+        self.save()
+
+    def save(self):
+        with self._lock:
+            payload = json.dumps(self._data, ensure_ascii=False, indent=1)
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
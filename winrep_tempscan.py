@@ -0,0 +1,363 @@
+"""
+Probelauf für ``temp_cleanup``: was würde die Bereinigung freigeben?
+
+Die Aktion selbst setzt nur ``StateFlags0200`` und startet
+``cleanmgr /sagerun:200`` – ohne Angabe, wie viel Platz frei wird. Dieses
+Modul durchläuft die Bereinigungsziele (TEMP, SoftwareDistribution\\Download,
+WER-Warteschlangen, Miniaturansichten, Speicherabbilder) selbst mit
+``os.scandir`` in mehreren Threads und liefert Größe und Dateianzahl je
+Kategorie. Jeder Worker holt sich Ordner aus einer gemeinsamen Warteschlange
+und stellt gefundene Unterordner wieder hinein – so verteilt sich auch ein
+einzelner tiefer Baum auf alle Threads (``scandir`` gibt das GIL während
+der Systemaufrufe frei).
+
+Symbolische Links und Junctions werden nie verfolgt. Optional löscht
+``delete_files`` die gefundenen Dateien parallel; gesperrte Dateien
+(in Benutzung) werden übersprungen und gezählt.
+
+Funktioniert mit beliebigen Verzeichnisbäumen, auch unter Linux
+(``winrep.py tempscan PFAD ...``).
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import queue
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+TEMPSCAN_WORKERS = min(16, (os.cpu_count() or 4) * 2)   # I/O-gebunden → mehr Threads als Kerne
+TEMPSCAN_MAX_FILES = 500_000       # Dateiliste für das Löschen je Kategorie begrenzen
+
+
+@dataclass(frozen=True)
+class CleanupTarget:
+    key: str
+    title: str
+    paths: Tuple[str, ...]          # Ordner oder einzelne Dateien (Umgebungsvariablen erlaubt)
+    pattern: str = ""               # nur passende Dateinamen (fnmatch), z. B. "thumbcache_*.db"
+    recursive: bool = True
+
+
+def default_targets() -> List[CleanupTarget]:
+    """Entspricht grob den cleanmgr-Kategorien aus winrep_actions.ps1 (temp_cleanup)."""
+    return [
+        CleanupTarget("user_temp", "TEMP (Benutzer)", ("%TEMP%",)),
+        CleanupTarget("system_temp", "TEMP (Windows)", (r"%WINDIR%\Temp",)),
+        CleanupTarget("wu_download", "Windows Update Downloads", (r"%WINDIR%\SoftwareDistribution\Download",)),
+        CleanupTarget("wer", "Fehlerberichte (WER)", (
+            r"%PROGRAMDATA%\Microsoft\Windows\WER\ReportQueue",
+            r"%PROGRAMDATA%\Microsoft\Windows\WER\ReportArchive",
+            r"%LOCALAPPDATA%\Microsoft\Windows\WER\ReportQueue",
+            r"%LOCALAPPDATA%\Microsoft\Windows\WER\ReportArchive",
+        )),
+        CleanupTarget("thumbnails", "Miniaturansichten", (r"%LOCALAPPDATA%\Microsoft\Windows\Explorer",),
+                      pattern="thumbcache_*.db", recursive=False),
+        CleanupTarget("dumps", "Speicherabbilder", (
+            r"%WINDIR%\Minidump",
+            r"%WINDIR%\MEMORY.DMP",
+            r"%LOCALAPPDATA%\CrashDumps",
+        )),
+    ]
+
+
+def path_targets(paths: List[str]) -> List[CleanupTarget]:
+    """Beliebige Ordner als eigene Kategorien (Tests, Benchmarks unter Linux)."""
+    return [CleanupTarget(f"path{i}", p, (p,)) for i, p in enumerate(paths, 1)]
+
+
+def _expand(raw: str) -> Path | None:
+    expanded = os.path.expandvars(raw)
+    if "%" in expanded:
+        return None   # Variable auf diesem System nicht gesetzt
+    return Path(expanded)
+
+
+# =============================================================================
+# Scannen
+# =============================================================================
+
+@dataclass
+class CategoryStats:
+    key: str
+    title: str
+    roots: List[str] = field(default_factory=list)
+    files: int = 0
+    bytes: int = 0
+    dirs: int = 0
+    skipped_recent: int = 0          # jünger als ``min_age``
+    errors: int = 0                  # kein Zugriff o. Ä.
+    paths: List[str] = field(default_factory=list)   # nur mit ``collect=True``
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "key": self.key,
+            "title": self.title,
+            "roots": self.roots,
+            "files": self.files,
+            "bytes": self.bytes,
+            "dirs": self.dirs,
+            "skipped_recent": self.skipped_recent,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class ScanReport:
+    categories: Dict[str, CategoryStats]
+    seconds: float = 0.0
+    workers: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(c.bytes for c in self.categories.values())
+
+    @property
+    def total_files(self) -> int:
+        return sum(c.files for c in self.categories.values())
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "total_bytes": self.total_bytes,
+            "total_files": self.total_files,
+            "seconds": round(self.seconds, 3),
+            "workers": self.workers,
+            "categories": [c.as_dict() for c in self.categories.values()],
+        }
+
+    def format_text(self) -> str:
+        rows = [c for c in self.categories.values() if c.roots]
+        width = max((len(c.title) for c in rows), default=10)
+        lines = []
+        for c in rows:
+            extra = []
+            if c.skipped_recent:
+                extra.append(f"{c.skipped_recent} zu neu")
+            if c.errors:
+                extra.append(f"{c.errors} ohne Zugriff")
+            note = f"  ({', '.join(extra)})" if extra else ""
+            lines.append(f"  {c.title.ljust(width)}  {format_size(c.bytes):>10}  {c.files:>8} Dateien{note}")
+        lines.append(
+            f"  {'Summe'.ljust(width)}  {format_size(self.total_bytes):>10}  {self.total_files:>8} Dateien"
+            f"  ({self.seconds:.1f} s, {self.workers} Threads)"
+        )
+        return "\n".join(lines)
+
+
+def format_size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def is_link(entry: os.DirEntry) -> bool:
+    if entry.is_symlink():
+        return True
+    is_junction = getattr(entry, "is_junction", None)   # ab Python 3.12
+    return bool(is_junction and is_junction())
+
+
+def scan_targets(
+    targets: List[CleanupTarget],
+    workers: int = TEMPSCAN_WORKERS,
+    min_age: float = 0.0,
+    collect: bool = False,
+    cancelled: Callable[[], bool] | None = None,
+) -> ScanReport:
+    """
+    Größe und Anzahl der Dateien je Kategorie. ``min_age`` (Sekunden):
+    jüngere Dateien zählen nicht mit (cleanmgr lässt frische TEMP-Dateien
+    ebenfalls liegen). ``collect`` merkt sich die Pfade für ``delete_files``.
+    """
+    t0 = time.perf_counter()
+    categories = {t.key: CategoryStats(t.key, t.title) for t in targets}
+    by_key = {t.key: t for t in targets}
+    cutoff = time.time() - min_age if min_age > 0 else None
+    work: "queue.Queue[Tuple[str, str] | None]" = queue.Queue()
+    lock = threading.Lock()
+
+    def add_file(cat: CategoryStats, path: str, st) -> None:
+        if cutoff is not None and st.st_mtime > cutoff:
+            cat.skipped_recent += 1
+            return
+        cat.files += 1
+        cat.bytes += st.st_size
+        if collect and len(cat.paths) < TEMPSCAN_MAX_FILES:
+            cat.paths.append(path)
+
+    for t in targets:
+        cat = categories[t.key]
+        for raw in t.paths:
+            root = _expand(raw)
+            if root is None:
+                continue
+            try:
+                st = os.stat(root, follow_symlinks=False)
+            except OSError:
+                continue
+            cat.roots.append(str(root))
+            if stat.S_ISDIR(st.st_mode):
+                work.put((t.key, str(root)))
+            elif stat.S_ISREG(st.st_mode) and fnmatch.fnmatch(root.name.lower(), t.pattern.lower() or "*"):
+                add_file(cat, str(root), st)
+
+    def scan_dir(key: str, path: str) -> None:
+        target = by_key[key]
+        pattern = target.pattern.lower()
+        files = size = recent = dirs = errors = 0
+        found: List[str] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if is_link(entry):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            if target.recursive:
+                                subdirs.append(entry.path)
+                            continue
+                        if pattern and not fnmatch.fnmatch(entry.name.lower(), pattern):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        errors += 1
+                        continue
+                    if cutoff is not None and st.st_mtime > cutoff:
+                        recent += 1
+                        continue
+                    files += 1
+                    size += st.st_size
+                    if collect:
+                        found.append(entry.path)
+        except OSError:
+            errors += 1
+        for sub in subdirs:
+            work.put((key, sub))
+        dirs += 1
+        with lock:   # einmal je Ordner, nicht je Datei
+            cat = categories[key]
+            cat.files += files
+            cat.bytes += size
+            cat.skipped_recent += recent
+            cat.dirs += dirs
+            cat.errors += errors
+            if found:
+                room = TEMPSCAN_MAX_FILES - len(cat.paths)
+                cat.paths.extend(found[:room])
+
+    def worker() -> None:
+        while True:
+            item = work.get()
+            try:
+                if item is None:
+                    return
+                if cancelled is None or not cancelled():
+                    scan_dir(*item)
+            finally:
+                work.task_done()
+
+    workers = max(1, workers)
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for th in threads:
+        th.start()
+    work.join()   # Warteschlange leer und kein Ordner mehr in Arbeit
+    for _ in threads:
+        work.put(None)
+    for th in threads:
+        th.join()
+    return ScanReport(categories, time.perf_counter() - t0, workers)
+
+
+# =============================================================================
+# Löschen
+# =============================================================================
+
+@dataclass
+class DeleteResult:
+    files: int = 0
+    bytes: int = 0
+    failed: int = 0                  # in Benutzung / kein Zugriff
+    dirs_removed: int = 0
+    seconds: float = 0.0
+
+    def format_text(self) -> str:
+        failed = f", {self.failed} nicht löschbar (in Benutzung)" if self.failed else ""
+        return (f"{self.files} Dateien gelöscht, {format_size(self.bytes)} freigegeben{failed} "
+                f"({self.seconds:.1f} s)")
+
+
+def delete_files(report: ScanReport, workers: int = TEMPSCAN_WORKERS, remove_dirs: bool = True) -> DeleteResult:
+    """
+    Löscht die mit ``scan_targets(..., collect=True)`` gefundenen Dateien
+    parallel. Danach werden leer gewordene Unterordner entfernt (tiefste
+    zuerst); die Wurzelordner selbst bleiben stehen.
+    """
+    t0 = time.perf_counter()
+    result = DeleteResult()
+    lock = threading.Lock()
+    paths = [p for c in report.categories.values() for p in c.paths]
+    chunks = [paths[i::max(1, workers)] for i in range(max(1, workers))]
+
+    def worker(chunk: List[str]) -> None:
+        files = size = failed = 0
+        for path in chunk:
+            try:
+                n = os.stat(path, follow_symlinks=False).st_size
+                os.unlink(path)
+            except OSError:
+                failed += 1
+                continue
+            files += 1
+            size += n
+        with lock:
+            result.files += files
+            result.bytes += size
+            result.failed += failed
+
+    threads = [threading.Thread(target=worker, args=(chunk,), daemon=True) for chunk in chunks if chunk]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    if remove_dirs:
+        roots = [os.path.normcase(r) + os.sep for c in report.categories.values() for r in c.roots if os.path.isdir(r)]
+
+        def below_root(d: str) -> bool:
+            d = os.path.normcase(d)
+            return any(d.startswith(r) for r in roots)
+
+        parents = {os.path.dirname(p) for p in paths}
+        for d in sorted(parents, key=len, reverse=True):
+            while below_root(d):
+                try:
+                    os.rmdir(d)   # nur leere Ordner
+                except OSError:
+                    break
+                result.dirs_removed += 1
+                d = os.path.dirname(d)
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+# =============================================================================
+# Vorschau vor der Aktion
+# =============================================================================
+
+TEMPSCAN_ACTIONS = ("temp_cleanup",)
+
+
+def estimate_cleanup(report) -> ScanReport:
+    """Vor ``temp_cleanup``: Ziele scannen und die Summe als Messwert im ``ActionReport`` ablegen."""
+    scan = scan_targets(default_targets())
+    report.metrics["estimated_free"] = {"value": round(scan.total_bytes / (1024 * 1024), 1), "unit": "MB"}
+    report.metrics["estimated_files"] = {"value": scan.total_files, "unit": ""}
+    return scan